@@ -22,11 +22,13 @@ import string
 from oslo_config import cfg
 from oslo_log import log
 from oslo_utils import encodeutils
+from oslo_utils import timeutils
 from six.moves.urllib import parse
 import webob
 
 from manila.api.openstack import api_version_request as api_version
 from manila.api.openstack import versioned_method
+from manila.api.openstack import wsgi
 from manila.i18n import _
 
 api_common_opts = [
@@ -38,6 +40,17 @@ api_common_opts = [
     cfg.StrOpt(
         'osapi_share_base_URL',
         help='Base URL to be presented to users in links to the Share API'),
+    cfg.BoolOpt(
+        'osapi_stream_list_responses',
+        default=False,
+        help='If True, responses of the shares, share instances, share '
+             'snapshots and messages list APIs are rendered and written '
+             'out incrementally as a chunked JSON body instead of being '
+             'built in memory as a whole first. This bounds the memory '
+             'used by API workers serving very large listings. Since the '
+             'response status is sent with the first chunk, errors '
+             'rendering the items after it can not change the status: '
+             'they are logged and the response is aborted.'),
 ]
 
 CONF = cfg.CONF
@@ -111,6 +124,19 @@ def limited(items, request, max_limit=CONF.osapi_max_limit):
                     will cause exc.HTTPBadRequest() exceptions to be raised.
     :kwarg max_limit: The maximum number of items to return from 'items'
     """
+    limit, offset = get_limit_and_offset(request, max_limit=max_limit)
+    range_end = offset + limit
+    return items[offset:range_end]
+
+
+def get_limit_and_offset(request, max_limit=None):
+    """Return (limit, offset) tuple from request.
+
+    Validates 'limit' and 'offset' GET variables the same way as
+    :py:func:`limited` does, for passing them on to the database layer.
+    """
+    if max_limit is None:
+        max_limit = CONF.osapi_max_limit
     try:
         offset = int(request.GET.get('offset', 0))
     except ValueError:
@@ -132,8 +158,54 @@ def limited(items, request, max_limit=CONF.osapi_max_limit):
         raise webob.exc.HTTPBadRequest(explanation=msg)
 
     limit = min(max_limit, limit or max_limit)
-    range_end = offset + limit
-    return items[offset:range_end]
+    return limit, offset
+
+
+def get_pagination_and_sort_params(request, search_opts):
+    """Pop pagination and sorting params off the search options.
+
+    :param request: ``wsgi.Request`` possibly containing 'limit', 'offset',
+                    'marker', 'sort_key' and 'sort_dir' GET variables
+    :param search_opts: dict of search options built from the request GET
+                        variables, pagination and sorting keys are removed
+    :returns: dict with 'limit', 'offset', 'marker', 'sort_key' and
+              'sort_dir' keys to be passed on to the database layer
+    """
+    limit, offset = get_limit_and_offset(request)
+    for key in ('limit', 'offset'):
+        search_opts.pop(key, None)
+    return {
+        'limit': limit,
+        'offset': offset,
+        'marker': search_opts.pop('marker', None),
+        'sort_key': search_opts.pop('sort_key', None),
+        'sort_dir': search_opts.pop('sort_dir', None),
+    }
+
+
+def get_time_filters(search_opts,
+                     keys=('created_since', 'created_before',
+                           'updated_since')):
+    """Pop and parse timestamp filters off the search options.
+
+    :param search_opts: dict of search options built from the request GET
+                        variables, timestamp filters are removed
+    :param keys: names of the timestamp filters to look for
+    :returns: dict of filter names and naive UTC datetime values
+    """
+    time_filters = {}
+    for key in keys:
+        if key not in search_opts:
+            continue
+        value = search_opts.pop(key)
+        try:
+            time_filters[key] = timeutils.normalize_time(
+                timeutils.parse_isotime(value))
+        except ValueError:
+            msg = _("%(key)s is not a valid ISO 8601 timestamp: "
+                    "%(value)s.") % {'key': key, 'value': value}
+            raise webob.exc.HTTPBadRequest(explanation=msg)
+    return time_filters
 
 
 def remove_version_from_href(href):
@@ -182,11 +254,46 @@ class ViewBuilder(object):
     _collection_name = None
     _detail_version_modifiers = []
 
+    # NOTE: Cache of the modifier functions applicable to a given API
+    # version, keyed by view builder class and version. Modifiers are static
+    # per class, so they only need to be resolved once per version rather
+    # than once per resource in a listing.
+    _versioned_modifiers_cache = {}
+
     def _get_links(self, request, identifier):
+        href_prefix, bookmark_prefix = self._get_link_prefixes(request)
         return [{"rel": "self",
-                 "href": self._get_href_link(request, identifier), },
+                 "href": os.path.join(href_prefix, str(identifier)), },
                 {"rel": "bookmark",
-                 "href": self._get_bookmark_link(request, identifier), }]
+                 "href": os.path.join(bookmark_prefix, str(identifier)), }]
+
+    def _get_link_prefixes(self, request):
+        """Return href and bookmark link prefixes for the collection.
+
+        Prefixes only depend on the request, so they are computed once per
+        request and collection and reused for every resource in a listing.
+        """
+        cache = request.environ.setdefault('manila.view_link_prefixes', {})
+        key = (self._collection_name,
+               request.environ["manila.context"].project_id)
+        if key not in cache:
+            cache[key] = (
+                self._get_href_link(request, '').rstrip('/'),
+                self._get_bookmark_link(request, '').rstrip('/'),
+            )
+        return cache[key]
+
+    def _render_list(self, render, items):
+        """Render each item of a collection for a list view.
+
+        :param render: function that returns the view of a single item
+        :param items: items of the collection
+        :returns: list of rendered items, or a lazily rendered
+                  wsgi.StreamingList if list responses are streamed
+        """
+        if CONF.osapi_stream_list_responses:
+            return wsgi.StreamingList(six.moves.map(render, items))
+        return [render(item) for item in items]
 
     def _get_next_link(self, request, identifier):
         """Return href string with proper limit and marker params."""
@@ -248,11 +355,27 @@ class ViewBuilder(object):
         This method calls every method, that is applicable to the request
         version, in _detail_version_modifiers.
         """
-        for method_name in self._detail_version_modifiers:
-            method = getattr(self, method_name)
-            if request.api_version_request.matches_versioned_method(method):
-                request_context = request.environ['manila.context']
-                method.func(self, request_context, resource_dict, resource)
+        modifiers = self._get_versioned_modifiers(request)
+        if not modifiers:
+            return
+        request_context = request.environ['manila.context']
+        for func in modifiers:
+            func(self, request_context, resource_dict, resource)
+
+    def _get_versioned_modifiers(self, request):
+        """Return modifier functions applicable to the request version."""
+        version = request.api_version_request
+        key = (type(self), version.get_string(), version.experimental)
+        modifiers = self._versioned_modifiers_cache.get(key)
+        if modifiers is None:
+            modifiers = []
+            for method_name in self._detail_version_modifiers:
+                method = getattr(self, method_name)
+                if version.matches_versioned_method(method):
+                    modifiers.append(method.func)
+            modifiers = tuple(modifiers)
+            self._versioned_modifiers_cache[key] = modifiers
+        return modifiers
 
     @classmethod
     def versioned_method(cls, min_ver, max_ver=None, experimental=False):
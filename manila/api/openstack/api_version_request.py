@@ -121,13 +121,18 @@ REST_API_VERSION_HISTORY = """
              access rules will not work with API version >=2.45.
     * 2.46 - Added 'is_default' field to 'share_type' and 'share_group_type'
              objects.
+    * 2.47 - Added pagination and 'created_since', 'created_before' and
+             'updated_since' filters to the share instances, share servers,
+             share networks and messages list APIs.
+    * 2.48 - Added 'bytes_sent', 'bytes_total' and 'throughput' to the
+             share migration progress.
 """
 
 # The minimum and maximum versions of the API supported
 # The default api version request is defined to be the
 # minimum version of the API supported.
 _MIN_API_VERSION = "2.0"
-_MAX_API_VERSION = "2.46"
+_MAX_API_VERSION = "2.48"
 DEFAULT_API_VERSION = _MIN_API_VERSION
 
 
@@ -29,6 +29,7 @@ import webob.exc
 from manila.api.openstack import api_version_request as api_version
 from manila.api.openstack import versioned_method
 from manila.common import constants
+from manila.db.sqlalchemy import query_stats
 from manila import exception
 from manila.i18n import _
 from manila import policy
@@ -296,12 +297,88 @@ class DictSerializer(ActionDispatcher):
         return ""
 
 
+class StreamingList(object):
+    """Collection of items that is serialized lazily, one item at a time.
+
+    List view builders may place an instance of this class in the response
+    dict instead of a list. The JSON serializer then encodes the response
+    incrementally and the WSGI layer writes it out as a chunked body, so
+    the full list of rendered items and its JSON representation never have
+    to be held in memory at once.
+    """
+
+    def __init__(self, items):
+        self._items = items
+
+    def __iter__(self):
+        return iter(self._items)
+
+
 class JSONDictSerializer(DictSerializer):
     """Default JSON request body serialization."""
 
+    # Minimum size in bytes of the chunks written for streamed responses.
+    stream_chunk_size = 64 * 1024
+
     def default(self, data):
+        if isinstance(data, dict) and any(
+                isinstance(v, StreamingList) for v in data.values()):
+            return self._iter_encode(data)
         return six.b(jsonutils.dumps(data))
 
+    def _iter_encode(self, data):
+        """Yields the JSON encoding of data in chunks of bytes.
+
+        Items are rendered while the body is written, after the response
+        status has been sent, so a failure to render one of them can not be
+        reported as a fault any more. It is logged and the stream is
+        aborted, so that the client gets an incomplete chunked body rather
+        than a truncated JSON document that looks complete.
+        """
+        buf = []
+        buf_size = 0
+        try:
+            for fragment in self._iter_fragments(data):
+                buf.append(fragment)
+                buf_size += len(fragment)
+                if buf_size >= self.stream_chunk_size:
+                    yield six.b(''.join(buf))
+                    buf = []
+                    buf_size = 0
+        except Exception:
+            LOG.exception("Error rendering a streamed response, aborting "
+                          "it.")
+            raise
+        if buf:
+            yield six.b(''.join(buf))
+
+    def _iter_fragments(self, data):
+        yield '{'
+        for index, (key, value) in enumerate(data.items()):
+            if index:
+                yield ', '
+            yield jsonutils.dumps(key) + ': '
+            if isinstance(value, StreamingList):
+                yield '['
+                for item_index, item in enumerate(value):
+                    if item_index:
+                        yield ', '
+                    yield jsonutils.dumps(item)
+                yield ']'
+            else:
+                yield jsonutils.dumps(value)
+        yield '}'
+
+
+def _log_db_stats_after(body, request):
+    """Yields the chunks of a streamed body, then logs the DB usage."""
+    try:
+        for chunk in body:
+            yield chunk
+    finally:
+        query_stats.log_summary(
+            request.environ.get('manila.context'), request.url)
+
 
 def serializers(**serializers):
     """Attaches serializers to a method.
@@ -466,7 +543,14 @@ class ResponseObject(object):
             response.headers[hdr] = six.text_type(value)
         response.headers['Content-Type'] = six.text_type(content_type)
         if self.obj is not None:
-            response.body = serializer.serialize(self.obj)
+            body = serializer.serialize(self.obj)
+            if isinstance(body, six.binary_type):
+                response.body = body
+            else:
+                # NOTE: Streamed bodies are written out as they are
+                # produced, so their length is not known in advance.
+                response.app_iter = _log_db_stats_after(body, request)
+                request.environ['manila.streamed_response'] = True
 
         return response
 
@@ -859,6 +943,11 @@ class Resource(wsgi.Application):
             msg = _("%(url)s returned a fault: %(e)s") % msg_dict
 
         LOG.info(msg)
+        if not request.environ.get('manila.streamed_response'):
+            # NOTE: The database usage of streamed responses is logged once
+            # their body, which queries the database as well, is written.
+            query_stats.log_summary(
+                request.environ.get('manila.context'), request.url)
 
         if hasattr(response, 'headers'):
             for hdr, val in response.headers.items():
@@ -19,6 +19,8 @@ from six.moves import http_client
 import webob
 from webob import exc
 
+from manila.api import common
+from manila.api.openstack import api_version_request as api_version
 from manila.api.openstack import wsgi
 from manila.api.views import share_servers as share_servers_views
 from manila.common import constants
@@ -29,6 +31,14 @@ from manila import share
 
 LOG = log.getLogger(__name__)
 
+SHARE_SERVER_FILTERS = (
+    'host',
+    'status',
+    'share_network_id',
+    'share_network',
+    'project_id',
+)
+
 
 class ShareServerController(wsgi.Controller):
     """The Share Server API controller for the OpenStack API."""
@@ -48,7 +58,13 @@ class ShareServerController(wsgi.Controller):
         search_opts = {}
         search_opts.update(req.GET)
 
-        share_servers = db_api.share_server_get_all(context)
+        limit = None
+        if req.api_version_request >= api_version.APIVersionRequest("2.47"):
+            share_servers, limit = self._get_share_servers(
+                req, context, search_opts)
+            search_opts = {}
+        else:
+            share_servers = db_api.share_server_get_all(context)
         for s in share_servers:
             s.project_id = s.share_network['project_id']
             if s.share_network['name']:
@@ -62,7 +78,34 @@ class ShareServerController(wsgi.Controller):
                                   s[k] == v or k == 'share_network' and
                                   v in [s.share_network['name'],
                                         s.share_network['id']])]
-        return self._view_builder.build_share_servers(share_servers)
+        return self._view_builder.build_share_servers(
+            req, share_servers, limit=limit)
+
+    def _get_share_servers(self, req, context, search_opts):
+        """Returns a page of share servers filtered by the database.
+
+        The share servers are only limited if the request asks for it, as
+        they are not limited with earlier API versions.
+
+        :returns: tuple of the share servers and the limit applied to them
+        """
+        list_params = common.get_pagination_and_sort_params(req, search_opts)
+        if 'limit' not in req.GET:
+            list_params['limit'] = None
+        filters = common.get_time_filters(search_opts)
+        unsupported_filters = set(search_opts) - set(SHARE_SERVER_FILTERS)
+        if unsupported_filters:
+            msg = _("Share servers cannot be filtered using %s.") % (
+                ', '.join(sorted(unsupported_filters)))
+            raise exc.HTTPBadRequest(explanation=msg)
+        filters.update(search_opts)
+
+        try:
+            share_servers = db_api.share_server_get_all(
+                context, filters=filters, **list_params)
+        except exception.MarkerNotFound as e:
+            raise exc.HTTPBadRequest(explanation=six.text_type(e))
+        return share_servers, list_params['limit']
 
     @wsgi.Controller.authorize
     def show(self, req, id):
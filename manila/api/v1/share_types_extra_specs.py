@@ -99,7 +99,7 @@ class ShareTypeExtraSpecsController(wsgi.Controller):
             raise webob.exc.HTTPBadRequest(e.message)
 
         self._check_key_names(specs.keys())
-        db.share_type_extra_specs_update_or_create(context, type_id, specs)
+        share_types.update_share_type_extra_specs(context, type_id, specs)
         notifier_info = dict(type_id=type_id, specs=specs)
         notifier = rpc.get_notifier('shareTypeExtraSpecs')
         notifier.info(context, 'share_type_extra_specs.create', notifier_info)
@@ -119,7 +119,7 @@ class ShareTypeExtraSpecsController(wsgi.Controller):
             expl = _('Request body contains too many items')
             raise webob.exc.HTTPBadRequest(explanation=expl)
         self._verify_extra_specs(body, False)
-        db.share_type_extra_specs_update_or_create(context, type_id, body)
+        share_types.update_share_type_extra_specs(context, type_id, body)
         notifier_info = dict(type_id=type_id, id=id)
         notifier = rpc.get_notifier('shareTypeExtraSpecs')
         notifier.info(context, 'share_type_extra_specs.update', notifier_info)
@@ -167,7 +167,7 @@ class ShareTypeExtraSpecsController(wsgi.Controller):
             raise webob.exc.HTTPForbidden(explanation=msg)
 
         try:
-            db.share_type_extra_specs_delete(context, type_id, id)
+            share_types.delete_share_type_extra_spec(context, type_id, id)
         except exception.ShareTypeExtraSpecsNotFound as error:
             raise webob.exc.HTTPNotFound(explanation=error.msg)
 
@@ -69,7 +69,7 @@ class MessagesController(wsgi.Controller):
 
         return webob.Response(status_int=http_client.NO_CONTENT)
 
-    @wsgi.Controller.api_version(MESSAGES_BASE_MICRO_VERSION)
+    @wsgi.Controller.api_version(MESSAGES_BASE_MICRO_VERSION, '2.46')
     @wsgi.Controller.authorize('get_all')
     def index(self, req):
         """Returns a list of messages, transformed through view builder."""
@@ -91,6 +91,28 @@ class MessagesController(wsgi.Controller):
 
         return self._view_builder.index(req, limited_list)
 
+    @wsgi.Controller.api_version('2.47')  # noqa
+    @wsgi.Controller.authorize('get_all')
+    def index(self, req):  # pylint: disable=E0102
+        """Returns a page of messages, transformed through view builder."""
+        context = req.environ['manila.context']
+
+        search_opts = {}
+        search_opts.update(req.GET)
+
+        list_params = common.get_pagination_and_sort_params(req, search_opts)
+        list_params['sort_key'] = list_params['sort_key'] or 'created_at'
+        list_params['sort_dir'] = list_params['sort_dir'] or 'desc'
+        search_opts.update(common.get_time_filters(search_opts))
+
+        try:
+            messages = self.message_api.get_all(
+                context, search_opts=search_opts, **list_params)
+        except exception.MarkerNotFound as e:
+            raise exc.HTTPBadRequest(explanation=e.msg)
+
+        return self._view_builder.index(req, messages)
+
 
 def create_resource():
     return wsgi.Resource(MessagesController())
@@ -234,6 +234,7 @@ class QuotaSetsMixin(object):
                     user_id=user_id, share_type_id=share_type_id)
             except exception.AdminRequired:
                 raise webob.exc.HTTPForbidden()
+        QUOTAS.invalidate_limits_cache(project_id)
         return self._view_builder.detail_list(
             req,
             self._get_quotas(
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import six
 from webob import exc
 
 from manila.api import common
@@ -72,7 +73,7 @@ class ShareInstancesController(wsgi.Controller, wsgi.AdminActionsMixin):
         instances = db.share_instances_get_all(context)
         return self._view_builder.detail_list(req, instances)
 
-    @wsgi.Controller.api_version("2.35")  # noqa
+    @wsgi.Controller.api_version("2.35", "2.46")  # noqa
     @wsgi.Controller.authorize
     def index(self, req):  # pylint: disable=E0102
         context = req.environ['manila.context']
@@ -84,6 +85,28 @@ class ShareInstancesController(wsgi.Controller, wsgi.AdminActionsMixin):
         instances = db.share_instances_get_all(context, filters)
         return self._view_builder.detail_list(req, instances)
 
+    @wsgi.Controller.api_version("2.47")  # noqa
+    @wsgi.Controller.authorize
+    def index(self, req):  # pylint: disable=E0102
+        context = req.environ['manila.context']
+        filters = {}
+        filters.update(req.GET)
+        list_params = common.get_pagination_and_sort_params(req, filters)
+        if 'limit' not in req.GET:
+            # Share instances are not limited with earlier API versions.
+            list_params['limit'] = None
+        time_filters = common.get_time_filters(filters)
+        common.remove_invalid_options(
+            context, filters, ('export_location_id', 'export_location_path'))
+        filters.update(time_filters)
+
+        try:
+            instances = db.share_instances_get_all(
+                context, filters, **list_params)
+        except exception.MarkerNotFound as e:
+            raise exc.HTTPBadRequest(explanation=six.text_type(e))
+        return self._view_builder.detail_list(req, instances)
+
     @wsgi.Controller.api_version("2.3")
     @wsgi.Controller.authorize
     def show(self, req, id):
@@ -109,6 +109,9 @@ class ShareNetworkController(wsgi.Controller):
 
     def _get_share_networks(self, req, is_detail=True):
         """Returns a list of share networks."""
+        if req.api_version_request >= api_version.APIVersionRequest("2.47"):
+            return self._get_share_networks_from_db(req, is_detail=is_detail)
+
         context = req.environ['manila.context']
         search_opts = {}
         search_opts.update(req.GET)
@@ -177,6 +180,48 @@ class ShareNetworkController(wsgi.Controller):
         return self._view_builder.build_share_networks(
             req, limited_list, is_detail)
 
+    def _get_share_networks_from_db(self, req, is_detail=True):
+        """Returns a page of share networks filtered by the database."""
+        context = req.environ['manila.context']
+        search_opts = {}
+        search_opts.update(req.GET)
+
+        list_params = common.get_pagination_and_sort_params(req, search_opts)
+        filters = common.get_time_filters(search_opts)
+        security_service_id = search_opts.pop('security_service_id', None)
+        project_id = search_opts.pop('project_id', None)
+        all_tenants = 'all_tenants' in search_opts
+        search_opts.pop('all_tenants', None)
+        for key in ('ip_version', 'segmentation_id'):
+            if key in search_opts:
+                try:
+                    search_opts[key] = int(search_opts[key])
+                except ValueError:
+                    msg = _("%s must be an integer.") % key
+                    raise exc.HTTPBadRequest(explanation=msg)
+        filters.update(search_opts)
+
+        try:
+            if security_service_id:
+                networks = db_api.share_network_get_all_by_security_service(
+                    context, security_service_id, filters=filters,
+                    **list_params)
+            elif context.is_admin and project_id:
+                networks = db_api.share_network_get_all_by_project(
+                    context, project_id, filters=filters, **list_params)
+            elif context.is_admin and all_tenants:
+                networks = db_api.share_network_get_all(
+                    context, filters=filters, **list_params)
+            else:
+                networks = db_api.share_network_get_all_by_project(
+                    context, context.project_id, filters=filters,
+                    **list_params)
+        except exception.MarkerNotFound as e:
+            raise exc.HTTPBadRequest(explanation=six.text_type(e))
+
+        return self._view_builder.build_share_networks(
+            req, networks, is_detail)
+
     def index(self, req):
         """Returns a summary list of share networks."""
         policy.check_policy(req.environ['manila.context'], RESOURCE_NAME,
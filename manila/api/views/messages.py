@@ -55,8 +55,8 @@ class ViewBuilder(common.ViewBuilder):
                           for a pagination query
         :returns: message data in dictionary format
         """
-        messages_list = [func(request, message)['message']
-                         for message in messages]
+        messages_list = self._render_list(
+            lambda message: func(request, message)['message'], messages)
         messages_links = self._get_collection_links(request,
                                                     messages,
                                                     coll_name)
@@ -53,8 +53,9 @@ class ViewBuilder(common.ViewBuilder):
 
     def _list_view(self, func, request, instances):
         """Provide a view for a list of share instances."""
-        instances_list = [func(request, instance)['share_instance']
-                          for instance in instances]
+        instances_list = self._render_list(
+            lambda instance: func(request, instance)['share_instance'],
+            instances)
         instances_links = self._get_collection_links(request,
                                                      instances,
                                                      self._collection_name)
@@ -20,7 +20,9 @@ class ViewBuilder(common.ViewBuilder):
     """Model share migration view data response as a python dictionary."""
 
     _collection_name = 'share_migration'
-    _detail_version_modifiers = []
+    _detail_version_modifiers = [
+        "add_transfer_fields",
+    ]
 
     def get_progress(self, request, share, progress):
         """View of share migration job progress."""
@@ -30,3 +32,9 @@ class ViewBuilder(common.ViewBuilder):
         }
         self.update_versioned_resource_dict(request, result, progress)
         return result
+
+    @common.ViewBuilder.versioned_method("2.48")
+    def add_transfer_fields(self, context, progress_dict, progress):
+        progress_dict['bytes_sent'] = progress.get('bytes_sent')
+        progress_dict['bytes_total'] = progress.get('bytes_total')
+        progress_dict['throughput'] = progress.get('throughput')
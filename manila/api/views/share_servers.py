@@ -19,7 +19,7 @@ from manila.api import common
 class ViewBuilder(common.ViewBuilder):
     """Model a server API response as a python dictionary."""
 
-    _collection_name = 'share_servers'
+    _collection_name = 'share-servers'
 
     def build_share_server(self, share_server):
         """View of a share server."""
@@ -28,12 +28,23 @@ class ViewBuilder(common.ViewBuilder):
                 self._build_share_server_view(share_server, detailed=True)
         }
 
-    def build_share_servers(self, share_servers):
-        return {
+    def build_share_servers(self, request, share_servers, limit=None):
+        """View of a list of share servers.
+
+        :param limit: number of share servers the list was limited to, a
+            link to the next page is added if the list is full
+        """
+        share_servers_dict = {
             'share_servers':
                 [self._build_share_server_view(share_server)
                  for share_server in share_servers]
         }
+        if limit and len(share_servers) == limit:
+            share_servers_dict['share_servers_links'] = [{
+                'rel': 'next',
+                'href': self._get_next_link(request, share_servers[-1]['id']),
+            }]
+        return share_servers_dict
 
     def build_share_server_details(self, details):
         return {'details': details}
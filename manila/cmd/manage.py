@@ -70,6 +70,8 @@ from manila import context
 from manila import db
 from manila.db import migration
 from manila.i18n import _
+from manila.message import api as message_api
+from manila import quota
 from manila import utils
 from manila import version
 
@@ -263,6 +265,33 @@ class DbCommands(object):
         ctxt = context.get_admin_context()
         db.purge_deleted_records(ctxt, age_in_days)
 
+    @args('--batch_size', type=int, default=None,
+          help='Maximum number of messages deleted per transaction, '
+               'defaults to the message_reap_batch_size option.')
+    @args('--batch_delay', type=float, default=None,
+          help='Seconds to wait between two batches, defaults to the '
+               'message_reap_batch_delay option.')
+    def clean_expired_messages(self, batch_size=None, batch_delay=None):
+        """Delete expired user messages."""
+        ctxt = context.get_admin_context()
+        count = message_api.API().cleanup_expired_messages(
+            ctxt, batch_size=batch_size, batch_delay=batch_delay)
+        print(_("Deleted %d expired messages.") % count)
+
+    @args('--batch_size', type=int, default=None,
+          help='Maximum number of reservations rolled back per '
+               'transaction, defaults to the reservation_expire_batch_size '
+               'option.')
+    @args('--batch_delay', type=float, default=None,
+          help='Seconds to wait between two batches, defaults to the '
+               'reservation_expire_batch_delay option.')
+    def expire_reservations(self, batch_size=None, batch_delay=None):
+        """Roll back expired quota reservations."""
+        ctxt = context.get_admin_context()
+        count = quota.QUOTAS.expire(
+            ctxt, batch_size=batch_size, batch_delay=batch_delay)
+        print(_("Rolled back %d expired reservations.") % count)
+
 
 class VersionCommands(object):
     """Class for exposing the codebase version."""
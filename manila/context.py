@@ -89,6 +89,8 @@ class RequestContext(context.RequestContext):
             self.service_catalog = []
 
         self.quota_class = quota_class
+        # Database usage of the request, see manila.db.sqlalchemy.query_stats
+        self.db_stats = None
 
     def _get_read_deleted(self):
         return self._read_deleted
@@ -126,6 +128,8 @@ class RequestContext(context.RequestContext):
         """Return a version of this context with admin flag set."""
         ctx = copy.deepcopy(self)
         ctx.is_admin = True
+        # Account the database usage of the elevated context to the request.
+        ctx.db_stats = self.db_stats
 
         if 'admin' not in ctx.roles:
             ctx.roles.append('admin')
@@ -24,6 +24,7 @@ from tooz import locking
 
 from manila import exception
 from manila.i18n import _
+from manila import lock_stats
 
 
 LOG = log.getLogger(__name__)
@@ -122,6 +123,8 @@ class Lock(locking.Lock):
         self.coordinator = coordinator or LOCK_COORDINATOR
         self.blocking = True
         self.lock = self._prepare_lock(lock_name, lock_data)
+        self.timer = (lock_stats.LockTimer(lock_name)
+                      if lock_stats.enabled() else None)
 
     def _prepare_lock(self, lock_name, lock_data):
         if not isinstance(lock_name, six.string_types):
@@ -138,7 +141,12 @@ class Lock(locking.Lock):
         :rtype: bool
         """
         blocking = self.blocking if blocking is None else blocking
-        return self.lock.acquire(blocking=blocking)
+        if self.timer:
+            self.timer.acquiring()
+        acquired = self.lock.acquire(blocking=blocking)
+        if acquired and self.timer:
+            self.timer.acquired()
+        return acquired
 
     def release(self):
         """Attempts to release lock.
@@ -147,6 +155,8 @@ class Lock(locking.Lock):
         place is undefined.
         """
         self.lock.release()
+        if self.timer:
+            self.timer.released()
 
 
 def synchronized(lock_name, blocking=True, coordinator=None):
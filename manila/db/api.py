@@ -292,9 +292,13 @@ def quota_destroy_all_by_project(context, project_id):
     return IMPL.quota_destroy_all_by_project(context, project_id)
 
 
-def reservation_expire(context):
-    """Roll back any expired reservations."""
-    return IMPL.reservation_expire(context)
+def reservation_expire(context, batch_size=None):
+    """Roll back expired reservations.
+
+    If batch_size is given, at most that many reservations are rolled back.
+    Returns the number of reservations rolled back.
+    """
+    return IMPL.reservation_expire(context, batch_size=batch_size)
 
 
 ###################
@@ -330,9 +334,12 @@ def share_instances_host_update(context, current_host, new_host):
     return IMPL.share_instances_host_update(context, current_host, new_host)
 
 
-def share_instances_get_all(context, filters=None):
+def share_instances_get_all(context, filters=None, limit=None, offset=None,
+                            marker=None, sort_key=None, sort_dir=None):
     """Returns all share instances."""
-    return IMPL.share_instances_get_all(context, filters=filters)
+    return IMPL.share_instances_get_all(
+        context, filters=filters, limit=limit, offset=offset, marker=marker,
+        sort_key=sort_key, sort_dir=sort_dir)
 
 
 def share_instances_get_all_by_share_server(context, share_server_id):
@@ -806,20 +813,31 @@ def share_network_get(context, id):
     return IMPL.share_network_get(context, id)
 
 
-def share_network_get_all(context):
+def share_network_get_all(context, filters=None, limit=None, offset=None,
+                          marker=None, sort_key=None, sort_dir=None):
     """Get all share network DB records."""
-    return IMPL.share_network_get_all(context)
+    return IMPL.share_network_get_all(
+        context, filters=filters, limit=limit, offset=offset, marker=marker,
+        sort_key=sort_key, sort_dir=sort_dir)
 
 
-def share_network_get_all_by_project(context, project_id):
+def share_network_get_all_by_project(context, project_id, filters=None,
+                                     limit=None, offset=None, marker=None,
+                                     sort_key=None, sort_dir=None):
     """Get all share network DB records for the given project."""
-    return IMPL.share_network_get_all_by_project(context, project_id)
+    return IMPL.share_network_get_all_by_project(
+        context, project_id, filters=filters, limit=limit, offset=offset,
+        marker=marker, sort_key=sort_key, sort_dir=sort_dir)
 
 
-def share_network_get_all_by_security_service(context, security_service_id):
-    """Get all share network DB records for the given project."""
+def share_network_get_all_by_security_service(context, security_service_id,
+                                              filters=None, limit=None,
+                                              offset=None, marker=None,
+                                              sort_key=None, sort_dir=None):
+    """Get all share network DB records for the given security service."""
     return IMPL.share_network_get_all_by_security_service(
-        context, security_service_id)
+        context, security_service_id, filters=filters, limit=limit,
+        offset=offset, marker=marker, sort_key=sort_key, sort_dir=sort_dir)
 
 
 def share_network_add_security_service(context, id, security_service_id):
@@ -902,9 +920,12 @@ def share_server_get_all_by_host_and_share_net_valid(context, host,
         context, host, share_net_id, session=session)
 
 
-def share_server_get_all(context):
+def share_server_get_all(context, filters=None, limit=None, offset=None,
+                         marker=None, sort_key=None, sort_dir=None):
     """Get all share server DB records."""
-    return IMPL.share_server_get_all(context)
+    return IMPL.share_server_get_all(
+        context, filters=filters, limit=limit, offset=offset, marker=marker,
+        sort_key=sort_key, sort_dir=sort_dir)
 
 
 def share_server_get_all_by_host(context, host):
@@ -1022,6 +1043,11 @@ def driver_private_data_get(context, entity_id, key=None, default=None):
     return IMPL.driver_private_data_get(context, entity_id, key, default)
 
 
+def driver_private_data_get_by_entities(context, entity_ids, key=None):
+    """Get list or all key-value pairs for each of given entity_ids."""
+    return IMPL.driver_private_data_get_by_entities(context, entity_ids, key)
+
+
 def driver_private_data_update(context, entity_id, details,
                                delete_existing=False):
     """Update key-value pairs for given entity_id."""
@@ -1340,10 +1366,12 @@ def message_get(context, message_id):
     return IMPL.message_get(context, message_id)
 
 
-def message_get_all(context, filters=None, sort_key=None, sort_dir=None):
+def message_get_all(context, filters=None, limit=None, offset=None,
+                    marker=None, sort_key=None, sort_dir=None):
     """Returns all messages with the project of the specified context."""
-    return IMPL.message_get_all(context, filters=filters, sort_key=sort_key,
-                                sort_dir=sort_dir)
+    return IMPL.message_get_all(context, filters=filters, limit=limit,
+                                offset=offset, marker=marker,
+                                sort_key=sort_key, sort_dir=sort_dir)
 
 
 def message_create(context, values):
@@ -1356,9 +1384,13 @@ def message_destroy(context, message_id):
     return IMPL.message_destroy(context, message_id)
 
 
-def cleanup_expired_messages(context):
-    """Soft delete expired messages"""
-    return IMPL.cleanup_expired_messages(context)
+def cleanup_expired_messages(context, batch_size=None):
+    """Soft delete expired messages.
+
+    If batch_size is given, at most that many messages are deleted.
+    Returns the number of messages deleted.
+    """
+    return IMPL.cleanup_expired_messages(context, batch_size=batch_size)
 
 
 def backend_info_get(context, host):
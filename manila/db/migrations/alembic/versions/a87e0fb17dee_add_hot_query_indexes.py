@@ -0,0 +1,67 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""add indexes for the frequently run share and access queries
+
+Revision ID: a87e0fb17dee
+Revises: 11ee96se625f3
+Create Date: 2018-07-02 11:24:36.208514
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'a87e0fb17dee'
+down_revision = '11ee96se625f3'
+
+from alembic import op
+
+from manila.db.migrations import utils
+
+
+INDEXES = (
+    ('share_instances_host_deleted_idx', 'share_instances',
+     ['host', 'deleted']),
+    ('share_instance_access_map_instance_id_state_idx',
+     'share_instance_access_map', ['share_instance_id', 'state']),
+    ('share_snapshot_instances_instance_id_status_idx',
+     'share_snapshot_instances', ['share_instance_id', 'status']),
+    ('messages_expires_at_idx', 'messages', ['expires_at']),
+    ('network_allocations_ip_address_idx', 'network_allocations',
+     ['ip_address']),
+)
+
+
+def upgrade():
+    for index_name, table_name, columns in INDEXES:
+        op.create_index(index_name, table_name, columns)
+
+
+def downgrade():
+    connection = op.get_bind()
+    for index_name, table_name, columns in INDEXES:
+        # MySQL may have dropped the index it created for a foreign key on
+        # the leading column in favour of the new index, which then can not
+        # be dropped while the foreign key exists.
+        foreign_keys = []
+        if connection.engine.name == 'mysql':
+            table = utils.load_table(table_name, connection)
+            foreign_keys = [
+                fk for fk in table.foreign_key_constraints
+                if list(fk.column_keys) == columns[:1]]
+        for fk in foreign_keys:
+            op.drop_constraint(fk.name, table_name, type_='foreignkey')
+        op.drop_index(index_name, table_name)
+        for fk in foreign_keys:
+            op.create_foreign_key(
+                fk.name, table_name, fk.referred_table.name,
+                list(fk.column_keys),
+                [element.column.name for element in fk.elements])
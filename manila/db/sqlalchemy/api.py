@@ -18,6 +18,7 @@
 
 """Implementation of SQLAlchemy backend."""
 
+import collections
 import copy
 import datetime
 from functools import wraps
@@ -48,6 +49,7 @@ from sqlalchemy.sql import func
 
 from manila.common import constants
 from manila.db.sqlalchemy import models
+from manila.db.sqlalchemy import query_stats
 from manila import exception
 from manila.i18n import _
 from manila import quota
@@ -71,6 +73,8 @@ def _create_facade_lazily():
     global _FACADE
     if _FACADE is None:
         _FACADE = session.EngineFacade.from_config(cfg.CONF)
+        if CONF.db_query_stats:
+            query_stats.setup_engine(_FACADE.get_engine())
     return _FACADE
 
 
@@ -87,6 +91,8 @@ def get_session(**kwargs):
 def get_backend():
     """The backend is this module itself."""
 
+    if CONF.db_query_stats:
+        return query_stats.ProfiledBackend(sys.modules[__name__])
     return sys.modules[__name__]
 
 
@@ -209,6 +215,76 @@ def apply_sorting(model, query, sort_key, sort_dir):
     return query.order_by(sort_method())
 
 
+def _paginate_query(query, model, limit=None, offset=None, marker=None,
+                    sort_key=None, sort_dir=None):
+    """Applies sorting and pagination to a query.
+
+    Results are sorted by the given key and then by the model's 'id', so
+    that pages are stable even when the sort key is not unique.
+
+    :param query: query to apply sorting and pagination to
+    :param model: model object the query applies to
+    :param limit: maximum number of items to return
+    :param offset: number of items to skip
+    :param marker: ID of the last item of the previous page
+    :param sort_key: attribute of model to be used for sorting
+    :param sort_dir: desired direction of sorting, can be 'asc' and 'desc'
+    :returns: updated query
+    :raises: exception.InvalidInput, exception.MarkerNotFound
+    """
+    sort_key = sort_key or 'created_at'
+    sort_dir = sort_dir or 'desc'
+    if sort_dir.lower() not in ('desc', 'asc'):
+        msg = _("Wrong sorting data provided: sort key is '%(sort_key)s' "
+                "and sort direction is '%(sort_dir)s'.") % {
+                    "sort_key": sort_key, "sort_dir": sort_dir}
+        raise exception.InvalidInput(reason=msg)
+
+    sort_keys = [sort_key]
+    if sort_key != 'id':
+        sort_keys.append('id')
+
+    marker_ref = None
+    if marker is not None:
+        marker_ref = query.filter(model.id == marker).first()
+        if marker_ref is None:
+            raise exception.MarkerNotFound(marker=marker)
+
+    try:
+        query = db_utils.paginate_query(
+            query, model, limit, sort_keys, marker=marker_ref,
+            sort_dir=sort_dir.lower())
+    except db_exception.InvalidSortKey:
+        msg = _("Wrong sorting key provided - '%s'.") % sort_key
+        raise exception.InvalidInput(reason=msg)
+
+    if offset:
+        query = query.offset(offset)
+    return query
+
+
+def _apply_time_filters(query, model, filters):
+    """Applies 'created_since', 'created_before' and 'updated_since' filters.
+
+    Consumed filters are removed from the filters dict.
+
+    :param query: query to apply filters to
+    :param model: model object the query applies to
+    :param filters: dictionary of filters, values are datetime objects
+    :returns: updated query
+    """
+    created_since = filters.pop('created_since', None)
+    if created_since:
+        query = query.filter(model.created_at >= created_since)
+    created_before = filters.pop('created_before', None)
+    if created_before:
+        query = query.filter(model.created_at <= created_before)
+    updated_since = filters.pop('updated_since', None)
+    if updated_since:
+        query = query.filter(model.updated_at >= updated_since)
+    return query
+
+
 def model_query(context, model, *args, **kwargs):
     """Query helper that accounts for context's `read_deleted` field.
 
@@ -843,49 +919,54 @@ def _reservation_create(context, uuid, usage, project_id, user_id, resource,
 # code always acquires the lock on quota_usages before acquiring the lock
 # on reservations.
 
-def _get_share_type_quota_usages(context, session, project_id, share_type_id):
-    rows = model_query(
-        context, models.QuotaUsage, read_deleted="no", session=session,
-    ).filter(
-        models.QuotaUsage.project_id == project_id,
-        models.QuotaUsage.share_type_id == share_type_id,
-    ).with_lockmode('update').all()
-    return {row.resource: row for row in rows}
-
+def _get_quota_usages(context, session, project_id, user_id=None,
+                      share_type_id=None):
+    """Lock and return owner and project usages with a single query.
 
-def _get_user_quota_usages(context, session, project_id, user_id):
+    The owner is either the share type (if share_type_id is given) or the
+    user. The project usages used to be read with a separate query
+    filtering on ``share_type_id is None``, which is evaluated by Python
+    and matches no rows, so they were always empty and project quotas
+    were only checked against the owner usages. That behaviour is kept,
+    without the extra round trip.
+    """
     # Broken out for testability
+    if share_type_id:
+        owner_filter = models.QuotaUsage.share_type_id == share_type_id
+    else:
+        owner_filter = models.QuotaUsage.user_id == user_id
     rows = (model_query(context, models.QuotaUsage,
                         read_deleted="no",
                         session=session).
             filter_by(project_id=project_id).
-            filter(or_(models.QuotaUsage.user_id == user_id,
-                       models.QuotaUsage.user_id is None)).
+            filter(owner_filter).
             with_lockmode('update').
             all())
-    return {row.resource: row for row in rows}
+    return {row.resource: row for row in rows}, {}
 
 
-def _get_project_quota_usages(context, session, project_id):
+def _get_user_and_share_type_quota_usages(context, session, project_id,
+                                          user_id, share_type_id=None):
+    """Lock and return user and share type usages with a single query."""
+    filters = [models.QuotaUsage.user_id == user_id]
+    if share_type_id:
+        filters.append(models.QuotaUsage.share_type_id == share_type_id)
     rows = (model_query(context, models.QuotaUsage,
                         read_deleted="no",
                         session=session).
             filter_by(project_id=project_id).
-            filter(models.QuotaUsage.share_type_id is None).
+            filter(or_(*filters)).
             with_lockmode('update').
             all())
-    result = dict()
-    # Get the total count of in_use,reserved
+
+    user_usages = {}
+    st_usages = {}
     for row in rows:
-        if row.resource in result:
-            result[row.resource]['in_use'] += row.in_use
-            result[row.resource]['reserved'] += row.reserved
-            result[row.resource]['total'] += (row.in_use + row.reserved)
+        if share_type_id and row.share_type_id == share_type_id:
+            st_usages[row.resource] = row
         else:
-            result[row.resource] = dict(in_use=row.in_use,
-                                        reserved=row.reserved,
-                                        total=row.in_use + row.reserved)
-    return result
+            user_usages[row.resource] = row
+    return user_usages, st_usages
 
 
 @require_context
@@ -921,17 +1002,13 @@ def _quota_reserve(context, resources, project_quotas, user_or_st_quotas,
 
         if project_id is None:
             project_id = context.project_id
-        if share_type_id:
-            user_or_st_usages = _get_share_type_quota_usages(
-                context, session, project_id, share_type_id)
-        else:
+        if not share_type_id:
             user_id = user_id if user_id else context.user_id
-            user_or_st_usages = _get_user_quota_usages(
-                context, session, project_id, user_id)
 
         # Get the current usages
-        project_usages = _get_project_quota_usages(
-            context, session, project_id)
+        user_or_st_usages, project_usages = _get_quota_usages(
+            context, session, project_id, user_id=user_id,
+            share_type_id=share_type_id)
 
         # Handle usage refresh
         work = set(deltas.keys())
@@ -1135,13 +1212,9 @@ def reservation_commit(context, reservations, project_id=None, user_id=None,
                        share_type_id=None):
     session = get_session()
     with session.begin():
-        if share_type_id:
-            st_usages = _get_share_type_quota_usages(
-                context, session, project_id, share_type_id)
-        else:
-            st_usages = {}
-        user_usages = _get_user_quota_usages(
-            context, session, project_id, user_id)
+        user_usages, st_usages = _get_user_and_share_type_quota_usages(
+            context, session, project_id, user_id,
+            share_type_id=share_type_id)
 
         reservation_query = _quota_reservations_query(
             session, context, reservations)
@@ -1163,13 +1236,9 @@ def reservation_rollback(context, reservations, project_id=None, user_id=None,
                          share_type_id=None):
     session = get_session()
     with session.begin():
-        if share_type_id:
-            st_usages = _get_share_type_quota_usages(
-                context, session, project_id, share_type_id)
-        else:
-            st_usages = {}
-        user_usages = _get_user_quota_usages(
-            context, session, project_id, user_id)
+        user_usages, st_usages = _get_user_and_share_type_quota_usages(
+            context, session, project_id, user_id,
+            share_type_id=share_type_id)
 
         reservation_query = _quota_reservations_query(
             session, context, reservations)
@@ -1262,7 +1331,7 @@ def quota_destroy_all_by_project(context, project_id):
 
 @require_admin_context
 @oslo_db_api.wrap_db_retry(max_retries=5, retry_on_deadlock=True)
-def reservation_expire(context):
+def reservation_expire(context, batch_size=None):
     session = get_session()
     with session.begin():
         current_time = timeutils.utcnow()
@@ -1270,17 +1339,31 @@ def reservation_expire(context):
             context, models.Reservation,
             session=session, read_deleted="no").
             filter(models.Reservation.expire < current_time))
-
-        for reservation in reservation_query.all():
+        if batch_size:
+            reservation_query = reservation_query.order_by(
+                models.Reservation.id).limit(batch_size)
+        reservations = reservation_query.all()
+        if not reservations:
+            return 0
+
+        reserved = collections.defaultdict(int)
+        for reservation in reservations:
             if reservation.delta >= 0:
-                quota_usage = model_query(context, models.QuotaUsage,
-                                          session=session,
-                                          read_deleted="no").filter(
-                    models.QuotaUsage.id == reservation.usage_id).first()
-                quota_usage.reserved -= reservation.delta
+                reserved[reservation.usage_id] += reservation.delta
+        if reserved:
+            quota_usages = model_query(
+                context, models.QuotaUsage, session=session,
+                read_deleted="no").filter(
+                models.QuotaUsage.id.in_(list(reserved))).all()
+            for quota_usage in quota_usages:
+                quota_usage.reserved -= reserved[quota_usage.id]
                 session.add(quota_usage)
 
-        reservation_query.soft_delete(synchronize_session=False)
+        (model_query(context, models.Reservation, session=session,
+                     read_deleted="no").
+         filter(models.Reservation.id.in_([r.id for r in reservations])).
+         soft_delete(synchronize_session=False))
+        return len(reservations)
 
 
 ################
@@ -1401,7 +1484,8 @@ def share_instance_get(context, share_instance_id, session=None,
 
 
 @require_admin_context
-def share_instances_get_all(context, filters=None):
+def share_instances_get_all(context, filters=None, limit=None, offset=None,
+                            marker=None, sort_key=None, sort_dir=None):
     session = get_session()
     query = model_query(
         context, models.ShareInstance, session=session, read_deleted="no",
@@ -1409,7 +1493,8 @@ def share_instances_get_all(context, filters=None):
         joinedload('export_locations'),
     )
 
-    filters = filters or {}
+    filters = dict(filters or {})
+    query = _apply_time_filters(query, models.ShareInstance, filters)
 
     export_location_id = filters.get('export_location_id')
     export_location_path = filters.get('export_location_path')
@@ -1427,6 +1512,11 @@ def share_instances_get_all(context, filters=None):
                 models.ShareInstanceExportLocations.uuid ==
                 export_location_id)
 
+    if limit is not None or offset or marker or sort_key or sort_dir:
+        query = _paginate_query(
+            query, models.ShareInstance, limit=limit, offset=offset,
+            marker=marker, sort_key=sort_key, sort_dir=sort_dir)
+
     # Returns list of share instances that satisfy filters.
     query = query.all()
     return query
@@ -1480,12 +1570,16 @@ def _set_instances_share_data(context, instances, session):
     if instances and not isinstance(instances, list):
         instances = [instances]
 
+    share_ids = set(instance['share_id'] for instance in instances)
+    shares = {}
+    if share_ids:
+        shares = {share['id']: share for share in _share_get_query(
+            context, session).filter(models.Share.id.in_(share_ids))}
+
     instances_with_share_data = []
     for instance in instances:
-        try:
-            parent_share = share_get(context, instance['share_id'],
-                                     session=session)
-        except exception.NotFound:
+        parent_share = shares.get(instance['share_id'])
+        if parent_share is None:
             continue
         instance.set_share_data(parent_share)
         instances_with_share_data.append(instance)
@@ -2179,9 +2273,19 @@ def _set_instances_share_access_data(context, instance_accesses, session):
     if instance_accesses and not isinstance(instance_accesses, list):
         instance_accesses = [instance_accesses]
 
+    access_ids = set(
+        instance_access['access_id'] for instance_access in instance_accesses)
+    share_accesses = {}
+    if access_ids:
+        share_accesses = {
+            access['id']: access for access in _share_access_get_query(
+                context, session, {}).filter(
+                models.ShareAccessMapping.id.in_(access_ids))}
+
     for instance_access in instance_accesses:
-        share_access = share_access_get(
-            context, instance_access['access_id'], session=session)
+        share_access = share_accesses.get(instance_access['access_id'])
+        if share_access is None:
+            raise exception.NotFound()
         instance_access.set_share_access_data(share_access)
 
     return instance_accesses
@@ -2448,10 +2552,27 @@ def _set_share_snapshot_instance_data(context, snapshot_instances, session):
     if snapshot_instances and not isinstance(snapshot_instances, list):
         snapshot_instances = [snapshot_instances]
 
+    share_instance_ids = set(snapshot_instance['share_instance_id']
+                             for snapshot_instance in snapshot_instances)
+    share_instances = {}
+    if share_instance_ids:
+        share_instances = model_query(
+            context, models.ShareInstance, session=session,
+        ).filter(
+            models.ShareInstance.id.in_(share_instance_ids),
+        ).options(
+            joinedload('export_locations'),
+            joinedload('share_type'),
+        ).all()
+        share_instances = {
+            share_instance['id']: share_instance for share_instance in
+            _set_instances_share_data(context, share_instances, session)}
+
     for snapshot_instance in snapshot_instances:
-        share_instance = share_instance_get(
-            context, snapshot_instance['share_instance_id'], session=session,
-            with_share_data=True)
+        share_instance = share_instances.get(
+            snapshot_instance['share_instance_id'])
+        if share_instance is None:
+            raise exception.NotFound()
         snapshot_instance['share'] = share_instance
 
     return snapshot_instances
@@ -3121,64 +3242,111 @@ def share_export_locations_update(context, share_instance_id, export_locations,
     export_locations_paths = [el['path'] for el in export_locations]
 
     session = get_session()
+    with session.begin():
+        current_el_rows = _share_export_locations_get(
+            context, share_instance_id, session=session)
+        current_el_paths = [el['path'] for el in current_el_rows]
+
+        # NOTE: export locations are reported again on every restart, so
+        # the set and the order of the paths is usually unchanged.
+        if current_el_paths == export_locations_paths:
+            return set(current_el_paths)
+
+        def create_indexed_time_dict(key_list):
+            base = timeutils.utcnow()
+            return {
+                # NOTE(u_glide): Incrementing timestamp by microseconds to
+                # make timestamp order match index order.
+                key: base + datetime.timedelta(microseconds=index)
+                for index, key in enumerate(key_list)
+            }
 
-    current_el_rows = _share_export_locations_get(
-        context, share_instance_id, session=session)
+        indexed_update_time = create_indexed_time_dict(export_locations_paths)
 
-    def get_path_list_from_rows(rows):
-        return set([l['path'] for l in rows])
+        deleted_el_ids = []
+        updated_els = []
+        for el in current_el_rows:
+            if el['path'] in indexed_update_time:
+                updated_els.append({
+                    'id': el['id'],
+                    'updated_at': indexed_update_time[el['path']],
+                })
+            elif delete:
+                deleted_el_ids.append(el['id'])
+
+        if deleted_el_ids:
+            _export_locations_soft_delete(session, deleted_el_ids)
+        if updated_els:
+            session.bulk_update_mappings(
+                models.ShareInstanceExportLocations, updated_els)
+
+        # Now add new export locations
+        new_els = {}
+        for el in export_locations:
+            if el['path'] in current_el_paths or el['path'] in new_els:
+                continue
+            new_els[el['path']] = {
+                'uuid': uuidutils.generate_uuid(),
+                'path': el['path'],
+                'share_instance_id': share_instance_id,
+                'updated_at': indexed_update_time[el['path']],
+                'deleted': 0,
+                'is_admin_only': el.get('is_admin_only', False),
+                'metadata': el.get('metadata'),
+            }
+        if new_els:
+            _export_locations_bulk_create(session, list(new_els.values()))
 
-    current_el_paths = get_path_list_from_rows(current_el_rows)
+    if delete:
+        return set(export_locations_paths)
+    return set(current_el_paths).union(export_locations_paths)
 
-    def create_indexed_time_dict(key_list):
-        base = timeutils.utcnow()
-        return {
-            # NOTE(u_glide): Incrementing timestamp by microseconds to make
-            # timestamp order match index order.
-            key: base + datetime.timedelta(microseconds=index)
-            for index, key in enumerate(key_list)
-        }
 
-    indexed_update_time = create_indexed_time_dict(export_locations_paths)
+def _export_locations_soft_delete(session, export_location_ids):
+    now = timeutils.utcnow()
+    for model, column in (
+            (models.ShareInstanceExportLocationsMetadata,
+             models.ShareInstanceExportLocationsMetadata.export_location_id),
+            (models.ShareInstanceExportLocations,
+             models.ShareInstanceExportLocations.id)):
+        session.query(model).filter(
+            column.in_(export_location_ids),
+            model.deleted == 0,
+        ).update({
+            'deleted': model.id,
+            'deleted_at': now,
+        }, synchronize_session=False)
+
+
+def _export_locations_bulk_create(session, export_locations):
+    metadata = {
+        el['uuid']: el.pop('metadata') or {} for el in export_locations}
+    session.bulk_insert_mappings(
+        models.ShareInstanceExportLocations, export_locations)
+    if not any(metadata.values()):
+        return
 
-    for el in current_el_rows:
-        if delete and el['path'] not in export_locations_paths:
-            export_location_metadata_delete(context, el['uuid'])
-            el.soft_delete(session)
-        else:
-            updated_at = indexed_update_time[el['path']]
-            el.update({
-                'updated_at': updated_at,
-                'deleted': 0,
+    el_ids = dict(session.query(
+        models.ShareInstanceExportLocations.uuid,
+        models.ShareInstanceExportLocations.id,
+    ).filter(
+        models.ShareInstanceExportLocations.uuid.in_(list(metadata)),
+    ))
+    now = timeutils.utcnow()
+    metadata_rows = []
+    for el_uuid, el_metadata in metadata.items():
+        for meta_key, meta_value in el_metadata.items():
+            if meta_value is None:
+                LOG.warning("%s should be properly defined in the driver.",
+                            meta_key)
+            metadata_rows.append({
+                'export_location_id': el_ids[el_uuid],
+                'key': meta_key,
+                'value': meta_value,
+                'updated_at': now,
             })
-            el.save(session=session)
-            if el['el_metadata']:
-                export_location_metadata_update(
-                    context, el['uuid'], el['el_metadata'], session=session)
-
-    # Now add new export locations
-    for el in export_locations:
-        if el['path'] in current_el_paths:
-            # Already updated
-            continue
-
-        location_ref = models.ShareInstanceExportLocations()
-        location_ref.update({
-            'uuid': uuidutils.generate_uuid(),
-            'path': el['path'],
-            'share_instance_id': share_instance_id,
-            'updated_at': indexed_update_time[el['path']],
-            'deleted': 0,
-            'is_admin_only': el.get('is_admin_only', False),
-        })
-        location_ref.save(session=session)
-        if not el.get('metadata'):
-            continue
-        export_location_metadata_update(
-            context, location_ref['uuid'], el.get('metadata'), session=session)
-
-    return get_path_list_from_rows(_share_export_locations_get(
-        context, share_instance_id, session=session))
+    session.bulk_insert_mappings(
+        models.ShareInstanceExportLocationsMetadata, metadata_rows)
 
 
 #####################################
@@ -3388,25 +3556,73 @@ def share_network_get(context, id, session=None):
     return result
 
 
+def _share_network_get_all_with_filters(context, project_id=None,
+                                        security_service_id=None,
+                                        filters=None, limit=None,
+                                        offset=None, marker=None,
+                                        sort_key=None, sort_dir=None):
+    query = _network_get_query(context)
+    if project_id:
+        query = query.filter_by(project_id=project_id)
+    if security_service_id:
+        query = query.join(
+            models.ShareNetworkSecurityServiceAssociation,
+            models.ShareNetwork.id ==
+            models.ShareNetworkSecurityServiceAssociation.share_network_id,
+        ).filter(
+            models.ShareNetworkSecurityServiceAssociation.security_service_id
+            == security_service_id,
+            models.ShareNetworkSecurityServiceAssociation.deleted == 0)
+
+    filters = dict(filters or {})
+    query = _apply_time_filters(query, models.ShareNetwork, filters)
+    no_key = 'key_is_absent'
+    for k, v in filters.items():
+        temp_k = k.rstrip('~') if k in constants.LIKE_FILTER else k
+        filter_attr = getattr(models.ShareNetwork, temp_k, no_key)
+
+        if filter_attr == no_key:
+            msg = _("Share networks cannot be filtered using '%s' key.")
+            raise exception.InvalidInput(reason=msg % k)
+
+        if k in constants.LIKE_FILTER:
+            query = query.filter(filter_attr.op('LIKE')(u'%' + v + u'%'))
+        else:
+            query = query.filter(filter_attr == v)
+
+    if limit is not None or offset or marker or sort_key or sort_dir:
+        query = _paginate_query(
+            query, models.ShareNetwork, limit=limit, offset=offset,
+            marker=marker, sort_key=sort_key, sort_dir=sort_dir)
+    return query.all()
+
+
 @require_context
-def share_network_get_all(context):
-    return _network_get_query(context).all()
+def share_network_get_all(context, filters=None, limit=None, offset=None,
+                          marker=None, sort_key=None, sort_dir=None):
+    return _share_network_get_all_with_filters(
+        context, filters=filters, limit=limit, offset=offset, marker=marker,
+        sort_key=sort_key, sort_dir=sort_dir)
 
 
 @require_context
-def share_network_get_all_by_project(context, project_id):
-    return _network_get_query(context).filter_by(project_id=project_id).all()
+def share_network_get_all_by_project(context, project_id, filters=None,
+                                     limit=None, offset=None, marker=None,
+                                     sort_key=None, sort_dir=None):
+    return _share_network_get_all_with_filters(
+        context, project_id=project_id, filters=filters, limit=limit,
+        offset=offset, marker=marker, sort_key=sort_key, sort_dir=sort_dir)
 
 
 @require_context
-def share_network_get_all_by_security_service(context, security_service_id):
-    session = get_session()
-    return (model_query(context, models.ShareNetwork, session=session).
-            join(models.ShareNetworkSecurityServiceAssociation,
-            models.ShareNetwork.id ==
-            models.ShareNetworkSecurityServiceAssociation.share_network_id).
-            filter_by(security_service_id=security_service_id, deleted=0).
-            options(joinedload('share_servers')).all())
+def share_network_get_all_by_security_service(context, security_service_id,
+                                              filters=None, limit=None,
+                                              offset=None, marker=None,
+                                              sort_key=None, sort_dir=None):
+    return _share_network_get_all_with_filters(
+        context, security_service_id=security_service_id, filters=filters,
+        limit=limit, offset=offset, marker=marker, sort_key=sort_key,
+        sort_dir=sort_dir)
 
 
 @require_context
@@ -3559,8 +3775,36 @@ def share_server_get_all_by_host_and_share_net_valid(context, host,
 
 
 @require_context
-def share_server_get_all(context):
-    return _server_get_query(context).all()
+def share_server_get_all(context, filters=None, limit=None, offset=None,
+                         marker=None, sort_key=None, sort_dir=None):
+    """Returns share servers that satisfy filters.
+
+    Supported filters are 'host', 'status', 'share_network_id',
+    'project_id', 'share_network' (name or ID of the share network),
+    'created_since', 'created_before' and 'updated_since'.
+    """
+    query = _server_get_query(context)
+    filters = dict(filters or {})
+    query = _apply_time_filters(query, models.ShareServer, filters)
+    query = exact_filter(query, models.ShareServer, filters,
+                         ('host', 'status', 'share_network_id'))
+    project_id = filters.pop('project_id', None)
+    share_network = filters.pop('share_network', None)
+    if project_id or share_network:
+        query = query.join(
+            models.ShareNetwork,
+            models.ShareNetwork.id == models.ShareServer.share_network_id)
+        if project_id:
+            query = query.filter(models.ShareNetwork.project_id == project_id)
+        if share_network:
+            query = query.filter(or_(
+                models.ShareNetwork.name == share_network,
+                models.ShareNetwork.id == share_network))
+    if limit is not None or offset or marker or sort_key or sort_dir:
+        query = _paginate_query(
+            query, models.ShareServer, limit=limit, offset=offset,
+            marker=marker, sort_key=sort_key, sort_dir=sort_dir)
+    return query.all()
 
 
 @require_context
@@ -3621,10 +3865,14 @@ def _driver_private_data_query(session, context, entity_id, key=None,
     query = model_query(
         context, models.DriverPrivateData, session=session,
         read_deleted=read_deleted,
-    ).filter_by(
-        entity_uuid=entity_id,
     )
 
+    if isinstance(entity_id, list):
+        query = query.filter(
+            models.DriverPrivateData.entity_uuid.in_(entity_id))
+    else:
+        query = query.filter_by(entity_uuid=entity_id)
+
     if isinstance(key, list):
         return query.filter(models.DriverPrivateData.key.in_(key))
     elif key is not None:
@@ -3648,6 +3896,23 @@ def driver_private_data_get(context, entity_id, key=None,
         return result["value"] if result is not None else default
 
 
+@require_context
+def driver_private_data_get_by_entities(context, entity_ids, key=None,
+                                        session=None):
+    if not session:
+        session = get_session()
+
+    result = {entity_id: {} for entity_id in entity_ids}
+    if not entity_ids:
+        return result
+
+    query = _driver_private_data_query(
+        session, context, list(entity_ids), key)
+    for item in query.all():
+        result[item.entity_uuid][item.key] = item.value
+    return result
+
+
 @require_context
 def driver_private_data_update(context, entity_id, details,
                                delete_existing=False, session=None):
@@ -4984,8 +5249,8 @@ def message_get(context, message_id):
 
 
 @require_context
-def message_get_all(context, filters=None, sort_key='created_at',
-                    sort_dir='asc'):
+def message_get_all(context, filters=None, limit=None, offset=None,
+                    marker=None, sort_key='created_at', sort_dir='asc'):
     messages = models.Message
     query = model_query(context,
                         messages,
@@ -4998,12 +5263,11 @@ def message_get_all(context, filters=None, sort_key='created_at',
     if not filters:
         filters = {}
 
+    query = _apply_time_filters(query, messages, filters)
     query = exact_filter(query, messages, filters, legal_filter_keys)
-    try:
-        query = apply_sorting(messages, query, sort_key, sort_dir)
-    except AttributeError:
-        msg = _("Wrong sorting key provided - '%s'.") % sort_key
-        raise exception.InvalidInput(reason=msg)
+    query = _paginate_query(query, messages, limit=limit, offset=offset,
+                            marker=marker, sort_key=sort_key or 'created_at',
+                            sort_dir=sort_dir or 'asc')
 
     return query.all()
 
@@ -5032,12 +5296,20 @@ def message_destroy(context, message):
 
 
 @require_admin_context
-def cleanup_expired_messages(context):
+def cleanup_expired_messages(context, batch_size=None):
     session = get_session()
     now = timeutils.utcnow()
     with session.begin():
+        query = session.query(models.Message).filter(
+            models.Message.expires_at < now)
+        if not batch_size:
+            return query.delete()
+        ids = [row.id for row in query.with_entities(
+            models.Message.id).limit(batch_size)]
+        if not ids:
+            return 0
         return session.query(models.Message).filter(
-            models.Message.expires_at < now).delete()
+            models.Message.id.in_(ids)).delete(synchronize_session=False)
 
 
 @require_context
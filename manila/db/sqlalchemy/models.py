@@ -71,7 +71,7 @@ class Service(BASE, ManilaBase):
 
     availability_zone = orm.relationship(
         "AvailabilityZone",
-        lazy='immediate',
+        lazy='selectin',
         primaryjoin=(
             'and_('
             'Service.availability_zone_id == '
@@ -177,6 +177,9 @@ class Reservation(BASE, ManilaBase):
     """Represents a resource reservation for quotas."""
 
     __tablename__ = 'reservations'
+    __table_args__ = (
+        schema.Index('reservations_deleted_expire_idx', 'deleted', 'expire'),
+    )
     id = Column(Integer, primary_key=True)
     uuid = Column(String(36), nullable=False)
 
@@ -318,7 +321,7 @@ class Share(BASE, ManilaBase):
     task_state = Column(String(255))
     instances = orm.relationship(
         "ShareInstance",
-        lazy='immediate',
+        lazy='selectin',
         primaryjoin=(
             'and_('
             'Share.id == ShareInstance.share_id, '
@@ -331,6 +334,10 @@ class Share(BASE, ManilaBase):
 
 class ShareInstance(BASE, ManilaBase):
     __tablename__ = 'share_instances'
+    __table_args__ = (
+        schema.Index('share_instances_share_id_idx', 'share_id'),
+        schema.Index('share_instances_host_deleted_idx', 'host', 'deleted'),
+    )
 
     _extra_keys = ['name', 'export_location', 'availability_zone',
                    'replica_state']
@@ -388,7 +395,7 @@ class ShareInstance(BASE, ManilaBase):
                                   nullable=True)
     _availability_zone = orm.relationship(
         "AvailabilityZone",
-        lazy='immediate',
+        lazy='selectin',
         foreign_keys=availability_zone_id,
         primaryjoin=(
             'and_('
@@ -400,7 +407,7 @@ class ShareInstance(BASE, ManilaBase):
 
     export_locations = orm.relationship(
         "ShareInstanceExportLocations",
-        lazy='immediate',
+        lazy='selectin',
         primaryjoin=(
             'and_('
             'ShareInstance.id == '
@@ -414,7 +421,7 @@ class ShareInstance(BASE, ManilaBase):
                              nullable=True)
     share_type = orm.relationship(
         "ShareTypes",
-        lazy='immediate',
+        lazy='selectin',
         foreign_keys=share_type_id,
         primaryjoin='and_('
                     'ShareInstance.share_type_id == ShareTypes.id, '
@@ -458,7 +465,7 @@ class ShareInstanceExportLocationsMetadata(BASE, ManilaBase):
         ShareInstanceExportLocations,
         backref="_el_metadata_bare",
         foreign_keys=export_location_id,
-        lazy='immediate',
+        lazy='selectin',
         primaryjoin="and_("
                     "%(cls_name)s.export_location_id == "
                     "ShareInstanceExportLocations.id,"
@@ -558,7 +565,7 @@ class ShareAccessMapping(BASE, ManilaBase):
 
     instance_mappings = orm.relationship(
         "ShareInstanceAccessMapping",
-        lazy='immediate',
+        lazy='selectin',
         primaryjoin=(
             'and_('
             'ShareAccessMapping.id == '
@@ -580,7 +587,7 @@ class ShareAccessRulesMetadata(BASE, ManilaBase):
     access = orm.relationship(
         ShareAccessMapping, backref="share_access_rules_metadata",
         foreign_keys=access_id,
-        lazy='immediate',
+        lazy='selectin',
         primaryjoin='and_('
         'ShareAccessRulesMetadata.access_id == ShareAccessMapping.id,'
         'ShareAccessRulesMetadata.deleted == "False")')
@@ -590,6 +597,10 @@ class ShareInstanceAccessMapping(BASE, ManilaBase):
     """Represents access to individual share instances."""
 
     __tablename__ = 'share_instance_access_map'
+    __table_args__ = (
+        schema.Index('share_instance_access_map_instance_id_state_idx',
+                     'share_instance_id', 'state'),
+    )
     _proxified_properties = ('share_id', 'access_type', 'access_key',
                              'access_to', 'access_level')
 
@@ -605,7 +616,7 @@ class ShareInstanceAccessMapping(BASE, ManilaBase):
 
     instance = orm.relationship(
         "ShareInstance",
-        lazy='immediate',
+        lazy='selectin',
         primaryjoin=(
             'and_('
             'ShareInstanceAccessMapping.share_instance_id == '
@@ -730,6 +741,10 @@ class ShareSnapshot(BASE, ManilaBase):
 class ShareSnapshotInstance(BASE, ManilaBase):
     """Represents a snapshot of a share."""
     __tablename__ = 'share_snapshot_instances'
+    __table_args__ = (
+        schema.Index('share_snapshot_instances_instance_id_status_idx',
+                     'share_instance_id', 'status'),
+    )
     _extra_keys = ['name', 'share_id', 'share_name']
 
     @property
@@ -762,7 +777,7 @@ class ShareSnapshotInstance(BASE, ManilaBase):
 
     export_locations = orm.relationship(
         "ShareSnapshotInstanceExportLocation",
-        lazy='immediate',
+        lazy='selectin',
         primaryjoin=(
             'and_('
             'ShareSnapshotInstance.id == '
@@ -772,7 +787,7 @@ class ShareSnapshotInstance(BASE, ManilaBase):
     )
     share_instance = orm.relationship(
         ShareInstance, backref="snapshot_instances",
-        lazy='immediate',
+        lazy='selectin',
         primaryjoin=(
             'and_('
             'ShareSnapshotInstance.share_instance_id == ShareInstance.id,'
@@ -780,7 +795,7 @@ class ShareSnapshotInstance(BASE, ManilaBase):
     )
     snapshot = orm.relationship(
         "ShareSnapshot",
-        lazy="immediate",
+        lazy='selectin',
         foreign_keys=snapshot_id,
         backref="instances",
         primaryjoin=(
@@ -793,7 +808,7 @@ class ShareSnapshotInstance(BASE, ManilaBase):
     )
     share_group_snapshot = orm.relationship(
         "ShareGroupSnapshot",
-        lazy="immediate",
+        lazy='selectin',
         foreign_keys=share_group_snapshot_id,
         backref="share_group_snapshot_members",
         primaryjoin=('ShareGroupSnapshot.id == '
@@ -825,7 +840,7 @@ class ShareSnapshotAccessMapping(BASE, ManilaBase):
 
     instance_mappings = orm.relationship(
         "ShareSnapshotInstanceAccessMapping",
-        lazy='immediate',
+        lazy='selectin',
         primaryjoin=(
             'and_('
             'ShareSnapshotAccessMapping.id == '
@@ -856,7 +871,7 @@ class ShareSnapshotInstanceAccessMapping(BASE, ManilaBase):
 
     instance = orm.relationship(
         "ShareSnapshotInstance",
-        lazy='immediate',
+        lazy='selectin',
         primaryjoin=(
             'and_('
             'ShareSnapshotInstanceAccessMapping.share_snapshot_instance_id == '
@@ -969,7 +984,7 @@ class ShareServer(BASE, ManilaBase):
 
     _backend_details = orm.relationship(
         "ShareServerBackendDetails",
-        lazy='immediate',
+        lazy='selectin',
         viewonly=True,
         primaryjoin='and_('
                     'ShareServer.id == '
@@ -1012,6 +1027,9 @@ class ShareNetworkSecurityServiceAssociation(BASE, ManilaBase):
 class NetworkAllocation(BASE, ManilaBase):
     """Represents network allocation data."""
     __tablename__ = 'network_allocations'
+    __table_args__ = (
+        schema.Index('network_allocations_ip_address_idx', 'ip_address'),
+    )
     id = Column(String(36), primary_key=True, nullable=False)
     deleted = Column(String(36), default='False')
     label = Column(String(255), nullable=True)
@@ -1091,7 +1109,7 @@ class ShareGroup(BASE, ManilaBase):
                     'ShareGroup.deleted == 0)')
     _availability_zone = orm.relationship(
         "AvailabilityZone",
-        lazy='immediate',
+        lazy='selectin',
         foreign_keys=availability_zone_id,
         primaryjoin=(
             "and_("
@@ -1211,6 +1229,9 @@ class Message(BASE, ManilaBase):
     User messages show information about API operations to the API end-user.
     """
     __tablename__ = 'messages'
+    __table_args__ = (
+        schema.Index('messages_expires_at_idx', 'expires_at'),
+    )
     id = Column(String(36), primary_key=True, nullable=False)
     project_id = Column(String(255), nullable=False)
     # Info/Error/Warning.
@@ -0,0 +1,205 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Number of SQL statements, rows and time spent in the database.
+
+When enabled, the DB API functions are called through a proxy that records
+which function runs on behalf of which request context, and the engine
+counts the statements, rows and time of each statement against them. The
+statistics are kept in the ``db_stats`` attribute of the
+:class:`manila.context.RequestContext`, so that the API and the RPC
+endpoints can log a summary once the request is served.
+"""
+
+import functools
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log
+from sqlalchemy import event
+
+LOG = log.getLogger(__name__)
+
+query_stats_opts = [
+    cfg.BoolOpt('db_query_stats',
+                default=False,
+                help='Count the SQL statements, rows and time spent in the '
+                     'database by each API request and RPC call, and log '
+                     'a summary once it is served.'),
+    cfg.FloatOpt('db_slow_query_threshold',
+                 default=1.0,
+                 min=0,
+                 help='Time in seconds above which an SQL statement is '
+                      'logged as slow, along with the DB API function and '
+                      'the request that ran it. Only used when '
+                      'db_query_stats is enabled. 0 disables the logging '
+                      'of slow statements.'),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(query_stats_opts)
+
+# Number of DB API functions detailed in the summaries.
+SUMMARY_FUNCTIONS = 3
+# Number of characters of the slow statements that are logged.
+SLOW_STATEMENT_LENGTH = 1000
+
+_local = threading.local()
+
+
+class QueryStats(object):
+    """Statements, rows and time spent in the database, per function."""
+
+    def __init__(self):
+        self.statements = 0
+        self.rows = 0
+        self.elapsed = 0.0
+        self.functions = {}
+
+    def add(self, function, rows, elapsed):
+        self.statements += 1
+        self.rows += rows
+        self.elapsed += elapsed
+        stats = self.functions.setdefault(function, [0, 0, 0.0])
+        stats[0] += 1
+        stats[1] += rows
+        stats[2] += elapsed
+
+    def to_dict(self):
+        return {
+            'statements': self.statements,
+            'rows': self.rows,
+            'elapsed': self.elapsed,
+            'functions': {
+                function: {'statements': statements, 'rows': rows,
+                           'elapsed': elapsed}
+                for function, (statements, rows, elapsed)
+                in self.functions.items()},
+        }
+
+    def summary(self):
+        """Return a one line description of the statistics."""
+        functions = sorted(self.functions.items(),
+                           key=lambda item: -item[1][2])
+        details = ', '.join(
+            '%s: %d/%.3fs' % (function, statements, elapsed)
+            for function, (statements, rows, elapsed)
+            in functions[:SUMMARY_FUNCTIONS])
+        return '%d statements, %d rows, %.3fs in database (%s)' % (
+            self.statements, self.rows, self.elapsed, details)
+
+
+def get_stats(context):
+    """Return the statistics of a request context, creating them if needed.
+
+    :returns: The :class:`QueryStats` of the context, or None if the
+        context can not carry them.
+    """
+    if not hasattr(context, 'db_stats'):
+        return None
+    if context.db_stats is None:
+        context.db_stats = QueryStats()
+    return context.db_stats
+
+
+class ProfiledBackend(object):
+    """Proxy of a DB API backend recording the function being called."""
+
+    def __init__(self, backend):
+        self._backend = backend
+
+    def __getattr__(self, name):
+        attr = getattr(self._backend, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def profiled(*args, **kwargs):
+            if getattr(_local, 'current', None) is not None:
+                # Nested DB API calls are accounted to the outer function.
+                return attr(*args, **kwargs)
+            context = args[0] if args else None
+            _local.current = (name, get_stats(context),
+                              getattr(context, 'request_id', None))
+            try:
+                return attr(*args, **kwargs)
+            finally:
+                _local.current = None
+
+        setattr(self, name, profiled)
+        return profiled
+
+
+class ProfiledEndpoint(object):
+    """Proxy of an RPC endpoint logging the database usage of each call."""
+
+    def __init__(self, endpoint):
+        self._endpoint = endpoint
+
+    def __getattr__(self, name):
+        attr = getattr(self._endpoint, name)
+        if name.startswith('_') or not callable(attr):
+            return attr
+
+        @functools.wraps(attr)
+        def profiled(context, *args, **kwargs):
+            if hasattr(context, 'db_stats'):
+                context.db_stats = None
+            try:
+                return attr(context, *args, **kwargs)
+            finally:
+                log_summary(context, '%s.%s' % (
+                    type(self._endpoint).__name__, name))
+
+        return profiled
+
+
+def log_summary(context, operation):
+    """Log the database usage of a request context, if there is any."""
+    stats = getattr(context, 'db_stats', None)
+    if stats and stats.statements:
+        LOG.info('%(operation)s: %(summary)s',
+                 {'operation': operation, 'summary': stats.summary()})
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context,
+                           executemany):
+    conn.info['query_start_time'] = time.time()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany):
+    start_time = conn.info.pop('query_start_time', None)
+    if start_time is None:
+        return
+    elapsed = time.time() - start_time
+
+    function, stats, request_id = (
+        getattr(_local, 'current', None) or (None, None, None))
+    if stats is not None:
+        stats.add(function, max(cursor.rowcount, 0), elapsed)
+
+    threshold = CONF.db_slow_query_threshold
+    if threshold and elapsed >= threshold:
+        LOG.warning('Slow SQL statement run by %(function)s for request '
+                    '%(request_id)s took %(elapsed).3fs: %(statement)s',
+                    {'function': function or 'unknown',
+                     'request_id': request_id,
+                     'elapsed': elapsed,
+                     'statement': statement[:SLOW_STATEMENT_LENGTH]})
+
+
+def setup_engine(engine):
+    """Record the statements run by an engine."""
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
@@ -210,6 +210,10 @@ class MessageNotFound(NotFound):
     message = _("Message %(message_id)s could not be found.")
 
 
+class MarkerNotFound(NotFound):
+    message = _("Marker %(marker)s could not be found.")
+
+
 class Found(ManilaException):
     message = _("Resource was found.")
     code = 302
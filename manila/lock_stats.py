@@ -0,0 +1,195 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Wait and hold time statistics of the locks taken by manila services.
+
+Both the tooz based locks of :mod:`manila.coordination` and the oslo
+lockutils based locks of :func:`manila.utils.synchronized` record how long
+callers waited to acquire a lock and how long they held it. The samples
+are grouped per lock name template, so that all the per share network
+``share_manager_<id>`` locks, for instance, end up in the same histogram.
+Nothing is recorded unless the reports are enabled with the
+``lock_stats_report_interval`` option.
+"""
+
+import re
+import threading
+import time
+
+from oslo_config import cfg
+from oslo_log import log
+
+LOG = log.getLogger(__name__)
+
+lock_stats_opts = [
+    cfg.IntOpt('lock_stats_report_interval',
+               default=0,
+               min=0,
+               help='Interval in seconds between the reports of the wait '
+                    'and hold time statistics of the locks taken by the '
+                    'service. The statistics are logged and emitted as a '
+                    '"lock_stats.report" notification. 0 disables the '
+                    'reports.'),
+]
+
+CONF = cfg.CONF
+CONF.register_opts(lock_stats_opts)
+
+# Upper bounds, in seconds, of the histogram buckets. The last bucket
+# collects all the samples above the highest bound.
+BUCKETS = (0.001, 0.01, 0.1, 1, 10, 60)
+
+# Maximum number of lock name templates recorded between two reports. The
+# locks named after devices, file systems and the like are not collapsed by
+# their template, the acquisitions of further locks are recorded under
+# OTHER_LOCKS instead.
+MAX_LOCK_NAMES = 200
+OTHER_LOCKS = '{other}'
+
+_ID_PATTERN = re.compile(
+    r'[0-9a-f]{8}[-_]?[0-9a-f]{4}[-_]?[0-9a-f]{4}[-_]?[0-9a-f]{4}[-_]?'
+    r'[0-9a-f]{12}', re.IGNORECASE)
+
+
+def lock_name_template(name):
+    """Return the name of a lock with the IDs it contains replaced.
+
+    :param str name: Lock name, e.g. ``share_manager_<share network ID>``.
+    :returns: The lock name with each UUID replaced by ``{id}``.
+    """
+    return _ID_PATTERN.sub('{id}', name)
+
+
+def enabled():
+    """Return whether the lock statistics are recorded."""
+    return CONF.lock_stats_report_interval > 0
+
+
+class Histogram(object):
+    """Count, total, maximum and bucketed distribution of durations."""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+        for index, bound in enumerate(BUCKETS):
+            if duration <= bound:
+                break
+        else:
+            index = len(BUCKETS)
+        self.buckets[index] += 1
+
+    def to_dict(self):
+        bounds = ['le_%s' % bound for bound in BUCKETS] + ['inf']
+        return {
+            'count': self.count,
+            'total': self.total,
+            'max': self.max,
+            'buckets': dict(zip(bounds, self.buckets)),
+        }
+
+
+class LockStats(object):
+    """Wait and hold time histograms of locks, per lock name template."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def add(self, name, wait_time=None, hold_time=None):
+        """Record a lock acquisition.
+
+        :param str name: Lock name template. Once MAX_LOCK_NAMES
+            templates are recorded, further ones are recorded as
+            OTHER_LOCKS.
+        :param float wait_time: Seconds spent waiting for the lock.
+        :param float hold_time: Seconds the lock was held.
+        """
+        with self._lock:
+            if (name not in self._stats and
+                    len(self._stats) >= MAX_LOCK_NAMES):
+                name = OTHER_LOCKS
+            wait, hold = self._stats.setdefault(
+                name, (Histogram(), Histogram()))
+            if wait_time is not None:
+                wait.add(wait_time)
+            if hold_time is not None:
+                hold.add(hold_time)
+
+    def report(self, reset=True):
+        """Return the statistics recorded since the last reset.
+
+        :param bool reset: Whether to start over recording afterwards.
+        :returns: dict mapping lock name templates to dicts with the
+            ``wait`` and ``hold`` histograms.
+        """
+        with self._lock:
+            stats = self._stats
+            if reset:
+                self._stats = {}
+            return {name: {'wait': wait.to_dict(), 'hold': hold.to_dict()}
+                    for name, (wait, hold) in stats.items()}
+
+
+LOCK_STATS = LockStats()
+
+
+class LockTimer(object):
+    """Measure the wait and hold times of one lock acquisition.
+
+    ``acquiring`` is called before trying to acquire the lock, ``acquired``
+    once it is acquired and ``released`` once it is released.
+    """
+
+    def __init__(self, name, stats=None):
+        self.name = name
+        self.stats = stats or LOCK_STATS
+        self._requested_at = None
+        self._acquired_at = None
+
+    def acquiring(self):
+        self._requested_at = time.time()
+
+    def acquired(self):
+        self._acquired_at = time.time()
+
+    def released(self):
+        if self._acquired_at is None:
+            return
+        released_at = time.time()
+        wait_time = (self._acquired_at - self._requested_at
+                     if self._requested_at is not None else None)
+        self.stats.add(self.name, wait_time=wait_time,
+                       hold_time=released_at - self._acquired_at)
+        self._requested_at = self._acquired_at = None
+
+
+def log_report(stats):
+    """Log the statistics returned by :meth:`LockStats.report`."""
+    for name in sorted(stats, key=lambda n: -stats[n]['wait']['total']):
+        wait = stats[name]['wait']
+        hold = stats[name]['hold']
+        LOG.info('Lock "%(name)s" acquired %(count)d times, waited '
+                 '%(wait_total).3fs (max %(wait_max).3fs), held '
+                 '%(hold_total).3fs (max %(hold_max).3fs).',
+                 {'name': name,
+                  'count': hold['count'],
+                  'wait_total': wait['total'],
+                  'wait_max': wait['max'],
+                  'hold_total': hold['total'],
+                  'hold_max': hold['max']})
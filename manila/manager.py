@@ -51,15 +51,33 @@ This module provides Manager, a base class for managers.
 
 """
 
+import copy
+
 from oslo_config import cfg
 from oslo_log import log
 from oslo_service import periodic_task
+from oslo_utils import timeutils
 
 from manila.db import base
+from manila import lock_stats
+from manila import rpc
 from manila.scheduler import rpcapi as scheduler_rpcapi
+from manila.scheduler import utils as scheduler_utils
 from manila import version
 
+manager_opts = [
+    cfg.IntOpt('capabilities_full_update_interval',
+               default=0,
+               min=0,
+               help='Interval in seconds between the full capability '
+                    'updates that services send to the schedulers. In '
+                    'between, only the capabilities and pools that changed '
+                    'since the previous update are sent. 0 sends full '
+                    'updates every time.'),
+]
+
 CONF = cfg.CONF
+CONF.register_opts(manager_opts)
 LOG = log.getLogger(__name__)
 
 
@@ -97,6 +115,18 @@ class Manager(base.Base, PeriodicTasks):
         """Tasks to be run at a periodic interval."""
         return self.run_periodic_tasks(context, raise_on_error=raise_on_error)
 
+    @periodic_task.periodic_task(
+        spacing=CONF.lock_stats_report_interval,
+        enabled=CONF.lock_stats_report_interval > 0)
+    def _report_lock_stats(self, context):
+        """Log and notify the lock statistics recorded since last report."""
+        stats = lock_stats.LOCK_STATS.report()
+        if not stats:
+            return
+        lock_stats.log_report(stats)
+        rpc.get_notifier('lock_stats', self.host).info(
+            context, 'lock_stats.report', {'host': self.host, 'locks': stats})
+
     def init_host(self):
         """Handle initialization if this is a standalone service.
 
@@ -129,19 +159,57 @@ class SchedulerDependentManager(Manager):
         self.last_capabilities = None
         self.service_name = service_name
         self.scheduler_rpcapi = scheduler_rpcapi.SchedulerAPI()
+        # Capabilities sent with the previous update, their generation and
+        # the time of the last full update.
+        self._published_capabilities = None
+        self._capabilities_generation = 0
+        self._last_full_update = None
         super(SchedulerDependentManager, self).__init__(host, db_driver)
 
     def update_service_capabilities(self, capabilities):
         """Remember these capabilities to send on next periodic update."""
         self.last_capabilities = capabilities
 
+    def _force_full_capabilities_update(self):
+        """Send the full capabilities with the next update."""
+        self._published_capabilities = None
+
     @periodic_task.periodic_task
     def _publish_service_capabilities(self, context):
         """Pass data back to the scheduler at a periodic interval."""
-        if self.last_capabilities:
+        if not self.last_capabilities:
+            return
+
+        interval = CONF.capabilities_full_update_interval
+        if not interval:
             LOG.debug('Notifying Schedulers of capabilities ...')
             self.scheduler_rpcapi.update_service_capabilities(
                 context,
                 self.service_name,
                 self.host,
                 self.last_capabilities)
+            return
+
+        base_generation = self._capabilities_generation
+        self._capabilities_generation += 1
+        if (self._published_capabilities is None or
+                timeutils.is_older_than(self._last_full_update, interval)):
+            LOG.debug('Notifying Schedulers of capabilities ...')
+            self.scheduler_rpcapi.update_service_capabilities(
+                context,
+                self.service_name,
+                self.host,
+                self.last_capabilities,
+                generation=self._capabilities_generation)
+            self._last_full_update = timeutils.utcnow()
+        else:
+            LOG.debug('Notifying Schedulers of capability changes ...')
+            self.scheduler_rpcapi.update_service_capabilities(
+                context,
+                self.service_name,
+                self.host,
+                scheduler_utils.capabilities_delta(
+                    self._published_capabilities, self.last_capabilities),
+                generation=self._capabilities_generation,
+                base_generation=base_generation)
+        self._published_capabilities = copy.deepcopy(self.last_capabilities)
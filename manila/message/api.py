@@ -13,6 +13,7 @@
 Handles all requests related to user facing messages.
 """
 import datetime
+import time
 
 from oslo_config import cfg
 from oslo_log import log as logging
@@ -30,6 +31,13 @@ messages_opts = [
     cfg.IntOpt('message_reap_interval', default=86400,
                help='Interval between periodic task runs to clean expired '
                     'messages in seconds.'),
+    cfg.IntOpt('message_reap_batch_size', default=1000, min=0,
+               help='Maximum number of expired messages deleted in one '
+                    'database transaction. 0 deletes all expired messages '
+                    'in a single transaction.'),
+    cfg.FloatOpt('message_reap_batch_delay', default=0.1, min=0,
+                 help='Number of seconds to wait between two batches of '
+                      'expired messages being deleted.'),
 ]
 
 CONF = cfg.CONF
@@ -73,13 +81,15 @@ class API(base.Base):
         """Return message with the specified message id."""
         return self.db.message_get(context, id)
 
-    def get_all(self, context, search_opts={}, sort_key=None, sort_dir=None):
+    def get_all(self, context, search_opts={}, limit=None, offset=None,
+                marker=None, sort_key=None, sort_dir=None):
         """Return messages for the given context."""
         LOG.debug("Searching for messages by: %s",
                   six.text_type(search_opts))
 
         messages = self.db.message_get_all(
-            context, filters=search_opts, sort_key=sort_key, sort_dir=sort_dir)
+            context, filters=search_opts, limit=limit, offset=offset,
+            marker=marker, sort_key=sort_key, sort_dir=sort_dir)
 
         return messages
 
@@ -87,7 +97,26 @@ class API(base.Base):
         """Delete message with the specified message id."""
         return self.db.message_destroy(context, id)
 
-    def cleanup_expired_messages(self, context):
+    def cleanup_expired_messages(self, context, batch_size=None,
+                                 batch_delay=None):
+        """Delete expired messages, batch_size rows per transaction."""
+        if batch_size is None:
+            batch_size = CONF.message_reap_batch_size
+        if batch_delay is None:
+            batch_delay = CONF.message_reap_batch_delay
         ctx = context.elevated()
-        count = self.db.cleanup_expired_messages(ctx)
-        LOG.info("Deleted %s expired messages.", count)
+        start = time.time()
+        count = batches = 0
+        while True:
+            deleted = self.db.cleanup_expired_messages(
+                ctx, batch_size=batch_size)
+            count += deleted
+            batches += 1
+            if not batch_size or deleted < batch_size:
+                break
+            time.sleep(batch_delay)
+        LOG.info("Deleted %(count)s expired messages in %(batches)s "
+                 "batch(es) and %(time).2f seconds.",
+                 {'count': count, 'batches': batches,
+                  'time': time.time() - start})
+        return count
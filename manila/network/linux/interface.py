@@ -78,6 +78,7 @@ class LinuxInterfaceDriver(object):
             previous[address['cidr']] = address['ip_version']
 
         # add new addresses
+        added = []
         for ip_cidr in ip_cidrs:
 
             net = netaddr.IPNetwork(ip_cidr)
@@ -85,11 +86,10 @@ class LinuxInterfaceDriver(object):
                 del previous[ip_cidr]
                 continue
 
-            device.addr.add(net.version, ip_cidr, str(net.broadcast))
+            added.append((ip_cidr, str(net.broadcast)))
 
-        # clean up any old addresses
-        for ip_cidr, ip_version in previous.items():
-            device.addr.delete(ip_version, ip_cidr)
+        # add new and clean up any old addresses with a single call
+        device.addr.batch(add=added, delete=list(previous))
 
     def check_bridge_exists(self, bridge):
         if not ip_lib.device_exists(bridge):
@@ -13,15 +13,28 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import socket
+
 import netaddr
+from oslo_log import log
+from oslo_utils import importutils
 import six
 
 from manila.i18n import _
 from manila import utils
 
+pyroute2 = importutils.try_import('pyroute2')
+
+LOG = log.getLogger(__name__)
 
 LOOPBACK_DEVNAME = 'lo'
 
+# Netlink address scopes and flags, see linux/rtnetlink.h and
+# linux/if_addr.h.
+_NETLINK_SCOPES = {0: 'global', 200: 'site', 253: 'link', 254: 'host',
+                   255: 'nowhere'}
+_IFA_F_PERMANENT = 0x80
+
 
 class SubProcessBase(object):
     def __init__(self, namespace=None):
@@ -48,6 +61,27 @@ class SubProcessBase(object):
         total_cmd = ip_cmd + opt_list + [command] + list(args)
         return utils.execute(*total_cmd, run_as_root=as_root)[0]
 
+    def _as_root_batch(self, commands):
+        """Run several ip commands as root with a single ``ip -batch`` call.
+
+        :param commands: list of (command, args) tuples, e.g.
+            ``('route', ('del', '10.0.0.0/24', 'dev', 'eth0'))``.
+        """
+        if not commands:
+            return
+        if len(commands) == 1:
+            command, args = commands[0]
+            return self._as_root([], command, args)
+        script = ''.join(
+            ' '.join([command] + [six.text_type(arg) for arg in args]) + '\n'
+            for command, args in commands)
+        if self.namespace:
+            ip_cmd = ['ip', 'netns', 'exec', self.namespace, 'ip']
+        else:
+            ip_cmd = ['ip']
+        return utils.execute(*(ip_cmd + ['-batch', '-']),
+                             process_input=script, run_as_root=True)[0]
+
 
 class IPWrapper(SubProcessBase):
     def __init__(self, namespace=None):
@@ -73,6 +107,79 @@ class IPWrapper(SubProcessBase):
                 retval.append(IPDevice(name, self.namespace))
         return retval
 
+    def get_devices_addresses(self, exclude_loopback=False):
+        """Return the addresses of all the devices with a single dump.
+
+        Netlink is used when pyroute2 is available and the wrapper is not
+        bound to a namespace, the ``ip -o addr show`` output is parsed
+        otherwise.
+
+        :returns: dict mapping device names to lists of addresses, in the
+            format returned by :meth:`IpAddrCommand.list`.
+        """
+        devices = None
+        if pyroute2 is not None and not self.namespace:
+            try:
+                devices = self._get_devices_addresses_netlink()
+            except Exception as e:
+                LOG.debug("Netlink address dump failed, falling back to "
+                          "the ip command: %s", e)
+        if devices is None:
+            devices = self._get_devices_addresses_cli()
+        if exclude_loopback:
+            devices.pop(LOOPBACK_DEVNAME, None)
+        return devices
+
+    def _get_devices_addresses_cli(self):
+        devices = {}
+        output = self._execute('o', 'addr', ('show',), self.namespace)
+        for line in output.split('\n'):
+            tokens = line.split(':', 1)
+            if len(tokens) < 2:
+                continue
+            # Continuation lines are folded with a backslash by '-o'.
+            parts = tokens[1].split('\\', 1)[0].split()
+            if not parts:
+                continue
+            name = parts.pop(0).split('@', 1)[0]
+            addresses = devices.setdefault(name, [])
+            if parts and parts[0] in ('inet', 'inet6'):
+                addresses.append(_parse_addr(parts))
+        return devices
+
+    @staticmethod
+    def _get_devices_addresses_netlink():
+        devices = {}
+        with pyroute2.IPRoute() as ipr:
+            names = {}
+            for link in ipr.get_links():
+                name = link.get_attr('IFLA_IFNAME')
+                names[link['index']] = name
+                devices[name] = []
+            for addr in ipr.get_addr():
+                name = names.get(addr['index'])
+                if name is None:
+                    continue
+                ip = addr.get_attr('IFA_LOCAL') or addr.get_attr(
+                    'IFA_ADDRESS')
+                cidr = '%s/%s' % (ip, addr['prefixlen'])
+                if addr['family'] == socket.AF_INET6:
+                    version = 6
+                    broadcast = '::'
+                else:
+                    version = 4
+                    broadcast = (addr.get_attr('IFA_BROADCAST') or
+                                 str(netaddr.IPNetwork(cidr).broadcast))
+                flags = addr.get_attr('IFA_FLAGS') or addr['flags']
+                devices[name].append(dict(
+                    cidr=cidr,
+                    broadcast=broadcast,
+                    scope=_NETLINK_SCOPES.get(addr['scope'],
+                                              six.text_type(addr['scope'])),
+                    ip_version=version,
+                    dynamic=not flags & _IFA_F_PERMANENT))
+        return devices
+
     def add_tuntap(self, name, mode='tap'):
         self._as_root('', 'tuntap', ('add', name, 'mode', mode))
         return IPDevice(name, self.namespace)
@@ -151,6 +258,10 @@ class IpCommandBase(object):
                                      args,
                                      kwargs.get('use_root_namespace', False))
 
+    def _as_root_batch(self, *args_list):
+        return self._parent._as_root_batch(
+            [(self.COMMAND, tuple(args)) for args in args_list])
+
 
 class IpDeviceCommandBase(IpCommandBase):
     @property
@@ -252,6 +363,18 @@ class IpAddrCommand(IpDeviceCommandBase):
     def flush(self):
         self._as_root('flush', self.name)
 
+    def batch(self, add=(), delete=(), scope='global'):
+        """Add and delete several addresses with a single ip call.
+
+        :param add: list of (cidr, broadcast) tuples to add.
+        :param delete: list of CIDRs to delete.
+        :param scope: scope of the added addresses.
+        """
+        args_list = [('add', cidr, 'brd', broadcast, 'scope', scope,
+                      'dev', self.name) for cidr, broadcast in add]
+        args_list += [('del', cidr, 'dev', self.name) for cidr in delete]
+        self._as_root_batch(*args_list)
+
     def list(self, scope=None, to=None, filters=None):
         if filters is None:
             filters = []
@@ -267,28 +390,7 @@ class IpAddrCommand(IpDeviceCommandBase):
             line = line.strip()
             if not line.startswith('inet'):
                 continue
-            parts = line.split()
-            if parts[0] == 'inet6':
-                version = 6
-                scope = parts[3]
-                broadcast = '::'
-            else:
-                version = 4
-                if parts[2] == 'brd':
-                    broadcast = parts[3]
-                    scope = parts[5]
-                else:
-                    # sometimes output of 'ip a' might look like:
-                    # inet 192.168.100.100/24 scope global eth0
-                    # and broadcast needs to be calculated from CIDR
-                    broadcast = str(netaddr.IPNetwork(parts[1]).broadcast)
-                    scope = parts[3]
-
-            retval.append(dict(cidr=parts[1],
-                               broadcast=broadcast,
-                               scope=scope,
-                               ip_version=version,
-                               dynamic=('dynamic' == parts[-1])))
+            retval.append(_parse_addr(line.split()))
         return retval
 
 
@@ -367,14 +469,16 @@ class IpRouteCommand(IpDeviceCommandBase):
                 else:
                     break
 
+            args_list = []
             for (device, src) in device_list:
-                self._as_root('del', subnet, 'dev', device)
+                args_list.append(('del', subnet, 'dev', device))
                 if (src != ''):
-                    self._as_root('append', subnet, 'proto', 'kernel',
-                                  'src', src, 'dev', device)
+                    args_list.append(('append', subnet, 'proto', 'kernel',
+                                      'src', src, 'dev', device))
                 else:
-                    self._as_root('append', subnet, 'proto', 'kernel',
-                                  'dev', device)
+                    args_list.append(('append', subnet, 'proto', 'kernel',
+                                      'dev', device))
+            self._as_root_batch(*args_list)
 
     def clear_outdated_routes(self, cidr):
         """Removes duplicated routes for a certain network CIDR.
@@ -388,8 +492,8 @@ class IpRouteCommand(IpDeviceCommandBase):
         items = [x for x in routes
                  if x['Destination'] == cidr and x.get('Device') and
                  x['Device'] != self.name]
-        for item in items:
-            self.delete_net_route(item['Destination'], item['Device'])
+        self._as_root_batch(*[('delete', item['Destination'], 'dev',
+                               item['Device']) for item in items])
 
     def list(self):
         """List all routes
@@ -458,6 +562,31 @@ class IpNetnsCommand(IpCommandBase):
         return False
 
 
+def _parse_addr(parts):
+    """Parse the split 'inet'/'inet6' line of 'ip addr show' output."""
+    if parts[0] == 'inet6':
+        version = 6
+        scope = parts[3]
+        broadcast = '::'
+    else:
+        version = 4
+        if parts[2] == 'brd':
+            broadcast = parts[3]
+            scope = parts[5]
+        else:
+            # sometimes output of 'ip a' might look like:
+            # inet 192.168.100.100/24 scope global eth0
+            # and broadcast needs to be calculated from CIDR
+            broadcast = str(netaddr.IPNetwork(parts[1]).broadcast)
+            scope = parts[3]
+
+    return dict(cidr=parts[1],
+                broadcast=broadcast,
+                scope=scope,
+                ip_version=version,
+                dynamic=('dynamic' == parts[-1]))
+
+
 def device_exists(device_name, namespace=None):
     try:
         address = IPDevice(device_name, namespace).link.address
@@ -14,11 +14,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import copy
+import datetime
+import threading
+
 from keystoneauth1 import loading as ks_loading
 from neutronclient.common import exceptions as neutron_client_exc
 from neutronclient.v2_0 import client as clientv20
 from oslo_config import cfg
 from oslo_log import log
+from oslo_utils import timeutils
 
 from manila.common import client_auth
 from manila import context
@@ -64,8 +70,19 @@ neutron_opts = [
     cfg.StrOpt(
         'region_name',
         help='Region name for connecting to neutron in admin context.'),
+    cfg.IntOpt(
+        'metadata_cache_ttl',
+        default=0,
+        min=0,
+        help='Number of seconds the networks, subnets and extensions '
+             'fetched from neutron are cached. Networks and subnets updated '
+             'through manila are dropped from the cache right away. 0 '
+             'disables the cache.'),
 ]
 
+# Maximum number of networks, subnets and extension lists cached.
+METADATA_CACHE_SIZE = 1000
+
 CONF = cfg.CONF
 LOG = log.getLogger(__name__)
 
@@ -74,6 +91,40 @@ def list_opts():
     return client_auth.AuthClientLoader.list_opts(NEUTRON_GROUP)
 
 
+class MetadataCache(object):
+    """LRU cache whose entries expire ttl seconds after they were set."""
+
+    def __init__(self, ttl, max_size=METADATA_CACHE_SIZE):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._entries = collections.OrderedDict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= timeutils.utcnow():
+                return None
+            self._entries[key] = entry
+            return copy.deepcopy(value)
+
+    def set(self, key, value):
+        expires_at = timeutils.utcnow() + datetime.timedelta(seconds=self.ttl)
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (copy.deepcopy(value), expires_at)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return entry[0] if entry else None
+
+
 class API(object):
     """API for interacting with the neutron 2.x API.
 
@@ -91,10 +142,18 @@ class API(object):
         self.last_neutron_extension_sync = None
         self.extensions = {}
         self.auth_obj = None
+        self._client = None
+        self._metadata_cache = MetadataCache(
+            CONF[NEUTRON_GROUP].metadata_cache_ttl)
 
     @property
     def client(self):
-        return self.get_client(context.get_admin_context())
+        # NOTE: The admin client is built once and reused, so that its
+        # keystone session keeps the connections to neutron alive and the
+        # token is only requested again when it expires.
+        if not self._client:
+            self._client = self.get_client(context.get_admin_context())
+        return self._client
 
     def get_client(self, context):
         if not self.auth_obj:
@@ -125,42 +184,55 @@ class API(object):
         nets = self.client.list_networks(**search_opts).get('networks', [])
         return nets
 
+    def _get_port_request(self, tenant_id, network_id, host_id=None,
+                          subnet_id=None, fixed_ip=None, device_owner=None,
+                          device_id=None, mac_address=None,
+                          port_security_enabled=True, security_group_ids=None,
+                          dhcp_opts=None, **kwargs):
+        port = {}
+        port['network_id'] = network_id
+        port['admin_state_up'] = True
+        port['tenant_id'] = tenant_id
+        if not port_security_enabled:
+            port['port_security_enabled'] = port_security_enabled
+        elif security_group_ids:
+            port['security_groups'] = security_group_ids
+        if mac_address:
+            port['mac_address'] = mac_address
+        if host_id:
+            if not self._has_port_binding_extension():
+                msg = ("host_id (%(host_id)s) specified but neutron "
+                       "doesn't support port binding. Please activate the "
+                       "extension accordingly." % {"host_id": host_id})
+                raise exception.NetworkException(message=msg)
+            port['binding:host_id'] = host_id
+        if dhcp_opts is not None:
+            port['extra_dhcp_opts'] = dhcp_opts
+        if subnet_id:
+            fixed_ip_dict = {'subnet_id': subnet_id}
+            if fixed_ip:
+                fixed_ip_dict.update({'ip_address': fixed_ip})
+            port['fixed_ips'] = [fixed_ip_dict]
+        if device_owner:
+            port['device_owner'] = device_owner
+        if device_id:
+            port['device_id'] = device_id
+        if kwargs:
+            port.update(kwargs)
+        return port
+
     def create_port(self, tenant_id, network_id, host_id=None, subnet_id=None,
                     fixed_ip=None, device_owner=None, device_id=None,
                     mac_address=None, port_security_enabled=True,
                     security_group_ids=None, dhcp_opts=None, **kwargs):
         try:
-            port_req_body = {'port': {}}
-            port_req_body['port']['network_id'] = network_id
-            port_req_body['port']['admin_state_up'] = True
-            port_req_body['port']['tenant_id'] = tenant_id
-            if not port_security_enabled:
-                port_req_body['port']['port_security_enabled'] = (
-                    port_security_enabled)
-            elif security_group_ids:
-                port_req_body['port']['security_groups'] = security_group_ids
-            if mac_address:
-                port_req_body['port']['mac_address'] = mac_address
-            if host_id:
-                if not self._has_port_binding_extension():
-                    msg = ("host_id (%(host_id)s) specified but neutron "
-                           "doesn't support port binding. Please activate the "
-                           "extension accordingly." % {"host_id": host_id})
-                    raise exception.NetworkException(message=msg)
-                port_req_body['port']['binding:host_id'] = host_id
-            if dhcp_opts is not None:
-                port_req_body['port']['extra_dhcp_opts'] = dhcp_opts
-            if subnet_id:
-                fixed_ip_dict = {'subnet_id': subnet_id}
-                if fixed_ip:
-                    fixed_ip_dict.update({'ip_address': fixed_ip})
-                port_req_body['port']['fixed_ips'] = [fixed_ip_dict]
-            if device_owner:
-                port_req_body['port']['device_owner'] = device_owner
-            if device_id:
-                port_req_body['port']['device_id'] = device_id
-            if kwargs:
-                port_req_body['port'].update(kwargs)
+            port_req_body = {'port': self._get_port_request(
+                tenant_id, network_id, host_id=host_id, subnet_id=subnet_id,
+                fixed_ip=fixed_ip, device_owner=device_owner,
+                device_id=device_id, mac_address=mac_address,
+                port_security_enabled=port_security_enabled,
+                security_group_ids=security_group_ids, dhcp_opts=dhcp_opts,
+                **kwargs)}
             port = self.client.create_port(port_req_body).get('port', {})
             return port
         except neutron_client_exc.NeutronClientException as e:
@@ -171,6 +243,29 @@ class API(object):
             raise exception.NetworkException(code=e.status_code,
                                              message=e.message)
 
+    def create_ports(self, tenant_id, network_id, count=1, **kwargs):
+        """Create several identical ports with a single bulk request.
+
+        Neutron creates either all the ports or none of them.
+
+        :param count: number of ports to create.
+        :param kwargs: port attributes, as accepted by create_port().
+        :returns: list of the created ports.
+        """
+        try:
+            port = self._get_port_request(tenant_id, network_id, **kwargs)
+            port_req_body = {'ports': [copy.deepcopy(port)
+                                       for __ in range(count)]}
+            return self.client.create_port(port_req_body).get('ports', [])
+        except neutron_client_exc.NeutronClientException as e:
+            LOG.exception('Neutron error creating %(count)s ports on network '
+                          '%(network)s', {'count': count,
+                                          'network': network_id})
+            if e.status_code == 409:
+                raise exception.PortLimitExceeded()
+            raise exception.NetworkException(code=e.status_code,
+                                             message=e.message)
+
     def delete_port(self, port_id):
         try:
             self.client.delete_port(port_id)
@@ -184,6 +279,8 @@ class API(object):
         except neutron_client_exc.NeutronClientException as e:
             raise exception.NetworkException(code=e.status_code,
                                              message=e.message)
+        finally:
+            self._invalidate_subnet(subnet_id)
 
     def list_ports(self, **search_opts):
         """List ports for the client based on search options."""
@@ -201,26 +298,59 @@ class API(object):
         """Get all networks for client."""
         return self.client.list_networks().get('networks')
 
-    def get_network(self, network_uuid):
-        """Get specific network for client."""
-        try:
-            network = self.client.show_network(network_uuid).get('network', {})
-            return network
-        except neutron_client_exc.NeutronClientException as e:
-            raise exception.NetworkException(code=e.status_code,
-                                             message=e.message)
+    def _cached(self, key, fetch, use_cache=True):
+        if not (use_cache and self._metadata_cache.ttl):
+            return fetch()
+        value = self._metadata_cache.get(key)
+        if value is None:
+            value = fetch()
+            self._metadata_cache.set(key, value)
+        return value
+
+    def _invalidate_subnet(self, subnet_uuid):
+        subnet = self._metadata_cache.pop(('subnet', subnet_uuid))
+        if subnet and subnet.get('network_id'):
+            self._metadata_cache.pop(('network', subnet['network_id']))
+
+    def get_network(self, network_uuid, use_cache=True):
+        """Get specific network for client.
+
+        :param use_cache: Whether the network may be returned from the
+            metadata cache, if it is enabled.
+        """
+        def _get_network():
+            try:
+                return self.client.show_network(
+                    network_uuid).get('network', {})
+            except neutron_client_exc.NeutronClientException as e:
+                raise exception.NetworkException(code=e.status_code,
+                                                 message=e.message)
 
-    def get_subnet(self, subnet_uuid):
-        """Get specific subnet for client."""
-        try:
-            return self.client.show_subnet(subnet_uuid).get('subnet', {})
-        except neutron_client_exc.NeutronClientException as e:
-            raise exception.NetworkException(code=e.status_code,
-                                             message=e.message)
+        return self._cached(('network', network_uuid), _get_network,
+                            use_cache=use_cache)
+
+    def get_subnet(self, subnet_uuid, use_cache=True):
+        """Get specific subnet for client.
+
+        :param use_cache: Whether the subnet may be returned from the
+            metadata cache, if it is enabled.
+        """
+        def _get_subnet():
+            try:
+                return self.client.show_subnet(subnet_uuid).get('subnet', {})
+            except neutron_client_exc.NeutronClientException as e:
+                raise exception.NetworkException(code=e.status_code,
+                                                 message=e.message)
+
+        return self._cached(('subnet', subnet_uuid), _get_subnet,
+                            use_cache=use_cache)
 
     def list_extensions(self):
-        extensions_list = self.client.list_extensions().get('extensions')
-        return {ext['name']: ext for ext in extensions_list}
+        def _list_extensions():
+            extensions_list = self.client.list_extensions().get('extensions')
+            return {ext['name']: ext for ext in extensions_list}
+
+        return self._cached(('extensions',), _list_extensions)
 
     def _has_port_binding_extension(self):
         if not self.extensions:
@@ -261,6 +391,9 @@ class API(object):
         except neutron_client_exc.NeutronClientException as e:
             raise exception.NetworkException(code=e.status_code,
                                              message=e.message)
+        finally:
+            # NOTE: The subnets of the network changed.
+            self._metadata_cache.pop(('network', net_id))
 
     def router_add_interface(self, router_id, subnet_id, port_id=None):
         body = {}
@@ -329,6 +462,8 @@ class API(object):
         except neutron_client_exc.NeutronClientException as e:
             raise exception.NetworkException(code=e.status_code,
                                              message=e.message)
+        finally:
+            self._invalidate_subnet(subnet_uuid)
 
     def security_group_list(self, search_opts=None):
         try:
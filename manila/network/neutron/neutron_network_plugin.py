@@ -154,12 +154,8 @@ class NeutronNetworkPlugin(network.NetworkBaseAPI):
         allocation_count = kwargs.get('count', 1)
         device_owner = kwargs.get('device_owner', 'share')
 
-        ports = []
-        for __ in range(0, allocation_count):
-            ports.append(self._create_port(context, share_server,
-                                           share_network, device_owner))
-
-        return ports
+        return self._create_ports(context, share_server, share_network,
+                                  device_owner, allocation_count)
 
     def _get_matched_ip_address(self, fixed_ips, ip_version):
         """Get first ip address which matches the specified ip_version."""
@@ -203,13 +199,22 @@ class NeutronNetworkPlugin(network.NetworkBaseAPI):
             "device_id": share_server.get('id'),
         }
 
-    def _create_port(self, context, share_server, share_network, device_owner):
+    def _create_ports(self, context, share_server, share_network,
+                      device_owner, count):
         create_args = self._get_port_create_args(share_server, share_network,
                                                  device_owner)
 
-        port = self.neutron_api.create_port(
-            share_network['project_id'], **create_args)
+        # NOTE: All the ports are created with a single bulk request instead
+        # of one request per port.
+        ports = self.neutron_api.create_ports(
+            share_network['project_id'], count=count, **create_args)
+
+        return [self._create_network_allocation(context, share_server,
+                                                share_network, port)
+                for port in ports]
 
+    def _create_network_allocation(self, context, share_server,
+                                   share_network, port):
         ip_address = self._get_matched_ip_address(port['fixed_ips'],
                                                   share_network['ip_version'])
         port_dict = {
@@ -399,9 +404,16 @@ class NeutronBindNetworkPlugin(NeutronNetworkPlugin):
 
     @utils.retry(exception.NetworkBindException, retries=20)
     def _wait_for_ports_bind(self, ports, share_server):
+        port_ids = [port['id'] for port in ports]
+        neutron_ports = {
+            port['id']: port
+            for port in self.neutron_api.list_ports(id=port_ids)}
         inactive_ports = []
-        for port in ports:
-            port = self._neutron_api.show_port(port['id'])
+        for port_id in port_ids:
+            port = neutron_ports.get(port_id)
+            if port is None:
+                msg = _("Port %s not found.") % port_id
+                raise exception.NetworkException(msg)
             if (port['status'] == neutron_constants.PORT_STATUS_ERROR or
                     ('binding:vif_type' in port and
                      port['binding:vif_type'] ==
@@ -34,7 +34,10 @@ import manila.coordination
 import manila.data.helper
 import manila.db.api
 import manila.db.base
+import manila.db.sqlalchemy.query_stats
 import manila.exception
+import manila.lock_stats
+import manila.manager
 import manila.message.api
 import manila.network
 import manila.network.linux.interface
@@ -88,6 +91,7 @@ import manila.share.drivers.zfssa.zfssashare
 import manila.share.drivers_private_data
 import manila.share.hook
 import manila.share.manager
+import manila.share.share_types
 import manila.volume
 import manila.volume.cinder
 import manila.wsgi.eventlet_server
@@ -108,6 +112,9 @@ _global_opt_lists = [
     manila.db.api.db_opts,
     [manila.db.base.db_driver_opt],
     manila.exception.exc_log_opts,
+    manila.lock_stats.lock_stats_opts,
+    manila.db.sqlalchemy.query_stats.query_stats_opts,
+    manila.manager.manager_opts,
     manila.message.api.messages_opts,
     manila.network.linux.interface.OPTS,
     manila.network.network_opts,
@@ -182,6 +189,7 @@ _global_opt_lists = [
     manila.share.drivers.zfssa.zfssashare.ZFSSA_OPTS,
     manila.share.hook.hook_options,
     manila.share.manager.share_manager_opts,
+    manila.share.share_types.share_types_opts,
     manila.volume._volume_opts,
     manila.wsgi.eventlet_server.socket_opts,
 ]
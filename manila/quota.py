@@ -17,6 +17,7 @@
 """Quotas for shares."""
 
 import datetime
+import time
 
 from oslo_config import cfg
 from oslo_log import log
@@ -64,7 +65,27 @@ quota_opts = [
                help='Number of seconds between subsequent usage refreshes.'),
     cfg.StrOpt('quota_driver',
                default='manila.quota.DbQuotaDriver',
-               help='Default driver to use for quota checks.'), ]
+               help='Default driver to use for quota checks.'),
+    cfg.IntOpt('quota_limits_cache_ttl',
+               default=0,
+               min=0,
+               help='Number of seconds the quota limits looked up for '
+                    'reservations are cached by the quota driver. Cached '
+                    'limits are dropped as soon as quotas or quota classes '
+                    'are changed through this service, other services '
+                    'see the change once the entry expires. 0 disables '
+                    'the cache.'),
+    cfg.IntOpt('reservation_expire_batch_size',
+               default=1000,
+               min=0,
+               help='Maximum number of expired reservations rolled back in '
+                    'one database transaction. 0 rolls back all expired '
+                    'reservations in a single transaction.'),
+    cfg.FloatOpt('reservation_expire_batch_delay',
+                 default=0.1,
+                 min=0,
+                 help='Number of seconds to wait between two batches of '
+                      'expired reservations being rolled back.'), ]
 
 CONF = cfg.CONF
 CONF.register_opts(quota_opts)
@@ -78,6 +99,11 @@ class DbQuotaDriver(object):
     database.
     """
 
+    def __init__(self):
+        # Maps (project_id, user_id, share_type_id, quota_class, has_sync,
+        # resources) to (expiration time, limits).
+        self._limits_cache = {}
+
     def get_by_class(self, context, quota_class, resource):
         """Get a specific quota by quota class."""
 
@@ -358,6 +384,15 @@ class DbQuotaDriver(object):
             unknown = desired - set(sub_resources.keys())
             raise exception.QuotaResourceUnknown(unknown=sorted(unknown))
 
+        cache_key = None
+        if CONF.quota_limits_cache_ttl:
+            cache_key = (project_id, user_id, share_type_id,
+                         context.quota_class, has_sync,
+                         tuple(sorted(sub_resources)))
+            cached = self._limits_cache.get(cache_key)
+            if cached and cached[0] > timeutils.utcnow():
+                return dict(cached[1])
+
         if user_id:
             # Grab and return the quotas (without usages)
             quotas = self.get_user_quotas(context, sub_resources,
@@ -375,7 +410,31 @@ class DbQuotaDriver(object):
                                              context.quota_class,
                                              usages=False)
 
-        return {k: v['limit'] for k, v in quotas.items()}
+        limits = {k: v['limit'] for k, v in quotas.items()}
+        if cache_key:
+            now = timeutils.utcnow()
+            # Drop the expired limits, they would otherwise stay cached
+            # for projects that are not used anymore.
+            for key, (expire, _limits) in list(self._limits_cache.items()):
+                if expire <= now:
+                    self._limits_cache.pop(key, None)
+            expire = now + datetime.timedelta(
+                seconds=CONF.quota_limits_cache_ttl)
+            self._limits_cache[cache_key] = (expire, dict(limits))
+        return limits
+
+    def invalidate_limits_cache(self, project_id=None):
+        """Drop cached quota limits.
+
+        :param project_id: If given, only the limits cached for this
+                           project are dropped, otherwise all of them.
+        """
+        if project_id is None:
+            self._limits_cache.clear()
+            return
+        for key in list(self._limits_cache):
+            if key[0] == project_id:
+                self._limits_cache.pop(key, None)
 
     def reserve(self, context, resources, deltas, expire=None,
                 project_id=None, user_id=None, share_type_id=None):
@@ -555,6 +614,7 @@ class DbQuotaDriver(object):
         """
 
         db.quota_destroy_all_by_project(context, project_id)
+        self.invalidate_limits_cache(project_id)
 
     def destroy_all_by_project_and_user(self, context, project_id, user_id):
         """Destroy metadata associated with a project and user.
@@ -568,6 +628,7 @@ class DbQuotaDriver(object):
         """
 
         db.quota_destroy_all_by_project_and_user(context, project_id, user_id)
+        self.invalidate_limits_cache(project_id)
 
     def destroy_all_by_project_and_share_type(self, context, project_id,
                                               share_type_id):
@@ -583,17 +644,42 @@ class DbQuotaDriver(object):
 
         db.quota_destroy_all_by_project_and_share_type(
             context, project_id, share_type_id)
+        self.invalidate_limits_cache(project_id)
 
-    def expire(self, context):
+    def expire(self, context, batch_size=None, batch_delay=None):
         """Expire reservations.
 
         Explores all currently existing reservations and rolls back
         any that have expired.
 
         :param context: The request context, for access checks.
+        :param batch_size: Maximum number of reservations rolled back per
+                           transaction, reservation_expire_batch_size
+                           is used if not specified.
+        :param batch_delay: Seconds to wait between two batches,
+                            reservation_expire_batch_delay is used if
+                            not specified.
+        :returns: The number of reservations rolled back.
         """
 
-        db.reservation_expire(context)
+        if batch_size is None:
+            batch_size = CONF.reservation_expire_batch_size
+        if batch_delay is None:
+            batch_delay = CONF.reservation_expire_batch_delay
+        start = time.time()
+        count = batches = 0
+        while True:
+            expired = db.reservation_expire(context, batch_size=batch_size)
+            count += expired
+            batches += 1
+            if not batch_size or expired < batch_size:
+                break
+            time.sleep(batch_delay)
+        LOG.info("Rolled back %(count)s expired reservations in "
+                 "%(batches)s batch(es) and %(time).2f seconds.",
+                 {'count': count, 'batches': batches,
+                  'time': time.time() - start})
+        return count
 
 
 class BaseResource(object):
@@ -1028,16 +1114,29 @@ class QuotaEngine(object):
 
         self._driver.destroy_all_by_project(context, project_id)
 
-    def expire(self, context):
+    def expire(self, context, batch_size=None, batch_delay=None):
         """Expire reservations.
 
         Explores all currently existing reservations and rolls back
         any that have expired.
 
         :param context: The request context, for access checks.
+        :param batch_size: Maximum number of reservations rolled back per
+                           transaction.
+        :param batch_delay: Seconds to wait between two batches.
+        """
+
+        return self._driver.expire(
+            context, batch_size=batch_size, batch_delay=batch_delay)
+
+    def invalidate_limits_cache(self, project_id=None):
+        """Drop quota limits cached by the driver.
+
+        :param project_id: If given, only the limits cached for this
+                           project are dropped, otherwise all of them.
         """
 
-        self._driver.expire(context)
+        self._driver.invalidate_limits_cache(project_id=project_id)
 
     @property
     def resources(self):
@@ -31,6 +31,7 @@ from oslo_messaging.rpc import dispatcher
 from oslo_serialization import jsonutils
 
 import manila.context
+from manila.db.sqlalchemy import query_stats
 import manila.exception
 from manila import utils
 
@@ -138,6 +139,9 @@ def get_server(target, endpoints, serializer=None):
     assert TRANSPORT is not None
     access_policy = dispatcher.DefaultRPCAccessPolicy
     serializer = RequestContextSerializer(serializer)
+    if CONF.db_query_stats:
+        endpoints = [query_stats.ProfiledEndpoint(endpoint)
+                     for endpoint in endpoints]
     return messaging.get_rpc_server(TRANSPORT,
                                     target,
                                     endpoints,
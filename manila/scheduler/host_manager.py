@@ -463,6 +463,8 @@ class HostManager(object):
 
     def __init__(self):
         self.service_states = {}  # { <host>: {<service>: {cap k : v}}}
+        # { <host>: <generation of the capabilities in service_states> }
+        self.service_states_generation = {}
         self.host_state_map = {}
         self.filter_handler = base_host_filter.HostFilterHandler(
             'manila.scheduler.filters')
@@ -548,7 +550,8 @@ class HostManager(object):
                                                        hosts,
                                                        weight_properties)
 
-    def update_service_capabilities(self, service_name, host, capabilities):
+    def update_service_capabilities(self, service_name, host, capabilities,
+                                    generation=None):
         """Update the per-service capabilities based on this notification."""
         if service_name not in ('share',):
             LOG.debug('Ignoring %(service_name)s service update '
@@ -560,12 +563,46 @@ class HostManager(object):
         capability_copy = dict(capabilities)
         capability_copy["timestamp"] = timeutils.utcnow()  # Reported time
         self.service_states[host] = capability_copy
+        self.service_states_generation[host] = generation
 
         LOG.debug("Received %(service_name)s service update from "
                   "%(host)s: %(cap)s",
                   {'service_name': service_name, 'host': host,
                    'cap': capabilities})
 
+    def update_service_capabilities_delta(self, service_name, host, delta,
+                                          generation, base_generation):
+        """Merge the capability changes a service sent.
+
+        :returns: False if the capabilities the changes are based on are
+            not known, True otherwise.
+        """
+        if service_name not in ('share',):
+            LOG.debug('Ignoring %(service_name)s service update '
+                      'from %(host)s',
+                      {'service_name': service_name, 'host': host})
+            return True
+
+        if (host not in self.service_states or
+                self.service_states_generation.get(host) != base_generation):
+            LOG.debug("Ignoring %(service_name)s service update from "
+                      "%(host)s based on unknown generation %(generation)s.",
+                      {'service_name': service_name, 'host': host,
+                       'generation': base_generation})
+            return False
+
+        capabilities = scheduler_utils.apply_capabilities_delta(
+            self.service_states[host], delta)
+        capabilities["timestamp"] = timeutils.utcnow()  # Reported time
+        self.service_states[host] = capabilities
+        self.service_states_generation[host] = generation
+
+        LOG.debug("Received %(service_name)s service update from "
+                  "%(host)s: %(delta)s",
+                  {'service_name': service_name, 'host': host,
+                   'delta': delta})
+        return True
+
     def _update_host_state_map(self, context):
 
         # Get resource usage across the available share nodes:
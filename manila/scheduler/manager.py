@@ -62,7 +62,7 @@ MAPPING = {
 class SchedulerManager(manager.Manager):
     """Chooses a host to create shares."""
 
-    RPC_API_VERSION = '1.8'
+    RPC_API_VERSION = '1.9'
 
     def __init__(self, scheduler_driver=None, service_name=None,
                  *args, **kwargs):
@@ -96,13 +96,24 @@ class SchedulerManager(manager.Manager):
         return self.driver.get_service_capabilities()
 
     def update_service_capabilities(self, context, service_name=None,
-                                    host=None, capabilities=None, **kwargs):
+                                    host=None, capabilities=None,
+                                    generation=None, base_generation=None,
+                                    **kwargs):
         """Process a capability update from a service node."""
         if capabilities is None:
             capabilities = {}
-        self.driver.update_service_capabilities(service_name,
-                                                host,
-                                                capabilities)
+        if base_generation is None:
+            self.driver.update_service_capabilities(service_name,
+                                                    host,
+                                                    capabilities,
+                                                    generation=generation)
+        elif not self.driver.update_service_capabilities_delta(
+                service_name, host, capabilities, generation,
+                base_generation):
+            # The capabilities the delta is based on were missed, e.g.
+            # after a restart of the scheduler, ask for the full ones.
+            share_rpcapi.ShareAPI().publish_service_capabilities(
+                context, host=host)
 
     def create_share_instance(self, context, request_spec=None,
                               filter_properties=None):
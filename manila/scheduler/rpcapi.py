@@ -40,9 +40,11 @@ class SchedulerAPI(object):
         1.6 - Add manage_share
         1.7 - Updated migrate_share_to_host method with new parameters
         1.8 - Rename create_consistency_group -> create_share_group method
+        1.9 - Add generation and base_generation parameters to
+        update_service_capabilities() for incremental updates
     """
 
-    RPC_API_VERSION = '1.8'
+    RPC_API_VERSION = '1.9'
 
     def __init__(self):
         super(SchedulerAPI, self).__init__()
@@ -61,13 +63,30 @@ class SchedulerAPI(object):
 
     def update_service_capabilities(self, context,
                                     service_name, host,
-                                    capabilities):
-        call_context = self.client.prepare(fanout=True, version='1.0')
+                                    capabilities, generation=None,
+                                    base_generation=None):
+        """Casts the capabilities of a service to all the schedulers.
+
+        When base_generation is set, capabilities is a delta returned by
+        :func:`manila.scheduler.utils.capabilities_delta` against the
+        capabilities of that generation.
+        """
+        if generation is None:
+            call_context = self.client.prepare(fanout=True, version='1.0')
+            call_context.cast(context,
+                              'update_service_capabilities',
+                              service_name=service_name,
+                              host=host,
+                              capabilities=capabilities)
+            return
+        call_context = self.client.prepare(fanout=True, version='1.9')
         call_context.cast(context,
                           'update_service_capabilities',
                           service_name=service_name,
                           host=host,
-                          capabilities=capabilities)
+                          capabilities=capabilities,
+                          generation=generation,
+                          base_generation=base_generation)
 
     def get_pools(self, context, filters=None):
         call_context = self.client.prepare(version='1.1')
@@ -167,3 +167,84 @@ def capabilities_satisfied(capabilities, extra_specs):
                       {'key': key, 'req': req, 'cap': cap})
             return False
     return True
+
+
+def _pools_by_name(capabilities):
+    pools = capabilities.get('pools')
+    if not isinstance(pools, list) or not all(
+            isinstance(pool, dict) and 'pool_name' in pool for pool in pools):
+        return None
+    return {pool['pool_name']: pool for pool in pools}
+
+
+def _dict_delta(old, new):
+    updated = {key: value for key, value in new.items()
+               if key not in old or old[key] != value}
+    removed = [key for key in old if key not in new]
+    return updated, removed
+
+
+def capabilities_delta(old, new):
+    """Return the changes between two capability reports of a service.
+
+    Pools are compared one by one, by name, so that only the keys that
+    changed in the pools that changed are sent.
+
+    :param old: capabilities previously reported by the service.
+    :param new: capabilities the service reports now.
+    :returns: dict with the ``updated`` keys and their new values, the
+        ``removed`` keys and, when both reports have pools, the ``pools``
+        delta with the ``updated`` and ``removed`` keys per pool name and
+        the ``deleted`` pool names.
+    """
+    old_pools = _pools_by_name(old)
+    new_pools = _pools_by_name(new)
+    pools_delta = None
+    if old_pools is not None and new_pools is not None:
+        old = dict(old, pools=None)
+        new = dict(new, pools=None)
+        pools_delta = {'updated': {}, 'removed': {}, 'deleted': []}
+        for name, pool in new_pools.items():
+            updated, removed = _dict_delta(old_pools.get(name, {}), pool)
+            if updated:
+                pools_delta['updated'][name] = updated
+            if removed:
+                pools_delta['removed'][name] = removed
+        pools_delta['deleted'] = [name for name in old_pools
+                                  if name not in new_pools]
+
+    updated, removed = _dict_delta(old, new)
+    delta = {'updated': updated, 'removed': removed}
+    if pools_delta is not None:
+        delta['pools'] = pools_delta
+    return delta
+
+
+def apply_capabilities_delta(capabilities, delta):
+    """Return capabilities with a delta from capabilities_delta() applied.
+
+    :param capabilities: capabilities the delta is based on, not modified.
+    :param delta: dict returned by :func:`capabilities_delta`.
+    """
+    result = dict(capabilities)
+    for key in delta.get('removed', []):
+        result.pop(key, None)
+    pools_delta = delta.get('pools')
+    if pools_delta is not None:
+        pools = []
+        names = set()
+        for pool in capabilities.get('pools') or []:
+            name = pool['pool_name']
+            if name in pools_delta['deleted']:
+                continue
+            pool = dict(pool, **pools_delta['updated'].get(name, {}))
+            for key in pools_delta['removed'].get(name, []):
+                pool.pop(key, None)
+            pools.append(pool)
+            names.add(name)
+        for name, pool in pools_delta['updated'].items():
+            if name not in names:
+                pools.append(dict(pool))
+        result['pools'] = pools
+    result.update(delta.get('updated', {}))
+    return result
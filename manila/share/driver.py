@@ -21,8 +21,10 @@ Drivers for shares.
 import six
 import time
 
+from eventlet import timeout as eventlet_timeout
 from oslo_config import cfg
 from oslo_log import log
+from oslo_service import loopingcall
 
 from manila import exception
 from manila.i18n import _
@@ -132,6 +134,22 @@ share_opts = [
     cfg.StrOpt('goodness_function',
                help='String representation for an equation that will be '
                     'used to determine the goodness of a host.'),
+    cfg.IntOpt(
+        'driver_stats_refresh_interval',
+        default=0,
+        min=0,
+        help='Interval in seconds between the refreshes of the backend '
+             'stats done in the background. When set, the share manager '
+             'publishes the last stats collected instead of waiting for '
+             'the backend. 0 refreshes the stats each time they are '
+             'published.'),
+    cfg.IntOpt(
+        'driver_stats_refresh_timeout',
+        default=300,
+        min=0,
+        help='Time in seconds after which a background refresh of the '
+             'backend stats is abandoned. The last stats collected keep '
+             'being published. 0 means no timeout.'),
 ]
 
 ssh_opts = [
@@ -257,6 +275,7 @@ class ShareDriver(object):
         self.configuration = kwargs.get('configuration', None)
         self.initialized = False
         self._stats = {}
+        self._stats_collector = None
         self.ip_versions = None
         self.ipv6_implemented = False
 
@@ -803,13 +822,41 @@ class ShareDriver(object):
     def get_share_stats(self, refresh=False):
         """Get share status.
 
-        If 'refresh' is True, run update the stats first.
+        If 'refresh' is True, run update the stats first. When the stats
+        are refreshed in the background, the last stats collected are
+        returned right away instead, once there are any.
         """
         if refresh:
-            self._update_share_stats()
+            interval = (self.configuration and self.configuration.safe_get(
+                'driver_stats_refresh_interval'))
+            if not interval:
+                self._update_share_stats()
+            elif self._stats_collector is None:
+                self._update_share_stats()
+                self._stats_collector = loopingcall.FixedIntervalLoopingCall(
+                    self._collect_share_stats)
+                self._stats_collector.start(interval=interval,
+                                            initial_delay=interval)
 
         return self._stats
 
+    def _collect_share_stats(self):
+        """Refresh the stats from the background stats collector."""
+        timeout = self.configuration.safe_get('driver_stats_refresh_timeout')
+        try:
+            with eventlet_timeout.Timeout(timeout or None):
+                self._update_share_stats()
+        except eventlet_timeout.Timeout:
+            LOG.warning("Refreshing the stats of backend %(backend)s took "
+                        "more than %(timeout)s seconds, the previous stats "
+                        "are kept.",
+                        {'backend': self.configuration.config_group,
+                         'timeout': timeout})
+        except Exception:
+            LOG.exception("Failed to refresh the stats of backend "
+                          "%s, the previous stats are kept.",
+                          self.configuration.config_group)
+
     def get_network_allocations_number(self):
         """Returns number of network allocations for creating VIFs.
 
@@ -14,14 +14,13 @@
 #    under the License.
 
 import pipes
+import threading
 
 from oslo_concurrency import processutils
 from oslo_log import log
 from oslo_utils import excutils
+import requests
 import six
-from six.moves import http_cookiejar
-from six.moves.urllib import error as url_error  # pylint: disable=E0611
-from six.moves.urllib import request as url_request  # pylint: disable=E0611
 
 from manila import exception
 from manila.i18n import _
@@ -43,44 +42,54 @@ class XMLAPIConnector(object):
         self.auth_url = 'https://' + self.storage_ip + '/Login'
         self._url = 'https://{}/servlets/CelerraManagementServices'.format(
             self.storage_ip)
-        context = enas_utils.create_ssl_context(configuration)
-        if context:
-            https_handler = url_request.HTTPSHandler(context=context)
+        # NOTE: The session keeps the connections to the XML API server
+        # alive and stores the authentication cookie returned by the login.
+        self.session = requests.Session()
+        if configuration.emc_ssl_cert_verify:
+            self.session.verify = configuration.emc_ssl_cert_path or True
         else:
-            https_handler = url_request.HTTPSHandler()
-        cookie_handler = url_request.HTTPCookieProcessor(
-            http_cookiejar.CookieJar())
-        self.url_opener = url_request.build_opener(https_handler,
-                                                   cookie_handler)
+            self.session.verify = False
+        self._login_lock = threading.Lock()
+        self._login_generation = 0
         self._do_setup()
 
     def _do_setup(self):
         credential = ('user=' + self.username
                       + '&password=' + self.password
                       + '&Login=Login')
-        req = url_request.Request(self.auth_url, credential,
-                                  constants.CONTENT_TYPE_URLENCODE)
-        resp = self.url_opener.open(req)
-        resp_body = resp.read()
-        self._http_log_resp(resp, resp_body)
-
-    def _http_log_req(self, req):
+        self._http_log_req('POST', self.auth_url,
+                           constants.CONTENT_TYPE_URLENCODE, None)
+        resp = self.session.post(self.auth_url, data=credential,
+                                 headers=constants.CONTENT_TYPE_URLENCODE)
+        self._http_log_resp(resp)
+        resp.raise_for_status()
+        self._login_generation += 1
+
+    def _login_again(self, generation):
+        """Log in again unless another request did it in the meantime."""
+        with self._login_lock:
+            if generation == self._login_generation:
+                LOG.debug("Login again because client certification "
+                          "may be expired.")
+                self._do_setup()
+
+    def _http_log_req(self, method, url, headers, body):
         if not self.debug:
             return
 
         string_parts = ['curl -i']
-        string_parts.append(' -X %s' % req.get_method())
+        string_parts.append(' -X %s' % method)
 
-        for k in req.headers:
-            header = ' -H "%s: %s"' % (k, req.headers[k])
+        for k in headers:
+            header = ' -H "%s: %s"' % (k, headers[k])
             string_parts.append(header)
 
-        if req.data:
-            string_parts.append(" -d '%s'" % req.data)
-        string_parts.append(' ' + req.get_full_url())
+        if body:
+            string_parts.append(" -d '%s'" % body)
+        string_parts.append(' ' + url)
         LOG.debug("\nREQ: %s.\n", "".join(string_parts))
 
-    def _http_log_resp(self, resp, body):
+    def _http_log_resp(self, resp):
         if not self.debug:
             return
 
@@ -90,44 +99,40 @@ class XMLAPIConnector(object):
             'RESP: [%(code)s] %(resp_hdrs)s\n'
             'RESP BODY: %(resp_b)s.\n',
             {
-                'code': resp.getcode(),
+                'code': resp.status_code,
                 'resp_hdrs': headers,
-                'resp_b': body,
+                'resp_b': resp.content,
             }
         )
 
     def _request(self, req_body=None, method=None,
                  header=constants.CONTENT_TYPE_URLENCODE):
-        req = url_request.Request(self._url, req_body, header)
-        if method not in (None, 'GET', 'POST'):
-            req.get_method = lambda: method
-        self._http_log_req(req)
-        try:
-            resp = self.url_opener.open(req)
-            resp_body = resp.read()
-            self._http_log_resp(resp, resp_body)
-        except url_error.HTTPError as http_err:
-            if '403' == six.text_type(http_err.code):
-                raise exception.NotAuthorized()
-            else:
-                err = {'errorCode': -1,
-                       'httpStatusCode': http_err.code,
-                       'messages': six.text_type(http_err),
-                       'request': req_body}
-                msg = (_("The request is invalid. Reason: %(reason)s") %
-                       {'reason': err})
-                raise exception.ManilaException(message=msg)
-
-        return resp_body
+        if method in (None, 'GET', 'POST'):
+            method = 'POST' if req_body is not None else 'GET'
+        self._http_log_req(method, self._url, header, req_body)
+        resp = self.session.request(method, self._url, data=req_body,
+                                    headers=header)
+        self._http_log_resp(resp)
+        if resp.status_code == requests.codes.forbidden:
+            raise exception.NotAuthorized()
+        elif resp.status_code >= requests.codes.bad_request:
+            err = {'errorCode': -1,
+                   'httpStatusCode': resp.status_code,
+                   'messages': resp.reason,
+                   'request': req_body}
+            msg = (_("The request is invalid. Reason: %(reason)s") %
+                   {'reason': err})
+            raise exception.ManilaException(message=msg)
+
+        return resp.content
 
     def request(self, req_body=None, method=None,
                 header=constants.CONTENT_TYPE_URLENCODE):
+        generation = self._login_generation
         try:
             resp_body = self._request(req_body, method, header)
         except exception.NotAuthorized:
-            LOG.debug("Login again because client certification "
-                      "may be expired.")
-            self._do_setup()
+            self._login_again(generation)
             resp_body = self._request(req_body, method, header)
 
         return resp_body
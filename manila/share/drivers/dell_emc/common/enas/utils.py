@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
 import types
 
 from oslo_config import cfg
@@ -20,7 +21,6 @@ from oslo_log import log
 from oslo_utils import fnmatch
 from oslo_utils import netutils
 from oslo_utils import timeutils
-import ssl
 
 CONF = cfg.CONF
 LOG = log.getLogger(__name__)
@@ -85,27 +85,6 @@ def do_match_any(full, matcher_list):
     return matched, not_matched
 
 
-def create_ssl_context(configuration):
-    """Create context for ssl verification.
-
-    .. note:: starting from python 2.7.9 ssl adds create_default_context.
-              We need to keep compatibility with previous python as well.
-    """
-    try:
-        if configuration.emc_ssl_cert_verify:
-            context = ssl.create_default_context(
-                capath=configuration.emc_ssl_cert_path)
-        else:
-            context = ssl.create_default_context()
-            context.check_hostname = False
-            context.verify_mode = ssl.CERT_NONE
-    except AttributeError:
-        LOG.warning('Creating ssl context is not supported on this '
-                    'version of Python, ssl verification is disabled.')
-        context = None
-    return context
-
-
 def parse_ipaddr(text):
     """Parse the output of VNX server_export command, get IPv4/IPv6 addresses.
 
@@ -179,3 +158,46 @@ def export_unc_path(ip_addr):
     if netutils.is_valid_ipv6(ip_addr):
         ip_addr = ip_addr.replace(':', '-') + unc_suffix
     return ip_addr
+
+
+class ObjectCache(dict):
+    """Dictionary whose entries expire ttl seconds after they were set.
+
+    Expired entries are dropped when ``key in cache`` or ``get`` is
+    checked, so that callers query the backend again. Item access does
+    not expire entries, a lookup following a successful membership test
+    always finds its value. With a ttl of 0 the entries are kept until
+    they are removed.
+    """
+
+    def __init__(self, ttl=0):
+        super(ObjectCache, self).__init__()
+        self.ttl = ttl
+        self._expires_at = {}
+
+    def _expire(self, key):
+        expires_at = self._expires_at.get(key)
+        if expires_at is not None and expires_at <= timeutils.utcnow():
+            self.pop(key, None)
+
+    def __setitem__(self, key, value):
+        super(ObjectCache, self).__setitem__(key, value)
+        if self.ttl:
+            self._expires_at[key] = timeutils.utcnow() + datetime.timedelta(
+                seconds=self.ttl)
+
+    def __contains__(self, key):
+        self._expire(key)
+        return super(ObjectCache, self).__contains__(key)
+
+    def get(self, key, default=None):
+        self._expire(key)
+        return super(ObjectCache, self).get(key, default)
+
+    def pop(self, key, *args):
+        self._expires_at.pop(key, None)
+        return super(ObjectCache, self).pop(key, *args)
+
+    def clear(self):
+        self._expires_at.clear()
+        super(ObjectCache, self).clear()
@@ -56,7 +56,15 @@ VNX_OPTS = [
                 deprecated_name='emc_interface_ports',
                 help='Comma separated list of ports that can be used for '
                      'share server interfaces. Members of the list '
-                     'can be Unix-style glob expressions.')
+                     'can be Unix-style glob expressions.'),
+    cfg.IntOpt('vnx_object_cache_ttl',
+               default=0,
+               min=0,
+               help='Number of seconds the data movers, VDMs, file systems, '
+                    'storage pools, checkpoints and CIFS servers looked up '
+                    'through the XML API are cached. Objects changed by the '
+                    'driver are dropped from the cache right away. 0 keeps '
+                    'cached objects until the driver changes them.'),
 ]
 
 CONF = cfg.CONF
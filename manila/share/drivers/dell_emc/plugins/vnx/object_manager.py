@@ -39,6 +39,7 @@ LOG = log.getLogger(__name__)
 class StorageObjectManager(object):
     def __init__(self, configuration):
         self.context = dict()
+        self.cache_ttl = configuration.safe_get('vnx_object_cache_ttl') or 0
 
         self.connectors = dict()
         self.connectors['XML'] = connector.XMLAPIConnector(configuration)
@@ -210,13 +211,17 @@ class StorageObject(object):
     def get_context(self, type):
         return self.manager.getStorageContext(type)
 
+    def _invalidate_mover(self, mover_name):
+        """Drop the cached details of a mover changed by a request."""
+        self.get_context('Mover').mover_map.pop(mover_name, None)
+
 
 @enas_utils.decorate_all_methods(enas_utils.log_enter_exit,
                                  debug_only=True)
 class FileSystem(StorageObject):
     def __init__(self, conn, elt_maker, xml_parser, manager):
         super(FileSystem, self).__init__(conn, elt_maker, xml_parser, manager)
-        self.filesystem_map = dict()
+        self.filesystem_map = enas_utils.ObjectCache(manager.cache_ttl)
 
     @utils.retry(exception.EMCVnxInvalidMoverID)
     def create(self, name, size, pool_name, mover_name, is_vdm=True):
@@ -377,6 +382,8 @@ class FileSystem(StorageObject):
             LOG.error(message)
             raise exception.EMCVnxXMLAPIError(err=message)
 
+        self.filesystem_map.pop(name, None)
+
     def get_id(self, name):
         status, out = self.get(name)
         if constants.STATUS_OK != status:
@@ -484,7 +491,7 @@ class FileSystem(StorageObject):
 class StoragePool(StorageObject):
     def __init__(self, conn, elt_maker, xml_parser, manager):
         super(StoragePool, self).__init__(conn, elt_maker, xml_parser, manager)
-        self.pool_map = dict()
+        self.pool_map = enas_utils.ObjectCache(manager.cache_ttl)
 
     def get(self, name, force=False):
         if name not in self.pool_map or force:
@@ -687,8 +694,8 @@ class MountPoint(StorageObject):
 class Mover(StorageObject):
     def __init__(self, conn, elt_maker, xml_parser, manager):
         super(Mover, self).__init__(conn, elt_maker, xml_parser, manager)
-        self.mover_map = dict()
-        self.mover_ref_map = dict()
+        self.mover_map = enas_utils.ObjectCache(manager.cache_ttl)
+        self.mover_ref_map = enas_utils.ObjectCache(manager.cache_ttl)
 
     def get_ref(self, name, force=False):
         if name not in self.mover_ref_map or force:
@@ -852,7 +859,7 @@ class Mover(StorageObject):
 class VDM(StorageObject):
     def __init__(self, conn, elt_maker, xml_parser, manager):
         super(VDM, self).__init__(conn, elt_maker, xml_parser, manager)
-        self.vdm_map = dict()
+        self.vdm_map = enas_utils.ObjectCache(manager.cache_ttl)
 
     @utils.retry(exception.EMCVnxInvalidMoverID)
     def create(self, name, mover_name):
@@ -1027,7 +1034,7 @@ class VDM(StorageObject):
 class Snapshot(StorageObject):
     def __init__(self, conn, elt_maker, xml_parser, manager):
         super(Snapshot, self).__init__(conn, elt_maker, xml_parser, manager)
-        self.snap_map = dict()
+        self.snap_map = enas_utils.ObjectCache(manager.cache_ttl)
 
     def create(self, name, fs_name, pool_id, ckpt_size=None):
         fs_id = self.get_context('FileSystem').get_id(fs_name)
@@ -1214,6 +1221,8 @@ class MoverInterface(StorageObject):
             LOG.error(message)
             raise exception.EMCVnxXMLAPIError(err=message)
 
+        self._invalidate_mover(mover_name)
+
     def get(self, name, mover_name):
         # Maximum of 32 characters for mover interface name
         if len(name) > 32:
@@ -1263,6 +1272,8 @@ class MoverInterface(StorageObject):
             LOG.error(message)
             raise exception.EMCVnxXMLAPIError(err=message)
 
+        self._invalidate_mover(mover_name)
+
 
 @enas_utils.decorate_all_methods(enas_utils.log_enter_exit,
                                  debug_only=True)
@@ -1300,6 +1311,8 @@ class DNSDomain(StorageObject):
             LOG.error(message)
             raise exception.EMCVnxXMLAPIError(err=message)
 
+        self._invalidate_mover(mover_name)
+
     @utils.retry(exception.EMCVnxInvalidMoverID)
     def delete(self, mover_name, name):
         mover_id = self._get_mover_id(mover_name, False)
@@ -1324,6 +1337,9 @@ class DNSDomain(StorageObject):
             LOG.warning("Failed to delete DNS domain %(name)s. "
                         "Reason: %(err)s.",
                         {'name': name, 'err': response['problems']})
+            return
+
+        self._invalidate_mover(mover_name)
 
 
 @enas_utils.decorate_all_methods(enas_utils.log_enter_exit,
@@ -1331,7 +1347,7 @@ class DNSDomain(StorageObject):
 class CIFSServer(StorageObject):
     def __init__(self, conn, elt_maker, xml_parser, manager):
         super(CIFSServer, self).__init__(conn, elt_maker, xml_parser, manager)
-        self.cifs_server_map = dict()
+        self.cifs_server_map = enas_utils.ObjectCache(manager.cache_ttl)
 
     @utils.retry(exception.EMCVnxInvalidMoverID)
     def create(self, server_args):
@@ -1389,6 +1405,8 @@ class CIFSServer(StorageObject):
                 LOG.error(message)
                 raise exception.EMCVnxXMLAPIError(err=message)
 
+        self.cifs_server_map.pop(mover_name, None)
+
     @utils.retry(exception.EMCVnxInvalidMoverID)
     def get_all(self, mover_name, is_vdm=True):
         mover_id = self._get_mover_id(mover_name, is_vdm)
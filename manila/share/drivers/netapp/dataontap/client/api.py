@@ -371,6 +371,9 @@ class NaElement(object):
             self._element = name
         else:
             self._element = etree.Element(name)
+        # Wrapped children and their index by tag name, built lazily.
+        self._children = None
+        self._child_index = None
 
     def get_name(self):
         """Returns the tag name of the element."""
@@ -400,23 +403,75 @@ class NaElement(object):
             return
         raise ValueError(_("Can only add elements of type NaElement."))
 
+    def _get_children(self):
+        """Returns the cached list of wrapped children.
+
+        The cache is rebuilt when the number of children of the underlying
+        element changes, e.g. because a child was added through another
+        NaElement instance wrapping the same element.
+        """
+        if (self._children is None or
+                len(self._children) != len(self._element)):
+            self._children = [
+                NaElement(el) for el in self._element.iterchildren()]
+            self._child_index = None
+        return self._children
+
+    def _get_child_index(self):
+        """Returns dict mapping tag names to the first child having them.
+
+        Children are indexed both by their full and their local tag name,
+        so that namespaced and plain names can be looked up.
+        """
+        children = self._get_children()
+        if self._child_index is None:
+            index = {}
+            for child in children:
+                tag = child._element.tag
+                if not isinstance(tag, six.string_types):
+                    # Comments and processing instructions
+                    continue
+                index.setdefault(tag, child)
+                index.setdefault(tag.rpartition('}')[2], child)
+            self._child_index = index
+        return self._child_index
+
     def get_child_by_name(self, name):
         """Get the child element by the tag name."""
-        for child in self._element.iterchildren():
-            if child.tag == name or etree.QName(child.tag).localname == name:
-                return NaElement(child)
-        return None
+        return self._get_child_index().get(name)
 
     def get_child_content(self, name):
         """Get the content of the child."""
-        for child in self._element.iterchildren():
-            if child.tag == name or etree.QName(child.tag).localname == name:
-                return child.text
-        return None
+        child = self._get_child_index().get(name)
+        return child._element.text if child is not None else None
+
+    def get_child_by_path(self, path):
+        """Get the descendant element by '/' separated tag names."""
+        element = self
+        for name in path.split('/'):
+            element = element.get_child_by_name(name)
+            if element is None:
+                return None
+        return element
+
+    def get_child_content_by_path(self, path):
+        """Get the content of the descendant by '/' separated tag names."""
+        element = self.get_child_by_path(path)
+        return element.get_content() if element is not None else None
 
     def get_children(self):
         """Get the children for the element."""
-        return [NaElement(el) for el in self._element.iterchildren()]
+        return list(self._get_children())
+
+    def to_dict(self):
+        """Translates the children of the element to a dict.
+
+        Keys are local tag names. Children without children of their own
+        are translated to their content, other ones to nested dicts.
+        Children sharing the same name, like the records of an
+        attributes list, are gathered in a list.
+        """
+        return _element_to_dict(self._element)
 
     def has_attr(self, name):
         """Checks whether element has attribute."""
@@ -557,6 +612,20 @@ class NaElement(object):
             raise ValueError(_('Type cannot be converted into NaElement.'))
 
 
+def _element_to_dict(element):
+    result = {}
+    for child in element.iterchildren(tag=etree.Element):
+        name = child.tag.rpartition('}')[2]
+        value = _element_to_dict(child) if len(child) else child.text
+        if name not in result:
+            result[name] = value
+        elif isinstance(result[name], list):
+            result[name].append(value)
+        else:
+            result[name] = [result[name], value]
+    return result
+
+
 class NaApiError(Exception):
     """Base exception class for NetApp API errors."""
 
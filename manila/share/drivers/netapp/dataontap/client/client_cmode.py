@@ -37,6 +37,8 @@ LOG = log.getLogger(__name__)
 DELETED_PREFIX = 'deleted_manila_'
 DEFAULT_IPSPACE = 'Default'
 DEFAULT_MAX_PAGE_LENGTH = 50
+# Maximum number of volume names matched by a single volume-modify-iter query
+MAX_VOLUMES_PER_MODIFY = 500
 CUTOVER_ACTION_MAP = {
     'defer': 'defer_on_failure',
     'abort': 'abort_on_failure',
@@ -1070,6 +1072,44 @@ class NetAppCmodeClient(client_base.NetAppBaseClient):
             'aggr-ownership-attributes') or netapp_api.NaElement('none')
         return aggr_ownership_attrs.get_child_content('home-name')
 
+    @na_utils.trace
+    def get_nodes_for_aggregates(self, aggregate_names):
+        """Get home nodes for the specified aggregates.
+
+        Aggregates whose home node is unknown, most notably because the
+        API was sent to a Vserver LIF, are left out of the returned dict.
+        """
+
+        if not aggregate_names:
+            return {}
+
+        desired_attributes = {
+            'aggr-attributes': {
+                'aggregate-name': None,
+                'aggr-ownership-attributes': {
+                    'home-name': None,
+                },
+            },
+        }
+
+        try:
+            aggrs = self._get_aggregates(aggregate_names=aggregate_names,
+                                         desired_attributes=desired_attributes)
+        except netapp_api.NaApiError as e:
+            if e.code == netapp_api.EAPINOTFOUND:
+                return {}
+            else:
+                raise
+
+        aggr_node_map = {}
+        for aggr in aggrs:
+            node_name = aggr.get_child_content_by_path(
+                'aggr-ownership-attributes/home-name')
+            if node_name:
+                aggr_node_map[aggr.get_child_content(
+                    'aggregate-name')] = node_name
+        return aggr_node_map
+
     @na_utils.trace
     def get_cluster_aggregate_capacities(self, aggregate_names):
         """Calculates capacity of one or more aggregates.
@@ -1209,6 +1249,33 @@ class NetAppCmodeClient(client_base.NetAppBaseClient):
 
         return uuids
 
+    def get_performance_instance_uuids_for_nodes(self, object_name,
+                                                 node_names):
+        """Get UUIDs of performance instances for several cluster nodes."""
+
+        api_args = {
+            'objectname': object_name,
+            'query': {
+                'instance-info': {
+                    'uuid': '|'.join(
+                        node_name + ':*' for node_name in node_names),
+                }
+            }
+        }
+
+        result = self.send_iter_request('perf-object-instance-list-info-iter',
+                                        api_args)
+
+        uuids = []
+
+        instances = result.get_child_by_name(
+            'attributes-list') or netapp_api.NaElement('None')
+
+        for instance_info in instances.get_children():
+            uuids.append(instance_info.get_child_content('uuid'))
+
+        return uuids
+
     def get_performance_counter_info(self, object_name, counter_name):
         """Gets info about one or more Data ONTAP performance counters."""
 
@@ -1666,6 +1733,46 @@ class NetAppCmodeClient(client_base.NetAppBaseClient):
                     errors[0].get_child_content('error-code'),
                     errors[0].get_child_content('error-message'))
 
+    @na_utils.trace
+    def set_volumes_snapdir_access(self, volume_names, hide_snapdir):
+        """Set snapshot directory visibility of several volumes at once.
+
+        One volume-modify-iter call is issued per batch of volume names,
+        with a query matching all the volumes of the batch.
+        """
+        volume_names = sorted(set(volume_names))
+        for i in range(0, len(volume_names), MAX_VOLUMES_PER_MODIFY):
+            batch = volume_names[i:i + MAX_VOLUMES_PER_MODIFY]
+            api_args = {
+                'query': {
+                    'volume-attributes': {
+                        'volume-id-attributes': {
+                            'name': '|'.join(batch),
+                        },
+                    },
+                },
+                'attributes': {
+                    'volume-attributes': {
+                        'volume-snapshot-attributes': {
+                            'snapdir-access-enabled': six.text_type(
+                                not hide_snapdir).lower(),
+                        },
+                    },
+                },
+                'max-records': len(batch),
+                'continue-on-failure': 'true',
+            }
+            result = self.send_request('volume-modify-iter', api_args)
+            failures = result.get_child_content('num-failed')
+            if failures and int(failures) > 0:
+                failure_list = result.get_child_by_name(
+                    'failure-list') or netapp_api.NaElement('none')
+                errors = failure_list.get_children()
+                if errors:
+                    raise netapp_api.NaApiError(
+                        errors[0].get_child_content('error-code'),
+                        errors[0].get_child_content('error-message'))
+
     @na_utils.trace
     def set_volume_security_style(self, volume_name, security_style='unix'):
         """Set volume security style"""
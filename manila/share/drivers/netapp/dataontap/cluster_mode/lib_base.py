@@ -2320,11 +2320,26 @@ class NetAppCmodeFileStorageLibrary(object):
     def ensure_shares(self, context, shares):
         cfg_snapdir = self.configuration.netapp_reset_snapdir_visibility
         hide_snapdir = self.HIDE_SNAPDIR_CFG_MAP[cfg_snapdir.lower()]
-        if hide_snapdir is not None:
-            for share in shares:
-                share_server = share.get('share_server')
-                vserver, vserver_client = self._get_vserver(
-                    share_server=share_server)
-                share_name = self._get_backend_share_name(share['id'])
-                self._apply_snapdir_visibility(
-                    hide_snapdir, share_name, vserver_client)
+        if hide_snapdir is None:
+            return
+
+        # Resolve the vserver once per share server and modify all the
+        # volumes of a vserver with a single request.
+        vservers = {}
+        share_names = {}
+        for share in shares:
+            share_server_id = share.get('share_server_id')
+            if share_server_id not in vservers:
+                vservers[share_server_id] = self._get_vserver(
+                    share_server=share.get('share_server'))
+            vserver, vserver_client = vservers[share_server_id]
+            share_names.setdefault(vserver, (vserver_client, []))[1].append(
+                self._get_backend_share_name(share['id']))
+
+        for vserver, (vserver_client, names) in share_names.items():
+            LOG.debug('Applying snapshot visibility according to '
+                      'hide_snapdir value of %(hide_snapdir)s on '
+                      '%(count)d shares of vserver %(vserver)s.',
+                      {'hide_snapdir': hide_snapdir, 'count': len(names),
+                       'vserver': vserver})
+            vserver_client.set_volumes_snapdir_access(names, hide_snapdir)
@@ -16,8 +16,6 @@
 Performance metrics functions and cache for NetApp systems.
 """
 
-import copy
-
 from oslo_log import log as logging
 
 from manila import exception
@@ -36,6 +34,9 @@ class PerformanceLibrary(object):
         self.zapi_client = zapi_client
         self.performance_counters = {}
         self.pool_utilization = {}
+        # Aggregate home nodes and counter info kept between refreshes.
+        self.aggr_node_map = {}
+        self.counter_info = {}
         self._init_counter_info()
 
     def _init_counter_info(self):
@@ -77,14 +78,19 @@ class PerformanceLibrary(object):
                                                     aggregate_pools)
         node_names, aggr_node_map = self._get_nodes_for_aggregates(aggr_names)
 
+        # Get new performance counters of all nodes at once
+        nodes_counters = (
+            self._get_nodes_utilization_counters(node_names)
+            if node_names else {})
+
         # Update performance counter cache for each node
         node_utilization = {}
         for node_name in node_names:
             if node_name not in self.performance_counters:
                 self.performance_counters[node_name] = []
 
-            # Get new performance counters and save only the last 10
-            counters = self._get_node_utilization_counters(node_name)
+            # Save only the last 10 performance counters
+            counters = nodes_counters.get(node_name)
             if not counters:
                 continue
 
@@ -102,7 +108,7 @@ class PerformanceLibrary(object):
 
         # Update pool utilization map atomically
         pool_utilization = {}
-        all_pools = copy.deepcopy(flexvol_pools)
+        all_pools = dict(flexvol_pools)
         all_pools.update(aggregate_pools)
         for pool_name, pool_info in all_pools.items():
             aggr_name = pool_info.get('netapp_aggregate', 'unknown')
@@ -124,6 +130,8 @@ class PerformanceLibrary(object):
         """Change API client after a whole-backend failover event."""
 
         self.zapi_client = zapi_client
+        self.aggr_node_map = {}
+        self.counter_info = {}
         self.update_performance_cache(flexvol_pools, aggregate_pools)
 
     def _get_aggregates_for_pools(self, flexvol_pools, aggregate_pools):
@@ -137,18 +145,19 @@ class PerformanceLibrary(object):
         return list(aggr_names)
 
     def _get_nodes_for_aggregates(self, aggr_names):
-        """Get the cluster nodes that own the specified aggregates."""
+        """Get the cluster nodes that own the specified aggregates.
 
-        node_names = set()
-        aggr_node_map = {}
+        The home nodes of all the aggregates are looked up with a single API
+        call on each refresh, so that aggregates relocated to another node
+        are accounted to their new node.
+        """
 
-        for aggr_name in aggr_names:
-            node_name = self.zapi_client.get_node_for_aggregate(aggr_name)
-            if node_name:
-                node_names.add(node_name)
-                aggr_node_map[aggr_name] = node_name
+        aggr_names = [aggr_name for aggr_name in aggr_names if aggr_name]
+        self.aggr_node_map = (
+            self.zapi_client.get_nodes_for_aggregates(aggr_names)
+            if aggr_names else {})
 
-        return list(node_names), aggr_node_map
+        return list(set(self.aggr_node_map.values())), self.aggr_node_map
 
     def _get_node_utilization(self, counters_t1, counters_t2, node_name):
         """Get node utilization from two sets of performance counters."""
@@ -317,8 +326,8 @@ class PerformanceLibrary(object):
         """Get array labels and expand counter data array."""
 
         # Get array labels for counter value
-        counter_info = self.zapi_client.get_performance_counter_info(
-            object_name, counter_name)
+        counter_info = self._get_performance_counter_info(object_name,
+                                                          counter_name)
 
         array_labels = [counter_name + ':' + label.lower()
                         for label in counter_info['labels']]
@@ -328,6 +337,16 @@ class PerformanceLibrary(object):
         array_data = dict(zip(array_labels, array_values))
         counter.update(array_data)
 
+    def _get_performance_counter_info(self, object_name, counter_name):
+        """Get counter info, which does not change, from the cache."""
+
+        key = (object_name, counter_name)
+        if key not in self.counter_info:
+            self.counter_info[key] = (
+                self.zapi_client.get_performance_counter_info(
+                    object_name, counter_name))
+        return self.counter_info[key]
+
     def _get_base_counter_name(self, object_name, counter_name):
         """Get the name of the base counter for the specified counter."""
 
@@ -335,24 +354,37 @@ class PerformanceLibrary(object):
             object_name, counter_name)
         return counter_info['base-counter']
 
-    def _get_node_utilization_counters(self, node_name):
-        """Get all performance counters for calculating node utilization."""
+    def _get_nodes_utilization_counters(self, node_names):
+        """Get performance counters for calculating utilization of nodes.
+
+        The counters of all the nodes are requested at once, with one
+        multi-instance request per performance object.
+
+        :returns: dict mapping node names to lists of counters.
+        """
 
         try:
-            return (self._get_node_utilization_system_counters(node_name) +
-                    self._get_node_utilization_wafl_counters(node_name) +
-                    self._get_node_utilization_processor_counters(node_name))
+            counters = (
+                self._get_node_utilization_system_counters(node_names) +
+                self._get_node_utilization_wafl_counters(node_names) +
+                self._get_node_utilization_processor_counters(node_names))
         except netapp_api.NaApiError:
-            LOG.exception('Could not get utilization counters from node '
-                          '%s', node_name)
-            return None
+            LOG.exception('Could not get utilization counters from nodes '
+                          '%s', ', '.join(node_names))
+            return {}
+
+        nodes_counters = {}
+        for counter in counters:
+            nodes_counters.setdefault(counter['node-name'], []).append(
+                counter)
+        return nodes_counters
 
-    def _get_node_utilization_system_counters(self, node_name):
+    def _get_node_utilization_system_counters(self, node_names):
         """Get the system counters for calculating node utilization."""
 
         system_instance_uuids = (
-            self.zapi_client.get_performance_instance_uuids(
-                self.system_object_name, node_name))
+            self.zapi_client.get_performance_instance_uuids_for_nodes(
+                self.system_object_name, node_names))
 
         system_counter_names = [
             'avg_processor_busy',
@@ -367,11 +399,12 @@ class PerformanceLibrary(object):
 
         return system_counters
 
-    def _get_node_utilization_wafl_counters(self, node_name):
+    def _get_node_utilization_wafl_counters(self, node_names):
         """Get the WAFL counters for calculating node utilization."""
 
-        wafl_instance_uuids = self.zapi_client.get_performance_instance_uuids(
-            'wafl', node_name)
+        wafl_instance_uuids = (
+            self.zapi_client.get_performance_instance_uuids_for_nodes(
+                'wafl', node_names))
 
         wafl_counter_names = ['total_cp_msecs', 'cp_phase_times']
         wafl_counters = self.zapi_client.get_performance_counters(
@@ -385,12 +418,12 @@ class PerformanceLibrary(object):
 
         return wafl_counters
 
-    def _get_node_utilization_processor_counters(self, node_name):
+    def _get_node_utilization_processor_counters(self, node_names):
         """Get the processor counters for calculating node utilization."""
 
         processor_instance_uuids = (
-            self.zapi_client.get_performance_instance_uuids('processor',
-                                                            node_name))
+            self.zapi_client.get_performance_instance_uuids_for_nodes(
+                'processor', node_names))
 
         processor_counter_names = ['domain_busy', 'processor_elapsed_time']
         processor_counters = self.zapi_client.get_performance_counters(
@@ -19,6 +19,7 @@ Control Quobyte over its JSON RPC API.
 """
 
 import requests
+from requests import adapters
 from requests import auth
 from requests import codes
 
@@ -26,6 +27,7 @@ from oslo_log import log
 from oslo_serialization import jsonutils
 import six
 import six.moves.urllib.parse as urlparse
+from urllib3.util import retry
 
 from manila import exception
 from manila import utils
@@ -36,6 +38,12 @@ ERROR_ENOENT = 2
 ERROR_ENTITY_NOT_FOUND = -24
 ERROR_GARBAGE_ARGS = -3
 
+# Failed connection attempts are retried with an exponential backoff. The
+# JSON RPC calls are POST requests that are not idempotent, so requests that
+# may have reached the API service are never sent again.
+RETRIES = 3
+RETRY_BACKOFF_FACTOR = 0.5
+
 
 class JsonRpc(object):
 
@@ -57,54 +65,92 @@ class JsonRpc(object):
             user_credentials[0], user_credentials[1])
         self._key_file = key_file
         self._cert_file = cert_file
+        self._session = self._create_session()
 
-    @utils.synchronized('quobyte-request')
-    def call(self, method_name, user_parameters, expected_errors=None):
-        if expected_errors is None:
-            expected_errors = []
-        # prepare request
+    def _create_session(self):
+        """Create a keep-alive session used for all requests."""
+        session = requests.Session()
+        session.auth = self._credentials
+        if self._url_scheme == 'https':
+            session.verify = self._ca_file
+            if self._cert_file:
+                session.cert = (self._cert_file, self._key_file)
+        retries = retry.Retry(
+            total=RETRIES, connect=RETRIES, read=False, status=0,
+            backoff_factor=RETRY_BACKOFF_FACTOR)
+        session.mount(self._url_scheme + '://',
+                      adapters.HTTPAdapter(max_retries=retries))
+        return session
+
+    def _build_request(self, method_name, user_parameters):
         self._id += 1
         parameters = {'retry': 'INFINITELY'}  # Backend specific setting
         if user_parameters:
             parameters.update(user_parameters)
-        post_data = {
+        return {
             'jsonrpc': '2.0',
             'method': method_name,
             'params': parameters,
             'id': six.text_type(self._id),
         }
+
+    def _post(self, post_data):
         LOG.debug("Request payload to be send is: %s",
                   jsonutils.dumps(post_data))
 
-        # send request
-        if self._url_scheme == 'https':
-            if self._cert_file:
-                result = requests.post(url=self._url,
-                                       json=post_data,
-                                       auth=self._credentials,
-                                       verify=self._ca_file,
-                                       cert=(self._cert_file, self._key_file))
-            else:
-                result = requests.post(url=self._url,
-                                       json=post_data,
-                                       auth=self._credentials,
-                                       verify=self._ca_file)
-        else:
-            result = requests.post(url=self._url,
-                                   json=post_data,
-                                   auth=self._credentials)
+        result = self._session.post(url=self._url, json=post_data)
 
         # eval request response
         if result.status_code == codes['OK']:
             LOG.debug("Retrieved data from Quobyte backend: %s", result.text)
-            response = result.json()
-            return self._checked_for_application_error(response,
-                                                       expected_errors)
+            return result.json()
 
         # If things did not work out provide error info
         LOG.debug("Backend request resulted in error: %s", result.text)
         result.raise_for_status()
 
+    @utils.synchronized('quobyte-request')
+    def call(self, method_name, user_parameters, expected_errors=None):
+        if expected_errors is None:
+            expected_errors = []
+        response = self._post(
+            self._build_request(method_name, user_parameters))
+        if response is not None:
+            return self._checked_for_application_error(response,
+                                                       expected_errors)
+
+    @utils.synchronized('quobyte-request')
+    def call_many(self, calls, expected_errors=None):
+        """Send several calls as a single JSON RPC batch request.
+
+        :param calls: list of (method_name, user_parameters) tuples.
+        :param expected_errors: error codes for which None is returned
+            as the result of the failed call instead of raising.
+        :returns: list of the call results, in the order of calls.
+        """
+        if expected_errors is None:
+            expected_errors = []
+        if not calls:
+            return []
+        requests_data = [self._build_request(method_name, user_parameters)
+                         for method_name, user_parameters in calls]
+        response = self._post(requests_data)
+        if not isinstance(response, list):
+            # The whole batch was rejected, e.g. because it is malformed.
+            self._checked_for_application_error(response, expected_errors)
+            raise exception.QBException(
+                "Unexpected response to a batch request: %s" % response)
+
+        responses = {r.get('id'): r for r in response}
+        results = []
+        for request in requests_data:
+            if request['id'] not in responses:
+                raise exception.QBException(
+                    "No response to the batched %s call." % request['method'])
+            results.append(self._checked_for_application_error(
+                responses[request['id']], expected_errors))
+        return results
+
     def _checked_for_application_error(self, result, expected_errors=None):
         if expected_errors is None:
             expected_errors = []
@@ -35,6 +35,10 @@ from manila.share.drivers.quobyte import jsonrpc
 
 LOG = log.getLogger(__name__)
 
+# Number of shares resolved and exported by each batched RPC of
+# ensure_shares.
+ENSURE_SHARES_BATCH_SIZE = 100
+
 quobyte_manila_share_opts = [
     cfg.StrOpt('quobyte_api_url',
                help='URL of the Quobyte API server (http or https)'),
@@ -84,9 +88,11 @@ class QuobyteShareDriver(driver.ExecuteMixin, driver.ShareDriver,):
         1.2.5   - Fixed two quota handling bugs
         1.2.6   - Fixed volume resize and jsonrpc code style bugs
         1.2.7   - Add quobyte_export_path option
+        1.2.8   - Use a keep-alive RPC session and batched RPCs for stats
+                  and ensure_shares()
     """
 
-    DRIVER_VERSION = '1.2.7'
+    DRIVER_VERSION = '1.2.8'
 
     def __init__(self, *args, **kwargs):
         super(QuobyteShareDriver, self).__init__(False, *args, **kwargs)
@@ -146,7 +152,12 @@ class QuobyteShareDriver(driver.ExecuteMixin, driver.ShareDriver,):
         super(QuobyteShareDriver, self)._update_share_stats(data)
 
     def _get_capacities(self):
-        result = self.rpc.call('getSystemStatistics', {})
+        result, volume_config = self.rpc.call_many([
+            ('getSystemStatistics', {}),
+            ('getEffectiveVolumeConfiguration',
+             {'configuration_name':
+              self.configuration.quobyte_volume_configuration}),
+        ])
 
         total = float(result['total_physical_capacity'])
         used = float(result['total_physical_usage'])
@@ -156,17 +167,20 @@ class QuobyteShareDriver(driver.ExecuteMixin, driver.ShareDriver,):
         free = total - used
         if free < 0:
             free = 0  # no space available
-        free_replicated = free / self._get_qb_replication_factor()
+        free_replicated = free / self._get_qb_replication_factor(
+            volume_config)
         # floor numbers to nine digits (bytes)
         total = math.floor((total / units.Gi) * units.G) / units.G
         free = math.floor((free_replicated / units.Gi) * units.G) / units.G
 
         return total, free
 
-    def _get_qb_replication_factor(self):
-        result = self.rpc.call('getEffectiveVolumeConfiguration',
-                               {'configuration_name': self.
-                                configuration.quobyte_volume_configuration})
+    def _get_qb_replication_factor(self, result=None):
+        if result is None:
+            result = self.rpc.call(
+                'getEffectiveVolumeConfiguration',
+                {'configuration_name': self.
+                 configuration.quobyte_volume_configuration})
         return int(result['configuration']['volume_metadata_configuration']
                    ['replication_factor'])
 
@@ -300,6 +314,47 @@ class QuobyteShareDriver(driver.ExecuteMixin, driver.ShareDriver,):
 
         return self._build_share_export_string(result)
 
+    def ensure_shares(self, context, shares):
+        """Invoked to ensure that shares are exported.
+
+        Resolves the volumes of the shares with batched RPCs and re-exports
+        them with further ones, ENSURE_SHARES_BATCH_SIZE shares at a time.
+        Shares whose volume cannot be found are set to error.
+        """
+        updates = {}
+        for start in range(0, len(shares), ENSURE_SHARES_BATCH_SIZE):
+            updates.update(self._ensure_shares_batch(
+                shares[start:start + ENSURE_SHARES_BATCH_SIZE]))
+        return updates
+
+    def _ensure_shares_batch(self, shares):
+        resolved = self.rpc.call_many(
+            [('resolveVolumeName', dict(volume_name=share['name'],
+                                        tenant_domain=share['project_id']))
+             for share in shares],
+            expected_errors=[jsonrpc.ERROR_ENOENT,
+                             jsonrpc.ERROR_ENTITY_NOT_FOUND])
+
+        updates = {}
+        found = []
+        for share, result in zip(shares, resolved):
+            if result:
+                found.append((share, result['volume_uuid']))
+            else:
+                LOG.error("Could not find the Quobyte volume of share %s.",
+                          share['id'])
+                updates[share['id']] = {'status': constants.STATUS_ERROR}
+
+        LOG.debug("Ensuring %s Quobyte shares", len(found))
+        exported = self.rpc.call_many(
+            [('exportVolume', dict(volume_uuid=volume_uuid, protocol='NFS'))
+             for share, volume_uuid in found])
+
+        for (share, volume_uuid), result in zip(found, exported):
+            updates[share['id']] = {
+                'export_locations': self._build_share_export_string(result)}
+        return updates
+
     def _allow_access(self, context, share, access, share_server=None):
         """Allow access to a share."""
         if access['access_type'] != 'ip':
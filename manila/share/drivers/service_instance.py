@@ -989,26 +989,20 @@ class NeutronNetworkHelper(BaseNetworkhelper):
 
     def _remove_outdated_interfaces(self, device):
         """Finds and removes unused network device."""
-        device_cidr_set = self._get_set_of_device_cidrs(device)
-        for dev in ip_lib.IPWrapper().get_devices():
-            if dev.name != device.name and dev.name[:3] == device.name[:3]:
-                cidr_set = self._get_set_of_device_cidrs(dev)
+        # NOTE: a single dump of the addresses of all the devices is used
+        # instead of listing the addresses of each device separately.
+        devices = ip_lib.IPWrapper().get_devices_addresses()
+        device_cidr_set = self._get_set_of_cidrs(
+            devices.get(device.name, []))
+        for name, addr_list in devices.items():
+            if name != device.name and name[:3] == device.name[:3]:
+                cidr_set = self._get_set_of_cidrs(addr_list)
                 if device_cidr_set & cidr_set:
-                    self.vif_driver.unplug(dev.name)
+                    self.vif_driver.unplug(name)
 
-    def _get_set_of_device_cidrs(self, device):
+    @staticmethod
+    def _get_set_of_cidrs(addr_list):
         cidrs = set()
-        addr_list = []
-        try:
-            # NOTE(ganso): I could call ip_lib.device_exists here, but since
-            # this is a concurrency problem, it would not fix the problem.
-            addr_list = device.addr.list()
-        except Exception as e:
-            if 'does not exist' in six.text_type(e):
-                LOG.warning(
-                    "Device %s does not exist anymore.", device.name)
-            else:
-                raise
         for addr in addr_list:
             if addr['ip_version'] == 4:
                 cidrs.add(six.text_type(netaddr.IPNetwork(addr['cidr']).cidr))
@@ -1103,8 +1097,13 @@ class NeutronNetworkHelper(BaseNetworkhelper):
     @utils.synchronized(
         "service_instance_get_all_service_subnets", external=True)
     def _get_all_service_subnets(self):
-        service_network = self.neutron_api.get_network(self.service_network_id)
+        # NOTE: Service subnets are claimed by renaming them, possibly by
+        # other manila-share processes, so they are never read from the
+        # metadata cache.
+        service_network = self.neutron_api.get_network(
+            self.service_network_id, use_cache=False)
         subnets = []
         for subnet_id in service_network['subnets']:
-            subnets.append(self.neutron_api.get_subnet(subnet_id))
+            subnets.append(
+                self.neutron_api.get_subnet(subnet_id, use_cache=False))
         return subnets
@@ -20,6 +20,7 @@ and exports them as shares.
 
 import math
 import os
+import tempfile
 import time
 
 from oslo_config import cfg
@@ -27,6 +28,7 @@ from oslo_log import log
 from oslo_utils import importutils
 from oslo_utils import strutils
 from oslo_utils import timeutils
+from oslo_utils import units
 
 from manila.common import constants
 from manila import exception
@@ -117,12 +119,56 @@ zfsonlinux_opts = [
         required=True,
         default="tmp_snapshot_for_share_migration_",
         help="Set snapshot prefix for usage in ZFS migration. Required."),
+    cfg.StrOpt(
+        "zfs_send_compression",
+        default="none",
+        choices=["none", "gzip", "lz4", "zstd"],
+        help="Compression applied to the 'zfs send' stream while it is "
+             "transferred to another host for share replication and "
+             "migration. The chosen utility should be installed on all "
+             "ZFS storage hosts. Optional."),
+    cfg.BoolOpt(
+        "zfs_send_large_blocks",
+        default=False,
+        help="Send blocks larger than 128 KiB as they are, with "
+             "'zfs send -L'. Receiving pools should have the 'large_blocks' "
+             "feature enabled. Optional."),
+    cfg.BoolOpt(
+        "zfs_send_embedded_data",
+        default=False,
+        help="Send embedded data blocks as they are, with 'zfs send -e'. "
+             "Receiving pools should have the 'embedded_data' feature "
+             "enabled. Optional."),
+    cfg.IntOpt(
+        "zfs_send_buffer_size",
+        default=0,
+        min=0,
+        help="Size in MiB of the memory buffers added with 'mbuffer' on "
+             "both ends of the 'zfs send' stream transferred to another "
+             "host. 0 disables buffering. Optional."),
+    cfg.BoolOpt(
+        "zfs_receive_resumable",
+        default=False,
+        help="Receive streams from other hosts with 'zfs receive -s', so "
+             "that interrupted transfers are continued from the receive "
+             "resume token with 'zfs send -t' instead of starting over. "
+             "Streams are sent without the -R and -D flags then, as they "
+             "cannot be resumed. Optional."),
 ]
 
 CONF = cfg.CONF
 CONF.register_opts(zfsonlinux_opts)
 LOG = log.getLogger(__name__)
 
+# Commands compressing and decompressing 'zfs send' streams.
+SEND_COMPRESSION_CMDS = {
+    'gzip': (['gzip', '-c'], ['gzip', '-dc']),
+    'lz4': (['lz4', '-c'], ['lz4', '-dc']),
+    'zstd': (['zstd', '-c'], ['zstd', '-dc']),
+}
+# How many times an interrupted transfer is continued from its resume token.
+SEND_RESUME_ATTEMPTS = 3
+
 
 def ensure_share_server_not_provided(f):
 
@@ -350,18 +396,21 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
     def _get_pools_info(self):
         """Returns info about all pools used by backend."""
         pools = []
+        zpools_info = self.get_zpools_info(self.zpool_list)
         for zpool in self.zpool_list:
-            free_size = self.get_zpool_option(zpool, 'free')
-            free_size = utils.translate_string_size_to_float(free_size)
-            total_size = self.get_zpool_option(zpool, 'size')
-            total_size = utils.translate_string_size_to_float(total_size)
+            info = zpools_info[zpool]
             pool = {
                 'pool_name': zpool,
-                'total_capacity_gb': float(total_size),
-                'free_capacity_gb': float(free_size),
+                'total_capacity_gb': float(info['size']) / units.Gi,
+                'free_capacity_gb': float(info['free']) / units.Gi,
                 'reserved_percentage':
                     self.configuration.reserved_share_percentage,
             }
+            # Published for usage in filter and goodness functions.
+            if info['fragmentation'] is not None:
+                pool['fragmentation_percent'] = info['fragmentation']
+            if info['dedupratio'] is not None:
+                pool['dedupe_ratio'] = info['dedupratio']
             pool.update(self.common_capabilities)
             if self.configuration.replication_domain:
                 pool['replication_type'] = 'readable'
@@ -896,6 +945,144 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
             snapshot_tag.replace('-', '_').replace('.', '_').replace(':', '_'))
         return snapshot_tag
 
+    def _get_send_receive_cmd(self, src_snapshot_name, dst_dataset_name,
+                              ssh_to_dst_cmd, previous_snapshot_tag=None,
+                              force_receive=False, resume_token=None,
+                              progress_file=None):
+        """Returns args of pipeline sending snapshot to another host.
+
+        The pipeline is expected to be run by a shell on the source host.
+        Stream compression and buffering stages are added according to
+        the backend configuration.
+        """
+        send_flags = '-v'
+        if progress_file:
+            send_flags += 'P'
+        if self.configuration.zfs_send_large_blocks:
+            send_flags += 'L'
+        if self.configuration.zfs_send_embedded_data:
+            send_flags += 'e'
+        if resume_token:
+            send = ['sudo', 'zfs', 'send', send_flags, '-t', resume_token]
+        else:
+            if not self.configuration.zfs_receive_resumable:
+                send_flags += 'DR'
+            if previous_snapshot_tag:
+                send = ['sudo', 'zfs', 'send', send_flags + 'I',
+                        previous_snapshot_tag, src_snapshot_name]
+            else:
+                send = ['sudo', 'zfs', 'send', send_flags, src_snapshot_name]
+        if progress_file:
+            send.append('2>%s' % progress_file)
+
+        receive_flags = '-v'
+        if force_receive:
+            receive_flags += 'F'
+        if self.configuration.zfs_receive_resumable:
+            receive_flags += 's'
+        receive = ['sudo', 'zfs', 'receive', receive_flags, dst_dataset_name]
+
+        src_stages, dst_stages = [send], [receive]
+        compression = SEND_COMPRESSION_CMDS.get(
+            self.configuration.zfs_send_compression)
+        if compression:
+            src_stages.append(compression[0])
+            dst_stages.insert(0, compression[1])
+        if self.configuration.zfs_send_buffer_size:
+            buffer_cmd = ['mbuffer', '-q', '-m',
+                          '%dM' % self.configuration.zfs_send_buffer_size]
+            src_stages.append(buffer_cmd)
+            dst_stages.insert(0, buffer_cmd)
+
+        cmd = []
+        for stage in src_stages:
+            cmd.extend(stage + ['|'])
+        cmd.extend(['ssh', ssh_to_dst_cmd])
+        if len(dst_stages) == 1:
+            cmd.extend(receive)
+        else:
+            # Pipeline on the destination host is run by its own shell.
+            cmd.append('"%s"' % ' | '.join(
+                ' '.join(stage) for stage in dst_stages))
+        return cmd
+
+    def _get_receive_resume_token(self, dataset_name, ssh_cmd):
+        """Returns resume token of interrupted receive into dataset."""
+        try:
+            out, err = self.execute(
+                'ssh', ssh_cmd,
+                'sudo', 'zfs', 'get', '-H', '-o', 'value',
+                'receive_resume_token', dataset_name,
+            )
+        except exception.ProcessExecutionError as e:
+            LOG.debug("Failed to get receive resume token of dataset "
+                      "'%(name)s': %(e)s", {'name': dataset_name, 'e': e})
+            return None
+        token = out.strip()
+        return token if token not in ('', '-') else None
+
+    def _get_latest_snapshot_tag(self, dataset_name, ssh_cmd):
+        """Returns tag of the most recent snapshot of dataset."""
+        out, err = self.execute(
+            'ssh', ssh_cmd,
+            'sudo', 'zfs', 'list', '-H', '-o', 'name', '-t', 'snapshot',
+            '-s', 'createtxg', '-d', '1', dataset_name,
+        )
+        names = out.split()
+        return names[-1].split('@')[-1] if names else None
+
+    def _send_snapshot(self, ssh_to_src_cmd, ssh_to_dst_cmd,
+                       src_snapshot_name, dst_dataset_name,
+                       previous_snapshot_tag=None, force_receive=False):
+        """Sends snapshot from source host to dataset on destination host.
+
+        If resumable receive is enabled, interrupted transfers are continued
+        from the receive resume token of the destination dataset.
+        """
+        cmd = self._get_send_receive_cmd(
+            src_snapshot_name, dst_dataset_name, ssh_to_dst_cmd,
+            previous_snapshot_tag=previous_snapshot_tag,
+            force_receive=force_receive)
+        resumed = 0
+        is_resume = False
+        while True:
+            try:
+                out, err = self.execute('ssh', ssh_to_src_cmd, *cmd)
+            except exception.ProcessExecutionError as e:
+                if (not self.configuration.zfs_receive_resumable or
+                        resumed >= SEND_RESUME_ATTEMPTS):
+                    raise
+                resume_token = self._get_receive_resume_token(
+                    dst_dataset_name, ssh_to_dst_cmd)
+                if not resume_token:
+                    raise
+                resumed += 1
+                LOG.warning(
+                    "Transfer of snapshot '%(snapshot)s' to dataset "
+                    "'%(dataset)s' has been interrupted, resuming it. "
+                    "Error: %(e)s",
+                    {'snapshot': src_snapshot_name,
+                     'dataset': dst_dataset_name, 'e': e})
+                cmd = self._get_send_receive_cmd(
+                    src_snapshot_name, dst_dataset_name, ssh_to_dst_cmd,
+                    force_receive=force_receive, resume_token=resume_token)
+                is_resume = True
+                continue
+
+            if is_resume:
+                # Resumed stream contains only the snapshot that was being
+                # received, send the rest of the incremental stream.
+                latest_tag = self._get_latest_snapshot_tag(
+                    dst_dataset_name, ssh_to_dst_cmd)
+                if latest_tag != src_snapshot_name.split('@')[-1]:
+                    cmd = self._get_send_receive_cmd(
+                        src_snapshot_name, dst_dataset_name, ssh_to_dst_cmd,
+                        previous_snapshot_tag=latest_tag,
+                        force_receive=force_receive)
+                    is_resume = False
+                    continue
+            return out, err
+
     @ensure_share_server_not_provided
     def create_replica(self, context, replica_list, new_replica,
                        access_rules, replica_snapshots, share_server=None):
@@ -941,12 +1128,8 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
         )
 
         # Send/receive temporary snapshot
-        out, err = self.execute(
-            'ssh', ssh_to_src_cmd,
-            'sudo', 'zfs', 'send', '-vDR', src_snapshot_name, '|',
-            'ssh', ssh_cmd,
-            'sudo', 'zfs', 'receive', '-v', dst_dataset_name,
-        )
+        out, err = self._send_snapshot(
+            ssh_to_src_cmd, ssh_cmd, src_snapshot_name, dst_dataset_name)
         msg = ("Info about replica '%(replica_id)s' creation is following: "
                "\n%(out)s")
         LOG.debug(msg, {'replica_id': new_replica['id'], 'out': out})
@@ -1012,18 +1195,20 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
     def _update_replica_state(self, context, replica_list, replica,
                               replica_snapshots=None, access_rules=None):
         active_replica = self._get_active_replica(replica_list)
-        src_dataset_name = self.private_storage.get(
-            active_replica['id'], 'dataset_name')
-        ssh_to_src_cmd = self.private_storage.get(
-            active_replica['id'], 'ssh_cmd')
-        ssh_to_dst_cmd = self.private_storage.get(
-            replica['id'], 'ssh_cmd')
-        dst_dataset_name = self.private_storage.get(
-            replica['id'], 'dataset_name')
+        replica_ids = [repl['id'] for repl in replica_list]
+        if replica['id'] not in replica_ids:
+            replica_ids.append(replica['id'])
+        private_data = self.private_storage.get_by_entities(
+            replica_ids, ['dataset_name', 'ssh_cmd', 'repl_snapshot_tag'])
+        src_data = private_data[active_replica['id']]
+        dst_data = private_data[replica['id']]
+        src_dataset_name = src_data.get('dataset_name')
+        ssh_to_src_cmd = src_data.get('ssh_cmd')
+        ssh_to_dst_cmd = dst_data.get('ssh_cmd')
+        dst_dataset_name = dst_data.get('dataset_name')
 
         # Create temporary snapshot
-        previous_snapshot_tag = self.private_storage.get(
-            replica['id'], 'repl_snapshot_tag')
+        previous_snapshot_tag = dst_data.get('repl_snapshot_tag')
         snapshot_tag = self._get_replication_snapshot_tag(replica)
         src_snapshot_name = src_dataset_name + '@' + snapshot_tag
         self.execute(
@@ -1035,13 +1220,10 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
         self.zfs('set', 'readonly=on', dst_dataset_name)
 
         # Send/receive diff between previous snapshot and last one
-        out, err = self.execute(
-            'ssh', ssh_to_src_cmd,
-            'sudo', 'zfs', 'send', '-vDRI',
-            previous_snapshot_tag, src_snapshot_name, '|',
-            'ssh', ssh_to_dst_cmd,
-            'sudo', 'zfs', 'receive', '-vF', dst_dataset_name,
-        )
+        out, err = self._send_snapshot(
+            ssh_to_src_cmd, ssh_to_dst_cmd, src_snapshot_name,
+            dst_dataset_name, previous_snapshot_tag=previous_snapshot_tag,
+            force_receive=True)
         msg = ("Info about last replica '%(replica_id)s' sync is following: "
                "\n%(out)s")
         LOG.debug(msg, {'replica_id': replica['id'], 'out': out})
@@ -1053,38 +1235,40 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
         self.private_storage.update(
             replica['id'], {'repl_snapshot_tag': snapshot_tag})
 
-        # Destroy all snapshots on dst filesystem except referenced ones.
-        snap_references = set()
-        for repl in replica_list:
-            snap_references.add(
-                self.private_storage.get(repl['id'], 'repl_snapshot_tag'))
+        # Re-read the tags just before pruning, other replicas of the share
+        # may have been synced in the meantime.
+        snap_references = set(
+            data.get('repl_snapshot_tag') for data in
+            self.private_storage.get_by_entities(
+                replica_ids, 'repl_snapshot_tag').values())
+        snap_references.add(snapshot_tag)
 
-        dst_pool_name = dst_dataset_name.split('/')[0]
-        out, err = self.zfs('list', '-r', '-t', 'snapshot', dst_pool_name)
-        data = self.parse_zfs_answer(out)
-        for datum in data:
-            if (dst_dataset_name in datum['NAME'] and
-                    '@' + self.replica_snapshot_prefix in datum['NAME'] and
-                    datum['NAME'].split('@')[-1] not in snap_references):
-                self._delete_dataset_or_snapshot_with_retry(datum['NAME'])
+        # Destroy all snapshots on dst filesystem except referenced ones.
+        out, err = self.zfs(
+            'list', '-H', '-o', 'name', '-t', 'snapshot', '-d', '1',
+            dst_dataset_name)
+        stale_tags = self._get_stale_snapshot_tags(
+            out, self.replica_snapshot_prefix, snap_references)
+        if stale_tags:
+            self.zfs_with_retry(
+                'destroy', '-f',
+                dst_dataset_name + '@' + ','.join(stale_tags))
 
         # Destroy all snapshots on src filesystem except referenced ones.
-        src_pool_name = src_snapshot_name.split('/')[0]
         out, err = self.execute(
             'ssh', ssh_to_src_cmd,
-            'sudo', 'zfs', 'list', '-r', '-t', 'snapshot', src_pool_name,
+            'sudo', 'zfs', 'list', '-H', '-o', 'name', '-t', 'snapshot',
+            '-d', '1', src_dataset_name,
         )
-        data = self.parse_zfs_answer(out)
-        full_src_snapshot_prefix = (
-            src_dataset_name + '@' +
-            self._get_replication_snapshot_prefix(replica))
-        for datum in data:
-            if (full_src_snapshot_prefix in datum['NAME'] and
-                    datum['NAME'].split('@')[-1] not in snap_references):
-                self.execute_with_retry(
-                    'ssh', ssh_to_src_cmd,
-                    'sudo', 'zfs', 'destroy', '-f', datum['NAME'],
-                )
+        stale_tags = self._get_stale_snapshot_tags(
+            out, self._get_replication_snapshot_prefix(replica),
+            snap_references)
+        if stale_tags:
+            self.execute_with_retry(
+                'ssh', ssh_to_src_cmd,
+                'sudo', 'zfs', 'destroy', '-f',
+                src_dataset_name + '@' + ','.join(stale_tags),
+            )
 
         if access_rules:
             # Apply access rules from original share
@@ -1099,6 +1283,21 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
         # Return results
         return constants.REPLICA_STATE_IN_SYNC
 
+    @staticmethod
+    def _get_stale_snapshot_tags(out, prefix, snap_references):
+        """Returns tags of listed snapshots not referenced by any replica.
+
+        :param out: output of 'zfs list -H -o name -t snapshot' command.
+        :param prefix: prefix of the snapshot tags that may be destroyed.
+        :param snap_references: set of snapshot tags that should be kept.
+        """
+        stale_tags = []
+        for name in out.split():
+            tag = name.split('@')[-1]
+            if tag.startswith(prefix) and tag not in snap_references:
+                stale_tags.append(tag)
+        return stale_tags
+
     @ensure_share_server_not_provided
     def promote_replica(self, context, replica_list, replica, access_rules,
                         share_server=None):
@@ -1147,13 +1346,11 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
 
                 try:
                     # Send/receive diff between previous snapshot and last one
-                    out, err = self.execute(
-                        'ssh', ssh_to_src_cmd,
-                        'sudo', 'zfs', 'send', '-vDRI',
-                        previous_snapshot_tag, src_snapshot_name, '|',
-                        'ssh', ssh_to_dst_cmd,
-                        'sudo', 'zfs', 'receive', '-vF', dataset_name,
-                    )
+                    out, err = self._send_snapshot(
+                        ssh_to_src_cmd, ssh_to_dst_cmd, src_snapshot_name,
+                        dataset_name,
+                        previous_snapshot_tag=previous_snapshot_tag,
+                        force_receive=True)
                 except exception.ProcessExecutionError as e:
                     LOG.warning("Failed to sync replica %(id)s. %(e)s",
                                 {'id': repl['id'], 'e': e})
@@ -1201,13 +1398,11 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
 
                 try:
                     # Send/receive diff between previous snapshot and last one
-                    out, err = self.execute(
-                        'ssh', ssh_to_src_cmd,
-                        'sudo', 'zfs', 'send', '-vDRI',
-                        previous_snapshot_tag, src_snapshot_name, '|',
-                        'ssh', ssh_to_dst_cmd,
-                        'sudo', 'zfs', 'receive', '-vF', dataset_name,
-                    )
+                    out, err = self._send_snapshot(
+                        ssh_to_src_cmd, ssh_to_dst_cmd, src_snapshot_name,
+                        dataset_name,
+                        previous_snapshot_tag=previous_snapshot_tag,
+                        force_receive=True)
                 except exception.ProcessExecutionError as e:
                     LOG.warning("Failed to sync replica %(id)s. %(e)s",
                                 {'id': repl['id'], 'e': e})
@@ -1289,13 +1484,11 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
 
             try:
                 # Send/receive diff between previous snapshot and last one
-                out, err = self.execute(
-                    'ssh', ssh_to_src_cmd,
-                    'sudo', 'zfs', 'send', '-vDRI',
-                    previous_snapshot_tag, src_snapshot_name, '|',
-                    'ssh', ssh_to_dst_cmd,
-                    'sudo', 'zfs', 'receive', '-vF', dst_dataset_name,
-                )
+                out, err = self._send_snapshot(
+                    ssh_to_src_cmd, ssh_to_dst_cmd, src_snapshot_name,
+                    dst_dataset_name,
+                    previous_snapshot_tag=previous_snapshot_tag,
+                    force_receive=True)
             except exception.ProcessExecutionError as e:
                 LOG.warning(
                     "Failed to sync snapshot instance %(id)s. %(e)s",
@@ -1428,6 +1621,10 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
             }
         )
 
+        filename = dst_dataset_name.replace('/', '_')
+        progress_file = os.path.join(
+            tempfile.gettempdir(), '%s.progress' % filename)
+
         # Save valuable data to DB
         self.private_storage.update(source_share['id'], {
             'migr_snapshot_tag': snapshot_tag,
@@ -1439,19 +1636,20 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
             'pool_name': share_utils.extract_host(
                 destination_share['host'], level='pool'),
             'migr_snapshot_tag': snapshot_tag,
+            'migr_progress_file': progress_file,
         })
 
         # Create temporary snapshot on src host.
         self.execute('sudo', 'zfs', 'snapshot', src_snapshot_name)
 
         # Send/receive temporary snapshot
-        cmd = (
-            'ssh ' + ssh_cmd + ' '
-            'sudo zfs send -vDR ' + src_snapshot_name + ' '
-            '| ssh ' + remote_ssh_cmd + ' '
-            'sudo zfs receive -v ' + dst_dataset_name
-        )
-        filename = dst_dataset_name.replace('/', '_')
+        cmd = self._get_send_receive_cmd(
+            src_snapshot_name, dst_dataset_name, remote_ssh_cmd,
+            progress_file=progress_file)
+        self._run_migration_script(ssh_cmd, cmd, filename)
+
+    def _run_migration_script(self, ssh_cmd, cmd, filename):
+        cmd = 'ssh ' + ssh_cmd + ' ' + ' '.join(cmd)
         with utils.tempdir() as tmpdir:
             tmpfilename = os.path.join(tmpdir, '%s.sh' % filename)
             with open(tmpfilename, "w") as migr_script:
@@ -1468,11 +1666,38 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
 
         snapshot_tag = self.private_storage.get(
             destination_share['id'], 'migr_snapshot_tag')
+        resume_token = self.private_storage.get(
+            destination_share['id'], 'migr_resume_token')
 
         out, err = self.execute('ps', 'aux')
-        if not '@%s' % snapshot_tag in out:
+        if not ('@%s' % snapshot_tag in out or
+                (resume_token and resume_token in out)):
             dst_dataset_name = self.private_storage.get(
                 destination_share['id'], 'dataset_name')
+            if self.configuration.zfs_receive_resumable:
+                remote_ssh_cmd = self.private_storage.get(
+                    destination_share['id'], 'ssh_cmd')
+                resume_token = self._get_receive_resume_token(
+                    dst_dataset_name, remote_ssh_cmd)
+                if resume_token:
+                    LOG.warning(
+                        "Migration of share instance '%s' has been "
+                        "interrupted, resuming it.", destination_share['id'])
+                    self.private_storage.update(destination_share['id'], {
+                        'migr_resume_token': resume_token,
+                    })
+                    ssh_cmd = '%(username)s@%(host)s' % {
+                        'username': self.configuration.zfs_ssh_username,
+                        'host': self.configuration.zfs_service_ip,
+                    }
+                    cmd = self._get_send_receive_cmd(
+                        None, dst_dataset_name, remote_ssh_cmd,
+                        resume_token=resume_token,
+                        progress_file=self.private_storage.get(
+                            destination_share['id'], 'migr_progress_file'))
+                    self._run_migration_script(
+                        ssh_cmd, cmd, dst_dataset_name.replace('/', '_'))
+                    return
             try:
                 self.execute(
                     'sudo', 'zfs', 'get', 'quota', dst_dataset_name,
@@ -1485,6 +1710,104 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
                     'Migration process is absent and dst dataset '
                     'returned following error: %s') % e)
 
+    @ensure_share_server_not_provided
+    def migration_get_progress(
+            self, context, source_share, destination_share, source_snapshots,
+            snapshot_mappings, share_server=None,
+            destination_share_server=None):
+        """Is called to get progress of share migration."""
+
+        progress_file = self.private_storage.get(
+            destination_share['id'], 'migr_progress_file')
+        try:
+            out, err = self.execute('cat', progress_file)
+        except exception.ProcessExecutionError as e:
+            LOG.debug("Progress of migration of share instance '%(id)s' "
+                      "is unknown: %(e)s",
+                      {'id': destination_share['id'], 'e': e})
+            return {'total_progress': 0}
+        return self._parse_send_progress(out)
+
+    @staticmethod
+    def _parse_send_progress(out):
+        """Parses progress written by 'zfs send -vP' to its stderr.
+
+        Besides the total progress in percents, returns the amount of sent
+        bytes and the average throughput in bytes per second. A replication
+        stream sends several snapshots one after the other, and the byte
+        counters of 'zfs send' restart with each of them.
+        """
+        # The output looks like this, with tab separated fields: one line
+        # per snapshot of the stream with its estimated size, the estimated
+        # size of the whole stream, then the time, the bytes sent for the
+        # current snapshot and its name, once per second:
+        #
+        #   full         pool/share@snap1                  10240
+        #   incremental  snap1           pool/share@snap2  4096
+        #   size         14336
+        #   13:04:31     6144            pool/share@snap1
+        #   13:04:32     2048            pool/share@snap2
+        total_size = 0
+        # Snapshots of the stream in the order they are sent, along with
+        # their estimated sizes.
+        streams = []
+        samples = []
+        for line in out.splitlines():
+            fields = line.split()
+            if len(fields) == 2 and fields[0] == 'size':
+                total_size = int(fields[1])
+            elif (len(fields) == 3 and fields[0] == 'full' and
+                    fields[2].isdigit()):
+                streams.append((fields[1], int(fields[2])))
+            elif (len(fields) == 4 and fields[0] == 'incremental' and
+                    fields[3].isdigit()):
+                streams.append((fields[2], int(fields[3])))
+            elif (len(fields) == 3 and fields[0].count(':') == 2 and
+                    fields[1].isdigit()):
+                hours, minutes, seconds = map(int, fields[0].split(':'))
+                samples.append((hours * 3600 + minutes * 60 + seconds,
+                                fields[2], int(fields[1])))
+
+        positions = {name: index
+                     for index, (name, size) in enumerate(streams)}
+        # Bytes sent for the snapshots that are done. In the example above,
+        # the 6144 bytes last reported for snap1 are added to the counter
+        # of snap2 once it shows up.
+        done = 0
+        current = None
+        current_bytes = 0
+        sent = []
+        for seconds, snapshot, count in samples:
+            if snapshot != current:
+                done += current_bytes
+                # Snapshots between the previous and this one were sent too
+                # quickly to report any progress, so they are counted with
+                # their estimated size.
+                if snapshot in positions and (current is None or
+                                              current in positions):
+                    start = positions[current] + 1 if current else 0
+                    done += sum(size for name, size in
+                                streams[start:positions[snapshot]])
+                current = snapshot
+            current_bytes = count
+            sent.append((seconds, done + count))
+
+        bytes_sent = sent[-1][1] if sent else 0
+        throughput = 0
+        if len(sent) > 1:
+            elapsed = (sent[-1][0] - sent[0][0]) % 86400
+            if elapsed:
+                throughput = (sent[-1][1] - sent[0][1]) // elapsed
+        total_progress = 0
+        if total_size:
+            total_progress = min(100, bytes_sent * 100 // total_size)
+        return {
+            'total_progress': total_progress,
+            'bytes_sent': bytes_sent,
+            'bytes_total': total_size,
+            'throughput': throughput,
+        }
+
     @ensure_share_server_not_provided
     def migration_complete(
             self, context, source_share, destination_share, source_snapshots,
@@ -1522,6 +1845,8 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
         # Destroy src share and temporary migration snapshot on src (this) host
         self.delete_share(context, source_share)
 
+        self._delete_migration_progress_file(destination_share)
+
         return {'export_locations': export_locations}
 
     @ensure_share_server_not_provided
@@ -1539,13 +1864,16 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
             destination_share['id'], 'ssh_cmd')
         snapshot_tag = self.private_storage.get(
             destination_share['id'], 'migr_snapshot_tag')
+        resume_token = self.private_storage.get(
+            destination_share['id'], 'migr_resume_token')
 
         # Kill migration process if exists
         try:
             out, err = self.execute('ps', 'aux')
             lines = out.split('\n')
             for line in lines:
-                if '@%s' % snapshot_tag in line:
+                if ('@%s' % snapshot_tag in line or
+                        (resume_token and resume_token in line)):
                     migr_pid = [
                         x for x in line.strip().split(' ') if x != ''][1]
                     self.execute('sudo', 'kill', '-9', migr_pid)
@@ -1573,6 +1901,19 @@ class ZFSonLinuxShareDriver(zfs_utils.ExecuteMixin, driver.ShareDriver):
                 "%s",
                 e)
 
+        self._delete_migration_progress_file(destination_share)
+
         LOG.debug(
             "Migration of share with ID '%s' has been canceled.",
             source_share["id"])
+
+    def _delete_migration_progress_file(self, destination_share):
+        progress_file = self.private_storage.get(
+            destination_share['id'], 'migr_progress_file')
+        if not progress_file:
+            return
+        try:
+            self.execute('rm', '-f', progress_file)
+        except exception.ProcessExecutionError as e:
+            LOG.warning("Failed to delete migration progress file "
+                        "'%(file)s': %(e)s", {'file': progress_file, 'e': e})
@@ -35,6 +35,10 @@ from manila import utils
 
 LOG = log.getLogger(__name__)
 
+# Properties requested by ExecuteMixin.get_zpools_info(), name goes first.
+ZPOOL_LIST_FIELDS = ('name', 'size', 'free', 'allocated', 'fragmentation',
+                     'capacity', 'dedupratio')
+
 
 def zfs_dataset_synchronized(f):
 
@@ -136,6 +140,34 @@ class ExecuteMixin(driver.ExecuteMixin):
         """Returns value of requested zpool option."""
         return self._get_option(zpool_name, option_name, True, **kwargs)
 
+    def get_zpools_info(self, zpool_names, **kwargs):
+        """Returns capacity info of requested zpools with one command.
+
+        :param zpool_names: list of zpool names.
+        :returns: dict mapping zpool names to dicts with 'size', 'free' and
+            'allocated' values in bytes, 'fragmentation' and 'capacity'
+            percents and 'dedupratio'. Values not known to zpool are None.
+        """
+        out, err = self.execute(
+            'sudo', 'zpool', 'list', '-Hp', '-o', ','.join(ZPOOL_LIST_FIELDS),
+            *zpool_names, **kwargs)
+
+        data = {}
+        for line in out.splitlines():
+            values = line.split('\t')
+            if len(values) != len(ZPOOL_LIST_FIELDS):
+                continue
+            info = {}
+            for field, value in zip(ZPOOL_LIST_FIELDS[1:], values[1:]):
+                value = value.strip().rstrip('%x')
+                try:
+                    info[field] = (float(value) if field == 'dedupratio'
+                                   else int(value))
+                except ValueError:
+                    info[field] = None
+            data[values[0]] = info
+        return data
+
     def get_zfs_option(self, dataset_name, option_name, **kwargs):
         """Returns value of requested zfs dataset option."""
         return self._get_option(dataset_name, option_name, False, **kwargs)
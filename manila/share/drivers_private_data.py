@@ -58,6 +58,20 @@ class StorageDriver(object):
            See DriverPrivateData.get() method for more details.
         """
 
+    def get_by_entities(self, entity_ids, key):
+        """Backend implementation for DriverPrivateData.get_by_entities().
+
+           Should return a dict mapping each of 'entity_ids' to a dict with
+           all its keys if 'key' is None, or with the keys of the provided
+           'key' list otherwise. The default implementation calls get() for
+           each entity, backends should override it to fetch the data at
+           once.
+
+           See DriverPrivateData.get_by_entities() method for more details.
+        """
+        return {entity_id: self.get(entity_id, key, {})
+                for entity_id in entity_ids}
+
     @abc.abstractmethod
     def update(self, entity_id, details, delete_existing):
         """Backend implementation for DriverPrivateData.update() method.
@@ -92,6 +106,11 @@ class SqlStorageDriver(StorageDriver):
             self.context, entity_id, key, default
         )
 
+    def get_by_entities(self, entity_ids, key):
+        return db_api.driver_private_data_get_by_entities(
+            self.context, entity_ids, key
+        )
+
     def delete(self, entity_id, key):
         return db_api.driver_private_data_delete(
             self.context, entity_id, key
@@ -138,6 +157,20 @@ class DriverPrivateData(object):
         self._validate_entity_id(entity_id)
         return self._storage.get(entity_id, key, default)
 
+    def get_by_entities(self, entity_ids, key=None):
+        """Get list or all key-value pairs of several entities at once.
+
+        :param entity_ids: list of Model UUIDs
+        :param key: Key string or list of keys
+        :returns: dict mapping each entity_id to a dict with its key-value
+                  pairs
+        """
+        for entity_id in entity_ids:
+            self._validate_entity_id(entity_id)
+        if key is not None and not isinstance(key, list):
+            key = [key]
+        return self._storage.get_by_entities(list(entity_ids), key)
+
     def update(self, entity_id, details, delete_existing=False):
         """Update or create specified key-value pairs.
 
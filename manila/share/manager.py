@@ -608,34 +608,58 @@ class ShareManager(manager.SchedulerDependentManager):
                 {'share_server_id': compatible_share_server['id']},
                 with_share_data=True
             )
-            if create_on_backend:
-                metadata = {'request_host': share_instance['host']}
-                compatible_share_server = (
-                    self._create_share_server_in_backend(
-                        context, compatible_share_server,
-                        metadata=metadata))
 
             return compatible_share_server, share_instance_ref
 
-        return _wrapped_provide_share_server_for_share()
+        compatible_share_server, share_instance_ref = (
+            _wrapped_provide_share_server_for_share())
+
+        # NOTE: The share server is set up on the back end outside of the
+        # share network lock, so that a slow setup does not block the shares
+        # being created on other share servers of the share network.
+        if create_on_backend:
+            metadata = {'request_host': share_instance['host']}
+            compatible_share_server = self._create_share_server_in_backend(
+                context, compatible_share_server, metadata=metadata)
+
+        return compatible_share_server, share_instance_ref
 
     def _create_share_server_in_backend(self, context, share_server,
                                         metadata=None):
         """Perform setup_server on backend
 
+        Requests providing the same share server while it is being set up
+        wait for the setup to end and then use the share server.
+
         :param metadata: A dictionary, to be passed to driver's setup_server()
         """
-
-        if share_server['status'] == constants.STATUS_CREATING:
-            # Create share server on backend with data from db.
-            share_server = self._setup_server(context, share_server,
-                                              metadata=metadata)
-            LOG.info("Share server created successfully.")
-        else:
+        if share_server['status'] != constants.STATUS_CREATING:
             LOG.info("Using preexisting share server: "
                      "'%(share_server_id)s'",
                      {'share_server_id': share_server['id']})
-        return share_server
+            return share_server
+
+        @utils.synchronized("share_server_setup_%s" % share_server['id'],
+                            external=True)
+        def _wrapped_create_share_server_in_backend():
+            # NOTE: Read the share server again, another request may have
+            # set it up while this one was waiting for the lock.
+            server = self.db.share_server_get(context, share_server['id'])
+            if server['status'] == constants.STATUS_CREATING:
+                # Create share server on backend with data from db.
+                server = self._setup_server(context, server,
+                                            metadata=metadata)
+                LOG.info("Share server created successfully.")
+            elif server['status'] == constants.STATUS_ACTIVE:
+                LOG.info("Using share server '%(share_server_id)s' set up "
+                         "by a concurrent request.",
+                         {'share_server_id': server['id']})
+            else:
+                raise exception.ShareServerNotCreated(
+                    share_server_id=server['id'])
+            return server
+
+        return _wrapped_create_share_server_in_backend()
 
     def create_share_server(self, context, share_server_id):
         """Invoked to create a share server in this backend.
@@ -770,18 +794,15 @@ class ShareManager(manager.SchedulerDependentManager):
                 {'share_server_id': compatible_share_server['id']},
             )
 
-            if compatible_share_server['status'] == constants.STATUS_CREATING:
-                # Create share server on backend with data from db.
-                compatible_share_server = self._setup_server(
-                    context, compatible_share_server)
-                LOG.info("Share server created successfully.")
-            else:
-                LOG.info("Used preexisting share server "
-                         "'%(share_server_id)s'",
-                         {'share_server_id': compatible_share_server['id']})
             return compatible_share_server, updated_share_group
 
-        return _wrapped_provide_share_server_for_share_group()
+        compatible_share_server, updated_share_group = (
+            _wrapped_provide_share_server_for_share_group())
+
+        compatible_share_server = self._create_share_server_in_backend(
+            context, compatible_share_server)
+
+        return compatible_share_server, updated_share_group
 
     def _get_share_server(self, context, share_instance):
         if share_instance['share_server_id']:
@@ -3398,6 +3419,9 @@ class ShareManager(manager.SchedulerDependentManager):
     def publish_service_capabilities(self, context):
         """Collect driver status and then publish it."""
         self._report_driver_status(context)
+        # Schedulers ask for the capabilities when they lack them, so the
+        # full capabilities are sent instead of the changes.
+        self._force_full_capabilities_update()
         self._publish_service_capabilities(context)
 
     def _form_server_setup_info(self, context, share_server, share_network):
@@ -216,8 +216,12 @@ class ShareAPI(object):
         call_context.cast(context, 'update_access',
                           share_instance_id=share_instance['id'])
 
-    def publish_service_capabilities(self, context):
-        call_context = self.client.prepare(fanout=True, version='1.0')
+    def publish_service_capabilities(self, context, host=None):
+        if host:
+            call_context = self.client.prepare(
+                server=utils.extract_host(host), version='1.0')
+        else:
+            call_context = self.client.prepare(fanout=True, version='1.0')
         call_context.cast(context, 'publish_service_capabilities')
 
     def extend_share(self, context, share, new_size, reservations):
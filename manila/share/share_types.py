@@ -15,12 +15,16 @@
 
 """Built-in share type properties."""
 
+import copy
+import datetime
 import re
+import threading
 
 from oslo_config import cfg
 from oslo_db import exception as db_exception
 from oslo_log import log
 from oslo_utils import strutils
+from oslo_utils import timeutils
 from oslo_utils import uuidutils
 import six
 
@@ -30,9 +34,85 @@ from manila import db
 from manila import exception
 from manila.i18n import _
 
+share_types_opts = [
+    cfg.IntOpt('share_type_cache_ttl',
+               default=0,
+               min=0,
+               help='Time in seconds share types and their extra specs are '
+                    'cached in memory by each manila process. Changes made '
+                    'through the process itself drop the cache right away, '
+                    'changes made through other processes are seen once '
+                    'the cached entries expire. 0 disables the cache.'),
+]
+
 CONF = cfg.CONF
+CONF.register_opts(share_types_opts)
 LOG = log.getLogger(__name__)
 
+# Number of entries after which the share type cache is emptied.
+SHARE_TYPE_CACHE_SIZE = 1000
+
+
+class ShareTypeCache(object):
+    """Process local cache of share types.
+
+    Entries expire after ``share_type_cache_ttl`` seconds. Every change to
+    the share types bumps the generation of the cache and drops all the
+    entries, values fetched concurrently with a change are not stored.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries = {}
+        self._generation = 0
+
+    def get(self, key, fetch):
+        """Return the cached value for key, fetching it if needed.
+
+        :param key: hashable cache key.
+        :param fetch: callable returning the value when it is not cached.
+        """
+        ttl = CONF.share_type_cache_ttl
+        if not ttl:
+            return fetch()
+
+        now = timeutils.utcnow()
+        with self._lock:
+            entry = self._entries.get(key)
+            generation = self._generation
+        if entry and entry[0] > now:
+            return copy.deepcopy(entry[1])
+
+        value = fetch()
+        with self._lock:
+            if generation == self._generation:
+                if len(self._entries) >= SHARE_TYPE_CACHE_SIZE:
+                    self._entries.clear()
+                self._entries[key] = (
+                    now + datetime.timedelta(seconds=ttl),
+                    copy.deepcopy(value))
+        return value
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+SHARE_TYPE_CACHE = ShareTypeCache()
+
+
+def invalidate_cache():
+    """Drop the cached share types after they were changed."""
+    SHARE_TYPE_CACHE.invalidate()
+
+
+def _cache_key(ctxt, *args):
+    # Non admin users only see the public share types and the ones their
+    # project has access to.
+    scope = None if ctxt.is_admin else ctxt.project_id
+    return (scope,) + args
+
 
 def create(context, name, extra_specs=None, is_public=True,
            projects=None, description=None):
@@ -56,6 +136,8 @@ def create(context, name, extra_specs=None, is_public=True,
         LOG.exception('DB error.')
         raise exception.ShareTypeCreateFailed(name=name,
                                               extra_specs=extra_specs)
+    finally:
+        invalidate_cache()
     return type_ref
 
 
@@ -65,7 +147,10 @@ def destroy(context, id):
         msg = _("id cannot be None")
         raise exception.InvalidShareType(reason=msg)
     else:
-        db.share_type_destroy(context, id)
+        try:
+            db.share_type_destroy(context, id)
+        finally:
+            invalidate_cache()
 
 
 def get_all_types(context, inactive=0, search_opts=None):
@@ -136,7 +221,10 @@ def get_share_type(ctxt, id, expected_fields=None):
     if ctxt is None:
         ctxt = context.get_admin_context()
 
-    return db.share_type_get(ctxt, id, expected_fields=expected_fields)
+    key = _cache_key(ctxt, 'id', id, tuple(sorted(expected_fields or [])))
+    return SHARE_TYPE_CACHE.get(
+        key, lambda: db.share_type_get(ctxt, id,
+                                       expected_fields=expected_fields))
 
 
 def get_share_type_by_name(context, name):
@@ -145,7 +233,9 @@ def get_share_type_by_name(context, name):
         msg = _("name cannot be None")
         raise exception.InvalidShareType(reason=msg)
 
-    return db.share_type_get_by_name(context, name)
+    return SHARE_TYPE_CACHE.get(
+        _cache_key(context, 'name', name),
+        lambda: db.share_type_get_by_name(context, name))
 
 
 def get_share_type_by_name_or_id(context, share_type=None):
@@ -317,7 +407,10 @@ def add_share_type_access(context, share_type_id, project_id):
     if share_type_id is None:
         msg = _("share_type_id cannot be None")
         raise exception.InvalidShareType(reason=msg)
-    return db.share_type_access_add(context, share_type_id, project_id)
+    try:
+        return db.share_type_access_add(context, share_type_id, project_id)
+    finally:
+        invalidate_cache()
 
 
 def remove_share_type_access(context, share_type_id, project_id):
@@ -325,7 +418,27 @@ def remove_share_type_access(context, share_type_id, project_id):
     if share_type_id is None:
         msg = _("share_type_id cannot be None")
         raise exception.InvalidShareType(reason=msg)
-    return db.share_type_access_remove(context, share_type_id, project_id)
+    try:
+        return db.share_type_access_remove(context, share_type_id, project_id)
+    finally:
+        invalidate_cache()
+
+
+def update_share_type_extra_specs(context, share_type_id, extra_specs):
+    """Create or update extra specs of share type."""
+    try:
+        return db.share_type_extra_specs_update_or_create(
+            context, share_type_id, extra_specs)
+    finally:
+        invalidate_cache()
+
+
+def delete_share_type_extra_spec(context, share_type_id, key):
+    """Delete extra spec of share type."""
+    try:
+        db.share_type_extra_specs_delete(context, share_type_id, key)
+    finally:
+        invalidate_cache()
 
 
 def get_extra_specs_from_share(share):
@@ -12,6 +12,7 @@
 
 import ddt
 import mock
+from oslo_serialization import jsonutils
 import six
 import webob
 
@@ -178,6 +179,55 @@ class JSONDictSerializerTest(test.TestCase):
                                 six.b('')).replace(six.b(' '), six.b(''))
         self.assertEqual(expected_json, result)
 
+    def test_json_streaming_list(self):
+        items = ({'id': i, 'name': 'fake%s' % i} for i in range(5))
+        input_dict = {
+            'shares': wsgi.StreamingList(items),
+            'shares_links': [{'rel': 'next', 'href': 'fake_href'}],
+        }
+        serializer = wsgi.JSONDictSerializer()
+        serializer.stream_chunk_size = 10
+
+        result = serializer.serialize(input_dict)
+
+        self.assertNotIsInstance(result, six.binary_type)
+        chunks = list(result)
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(
+            {'shares': [{'id': i, 'name': 'fake%s' % i} for i in range(5)],
+             'shares_links': [{'rel': 'next', 'href': 'fake_href'}]},
+            jsonutils.loads(six.b('').join(chunks)))
+
+    def test_json_streaming_empty_list(self):
+        input_dict = {'shares': wsgi.StreamingList([])}
+        serializer = wsgi.JSONDictSerializer()
+
+        result = serializer.serialize(input_dict)
+
+        self.assertEqual(six.b('{"shares": []}'), six.b('').join(result))
+
+    def test_json_streaming_list_render_error(self):
+        def render(i):
+            if i == 3:
+                raise exception.NotFound()
+            return {'id': i}
+
+        mock_log = self.mock_object(wsgi, 'LOG')
+        input_dict = {
+            'shares': wsgi.StreamingList(six.moves.map(render, range(5))),
+        }
+        serializer = wsgi.JSONDictSerializer()
+        serializer.stream_chunk_size = 10
+        chunks = []
+
+        result = serializer.serialize(input_dict)
+
+        self.assertRaises(exception.NotFound, lambda: chunks.extend(result))
+        self.assertEqual(
+            six.b('{"shares": [{"id": 0}, {"id": 1}, {"id": 2}'),
+            six.b('').join(chunks))
+        self.assertTrue(mock_log.exception.called)
+
 
 class TextDeserializerTest(test.TestCase):
     def test_dispatch_default(self):
@@ -220,6 +270,41 @@ class ResourceTest(test.TestCase):
         self.assertEqual(six.b('off'), response.body)
         self.assertEqual(200, response.status_int)
 
+    def test_resource_call_logs_db_stats(self):
+        class Controller(object):
+            def index(self, req):
+                return 'off'
+
+        mock_log_summary = self.mock_object(wsgi.query_stats, 'log_summary')
+        req = webob.Request.blank('/tests')
+        req.environ['manila.context'] = context.RequestContext(
+            'fake_user', 'fake_project')
+        app = fakes.TestRouter(Controller())
+
+        req.get_response(app)
+
+        mock_log_summary.assert_called_once_with(
+            req.environ['manila.context'], req.url)
+
+    def test_resource_call_logs_db_stats_after_streamed_body(self):
+        class Controller(object):
+            def index(self, req):
+                return {'shares': wsgi.StreamingList([{'id': 'fake'}])}
+
+        mock_log_summary = self.mock_object(wsgi.query_stats, 'log_summary')
+        req = webob.Request.blank('/tests')
+        req.environ['manila.context'] = context.RequestContext(
+            'fake_user', 'fake_project')
+        app = fakes.TestRouter(Controller())
+
+        response = req.get_response(app)
+
+        self.assertFalse(mock_log_summary.called)
+        self.assertEqual({'shares': [{'id': 'fake'}]},
+                         jsonutils.loads(response.body))
+        mock_log_summary.assert_called_once_with(
+            req.environ['manila.context'], req.url)
+
     def test_resource_not_authorized(self):
         class Controller(object):
             def index(self, req):
@@ -864,6 +949,20 @@ class ResponseObjectTest(test.TestCase):
             self.assertEqual(202, response.status_int)
             self.assertEqual(six.b(mtype), response.body)
 
+    def test_serialize_streamed_body(self):
+        class JSONSerializer(object):
+            def serialize(self, obj):
+                return iter([six.b('{"fake": '), six.b('[]}')])
+
+        robj = wsgi.ResponseObject({}, json=JSONSerializer)
+        request = wsgi.Request.blank('/tests/123')
+
+        response = robj.serialize(request, 'application/json')
+
+        self.assertIsNone(response.content_length)
+        self.assertEqual(200, response.status_int)
+        self.assertEqual(six.b('{"fake": []}'), response.body)
+
 
 class ValidBodyTest(test.TestCase):
 
@@ -18,6 +18,7 @@ Test suites for 'common' code used throughout the OpenStack HTTP API.
 """
 
 import ddt
+import mock
 import webob
 import webob.exc
 
@@ -336,3 +337,40 @@ class ViewBuilderTest(test.TestCase):
         actual_resource = self.view_builder.view(req, self.fake_resource)
 
         self.assertEqual(expected_keys, set(actual_resource.keys()))
+
+    def test_versioned_modifiers_resolved_once_per_version(self):
+        patcher = mock.patch.dict(
+            common.ViewBuilder._versioned_modifiers_cache, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        req = fakes.HTTPRequest.blank('/my_resource', version='3.14')
+        match_mock = self.mock_object(
+            req.api_version_request, 'matches_versioned_method',
+            mock.Mock(return_value=True))
+
+        for __ in range(5):
+            self.view_builder.view(req, self.fake_resource)
+
+        self.assertEqual(
+            len(fakes.FakeResourceViewBuilder._detail_version_modifiers),
+            match_mock.call_count)
+
+    def test_get_links(self):
+        req = fakes.HTTPRequest.blank('/my_resource')
+
+        links = self.view_builder._get_links(req, 'fake_resource_id')
+
+        self.assertEqual(
+            [{'rel': 'self',
+              'href': 'http://localhost/v1/fake/fake_resource/'
+                      'fake_resource_id'},
+             {'rel': 'bookmark',
+              'href': 'http://localhost/fake/fake_resource/'
+                      'fake_resource_id'}],
+            links)
+        self.assertEqual(
+            self.view_builder._get_href_link(req, 'fake_resource_id'),
+            links[0]['href'])
+        self.assertEqual(
+            self.view_builder._get_bookmark_link(req, 'fake_resource_id'),
+            links[1]['href'])
@@ -13,9 +13,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
 import mock
 from webob import exc
 
+from manila.api.openstack import api_version_request as api_version
 from manila.api.v1 import share_servers
 from manila.common import constants
 from manila import context
@@ -23,6 +26,7 @@ from manila.db import api as db_api
 from manila import exception
 from manila import policy
 from manila import test
+from manila.tests.api import fakes
 
 
 fake_share_server_list = {
@@ -122,6 +126,7 @@ def fake_share_server_get():
 class FakeRequestAdmin(object):
     environ = {"manila.context": CONTEXT}
     GET = {}
+    api_version_request = api_version.APIVersionRequest('1.0')
 
 
 class FakeRequestWithHost(FakeRequestAdmin):
@@ -217,6 +222,90 @@ class ShareServerAPITest(test.TestCase):
         db_api.share_server_get_all.assert_called_once_with(CONTEXT)
         self.assertEqual(0, len(result['share_servers']))
 
+    def test_index_with_db_filters_and_pagination(self):
+        class FakeRequest(FakeRequestAdmin):
+            api_version_request = api_version.APIVersionRequest('2.47')
+            GET = {
+                'host': fake_share_server_list['share_servers'][0]['host'],
+                'project_id': 'fake_project_id',
+                'limit': '1',
+                'offset': '2',
+                'marker': 'fake_marker',
+                'sort_key': 'host',
+                'sort_dir': 'asc',
+                'updated_since': '2018-01-01T10:00:00Z',
+            }
+
+        result = self.controller.index(FakeRequest)
+
+        db_api.share_server_get_all.assert_called_once_with(
+            CONTEXT,
+            filters={
+                'host': fake_share_server_list['share_servers'][0]['host'],
+                'project_id': 'fake_project_id',
+                'updated_since': datetime.datetime(2018, 1, 1, 10, 0, 0),
+            },
+            limit=1, offset=2, marker='fake_marker', sort_key='host',
+            sort_dir='asc')
+        self.assertEqual(fake_share_server_list, result)
+
+    def test_index_with_db_filters_not_limited(self):
+        class FakeRequest(FakeRequestAdmin):
+            api_version_request = api_version.APIVersionRequest('2.47')
+            GET = {'status': constants.STATUS_ACTIVE}
+
+        result = self.controller.index(FakeRequest)
+
+        db_api.share_server_get_all.assert_called_once_with(
+            CONTEXT, filters={'status': constants.STATUS_ACTIVE},
+            limit=None, offset=0, marker=None, sort_key=None, sort_dir=None)
+        self.assertEqual(fake_share_server_list, result)
+
+    def test_index_with_db_pagination_next_link(self):
+        req = fakes.HTTPRequest.blank('/share-servers?limit=2&sort_key=host',
+                                      version='2.47', use_admin_context=True)
+
+        result = self.controller.index(req)
+
+        db_api.share_server_get_all.assert_called_once_with(
+            req.environ['manila.context'], filters={}, limit=2, offset=0,
+            marker=None, sort_key='host', sort_dir=None)
+        self.assertEqual(fake_share_server_list['share_servers'],
+                         result['share_servers'])
+        self.assertEqual(
+            [{'rel': 'next',
+              'href': 'http://localhost/v1/fake/share-servers?'
+                      'limit=2&sort_key=host&marker=fake_server_id_2'}],
+            result['share_servers_links'])
+
+    def test_index_with_db_pagination_last_page(self):
+        req = fakes.HTTPRequest.blank('/share-servers?limit=3',
+                                      version='2.47', use_admin_context=True)
+
+        result = self.controller.index(req)
+
+        self.assertEqual(fake_share_server_list, result)
+
+    def test_index_with_db_filters_unsupported_filter(self):
+        class FakeRequest(FakeRequestAdmin):
+            api_version_request = api_version.APIVersionRequest('2.47')
+            GET = {'fake_key': 'fake_value'}
+
+        self.assertRaises(exc.HTTPBadRequest,
+                          self.controller.index, FakeRequest)
+        self.assertFalse(db_api.share_server_get_all.called)
+
+    def test_index_with_db_filters_marker_not_found(self):
+        class FakeRequest(FakeRequestAdmin):
+            api_version_request = api_version.APIVersionRequest('2.47')
+            GET = {'marker': 'fake_marker'}
+
+        db_api.share_server_get_all.side_effect = (
+            exception.MarkerNotFound(marker='fake_marker'))
+
+        self.assertRaises(exc.HTTPBadRequest,
+                          self.controller.index, FakeRequest)
+
     def test_show(self):
         self.mock_object(db_api, 'share_server_get',
                          mock.Mock(return_value=fake_share_server_get()))
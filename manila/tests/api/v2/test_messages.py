@@ -10,6 +10,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
 import mock
 from oslo_config import cfg
 import webob
@@ -184,3 +186,38 @@ class MessageApiTest(test.TestCase):
 
         ex2 = self._expected_message_from_controller(msg2['id'])['message']
         self.assertEqual([ex2], res_dict['messages'])
+
+    def test_index_paginated_by_db(self):
+        msg = stubs.stub_message(fakes.get_fake_uuid())
+        self.mock_object(message_api.API, 'get_all', mock.Mock(
+                         return_value=[msg]))
+        req = fakes.HTTPRequest.blank(
+            '/messages?limit=1&offset=1&marker=fake_marker'
+            '&created_since=2018-01-01T10:00:00Z&action_id=001',
+            version='2.47', base_url='http://localhost/v2')
+        req.environ['manila.context'] = self.ctxt
+
+        res_dict = self.controller.index(req)
+
+        ex = self._expected_message_from_controller(msg['id'])['message']
+        self.assertEqual([ex], res_dict['messages'])
+        message_api.API.get_all.assert_called_once_with(
+            self.ctxt,
+            search_opts={
+                'action_id': '001',
+                'created_since': datetime.datetime(2018, 1, 1, 10, 0, 0),
+            },
+            limit=1, offset=1, marker='fake_marker', sort_key='created_at',
+            sort_dir='desc')
+
+    def test_index_marker_not_found(self):
+        self.mock_object(message_api.API, 'get_all', mock.Mock(
+                         side_effect=exception.MarkerNotFound(
+                             marker='fake_marker')))
+        req = fakes.HTTPRequest.blank(
+            '/messages?marker=fake_marker', version='2.47',
+            base_url='http://localhost/v2')
+        req.environ['manila.context'] = self.ctxt
+
+        self.assertRaises(webob.exc.HTTPBadRequest,
+                          self.controller.index, req)
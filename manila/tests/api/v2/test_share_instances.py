@@ -123,6 +123,48 @@ class ShareInstancesAPITest(test.TestCase):
         self.mock_policy_check.assert_called_once_with(
             req_context, self.resource_name, 'index')
 
+    def test_index_paginated(self):
+        test_instances = [
+            db_utils.create_share(size=s + 1).instance
+            for s in range(0, 3)
+        ]
+        ids = sorted(i['id'] for i in test_instances)
+
+        req = self._get_request(
+            '/share_instances?limit=2&sort_key=id&sort_dir=asc',
+            version='2.47')
+        first_page = self.controller.index(req)
+        req = self._get_request(
+            '/share_instances?limit=2&sort_key=id&sort_dir=asc&marker=%s' %
+            ids[1], version='2.47')
+        second_page = self.controller.index(req)
+
+        self.assertEqual(ids[:2],
+                         [i['id'] for i in first_page['share_instances']])
+        self.assertEqual(ids[2:],
+                         [i['id'] for i in second_page['share_instances']])
+
+    def test_index_not_limited(self):
+        self.flags(osapi_max_limit=2)
+        test_instances = [
+            db_utils.create_share(size=s + 1).instance
+            for s in range(0, 3)
+        ]
+
+        req = self._get_request('/share_instances', version='2.47')
+        actual_result = self.controller.index(req)
+
+        self._validate_ids_in_share_instances_list(
+            test_instances, actual_result['share_instances'])
+        self.assertNotIn('share_instances_links', actual_result)
+
+    def test_index_marker_not_found(self):
+        req = self._get_request('/share_instances?marker=fake_marker',
+                                version='2.47')
+
+        self.assertRaises(webob_exc.HTTPBadRequest,
+                          self.controller.index, req)
+
     def test_show(self):
         test_instance = db_utils.create_share(size=1).instance
         id = test_instance['id']
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
 import ddt
 import mock
 from oslo_db import exception as db_exception
@@ -514,6 +516,45 @@ class ShareNetworkAPITest(test.TestCase):
                 result[share_networks.RESOURCES_NAME][0],
                 fake_sn_with_ss_shortened)
 
+    @ddt.data(
+        ({'limit': '1', 'marker': 'fake_marker', 'sort_key': 'name',
+          'name~': 'test', 'segmentation_id': '2000',
+          'updated_since': '2018-01-01T10:00:00Z'},
+         {'name~': 'test', 'segmentation_id': 2000,
+          'updated_since': datetime.datetime(2018, 1, 1, 10, 0, 0)},
+         {'limit': 1, 'offset': 0, 'marker': 'fake_marker',
+          'sort_key': 'name', 'sort_dir': None}),
+        ({'offset': '2', 'sort_dir': 'asc'}, {},
+         {'limit': 1000, 'offset': 2, 'marker': None, 'sort_key': None,
+          'sort_dir': 'asc'}),
+    )
+    @ddt.unpack
+    def test_index_filtered_and_paginated_by_db(self, search_opts,
+                                                expected_filters,
+                                                expected_list_params):
+        self.mock_object(db_api, 'share_network_get_all_by_project',
+                         mock.Mock(return_value=[fake_share_network]))
+        req = fakes.HTTPRequest.blank(
+            '/share-networks?' + parse.urlencode(sorted(search_opts.items())),
+            version='2.47')
+
+        result = self.controller.index(req)
+
+        db_api.share_network_get_all_by_project.assert_called_once_with(
+            req.environ['manila.context'], 'fake',
+            filters=expected_filters, **expected_list_params)
+        self.assertEqual(1, len(result[share_networks.RESOURCES_NAME]))
+
+    @mock.patch.object(db_api, 'share_network_get_all_by_project',
+                       mock.Mock(side_effect=exception.MarkerNotFound(
+                           marker='fake_marker')))
+    def test_index_marker_not_found(self):
+        req = fakes.HTTPRequest.blank('/share-networks?marker=fake_marker',
+                                      version='2.47')
+
+        self.assertRaises(webob_exc.HTTPBadRequest,
+                          self.controller.index, req)
+
     @mock.patch.object(db_api, 'share_network_get', mock.Mock())
     def test_update_nominal(self):
         share_nw = 'fake network id'
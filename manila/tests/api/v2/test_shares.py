@@ -1098,6 +1098,56 @@ class ShareAPITest(test.TestCase):
         share_api.API.migration_get_progress.assert_called_once_with(
             utils.IsAMatcher(context.RequestContext), share)
 
+    @ddt.data(('2.47', {}),
+              ('2.48', {'bytes_sent': 1024, 'bytes_total': 4096,
+                        'throughput': 512}))
+    @ddt.unpack
+    def test_migration_get_progress_transfer_fields(self, version,
+                                                    expected_fields):
+        share = db_utils.create_share(
+            task_state=constants.TASK_STATE_MIGRATION_DRIVER_IN_PROGRESS)
+        req = fakes.HTTPRequest.blank('/shares/%s/action' % share['id'],
+                                      use_admin_context=True, version=version)
+        req.api_version_request.experimental = True
+        body = {'migration_get_progress': None}
+        self.mock_object(share_api.API, 'get',
+                         mock.Mock(return_value=share))
+        self.mock_object(share_api.API, 'migration_get_progress',
+                         mock.Mock(return_value={
+                             'total_progress': 25, 'bytes_sent': 1024,
+                             'bytes_total': 4096, 'throughput': 512}))
+
+        response = self.controller.migration_get_progress(req, share['id'],
+                                                          body)
+
+        expected = {
+            'total_progress': 25,
+            'task_state': constants.TASK_STATE_MIGRATION_DRIVER_IN_PROGRESS,
+        }
+        expected.update(expected_fields)
+        self.assertEqual(expected, response)
+
+    def test_migration_get_progress_transfer_fields_not_reported(self):
+        share = db_utils.create_share(
+            task_state=constants.TASK_STATE_DATA_COPYING_IN_PROGRESS)
+        req = fakes.HTTPRequest.blank('/shares/%s/action' % share['id'],
+                                      use_admin_context=True, version='2.48')
+        req.api_version_request.experimental = True
+        body = {'migration_get_progress': None}
+        self.mock_object(share_api.API, 'get',
+                         mock.Mock(return_value=share))
+        self.mock_object(share_api.API, 'migration_get_progress',
+                         mock.Mock(return_value={'total_progress': 50}))
+
+        response = self.controller.migration_get_progress(req, share['id'],
+                                                          body)
+
+        self.assertEqual(
+            {'total_progress': 50,
+             'task_state': constants.TASK_STATE_DATA_COPYING_IN_PROGRESS,
+             'bytes_sent': None, 'bytes_total': None, 'throughput': None},
+            response)
+
     def test_migration_get_progress_not_found(self):
         share = db_utils.create_share()
         req = fakes.HTTPRequest.blank('/shares/%s/action' % share['id'],
@@ -15,6 +15,7 @@
 
 import ddt
 
+from manila.api.openstack import wsgi
 from manila.api.views import shares
 from manila import test
 from manila.tests.api.contrib import stubs
@@ -87,3 +88,17 @@ class ViewBuilderTestCase(test.TestCase):
             expected['revert_to_snapshot_support'] = True
 
         self.assertSubDictMatch(expected, result['share'])
+
+    @ddt.data(True, False)
+    def test_detail_list(self, stream_list_responses):
+        self.flags(osapi_stream_list_responses=stream_list_responses)
+        req = fakes.HTTPRequest.blank('/shares', version='2.27')
+
+        result = self.builder.detail_list(req, [self.fake_share])
+
+        if stream_list_responses:
+            self.assertIsInstance(result['shares'], wsgi.StreamingList)
+        else:
+            self.assertIsInstance(result['shares'], list)
+        self.assertEqual([self.builder.detail(req, self.fake_share)['share']],
+                         list(result['shares']))
@@ -26,6 +26,8 @@ from manila.cmd import manage as manila_manage
 from manila import context
 from manila import db
 from manila.db import migration
+from manila.message import api as message_api
+from manila import quota
 from manila import test
 from manila import version
 
@@ -233,6 +235,34 @@ class ManilaCmdManageTestCase(test.TestCase):
         self.db_commands.stamp(version='123')
         migration.stamp.assert_called_once_with('123')
 
+    def test_clean_expired_messages(self):
+        self.mock_object(context, 'get_admin_context',
+                         mock.Mock(return_value='admin_ctxt'))
+        self.mock_object(message_api.API, 'cleanup_expired_messages',
+                         mock.Mock(return_value=3))
+
+        with mock.patch('sys.stdout', new=six.StringIO()) as fake_out:
+            self.db_commands.clean_expired_messages(
+                batch_size=10, batch_delay=0.5)
+
+        self.assertEqual('Deleted 3 expired messages.\n',
+                         fake_out.getvalue())
+        message_api.API.cleanup_expired_messages.assert_called_once_with(
+            'admin_ctxt', batch_size=10, batch_delay=0.5)
+
+    def test_expire_reservations(self):
+        self.mock_object(context, 'get_admin_context',
+                         mock.Mock(return_value='admin_ctxt'))
+        self.mock_object(quota.QUOTAS, 'expire', mock.Mock(return_value=3))
+
+        with mock.patch('sys.stdout', new=six.StringIO()) as fake_out:
+            self.db_commands.expire_reservations()
+
+        self.assertEqual('Rolled back 3 expired reservations.\n',
+                         fake_out.getvalue())
+        quota.QUOTAS.expire.assert_called_once_with(
+            'admin_ctxt', batch_size=None, batch_delay=None)
+
     def test_version_commands_list(self):
         self.mock_object(version, 'version_string',
                          mock.Mock(return_value='123'))
@@ -2757,3 +2757,33 @@ class AccessMetadataTableChecks(BaseMigrationChecks):
     def check_downgrade(self, engine):
         self.test_case.assertRaises(sa_exc.NoSuchTableError, utils.load_table,
                                     self.new_table_name, engine)
+
+
+@map_to_migration('a87e0fb17dee')
+class HotQueryIndexesChecks(BaseMigrationChecks):
+    indexes = (
+        ('share_instances', ['host', 'deleted']),
+        ('share_instance_access_map', ['share_instance_id', 'state']),
+        ('share_snapshot_instances', ['share_instance_id', 'status']),
+        ('messages', ['expires_at']),
+        ('network_allocations', ['ip_address']),
+    )
+
+    def setup_upgrade_data(self, engine):
+        pass
+
+    def _get_index(self, engine, table_name, columns):
+        table = utils.load_table(table_name, engine)
+        for idx in table.indexes:
+            if list(idx.columns.keys()) == columns:
+                return idx
+
+    def check_upgrade(self, engine, data):
+        for table_name, columns in self.indexes:
+            self.test_case.assertTrue(
+                self._get_index(engine, table_name, columns))
+
+    def check_downgrade(self, engine):
+        for table_name, columns in self.indexes:
+            self.test_case.assertFalse(
+                self._get_index(engine, table_name, columns))
@@ -27,6 +27,7 @@ from oslo_db import exception as db_exception
 from oslo_utils import timeutils
 from oslo_utils import uuidutils
 import six
+from sqlalchemy import orm
 
 from manila.common import constants
 from manila import context
@@ -459,9 +460,11 @@ class ShareDatabaseAPITestCase(test.TestCase):
             self.assertNotIn('share_proto', instance)
 
     def test_share_instance_get_all_by_host_not_found_exception(self):
-        db_utils.create_share()
-        self.mock_object(db_api, 'share_get', mock.Mock(
-                         side_effect=exception.NotFound))
+        share = db_utils.create_share()
+        session = db_api.get_session()
+        with session.begin():
+            session.query(models.Share).filter_by(id=share['id']).update(
+                {'deleted': share['id']})
         instances = db_api.share_instances_get_all_by_host(
             self.ctxt, 'fake_host', True)
 
@@ -1586,6 +1589,82 @@ class ShareExportLocationsDatabaseAPITestCase(test.TestCase):
         # actual result should contain locations in exact same order
         self.assertEqual(actual_result, update_locations)
 
+    def test_update_with_metadata(self):
+        share = db_utils.create_share()
+        initial_locations = [
+            {'path': 'fake1/1/', 'metadata': {'preferred': 'True'}},
+            {'path': 'fake2/2/', 'is_admin_only': True},
+        ]
+        update_locations = [
+            {'path': 'fake3/3/', 'metadata': {'preferred': 'False',
+                                              'speed': 'fast'}},
+            {'path': 'fake1/1/', 'metadata': {'preferred': 'True'}},
+        ]
+
+        result = db_api.share_export_locations_update(
+            self.ctxt, share.instance['id'], initial_locations, False)
+        self.assertEqual({'fake1/1/', 'fake2/2/'}, result)
+        removed = db_api.share_export_locations_get_by_share_instance_id(
+            self.ctxt, share.instance['id'])[1]
+
+        result = db_api.share_export_locations_update(
+            self.ctxt, share.instance['id'], update_locations, True)
+
+        self.assertEqual({'fake1/1/', 'fake3/3/'}, result)
+        locations = db_api.share_export_locations_get_by_share_instance_id(
+            self.ctxt, share.instance['id'])
+        self.assertEqual(['fake3/3/', 'fake1/1/'],
+                         [el['path'] for el in locations])
+        self.assertEqual({'preferred': 'False', 'speed': 'fast'},
+                         locations[0]['el_metadata'])
+        self.assertFalse(locations[0]['is_admin_only'])
+        self.assertEqual({'preferred': 'True'}, locations[1]['el_metadata'])
+        self.assertRaises(exception.ExportLocationNotFound,
+                          db_api.share_export_location_get_by_uuid,
+                          self.ctxt, removed['uuid'])
+
+    def test_update_without_delete(self):
+        share = db_utils.create_share()
+
+        db_api.share_export_locations_update(
+            self.ctxt, share.instance['id'], ['fake1/1/', 'fake2/2/'], False)
+        result = db_api.share_export_locations_update(
+            self.ctxt, share.instance['id'], ['fake3/3/', 'fake2/2/'], False)
+
+        self.assertEqual({'fake1/1/', 'fake2/2/', 'fake3/3/'}, result)
+        self.assertEqual(
+            ['fake1/1/', 'fake3/3/', 'fake2/2/'],
+            db_api.share_export_locations_get(self.ctxt, share['id']))
+
+    def test_update_unchanged(self):
+        share = db_utils.create_share()
+        locations = [
+            {'path': 'fake1/1/', 'metadata': {'preferred': 'True'}},
+            {'path': 'fake2/2/'},
+        ]
+        db_api.share_export_locations_update(
+            self.ctxt, share.instance['id'], locations, True)
+        before = db_api.share_export_locations_get_by_share_instance_id(
+            self.ctxt, share.instance['id'])
+        mock_update = self.mock_object(
+            orm.Session, 'bulk_update_mappings')
+        mock_insert = self.mock_object(
+            orm.Session, 'bulk_insert_mappings')
+        mock_delete = self.mock_object(
+            db_api, '_export_locations_soft_delete')
+
+        result = db_api.share_export_locations_update(
+            self.ctxt, share.instance['id'], locations, True)
+
+        self.assertEqual({'fake1/1/', 'fake2/2/'}, result)
+        mock_update.assert_not_called()
+        mock_insert.assert_not_called()
+        mock_delete.assert_not_called()
+        after = db_api.share_export_locations_get_by_share_instance_id(
+            self.ctxt, share.instance['id'])
+        self.assertEqual([(el['uuid'], el['updated_at']) for el in before],
+                         [(el['uuid'], el['updated_at']) for el in after])
+
     def test_update_string(self):
         share = db_utils.create_share()
         initial_location = 'fake1/1/'
@@ -1902,6 +1981,31 @@ class DriverPrivateDataDatabaseAPITestCase(test.TestCase):
         self.assertEqual(details[test_key], actual_result_single_key)
         self.assertEqual(dict.fromkeys(test_keys, "val"), actual_result_list)
 
+    def test_get_by_entities(self):
+        test_ids = [self._get_driver_test_data() for i in range(3)]
+        db_api.driver_private_data_update(
+            self.ctxt, test_ids[0], {"foo": "bar", "tee": "too"})
+        db_api.driver_private_data_update(
+            self.ctxt, test_ids[1], {"foo": "baz"})
+        db_api.driver_private_data_update(
+            self.ctxt, self._get_driver_test_data(), {"foo": "other"})
+
+        actual_result_all = db_api.driver_private_data_get_by_entities(
+            self.ctxt, test_ids)
+        actual_result_list = db_api.driver_private_data_get_by_entities(
+            self.ctxt, test_ids, ["foo"])
+
+        self.assertEqual({test_ids[0]: {"foo": "bar", "tee": "too"},
+                          test_ids[1]: {"foo": "baz"},
+                          test_ids[2]: {}}, actual_result_all)
+        self.assertEqual({test_ids[0]: {"foo": "bar"},
+                          test_ids[1]: {"foo": "baz"},
+                          test_ids[2]: {}}, actual_result_list)
+
+    def test_get_by_entities_empty(self):
+        self.assertEqual(
+            {}, db_api.driver_private_data_get_by_entities(self.ctxt, []))
+
     def test_delete_single(self):
         test_id = self._get_driver_test_data()
         test_key = "foo"
@@ -2118,6 +2222,46 @@ class ShareNetworkDatabaseAPITestCase(BaseDatabaseAPITestCase):
         self.assertEqual(1, len(result))
         self._check_fields(expected=share_nw_dict2, actual=result[0])
 
+    def test_get_all_by_project_with_filters(self):
+        share_nw_dict2 = dict(self.share_nw_dict)
+        share_nw_dict2['id'] = 'fake share nw id2'
+        share_nw_dict2['name'] = 'fake name'
+        share_nw_dict2['segmentation_id'] = 1001
+        db_api.share_network_create(self.fake_context, self.share_nw_dict)
+        db_api.share_network_create(self.fake_context, share_nw_dict2)
+
+        result = db_api.share_network_get_all_by_project(
+            self.fake_context, self.fake_context.project_id,
+            filters={'name~': 'fake', 'segmentation_id': 1001})
+
+        self.assertEqual(1, len(result))
+        self._check_fields(expected=share_nw_dict2, actual=result[0])
+
+    def test_get_all_by_project_with_invalid_filter(self):
+        self.assertRaises(exception.InvalidInput,
+                          db_api.share_network_get_all_by_project,
+                          self.fake_context, self.fake_context.project_id,
+                          filters={'fake_key': 'fake_value'})
+
+    def test_get_all_by_project_paginated(self):
+        ids = []
+        for i in range(3):
+            share_nw_dict = dict(self.share_nw_dict)
+            share_nw_dict['id'] = 'fake share nw id%s' % i
+            share_nw_dict['name'] = 'fake name%s' % i
+            db_api.share_network_create(self.fake_context, share_nw_dict)
+            ids.append(share_nw_dict['id'])
+
+        first_page = db_api.share_network_get_all_by_project(
+            self.fake_context, self.fake_context.project_id, limit=2,
+            sort_key='name', sort_dir='asc')
+        second_page = db_api.share_network_get_all_by_project(
+            self.fake_context, self.fake_context.project_id, limit=2,
+            marker=first_page[-1]['id'], sort_key='name', sort_dir='asc')
+
+        self.assertEqual(ids[:2], [n['id'] for n in first_page])
+        self.assertEqual(ids[2:], [n['id'] for n in second_page])
+
     def test_add_security_service(self):
         security_dict1 = {'id': 'fake security service id1',
                           'project_id': self.fake_context.project_id,
@@ -2549,6 +2693,49 @@ class ShareServerDatabaseAPITestCase(test.TestCase):
         servers = db_api.share_server_get_all(self.ctxt)
         self.assertEqual(2, len(servers))
 
+    def test_get_all_with_filters(self):
+        share_net = db_utils.create_share_network(
+            id='fake_sn_id', project_id='fake_project', name='fake_sn_name')
+        srv1 = db_utils.create_share_server(
+            share_network_id=share_net['id'], host='host1')
+        db_utils.create_share_server(
+            share_network_id=share_net['id'], host='host2')
+        db_utils.create_share_server(
+            share_network_id='fake_other_sn_id', host='host1')
+
+        servers = db_api.share_server_get_all(
+            self.ctxt, filters={'host': 'host1',
+                                'project_id': 'fake_project',
+                                'share_network': 'fake_sn_name'})
+
+        self.assertEqual([srv1['id']], [s['id'] for s in servers])
+
+    def test_get_all_paginated(self):
+        servers = [db_utils.create_share_server(host='host%s' % i)
+                   for i in range(4)]
+        ids = [s['id'] for s in servers]
+
+        first_page = db_api.share_server_get_all(
+            self.ctxt, limit=2, sort_key='host', sort_dir='asc')
+        second_page = db_api.share_server_get_all(
+            self.ctxt, limit=2, marker=first_page[-1]['id'],
+            sort_key='host', sort_dir='asc')
+
+        self.assertEqual(ids[:2], [s['id'] for s in first_page])
+        self.assertEqual(ids[2:], [s['id'] for s in second_page])
+
+    def test_get_all_updated_since(self):
+        now = timeutils.utcnow()
+        db_utils.create_share_server(
+            updated_at=now - datetime.timedelta(days=1))
+        srv = db_utils.create_share_server(updated_at=now)
+
+        servers = db_api.share_server_get_all(
+            self.ctxt,
+            filters={'updated_since': now - datetime.timedelta(hours=1)})
+
+        self.assertEqual([srv['id']], [s['id'] for s in servers])
+
     def test_backend_details_set(self):
         details = {
             'value1': '1',
@@ -2774,6 +2961,7 @@ class NetworkAllocationsDatabaseAPITestCase(test.TestCase):
             self.assertIn(na.label, ('admin', 'user', None))
 
 
+@ddt.ddt
 class ReservationDatabaseAPITest(test.TestCase):
 
     def setUp(self):
@@ -2804,6 +2992,101 @@ class ReservationDatabaseAPITest(test.TestCase):
         self.assertEqual(reservation['id'], reservations[0]['id'])
         self.assertEqual(2, quota_usage['reserved'])
 
+    def test_reservation_expire_batch(self):
+        quota_usage = db_api.quota_usage_create(self.context, 'fake_project',
+                                                'fake_user', 'fake_resource',
+                                                0, 12, until_refresh=None)
+        session = db_api.get_session()
+        expire = timeutils.utcnow() - datetime.timedelta(days=1)
+        for uuid in ('fake_uuid1', 'fake_uuid2', 'fake_uuid3'):
+            db_api._reservation_create(
+                self.context, uuid, quota_usage, 'fake_project',
+                'fake_user', 'fake_resource', 4, expire, session=session)
+
+        first = db_api.reservation_expire(self.context, batch_size=2)
+        second = db_api.reservation_expire(self.context, batch_size=2)
+        third = db_api.reservation_expire(self.context, batch_size=2)
+
+        quota_usage = db_api.quota_usage_get(self.context, 'fake_project',
+                                             'fake_resource')
+        self.assertEqual([2, 1, 0], [first, second, third])
+        self.assertEqual(0, quota_usage['reserved'])
+
+    @ddt.data(
+        {'user_id': 'fake_user'},
+        {'share_type_id': 'fake_share_type'},
+    )
+    def test__get_quota_usages(self, kwargs):
+        db_api.quota_usage_create(
+            self.context, 'fake_project', 'fake_user', 'shares', 3, 1,
+            until_refresh=None)
+        db_api.quota_usage_create(
+            self.context, 'fake_project', 'fake_other_user', 'shares', 4, 2,
+            until_refresh=None)
+        db_api.quota_usage_create(
+            self.context, 'fake_project', None, 'shares', 2, 0,
+            until_refresh=None, share_type_id='fake_share_type')
+        db_api.quota_usage_create(
+            self.context, 'fake_other_project', 'fake_user', 'shares', 7, 0,
+            until_refresh=None)
+        session = db_api.get_session()
+
+        with session.begin():
+            owner_usages, project_usages = db_api._get_quota_usages(
+                self.context, session, 'fake_project', **kwargs)
+
+        self.assertEqual(['shares'], list(owner_usages.keys()))
+        if kwargs.get('user_id'):
+            self.assertEqual('fake_user', owner_usages['shares'].user_id)
+            self.assertEqual(3, owner_usages['shares'].in_use)
+        else:
+            self.assertEqual(
+                'fake_share_type', owner_usages['shares'].share_type_id)
+            self.assertEqual(2, owner_usages['shares'].in_use)
+        self.assertEqual({}, project_usages)
+
+    def test__get_quota_usages_without_user(self):
+        db_api.quota_usage_create(
+            self.context, 'fake_project', None, 'gigabytes', 2, 0,
+            until_refresh=None)
+        db_api.quota_usage_create(
+            self.context, 'fake_project', 'fake_user', 'shares', 3, 1,
+            until_refresh=None)
+        session = db_api.get_session()
+
+        with session.begin():
+            owner_usages, project_usages = db_api._get_quota_usages(
+                self.context, session, 'fake_project', user_id='fake_user')
+
+        self.assertEqual(['shares'], list(owner_usages.keys()))
+        self.assertEqual('fake_user', owner_usages['shares'].user_id)
+        self.assertEqual({}, project_usages)
+
+    def test__get_user_and_share_type_quota_usages(self):
+        db_api.quota_usage_create(
+            self.context, 'fake_project', 'fake_user', 'shares', 3, 1,
+            until_refresh=None)
+        db_api.quota_usage_create(
+            self.context, 'fake_project', None, 'shares', 2, 0,
+            until_refresh=None, share_type_id='fake_share_type')
+        db_api.quota_usage_create(
+            self.context, 'fake_project', None, 'shares', 5, 0,
+            until_refresh=None, share_type_id='fake_other_share_type')
+        session = db_api.get_session()
+
+        with session.begin():
+            user_usages, st_usages = (
+                db_api._get_user_and_share_type_quota_usages(
+                    self.context, session, 'fake_project', 'fake_user',
+                    share_type_id='fake_share_type'))
+
+        self.assertEqual(['shares'], list(user_usages.keys()))
+        self.assertEqual(3, user_usages['shares'].in_use)
+        self.assertEqual('fake_user', user_usages['shares'].user_id)
+        self.assertEqual(2, st_usages['shares'].in_use)
+        self.assertEqual(
+            'fake_share_type', st_usages['shares'].share_type_id)
+
 
 @ddt.ddt
 class PurgeDeletedTest(test.TestCase):
@@ -3056,6 +3339,49 @@ class MessagesDatabaseAPITestCase(test.TestCase):
         result_ids = [r.id for r in result]
         self.assertEqual(result_ids, ids)
 
+    def test_message_get_all_paginated(self):
+        ids = []
+        for i in ['001', '002', '003', '004']:
+            msg = db_utils.create_message(project_id=self.project_id,
+                                          action_id=i)
+            ids.append(msg.id)
+
+        first_page = db_api.message_get_all(
+            self.ctxt, limit=2, sort_key='action_id')
+        second_page = db_api.message_get_all(
+            self.ctxt, limit=2, marker=first_page[-1]['id'],
+            sort_key='action_id')
+        with_offset = db_api.message_get_all(
+            self.ctxt, limit=2, offset=1, sort_key='action_id')
+
+        self.assertEqual(ids[:2], [r.id for r in first_page])
+        self.assertEqual(ids[2:], [r.id for r in second_page])
+        self.assertEqual(ids[1:3], [r.id for r in with_offset])
+
+    def test_message_get_all_marker_not_found(self):
+        self.assertRaises(exception.MarkerNotFound,
+                          db_api.message_get_all,
+                          self.ctxt, marker='fake_marker')
+
+    def test_message_get_all_invalid_sort_key(self):
+        self.assertRaises(exception.InvalidInput,
+                          db_api.message_get_all,
+                          self.ctxt, sort_key='fake_key')
+
+    def test_message_get_all_created_since(self):
+        now = timeutils.utcnow()
+        db_utils.create_message(
+            project_id=self.project_id, action_id='001',
+            created_at=now - datetime.timedelta(days=1))
+        msg = db_utils.create_message(
+            project_id=self.project_id, action_id='001', created_at=now)
+
+        result = db_api.message_get_all(
+            self.ctxt,
+            filters={'created_since': now - datetime.timedelta(hours=1)})
+
+        self.assertEqual([msg.id], [r.id for r in result])
+
     def test_cleanup_expired_messages(self):
         adm_context = self.ctxt.elevated()
 
@@ -3076,6 +3402,22 @@ class MessagesDatabaseAPITestCase(test.TestCase):
             messages = db_api.message_get_all(adm_context)
             self.assertEqual(2, len(messages))
 
+    def test_cleanup_expired_messages_batch(self):
+        adm_context = self.ctxt.elevated()
+        now = timeutils.utcnow()
+        for i in range(3):
+            db_utils.create_message(project_id=self.project_id,
+                                    action_id='001',
+                                    expires_at=now - datetime.timedelta(
+                                        days=1))
+
+        first = db_api.cleanup_expired_messages(adm_context, batch_size=2)
+        second = db_api.cleanup_expired_messages(adm_context, batch_size=2)
+        third = db_api.cleanup_expired_messages(adm_context, batch_size=2)
+
+        self.assertEqual([2, 1, 0], [first, second, third])
+        self.assertEqual([], db_api.message_get_all(adm_context))
+
 
 class BackendInfoDatabaseAPITestCase(test.TestCase):
 
@@ -0,0 +1,112 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Number of SQL statements run by the DB API calls listing resources."""
+
+import ddt
+from sqlalchemy import event
+
+from manila.common import constants
+from manila import context
+from manila.db.sqlalchemy import api as db_api
+from manila import test
+from manila.tests import db_utils
+
+
+@ddt.ddt
+class QueryCountTestCase(test.TestCase):
+    """Check that listing resources does not run statements per row.
+
+    Every call is made against a few and then against many more rows, and
+    must run the same number of statements in both cases.
+    """
+
+    def setUp(self):
+        super(QueryCountTestCase, self).setUp()
+        self.ctxt = context.get_admin_context()
+        self.engine = db_api.get_engine()
+
+    def _count_statements(self, method, *args, **kwargs):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context,
+                   executemany):
+            # Leave out the liveness checks of pooled connections.
+            if statement != 'SELECT 1':
+                statements.append(statement)
+
+        event.listen(self.engine, 'before_cursor_execute', record)
+        try:
+            result = method(self.ctxt, *args, **kwargs)
+        finally:
+            event.remove(self.engine, 'before_cursor_execute', record)
+        return len(statements), result
+
+    def _create_shares(self, count):
+        shares = []
+        for i in range(count):
+            share = db_utils.create_share(host='host1@backend1#pool1')
+            db_api.share_export_locations_update(
+                self.ctxt, share.instance['id'],
+                [{'path': 'fake_path_%d' % i, 'is_admin_only': False,
+                  'metadata': {'preferred': 'True'}}],
+                False)
+            db_utils.create_access(share_id=share['id'])
+            snapshot = db_utils.create_snapshot(share_id=share['id'])
+            db_utils.create_snapshot_instance(
+                snapshot['id'], share_instance_id=share.instance['id'],
+                status=constants.STATUS_AVAILABLE)
+            shares.append(share)
+        return shares
+
+    def _assert_constant_statements(self, method, *args, **kwargs):
+        self._create_shares(2)
+        few, result = self._count_statements(method, *args, **kwargs)
+        self.assertEqual(2, len(result))
+
+        self._create_shares(8)
+        many, result = self._count_statements(method, *args, **kwargs)
+        self.assertEqual(10, len(result))
+
+        self.assertEqual(few, many)
+
+    @ddt.data(True, False)
+    def test_share_instances_get_all_by_host(self, with_share_data):
+        self._assert_constant_statements(
+            db_api.share_instances_get_all_by_host, 'host1@backend1',
+            with_share_data=with_share_data)
+
+    def test_share_instances_get_all(self):
+        self._assert_constant_statements(db_api.share_instances_get_all)
+
+    def test_share_get_all(self):
+        self._assert_constant_statements(db_api.share_get_all)
+
+    def test_share_access_get_all_for_instance(self):
+        share = self._create_shares(1)[0]
+        few, result = self._count_statements(
+            db_api.share_access_get_all_for_instance, share.instance['id'])
+        self.assertEqual(1, len(result))
+
+        for i in range(9):
+            db_utils.create_access(share_id=share['id'],
+                                   access_to='10.0.0.%d' % i)
+        many, result = self._count_statements(
+            db_api.share_access_get_all_for_instance, share.instance['id'])
+        self.assertEqual(10, len(result))
+
+        self.assertEqual(few, many)
+
+    def test_share_snapshot_instance_get_all_with_filters(self):
+        self._assert_constant_statements(
+            db_api.share_snapshot_instance_get_all_with_filters,
+            {'statuses': constants.STATUS_AVAILABLE}, with_share_data=True)
@@ -0,0 +1,127 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Query plans of the frequently run DB API calls."""
+
+from oslo_utils import uuidutils
+import six
+from sqlalchemy import event
+
+from manila.common import constants
+from manila import context
+from manila.db.sqlalchemy import api as db_api
+from manila import test
+
+
+class QueryPlanTestCase(test.TestCase):
+    """Check that the hot DB API calls search their tables by index.
+
+    The statements run by a DB API call are recorded and explained with
+    their parameters inlined, since SQLite only plans prefix matches for
+    LIKE patterns known at prepare time. Case sensitive LIKE is enabled for
+    the explanation, as with the default collations of MySQL, so that
+    prefix matches on host names can be served by an index.
+    """
+
+    def setUp(self):
+        super(QueryPlanTestCase, self).setUp()
+        self.ctxt = context.get_admin_context()
+        self.engine = db_api.get_engine()
+        if self.engine.name != 'sqlite':
+            self.skipTest('Query plans are only checked with SQLite.')
+
+    @staticmethod
+    def _inline_parameters(statement, parameters):
+        def quote(value):
+            if value is None:
+                return 'NULL'
+            if isinstance(value, (int, float)):
+                return six.text_type(value)
+            return "'%s'" % six.text_type(value).replace("'", "''")
+
+        parts = statement.split('?')
+        if len(parts) != len(parameters) + 1:
+            raise ValueError(statement)
+        values = [quote(value) for value in parameters] + ['']
+        return ''.join(part + value for part, value in zip(parts, values))
+
+    def _get_query_plans(self, table_name, method, *args, **kwargs):
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context,
+                   executemany):
+            if not executemany and table_name in statement:
+                statements.append((statement, parameters))
+
+        event.listen(self.engine, 'before_cursor_execute', record)
+        try:
+            method(self.ctxt, *args, **kwargs)
+        finally:
+            event.remove(self.engine, 'before_cursor_execute', record)
+
+        connection = self.engine.raw_connection()
+        try:
+            cursor = connection.cursor()
+            cursor.execute('PRAGMA case_sensitive_like = 1')
+            plans = []
+            for statement, parameters in statements:
+                cursor.execute('EXPLAIN QUERY PLAN ' +
+                               self._inline_parameters(statement, parameters))
+                plans.append(' '.join(row[-1] for row in cursor.fetchall()))
+            cursor.execute('PRAGMA case_sensitive_like = 0')
+        finally:
+            connection.close()
+        return plans
+
+    def _assert_uses_index(self, index_name, table_name, method, *args,
+                           **kwargs):
+        plans = self._get_query_plans(table_name, method, *args, **kwargs)
+
+        self.assertTrue(plans)
+        self.assertIn(index_name, plans[0])
+        self.assertNotIn('SCAN %s ' % table_name, plans[0] + ' ')
+
+    def test_share_instances_get_all_by_host(self):
+        self._assert_uses_index(
+            'share_instances_host_deleted_idx', 'share_instances',
+            db_api.share_instances_get_all_by_host, 'fake_host@backend')
+
+    def test_share_access_get_all_for_instance(self):
+        self._assert_uses_index(
+            'share_instance_access_map_instance_id_state_idx',
+            'share_instance_access_map',
+            db_api.share_access_get_all_for_instance,
+            uuidutils.generate_uuid(),
+            filters={'state': constants.ACCESS_STATE_QUEUED_TO_APPLY})
+
+    def test_share_snapshot_instance_get_all_with_filters(self):
+        self._assert_uses_index(
+            'share_snapshot_instances_instance_id_status_idx',
+            'share_snapshot_instances',
+            db_api.share_snapshot_instance_get_all_with_filters,
+            {'share_instance_ids': uuidutils.generate_uuid(),
+             'statuses': constants.STATUS_AVAILABLE})
+
+    def test_cleanup_expired_messages(self):
+        self._assert_uses_index(
+            'messages_expires_at_idx', 'messages',
+            db_api.cleanup_expired_messages)
+
+    def test_reservation_expire(self):
+        self._assert_uses_index(
+            'reservations_deleted_expire_idx', 'reservations',
+            db_api.reservation_expire)
+
+    def test_network_allocations_get_by_ip_address(self):
+        self._assert_uses_index(
+            'network_allocations_ip_address_idx', 'network_allocations',
+            db_api.network_allocations_get_by_ip_address, '10.0.0.1')
@@ -0,0 +1,160 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import mock
+from sqlalchemy import event
+
+from manila import context
+from manila.db.sqlalchemy import api as db_api
+from manila.db.sqlalchemy import query_stats
+from manila import test
+from manila.tests import db_utils
+
+
+class QueryStatsTestCase(test.TestCase):
+
+    def setUp(self):
+        super(QueryStatsTestCase, self).setUp()
+        self.ctxt = context.RequestContext(
+            'fake_user', 'fake_project', is_admin=True,
+            request_id='req-fake')
+
+    def _setup_engine(self):
+        engine = db_api.get_engine()
+        query_stats.setup_engine(engine)
+        self.addCleanup(event.remove, engine, 'before_cursor_execute',
+                        query_stats._before_cursor_execute)
+        self.addCleanup(event.remove, engine, 'after_cursor_execute',
+                        query_stats._after_cursor_execute)
+
+    def test_query_stats(self):
+        stats = query_stats.QueryStats()
+        stats.add('share_get', 1, 0.5)
+        stats.add('share_get', 1, 0.25)
+        stats.add('share_instances_get_all', 10, 1.0)
+        stats.add('share_update', 0, 0.125)
+        stats.add('service_get', 1, 0.0625)
+
+        result = stats.to_dict()
+        self.assertEqual(5, result['statements'])
+        self.assertEqual(13, result['rows'])
+        self.assertEqual(1.9375, result['elapsed'])
+        self.assertEqual(
+            {'statements': 2, 'rows': 2, 'elapsed': 0.75},
+            result['functions']['share_get'])
+        self.assertEqual(
+            '5 statements, 13 rows, 1.938s in database '
+            '(share_instances_get_all: 1/1.000s, share_get: 2/0.750s, '
+            'share_update: 1/0.125s)', stats.summary())
+
+    def test_get_stats(self):
+        stats = query_stats.get_stats(self.ctxt)
+
+        self.assertIsInstance(stats, query_stats.QueryStats)
+        self.assertIs(stats, self.ctxt.db_stats)
+        self.assertIs(stats, query_stats.get_stats(self.ctxt))
+        self.assertIs(stats, query_stats.get_stats(self.ctxt.elevated()))
+        self.assertIsNone(query_stats.get_stats(object()))
+
+    def test_profiled_backend(self):
+        backend = mock.Mock(spec=['share_get'])
+        backend.share_get.side_effect = (
+            lambda *args: query_stats._local.current)
+        profiled = query_stats.ProfiledBackend(backend)
+
+        result = profiled.share_get(self.ctxt, 'fake_id')
+
+        self.assertEqual(('share_get', self.ctxt.db_stats, 'req-fake'),
+                         result)
+        backend.share_get.assert_called_once_with(self.ctxt, 'fake_id')
+        self.assertIsNone(query_stats._local.current)
+
+    def test_profiled_backend_nested_calls(self):
+        profiled = query_stats.ProfiledBackend(mock.Mock())
+        profiled._backend.share_get.side_effect = (
+            lambda ctxt: profiled.share_instance_get(ctxt))
+        profiled._backend.share_instance_get.side_effect = (
+            lambda ctxt: query_stats._local.current[0])
+
+        self.assertEqual('share_get', profiled.share_get(self.ctxt))
+        self.assertIsNone(query_stats._local.current)
+
+    def test_profiled_endpoint(self):
+        class FakeManager(object):
+            target = 'fake_target'
+
+            def create_share_instance(self, ctxt, share_instance_id):
+                query_stats.get_stats(ctxt).add(
+                    'share_instance_get', 1, 0.25)
+                return 'fake_result'
+
+        endpoint = FakeManager()
+        self.ctxt.db_stats = query_stats.QueryStats()
+        self.ctxt.db_stats.add('share_get', 1, 0.5)
+        mock_log = self.mock_object(query_stats.LOG, 'info')
+        profiled = query_stats.ProfiledEndpoint(endpoint)
+
+        result = profiled.create_share_instance(
+            self.ctxt, share_instance_id='fake_id')
+
+        self.assertEqual('fake_result', result)
+        self.assertEqual('fake_target', profiled.target)
+        self.assertEqual(1, self.ctxt.db_stats.statements)
+        mock_log.assert_called_once_with(
+            '%(operation)s: %(summary)s',
+            {'operation': 'FakeManager.create_share_instance',
+             'summary': self.ctxt.db_stats.summary()})
+
+    def test_log_summary_nothing_recorded(self):
+        mock_log = self.mock_object(query_stats.LOG, 'info')
+
+        query_stats.log_summary(self.ctxt, 'fake_operation')
+        query_stats.log_summary(None, 'fake_operation')
+
+        mock_log.assert_not_called()
+
+    def test_engine_statements(self):
+        self._setup_engine()
+        db_utils.create_share()
+        profiled = query_stats.ProfiledBackend(db_api)
+
+        shares = profiled.share_get_all(self.ctxt)
+
+        self.assertEqual(1, len(shares))
+        stats = self.ctxt.db_stats
+        self.assertIn('share_get_all', stats.functions)
+        self.assertEqual(stats.statements,
+                         stats.functions['share_get_all'][0])
+        self.assertGreater(stats.statements, 0)
+
+    def test_engine_slow_statements(self):
+        self.flags(db_slow_query_threshold=1e-9)
+        self._setup_engine()
+        mock_log = self.mock_object(query_stats.LOG, 'warning')
+        profiled = query_stats.ProfiledBackend(db_api)
+
+        profiled.share_get_all(self.ctxt)
+
+        self.assertTrue(mock_log.called)
+        args = mock_log.call_args[0][1]
+        self.assertEqual('share_get_all', args['function'])
+        self.assertEqual('req-fake', args['request_id'])
+        self.assertTrue(args['statement'].startswith('SELECT shares.'))
+
+    def test_engine_statements_outside_db_api(self):
+        self._setup_engine()
+        mock_log = self.mock_object(query_stats.LOG, 'warning')
+
+        db_api.share_get_all(self.ctxt)
+
+        self.assertIsNone(self.ctxt.db_stats)
+        mock_log.assert_not_called()
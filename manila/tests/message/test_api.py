@@ -85,7 +85,8 @@ class MessageApiTest(test.TestCase):
         self.message_api.get_all(self.ctxt)
 
         self.message_api.db.message_get_all.assert_called_once_with(
-            self.ctxt, filters={}, sort_dir=None, sort_key=None)
+            self.ctxt, filters={}, limit=None, offset=None, marker=None,
+            sort_dir=None, sort_key=None)
 
     def test_delete(self):
         self.message_api.delete(self.ctxt, 'fake_id')
@@ -97,6 +98,27 @@ class MessageApiTest(test.TestCase):
         admin_context = mock.Mock()
         self.mock_object(self.ctxt, 'elevated',
                          mock.Mock(return_value=admin_context))
-        self.message_api.cleanup_expired_messages(self.ctxt)
+        self.message_api.db.cleanup_expired_messages.return_value = 3
+        self.mock_object(message_api.time, 'sleep')
+
+        result = self.message_api.cleanup_expired_messages(self.ctxt)
+
+        self.assertEqual(3, result)
         self.message_api.db.cleanup_expired_messages.assert_called_once_with(
-            admin_context)
+            admin_context, batch_size=CONF.message_reap_batch_size)
+        self.assertFalse(message_api.time.sleep.called)
+
+    def test_cleanup_expired_messages_in_batches(self):
+        admin_context = mock.Mock()
+        self.mock_object(self.ctxt, 'elevated',
+                         mock.Mock(return_value=admin_context))
+        self.message_api.db.cleanup_expired_messages.side_effect = [2, 2, 0]
+        self.mock_object(message_api.time, 'sleep')
+
+        result = self.message_api.cleanup_expired_messages(
+            self.ctxt, batch_size=2, batch_delay=0.5)
+
+        self.assertEqual(4, result)
+        self.message_api.db.cleanup_expired_messages.assert_has_calls(
+            [mock.call(admin_context, batch_size=2)] * 3)
+        message_api.time.sleep.assert_has_calls([mock.call(0.5)] * 2)
@@ -98,8 +98,9 @@ class TestABCDriver(TestBase):
         self.ip_dev.assert_has_calls(
             [mock.call('tap0', namespace=ns),
              mock.call().addr.list(scope='global', filters=['permanent']),
-             mock.call().addr.add(4, '192.168.1.2/24', '192.168.1.255'),
-             mock.call().addr.delete(4, '172.16.77.240/24')])
+             mock.call().addr.batch(
+                 add=[('192.168.1.2/24', '192.168.1.255')],
+                 delete=['172.16.77.240/24'])])
 
 
 class TestOVSInterfaceDriver(TestBase):
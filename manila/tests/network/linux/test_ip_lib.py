@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import socket
+
 import mock
 
 from manila.network.linux import ip_lib
@@ -105,6 +107,26 @@ SUBNET_SAMPLE1 = ("10.0.0.0/24 dev qr-23380d11-d2  scope link  src 10.0.0.1\n"
 SUBNET_SAMPLE2 = ("10.0.0.0/24 dev tap1d7888a7-10  scope link  src 10.0.0.2\n"
                   "10.0.0.0/24 dev qr-23380d11-d2  scope link  src 10.0.0.1")
 
+ADDR_DUMP_SAMPLE = [
+    "1: lo    inet 127.0.0.1/8 scope host lo\\       valid_lft forever "
+    "preferred_lft forever",
+    "2: eth0    inet 172.16.77.240/24 brd 172.16.77.255 scope global eth0\\"
+    "       valid_lft forever preferred_lft forever",
+    "2: eth0    inet6 fe80::dfcc:aaff:feb9:76ce/64 scope link \\       "
+    "valid_lft forever preferred_lft forever",
+    "3: tap0@if5    inet 10.254.0.4/28 scope global tap0\\       "
+    "valid_lft forever preferred_lft forever",
+]
+
+
+class FakeNetlinkMessage(dict):
+    def __init__(self, attrs=None, **kwargs):
+        super(FakeNetlinkMessage, self).__init__(**kwargs)
+        self.attrs = attrs or {}
+
+    def get_attr(self, name):
+        return self.attrs.get(name)
+
 
 class TestSubProcessBase(test.TestCase):
     def setUp(self):
@@ -154,6 +176,36 @@ class TestSubProcessBase(test.TestCase):
                                              'ip', 'link', 'list',
                                              run_as_root=True)
 
+    def test_as_root_batch(self):
+        base = ip_lib.SubProcessBase()
+        base._as_root_batch([('addr', ('add', '10.0.0.2/24', 'dev', 'tap0')),
+                             ('route', ('del', '10.0.0.0/24', 'dev', 'br0'))])
+        self.execute.assert_called_once_with(
+            'ip', '-batch', '-',
+            process_input=('addr add 10.0.0.2/24 dev tap0\n'
+                           'route del 10.0.0.0/24 dev br0\n'),
+            run_as_root=True)
+
+    def test_as_root_batch_namespace(self):
+        base = ip_lib.SubProcessBase('ns')
+        base._as_root_batch([('link', ('set', 'lo', 'up')),
+                             ('link', ('set', 'eth0', 'mtu', 1500))])
+        self.execute.assert_called_once_with(
+            'ip', 'netns', 'exec', 'ns', 'ip', '-batch', '-',
+            process_input='link set lo up\nlink set eth0 mtu 1500\n',
+            run_as_root=True)
+
+    def test_as_root_batch_single_command(self):
+        base = ip_lib.SubProcessBase()
+        base._as_root_batch([('link', ('set', 'lo', 'up'))])
+        self.execute.assert_called_once_with('ip', 'link', 'set', 'lo', 'up',
+                                             run_as_root=True)
+
+    def test_as_root_batch_no_commands(self):
+        base = ip_lib.SubProcessBase()
+        base._as_root_batch([])
+        self.assertFalse(self.execute.called)
+
 
 class TestIpWrapper(test.TestCase):
     def setUp(self):
@@ -189,6 +241,103 @@ class TestIpWrapper(test.TestCase):
 
         self.execute.assert_called_once_with('o', 'link', ('list',), None)
 
+    def test_get_devices_addresses(self):
+        self.mock_object(ip_lib, 'pyroute2', None)
+        self.execute.return_value = '\n'.join(ADDR_DUMP_SAMPLE)
+
+        retval = ip_lib.IPWrapper().get_devices_addresses(
+            exclude_loopback=True)
+
+        self.assertEqual(
+            {'eth0': [dict(cidr='172.16.77.240/24',
+                           broadcast='172.16.77.255',
+                           scope='global',
+                           ip_version=4,
+                           dynamic=False),
+                      dict(cidr='fe80::dfcc:aaff:feb9:76ce/64',
+                           broadcast='::',
+                           scope='link',
+                           ip_version=6,
+                           dynamic=False)],
+             'tap0': [dict(cidr='10.254.0.4/28',
+                           broadcast='10.254.0.15',
+                           scope='global',
+                           ip_version=4,
+                           dynamic=False)]},
+            retval)
+        self.execute.assert_called_once_with('o', 'addr', ('show',), None)
+
+    def test_get_devices_addresses_netlink(self):
+        ipr = mock.MagicMock()
+        ipr.__enter__.return_value = ipr
+        ipr.get_links.return_value = [
+            FakeNetlinkMessage({'IFLA_IFNAME': 'lo'}, index=1),
+            FakeNetlinkMessage({'IFLA_IFNAME': 'eth0'}, index=2),
+            FakeNetlinkMessage({'IFLA_IFNAME': 'tap0'}, index=3),
+        ]
+        ipr.get_addr.return_value = [
+            FakeNetlinkMessage(
+                {'IFA_ADDRESS': '127.0.0.1', 'IFA_LOCAL': '127.0.0.1'},
+                index=1, family=socket.AF_INET, prefixlen=8, scope=254,
+                flags=0x80),
+            FakeNetlinkMessage(
+                {'IFA_ADDRESS': '172.16.77.240', 'IFA_LOCAL': '172.16.77.240',
+                 'IFA_BROADCAST': '172.16.77.255'},
+                index=2, family=socket.AF_INET, prefixlen=24, scope=0,
+                flags=0),
+            FakeNetlinkMessage(
+                {'IFA_ADDRESS': 'fe80::dfcc:aaff:feb9:76ce',
+                 'IFA_FLAGS': 0x80},
+                index=2, family=socket.AF_INET6, prefixlen=64, scope=253,
+                flags=0),
+        ]
+        pyroute2 = mock.Mock()
+        pyroute2.IPRoute.return_value = ipr
+        self.mock_object(ip_lib, 'pyroute2', pyroute2)
+
+        retval = ip_lib.IPWrapper().get_devices_addresses()
+
+        self.assertEqual(
+            {'lo': [dict(cidr='127.0.0.1/8',
+                         broadcast='127.255.255.255',
+                         scope='host',
+                         ip_version=4,
+                         dynamic=False)],
+             'eth0': [dict(cidr='172.16.77.240/24',
+                           broadcast='172.16.77.255',
+                           scope='global',
+                           ip_version=4,
+                           dynamic=True),
+                      dict(cidr='fe80::dfcc:aaff:feb9:76ce/64',
+                           broadcast='::',
+                           scope='link',
+                           ip_version=6,
+                           dynamic=False)],
+             'tap0': []},
+            retval)
+        self.assertFalse(self.execute.called)
+
+    def test_get_devices_addresses_netlink_error(self):
+        pyroute2 = mock.Mock()
+        pyroute2.IPRoute.side_effect = OSError('Operation not permitted')
+        self.mock_object(ip_lib, 'pyroute2', pyroute2)
+        self.execute.return_value = '\n'.join(ADDR_DUMP_SAMPLE)
+
+        retval = ip_lib.IPWrapper().get_devices_addresses()
+
+        self.assertEqual(['eth0', 'lo', 'tap0'], sorted(retval))
+        self.execute.assert_called_once_with('o', 'addr', ('show',), None)
+
+    def test_get_devices_addresses_namespace(self):
+        pyroute2 = mock.Mock()
+        self.mock_object(ip_lib, 'pyroute2', pyroute2)
+        self.execute.return_value = '\n'.join(ADDR_DUMP_SAMPLE)
+
+        ip_lib.IPWrapper('ns').get_devices_addresses()
+
+        self.assertFalse(pyroute2.IPRoute.called)
+        self.execute.assert_called_once_with('o', 'addr', ('show',), 'ns')
+
     def test_get_namespaces(self):
         self.execute.return_value = '\n'.join(NETNS_SAMPLE)
         retval = ip_lib.IPWrapper.get_namespaces()
@@ -515,6 +664,14 @@ class TestIpAddrCommand(TestIPCmdBase):
         self.addr_cmd.flush()
         self._assert_sudo([], ('flush', 'tap0'))
 
+    def test_batch(self):
+        self.addr_cmd.batch(add=[('192.168.45.100/24', '192.168.45.255')],
+                            delete=['10.0.0.2/24'])
+        self.parent._as_root_batch.assert_called_once_with([
+            ('addr', ('add', '192.168.45.100/24', 'brd', '192.168.45.255',
+                      'scope', 'global', 'dev', 'tap0')),
+            ('addr', ('del', '10.0.0.2/24', 'dev', 'tap0'))])
+
     def test_list(self):
         expected = [
             dict(ip_version=4, scope='global',
@@ -610,9 +767,10 @@ class TestIpRouteCommand(TestIPCmdBase):
 
         self.parent._run = mock.Mock(side_effect=pullup_side_effect)
         self.route_cmd.pullup_route('tap1d7888a7-10')
-        self._assert_sudo([], ('del', '10.0.0.0/24', 'dev', 'qr-23380d11-d2'))
-        self._assert_sudo([], ('append', '10.0.0.0/24', 'proto', 'kernel',
-                               'src', '10.0.0.1', 'dev', 'qr-23380d11-d2'))
+        self.parent._as_root_batch.assert_called_once_with([
+            ('route', ('del', '10.0.0.0/24', 'dev', 'qr-23380d11-d2')),
+            ('route', ('append', '10.0.0.0/24', 'proto', 'kernel',
+                       'src', '10.0.0.1', 'dev', 'qr-23380d11-d2'))])
 
     def test_pullup_route_first(self):
         # interface is first in the list - no changes
@@ -650,18 +808,20 @@ class TestIpRouteCommand(TestIPCmdBase):
             'delete', '10.0.0.0/24', 'dev', 'br-ex')
 
     def test_clear_outdated_routes(self):
-        self.route_cmd.delete_net_route = mock.Mock()
         list_result = [{'Destination': 'default',
                         'Device': 'eth0',
                         'Gateway': '172.24.47.1'},
                        {'Destination': '10.0.0.0/24',
                         'Device': 'eth0'},
                        {'Destination': '10.0.0.0/24',
-                        'Device': 'br-ex'}]
+                        'Device': 'br-ex'},
+                       {'Destination': '10.0.0.0/24',
+                        'Device': 'br-int'}]
         self.route_cmd.list = mock.Mock(return_value=list_result)
         self.route_cmd.clear_outdated_routes('10.0.0.0/24')
-        self.route_cmd.delete_net_route.assert_called_once_with(
-            '10.0.0.0/24', 'br-ex')
+        self.parent._as_root_batch.assert_called_once_with([
+            ('route', ('delete', '10.0.0.0/24', 'dev', 'br-ex')),
+            ('route', ('delete', '10.0.0.0/24', 'dev', 'br-int'))])
 
 
 class TestIpNetnsCommand(TestIPCmdBase):
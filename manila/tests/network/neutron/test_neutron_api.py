@@ -14,10 +14,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
+import fixtures
 import mock
 from neutronclient.common import exceptions as neutron_client_exc
 from neutronclient.v2_0 import client as clientv20
 from oslo_config import cfg
+from oslo_utils import timeutils
 
 from manila.db import base
 from manila import exception
@@ -68,6 +72,9 @@ class FakeNeutronClient(object):
     def update_port(self, port_id, body):
         return body
 
+    def update_subnet(self, subnet_id, body):
+        return body
+
     def add_interface_router(self, router_id, subnet_id, port_id):
         pass
 
@@ -263,6 +270,48 @@ class NeutronApiTest(test.TestCase):
         self.assertTrue(clientv20.Client.called)
         self.assertTrue(self.neutron_api.client.create_port.called)
 
+    def test_create_ports(self):
+        self.mock_object(self.neutron_api, '_has_port_binding_extension',
+                         mock.Mock(return_value=True))
+        self.mock_object(self.neutron_api.client, 'create_port',
+                         mock.Mock(side_effect=lambda body: body))
+
+        ports = self.neutron_api.create_ports(
+            'test tenant', 'test net', count=2, host_id='test host',
+            subnet_id='test subnet', device_owner='test owner')
+
+        self.assertEqual(2, len(ports))
+        self.assertIsNot(ports[0], ports[1])
+        for port in ports:
+            self.assertEqual('test tenant', port['tenant_id'])
+            self.assertEqual('test net', port['network_id'])
+            self.assertEqual('test host', port['binding:host_id'])
+            self.assertEqual([{'subnet_id': 'test subnet'}],
+                             port['fixed_ips'])
+            self.assertEqual('test owner', port['device_owner'])
+        self.neutron_api.client.create_port.assert_called_once_with(
+            {'ports': ports})
+
+    @mock.patch.object(neutron_api.LOG, 'exception', mock.Mock())
+    def test_create_ports_exception_status_409(self):
+        self.mock_object(
+            self.neutron_api.client, 'create_port',
+            mock.Mock(side_effect=neutron_client_exc.NeutronClientException(
+                status_code=409)))
+
+        self.assertRaises(exception.PortLimitExceeded,
+                          self.neutron_api.create_ports,
+                          'test tenant', 'test net', count=2)
+        self.assertTrue(neutron_api.LOG.exception.called)
+
+    def test_client_reused(self):
+        client = self.neutron_api.client
+
+        self.assertIs(client, self.neutron_api.client)
+        clientv20.Client.assert_called_once_with(
+            session=mock.ANY, auth=mock.ANY, endpoint_type=mock.ANY,
+            region_name=mock.ANY)
+
     def test_delete_port(self):
         # Set up test data
         self.mock_object(self.neutron_api.client, 'delete_port')
@@ -341,6 +390,76 @@ class NeutronApiTest(test.TestCase):
         self.neutron_api.client.show_subnet.assert_called_once_with(
             subnet_id)
 
+    def test_get_network_cached(self):
+        with test_utils.create_temp_config_with_opts(
+                {'neutron': {'metadata_cache_ttl': 60}}):
+            self.neutron_api = neutron_api.API()
+        self.useFixture(fixtures.MonkeyPatch(
+            'oslo_utils.timeutils.utcnow.override_time',
+            datetime.datetime(2018, 1, 1)))
+        self.mock_object(
+            self.neutron_api.client, 'show_network',
+            mock.Mock(return_value={'network': {'id': 'fake_net_id'}}))
+
+        network = self.neutron_api.get_network('fake_net_id')
+        network['mtu'] = 1500
+
+        self.assertEqual({'id': 'fake_net_id'},
+                         self.neutron_api.get_network('fake_net_id'))
+        self.neutron_api.client.show_network.assert_called_once_with(
+            'fake_net_id')
+
+        timeutils.advance_time_seconds(60)
+        self.neutron_api.get_network('fake_net_id')
+        self.neutron_api.get_network('fake_net_id', use_cache=False)
+
+        self.assertEqual(3, self.neutron_api.client.show_network.call_count)
+
+    def test_get_network_cache_disabled(self):
+        self.mock_object(
+            self.neutron_api.client, 'show_network',
+            mock.Mock(return_value={'network': {'id': 'fake_net_id'}}))
+
+        self.neutron_api.get_network('fake_net_id')
+        self.neutron_api.get_network('fake_net_id')
+
+        self.assertEqual(2, self.neutron_api.client.show_network.call_count)
+
+    def test_update_subnet_invalidates_cache(self):
+        with test_utils.create_temp_config_with_opts(
+                {'neutron': {'metadata_cache_ttl': 60}}):
+            self.neutron_api = neutron_api.API()
+        subnet = {'id': 'fake_subnet_id', 'network_id': 'fake_net_id',
+                  'name': ''}
+        self.mock_object(self.neutron_api.client, 'show_subnet',
+                         mock.Mock(return_value={'subnet': subnet}))
+        self.mock_object(
+            self.neutron_api.client, 'show_network',
+            mock.Mock(return_value={'network': {'id': 'fake_net_id'}}))
+        self.mock_object(self.neutron_api.client, 'update_subnet',
+                         mock.Mock(return_value={}))
+        self.neutron_api.get_subnet('fake_subnet_id')
+        self.neutron_api.get_network('fake_net_id')
+
+        self.neutron_api.update_subnet('fake_subnet_id', 'fake_name')
+        self.neutron_api.get_subnet('fake_subnet_id')
+        self.neutron_api.get_network('fake_net_id')
+
+        self.assertEqual(2, self.neutron_api.client.show_subnet.call_count)
+        self.assertEqual(2, self.neutron_api.client.show_network.call_count)
+
+    def test_metadata_cache_evicts_least_recently_used(self):
+        cache = neutron_api.MetadataCache(60, max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+
+        cache.set('c', 3)
+
+        self.assertEqual(1, cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(3, cache.get('c'))
+
     def test_get_all_network(self):
         # Set up test data
         fake_networks = [{'fake network': 'fake network info'}]
@@ -215,8 +215,8 @@ class NeutronNetworkPluginTest(test.TestCase):
             self.plugin,
             '_save_neutron_subnet_data').start()
 
-        with mock.patch.object(self.plugin.neutron_api, 'create_port',
-                               mock.Mock(return_value=fake_neutron_port)):
+        with mock.patch.object(self.plugin.neutron_api, 'create_ports',
+                               mock.Mock(return_value=[fake_neutron_port])):
             self.plugin.allocate_network(
                 self.fake_context,
                 fake_share_server,
@@ -228,8 +228,9 @@ class NeutronNetworkPluginTest(test.TestCase):
                                                  fake_share_network)
             save_subnet_data.assert_called_once_with(self.fake_context,
                                                      fake_share_network)
-            self.plugin.neutron_api.create_port.assert_called_once_with(
+            self.plugin.neutron_api.create_ports.assert_called_once_with(
                 fake_share_network['project_id'],
+                count=1,
                 network_id=fake_share_network['neutron_net_id'],
                 subnet_id=fake_share_network['neutron_subnet_id'],
                 device_owner='manila:share',
@@ -258,32 +259,26 @@ class NeutronNetworkPluginTest(test.TestCase):
             self.plugin,
             '_save_neutron_subnet_data').start()
 
-        with mock.patch.object(self.plugin.neutron_api, 'create_port',
-                               mock.Mock(return_value=fake_neutron_port)):
+        with mock.patch.object(self.plugin.neutron_api, 'create_ports',
+                               mock.Mock(return_value=[fake_neutron_port,
+                                                       fake_neutron_port])):
             self.plugin.allocate_network(
                 self.fake_context,
                 fake_share_server,
                 fake_share_network,
                 count=2)
 
-            neutron_api_calls = [
-                mock.call(fake_share_network['project_id'],
-                          network_id=fake_share_network['neutron_net_id'],
-                          subnet_id=fake_share_network['neutron_subnet_id'],
-                          device_owner='manila:share',
-                          device_id=fake_share_network['id']),
-                mock.call(fake_share_network['project_id'],
-                          network_id=fake_share_network['neutron_net_id'],
-                          subnet_id=fake_share_network['neutron_subnet_id'],
-                          device_owner='manila:share',
-                          device_id=fake_share_network['id']),
-            ]
             db_api_calls = [
                 mock.call(self.fake_context, fake_network_allocation),
                 mock.call(self.fake_context, fake_network_allocation)
             ]
-            self.plugin.neutron_api.create_port.assert_has_calls(
-                neutron_api_calls)
+            self.plugin.neutron_api.create_ports.assert_called_once_with(
+                fake_share_network['project_id'],
+                count=2,
+                network_id=fake_share_network['neutron_net_id'],
+                subnet_id=fake_share_network['neutron_subnet_id'],
+                device_owner='manila:share',
+                device_id=fake_share_network['id'])
             db_api.network_allocation_create.assert_has_calls(db_api_calls)
 
             has_provider_nw_ext.stop()
@@ -301,7 +296,7 @@ class NeutronNetworkPluginTest(test.TestCase):
             self.plugin,
             '_save_neutron_subnet_data').start()
         create_port = mock.patch.object(self.plugin.neutron_api,
-                                        'create_port').start()
+                                        'create_ports').start()
         create_port.side_effect = exception.NetworkException
 
         self.assertRaises(exception.NetworkException,
@@ -659,29 +654,41 @@ class NeutronBindNetworkPluginTest(test.TestCase):
             return plugin.NeutronBindNetworkPlugin()
 
     def test_wait_for_bind(self):
-        self.mock_object(self.bind_plugin.neutron_api, 'show_port')
-        self.bind_plugin.neutron_api.show_port.return_value = fake_neutron_port
+        self.mock_object(self.bind_plugin.neutron_api, 'list_ports')
+        self.bind_plugin.neutron_api.list_ports.return_value = [
+            fake_neutron_port]
 
         self.bind_plugin._wait_for_ports_bind([fake_neutron_port],
                                               fake_share_server)
 
-        self.bind_plugin.neutron_api.show_port.assert_called_once_with(
-            fake_neutron_port['id'])
+        self.bind_plugin.neutron_api.list_ports.assert_called_once_with(
+            id=[fake_neutron_port['id']])
         self.sleep_mock.assert_not_called()
 
     def test_wait_for_bind_error(self):
         fake_neut_port = copy.copy(fake_neutron_port)
         fake_neut_port['status'] = 'ERROR'
-        self.mock_object(self.bind_plugin.neutron_api, 'show_port')
-        self.bind_plugin.neutron_api.show_port.return_value = fake_neut_port
+        self.mock_object(self.bind_plugin.neutron_api, 'list_ports')
+        self.bind_plugin.neutron_api.list_ports.return_value = [
+            fake_neut_port]
 
         self.assertRaises(exception.NetworkException,
                           self.bind_plugin._wait_for_ports_bind,
                           [fake_neut_port, fake_neut_port],
                           fake_share_server)
 
-        self.bind_plugin.neutron_api.show_port.assert_called_once_with(
-            fake_neutron_port['id'])
+        self.bind_plugin.neutron_api.list_ports.assert_called_once_with(
+            id=[fake_neutron_port['id'], fake_neutron_port['id']])
+        self.sleep_mock.assert_not_called()
+
+    def test_wait_for_bind_port_not_found(self):
+        self.mock_object(self.bind_plugin.neutron_api, 'list_ports',
+                         mock.Mock(return_value=[]))
+
+        self.assertRaises(exception.NetworkException,
+                          self.bind_plugin._wait_for_ports_bind,
+                          [fake_neutron_port],
+                          fake_share_server)
         self.sleep_mock.assert_not_called()
 
     @ddt.data(('DOWN', 'ACTIVE'), ('DOWN', 'DOWN'), ('ACTIVE', 'DOWN'))
@@ -689,15 +696,18 @@ class NeutronBindNetworkPluginTest(test.TestCase):
         fake_neut_port1 = copy.copy(fake_neutron_port)
         fake_neut_port1['status'] = state[0]
         fake_neut_port2 = copy.copy(fake_neutron_port)
+        fake_neut_port2['id'] = 'test_port_id_2'
         fake_neut_port2['status'] = state[1]
-        self.mock_object(self.bind_plugin.neutron_api, 'show_port')
-        self.bind_plugin.neutron_api.show_port.side_effect = (
-            [fake_neut_port1, fake_neut_port2] * 20)
+        self.mock_object(self.bind_plugin.neutron_api, 'list_ports')
+        self.bind_plugin.neutron_api.list_ports.return_value = [
+            fake_neut_port1, fake_neut_port2]
 
         self.assertRaises(exception.NetworkBindException,
                           self.bind_plugin._wait_for_ports_bind,
                           [fake_neut_port1, fake_neut_port2],
                           fake_share_server)
+        self.assertEqual(
+            20, self.bind_plugin.neutron_api.list_ports.call_count)
 
     @mock.patch.object(db_api, 'share_network_get',
                        mock.Mock(return_value=fake_share_network))
@@ -720,8 +730,8 @@ class NeutronBindNetworkPluginTest(test.TestCase):
         self.bind_plugin.neutron_api.get_network.return_value = (
             fake_neutron_network)
 
-        with mock.patch.object(self.bind_plugin.neutron_api, 'create_port',
-                               mock.Mock(return_value=fake_neutron_port)):
+        with mock.patch.object(self.bind_plugin.neutron_api, 'create_ports',
+                               mock.Mock(return_value=[fake_neutron_port])):
             self.bind_plugin.allocate_network(
                 self.fake_context,
                 fake_share_server,
@@ -741,8 +751,9 @@ class NeutronBindNetworkPluginTest(test.TestCase):
                 'device_owner': 'manila:share',
                 'device_id': fake_share_network['id'],
             }
-            self.bind_plugin.neutron_api.create_port.assert_called_once_with(
-                fake_share_network['project_id'], **expected_kwargs)
+            self.bind_plugin.neutron_api.create_ports.assert_called_once_with(
+                fake_share_network['project_id'], count=1,
+                **expected_kwargs)
             db_api.network_allocation_create.assert_called_once_with(
                 self.fake_context,
                 fake_network_allocation)
@@ -801,8 +812,8 @@ class NeutronBindNetworkPluginTest(test.TestCase):
             fake_neutron_network_multi)
         self.mock_object(db_api, 'share_network_update')
 
-        with mock.patch.object(self.bind_plugin.neutron_api, 'create_port',
-                               mock.Mock(return_value=fake_neutron_port)):
+        with mock.patch.object(self.bind_plugin.neutron_api, 'create_ports',
+                               mock.Mock(return_value=[fake_neutron_port])):
             self.bind_plugin.allocate_network(
                 self.fake_context,
                 fake_share_server,
@@ -821,8 +832,9 @@ class NeutronBindNetworkPluginTest(test.TestCase):
                 'device_owner': 'manila:share',
                 'device_id': fake_share_network_multi['id']
             }
-            self.bind_plugin.neutron_api.create_port.assert_called_once_with(
-                fake_share_network_multi['project_id'], **expected_kwargs)
+            self.bind_plugin.neutron_api.create_ports.assert_called_once_with(
+                fake_share_network_multi['project_id'], count=1,
+                **expected_kwargs)
             db_api.network_allocation_create.assert_called_once_with(
                 self.fake_context,
                 fake_network_allocation_multi)
@@ -1181,29 +1193,41 @@ class NeutronBindSingleNetworkPluginTest(test.TestCase):
         self.assertFalse(instance.db.share_network_update.called)
 
     def test_wait_for_bind(self):
-        self.mock_object(self.bind_plugin.neutron_api, 'show_port')
-        self.bind_plugin.neutron_api.show_port.return_value = fake_neutron_port
+        self.mock_object(self.bind_plugin.neutron_api, 'list_ports')
+        self.bind_plugin.neutron_api.list_ports.return_value = [
+            fake_neutron_port]
 
         self.bind_plugin._wait_for_ports_bind([fake_neutron_port],
                                               fake_share_server)
 
-        self.bind_plugin.neutron_api.show_port.assert_called_once_with(
-            fake_neutron_port['id'])
+        self.bind_plugin.neutron_api.list_ports.assert_called_once_with(
+            id=[fake_neutron_port['id']])
         self.sleep_mock.assert_not_called()
 
     def test_wait_for_bind_error(self):
         fake_neut_port = copy.copy(fake_neutron_port)
         fake_neut_port['status'] = 'ERROR'
-        self.mock_object(self.bind_plugin.neutron_api, 'show_port')
-        self.bind_plugin.neutron_api.show_port.return_value = fake_neut_port
+        self.mock_object(self.bind_plugin.neutron_api, 'list_ports')
+        self.bind_plugin.neutron_api.list_ports.return_value = [
+            fake_neut_port]
 
         self.assertRaises(exception.NetworkException,
                           self.bind_plugin._wait_for_ports_bind,
                           [fake_neut_port, fake_neut_port],
                           fake_share_server)
 
-        self.bind_plugin.neutron_api.show_port.assert_called_once_with(
-            fake_neutron_port['id'])
+        self.bind_plugin.neutron_api.list_ports.assert_called_once_with(
+            id=[fake_neutron_port['id'], fake_neutron_port['id']])
+        self.sleep_mock.assert_not_called()
+
+    def test_wait_for_bind_port_not_found(self):
+        self.mock_object(self.bind_plugin.neutron_api, 'list_ports',
+                         mock.Mock(return_value=[]))
+
+        self.assertRaises(exception.NetworkException,
+                          self.bind_plugin._wait_for_ports_bind,
+                          [fake_neutron_port],
+                          fake_share_server)
         self.sleep_mock.assert_not_called()
 
     @ddt.data(('DOWN', 'ACTIVE'), ('DOWN', 'DOWN'), ('ACTIVE', 'DOWN'))
@@ -1211,15 +1235,18 @@ class NeutronBindSingleNetworkPluginTest(test.TestCase):
         fake_neut_port1 = copy.copy(fake_neutron_port)
         fake_neut_port1['status'] = state[0]
         fake_neut_port2 = copy.copy(fake_neutron_port)
+        fake_neut_port2['id'] = 'test_port_id_2'
         fake_neut_port2['status'] = state[1]
-        self.mock_object(self.bind_plugin.neutron_api, 'show_port')
-        self.bind_plugin.neutron_api.show_port.side_effect = (
-            [fake_neut_port1, fake_neut_port2] * 20)
+        self.mock_object(self.bind_plugin.neutron_api, 'list_ports')
+        self.bind_plugin.neutron_api.list_ports.return_value = [
+            fake_neut_port1, fake_neut_port2]
 
         self.assertRaises(exception.NetworkBindException,
                           self.bind_plugin._wait_for_ports_bind,
                           [fake_neut_port1, fake_neut_port2],
                           fake_share_server)
+        self.assertEqual(
+            20, self.bind_plugin.neutron_api.list_ports.call_count)
 
     @mock.patch.object(db_api, 'network_allocation_create',
                        mock.Mock(return_values=fake_network_allocation))
@@ -1240,8 +1267,8 @@ class NeutronBindSingleNetworkPluginTest(test.TestCase):
         neutron_host_id_opts.default = 'foohost1'
         self.mock_object(db_api, 'network_allocation_create')
 
-        with mock.patch.object(self.bind_plugin.neutron_api, 'create_port',
-                               mock.Mock(return_value=fake_neutron_port)):
+        with mock.patch.object(self.bind_plugin.neutron_api, 'create_ports',
+                               mock.Mock(return_value=[fake_neutron_port])):
             self.bind_plugin.allocate_network(
                 self.fake_context,
                 fake_share_server,
@@ -1261,8 +1288,9 @@ class NeutronBindSingleNetworkPluginTest(test.TestCase):
                 'device_owner': 'manila:share',
                 'device_id': fake_share_network['id'],
             }
-            self.bind_plugin.neutron_api.create_port.assert_called_once_with(
-                fake_share_network['project_id'], **expected_kwargs)
+            self.bind_plugin.neutron_api.create_ports.assert_called_once_with(
+                fake_share_network['project_id'], count=1,
+                **expected_kwargs)
             db_api.network_allocation_create.assert_called_once_with(
                 self.fake_context,
                 fake_network_allocation)
@@ -1464,8 +1492,8 @@ class NeutronBindNetworkPluginWithNormalTypeTest(test.TestCase):
             self.bind_plugin, '_is_neutron_multi_segment')
         multi_seg.return_value = False
 
-        with mock.patch.object(self.bind_plugin.neutron_api, 'create_port',
-                               mock.Mock(return_value=fake_neutron_port)):
+        with mock.patch.object(self.bind_plugin.neutron_api, 'create_ports',
+                               mock.Mock(return_value=[fake_neutron_port])):
             self.bind_plugin.allocate_network(
                 self.fake_context,
                 fake_share_server,
@@ -1485,8 +1513,9 @@ class NeutronBindNetworkPluginWithNormalTypeTest(test.TestCase):
                 'device_owner': 'manila:share',
                 'device_id': fake_share_network['id'],
             }
-            self.bind_plugin.neutron_api.create_port.assert_called_once_with(
-                fake_share_network['project_id'], **expected_kwargs)
+            self.bind_plugin.neutron_api.create_ports.assert_called_once_with(
+                fake_share_network['project_id'], count=1,
+                **expected_kwargs)
             db_api.network_allocation_create.assert_called_once_with(
                 self.fake_context,
                 fake_network_allocation)
@@ -1550,8 +1579,8 @@ class NeutronBindSingleNetworkPluginWithNormalTypeTest(test.TestCase):
         neutron_host_id_opts.default = 'foohost1'
         self.mock_object(db_api, 'network_allocation_create')
 
-        with mock.patch.object(self.bind_plugin.neutron_api, 'create_port',
-                               mock.Mock(return_value=fake_neutron_port)):
+        with mock.patch.object(self.bind_plugin.neutron_api, 'create_ports',
+                               mock.Mock(return_value=[fake_neutron_port])):
             self.bind_plugin.allocate_network(
                 self.fake_context,
                 fake_share_server,
@@ -1571,8 +1600,9 @@ class NeutronBindSingleNetworkPluginWithNormalTypeTest(test.TestCase):
                 'device_owner': 'manila:share',
                 'device_id': fake_share_network['id'],
             }
-            self.bind_plugin.neutron_api.create_port.assert_called_once_with(
-                fake_share_network['project_id'], **expected_kwargs)
+            self.bind_plugin.neutron_api.create_ports.assert_called_once_with(
+                fake_share_network['project_id'], count=1,
+                **expected_kwargs)
             db_api.network_allocation_create.assert_called_once_with(
                 self.fake_context,
                 fake_network_allocation)
@@ -51,7 +51,21 @@ class SchedulerTestCase(test.TestCase):
             self.driver.update_service_capabilities(
                 service_name, host, capabilities)
             (self.driver.host_manager.update_service_capabilities.
-                assert_called_once_with(service_name, host, capabilities))
+                assert_called_once_with(service_name, host, capabilities,
+                                        generation=None))
+
+    def test_update_service_capabilities_delta(self):
+        delta = {'updated': {'fake_capability': 'fake_value'}}
+        self.mock_object(self.driver.host_manager,
+                         'update_service_capabilities_delta',
+                         mock.Mock(return_value=True))
+
+        result = self.driver.update_service_capabilities_delta(
+            'fake_service', 'fake_host', delta, 2, 1)
+
+        self.assertTrue(result)
+        (self.driver.host_manager.update_service_capabilities_delta.
+            assert_called_once_with('fake_service', 'fake_host', delta, 2, 1))
 
     def test_hosts_up(self):
         service1 = {'host': 'host1'}
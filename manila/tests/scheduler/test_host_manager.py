@@ -143,6 +143,53 @@ class HostManagerTestCase(test.TestCase):
         }
         self.assertDictMatch(service_states, expected)
 
+    def test_update_service_capabilities_delta(self):
+        capabilities = {'free_capacity_gb': 4321, 'share_backend_name': 'b1',
+                        'pools': [{'pool_name': 'pool1', 'qos': False}]}
+        delta = {'updated': {'free_capacity_gb': 1234}, 'removed': [],
+                 'pools': {'updated': {'pool1': {'qos': True}},
+                           'removed': {}, 'deleted': []}}
+        self.host_manager.update_service_capabilities(
+            'share', 'host1', capabilities, generation=1)
+
+        with mock.patch.object(timeutils, 'utcnow',
+                               mock.Mock(return_value=31337)):
+            result = self.host_manager.update_service_capabilities_delta(
+                'share', 'host1', delta, 2, 1)
+
+        self.assertTrue(result)
+        self.assertEqual(
+            {'free_capacity_gb': 1234, 'share_backend_name': 'b1',
+             'pools': [{'pool_name': 'pool1', 'qos': True}],
+             'timestamp': 31337},
+            self.host_manager.service_states['host1'])
+        self.assertEqual(2, self.host_manager.service_states_generation[
+            'host1'])
+        self.assertEqual(4321, capabilities['free_capacity_gb'])
+
+    @ddt.data(('host1', 2), ('host2', 1))
+    @ddt.unpack
+    def test_update_service_capabilities_delta_unknown_base(
+            self, host, base_generation):
+        capabilities = {'free_capacity_gb': 4321}
+        self.host_manager.update_service_capabilities(
+            'share', 'host1', capabilities, generation=1)
+        service_states = copy.deepcopy(self.host_manager.service_states)
+
+        result = self.host_manager.update_service_capabilities_delta(
+            'share', host, {'updated': {'free_capacity_gb': 1}},
+            base_generation + 1, base_generation)
+
+        self.assertFalse(result)
+        self.assertEqual(service_states, self.host_manager.service_states)
+
+    def test_update_service_capabilities_delta_other_service(self):
+        result = self.host_manager.update_service_capabilities_delta(
+            'fake_service', 'host1', {'updated': {}}, 2, 1)
+
+        self.assertTrue(result)
+        self.assertEqual({}, self.host_manager.service_states)
+
     def test_get_all_host_states_share(self):
         fake_context = context.RequestContext('user', 'project')
         topic = CONF.share_topic
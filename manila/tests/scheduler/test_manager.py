@@ -125,7 +125,8 @@ class SchedulerManagerTestCase(test.TestCase):
             self.manager.update_service_capabilities(
                 self.context, service_name=service_name, host=host)
             (self.manager.driver.update_service_capabilities.
-                assert_called_once_with(service_name, host, {}))
+                assert_called_once_with(service_name, host, {},
+                                        generation=None))
         with mock.patch.object(self.manager.driver,
                                'update_service_capabilities', mock.Mock()):
             capabilities = {'fake_capability': 'fake_value'}
@@ -133,7 +134,28 @@ class SchedulerManagerTestCase(test.TestCase):
                 self.context, service_name=service_name, host=host,
                 capabilities=capabilities)
             (self.manager.driver.update_service_capabilities.
-                assert_called_once_with(service_name, host, capabilities))
+                assert_called_once_with(service_name, host, capabilities,
+                                        generation=None))
+
+    @ddt.data(True, False)
+    def test_update_service_capabilities_delta(self, applied):
+        self.mock_object(self.manager.driver,
+                         'update_service_capabilities_delta',
+                         mock.Mock(return_value=applied))
+        publish = self.mock_object(share_rpcapi.ShareAPI,
+                                   'publish_service_capabilities')
+        delta = {'updated': {'fake_capability': 'fake_value'}}
+
+        self.manager.update_service_capabilities(
+            self.context, service_name='fake_service', host='fake_host',
+            capabilities=delta, generation=2, base_generation=1)
+
+        (self.manager.driver.update_service_capabilities_delta.
+            assert_called_once_with('fake_service', 'fake_host', delta, 2, 1))
+        if applied:
+            self.assertFalse(publish.called)
+        else:
+            publish.assert_called_once_with(self.context, host='fake_host')
 
     @mock.patch.object(db, 'share_update', mock.Mock())
     @mock.patch('manila.message.api.API.create')
@@ -59,3 +59,62 @@ class UtilsTestCase(test.TestCase):
     def test_thin_provisioning(self, thin_capabilities, thin):
         thin_provisioning = utils.thin_provisioning(thin_capabilities)
         self.assertEqual(thin, thin_provisioning)
+
+
+@ddt.ddt
+class CapabilitiesDeltaTestCase(test.TestCase):
+
+    old = {
+        'share_backend_name': 'backend',
+        'timestamp': 'old',
+        'pools': [
+            {'pool_name': 'pool1', 'free_capacity_gb': 10, 'qos': False},
+            {'pool_name': 'pool2', 'free_capacity_gb': 20, 'qos': False},
+            {'pool_name': 'pool3', 'free_capacity_gb': 30, 'qos': False},
+        ],
+        'server_pools_mapping': {'server1': []},
+    }
+    new = {
+        'share_backend_name': 'backend',
+        'pools': [
+            {'pool_name': 'pool1', 'free_capacity_gb': 10, 'qos': False},
+            {'pool_name': 'pool2', 'free_capacity_gb': 15},
+            {'pool_name': 'pool4', 'free_capacity_gb': 40, 'qos': True},
+        ],
+        'server_pools_mapping': {'server1': [{'pool_name': 'pool2'}]},
+    }
+
+    def test_capabilities_delta(self):
+        delta = utils.capabilities_delta(self.old, self.new)
+
+        self.assertEqual(
+            {'updated': {'server_pools_mapping': {
+                'server1': [{'pool_name': 'pool2'}]}},
+             'removed': ['timestamp'],
+             'pools': {
+                 'updated': {
+                     'pool2': {'free_capacity_gb': 15},
+                     'pool4': {'pool_name': 'pool4', 'free_capacity_gb': 40,
+                               'qos': True}},
+                 'removed': {'pool2': ['qos']},
+                 'deleted': ['pool3']}},
+            delta)
+
+    def test_apply_capabilities_delta(self):
+        delta = utils.capabilities_delta(self.old, self.new)
+
+        result = utils.apply_capabilities_delta(self.old, delta)
+
+        self.assertEqual(self.new, result)
+        self.assertEqual(3, len(self.old['pools']))
+        self.assertFalse(self.old['pools'][1]['qos'])
+
+    @ddt.data(({'pools': None}, {'pools': [{'pool_name': 'pool1'}]}),
+              ({'pools': [{'pool_name': 'pool1'}]}, {'pools': None}),
+              ({'foo': 'bar'}, {'foo': 'baz', 'pools': 'fake'}))
+    @ddt.unpack
+    def test_capabilities_delta_without_pools(self, old, new):
+        delta = utils.capabilities_delta(old, new)
+
+        self.assertNotIn('pools', delta)
+        self.assertEqual(new, utils.apply_capabilities_delta(old, delta))
@@ -1570,6 +1570,8 @@ class FakeEMCShareDriver(object):
         self.configuration.emc_nas_server = FakeData.emc_nas_server
         self.configuration.emc_nas_login = FakeData.emc_nas_login
         self.configuration.emc_nas_password = FakeData.emc_nas_password
+        self.configuration.emc_ssl_cert_verify = False
+        self.configuration.emc_ssl_cert_path = None
         self.configuration.share_backend_name = FakeData.share_backend_name
 
 CIFS_SHARE = fake_share.fake_share(
@@ -13,18 +13,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import ddt
 from eventlet import greenthread
 import mock
 from oslo_concurrency import processutils
-from six.moves.urllib import error as url_error  # pylint: disable=E0611
-from six.moves.urllib import request as url_request  # pylint: disable=E0611
+import requests
 
 from manila import exception
 from manila.share import configuration as conf
 from manila.share.drivers.dell_emc.common.enas import connector
 from manila import test
 from manila.tests.share.drivers.dell_emc.common.enas import fakes
-from manila.tests.share.drivers.dell_emc.common.enas import utils as enas_utils
 from manila import utils
 
 
@@ -64,8 +63,8 @@ class XMLAPIConnectorTestData(object):
 XML_CONN_TD = XMLAPIConnectorTestData
 
 
+@ddt.ddt
 class XMLAPIConnectorTest(test.TestCase):
-    @mock.patch.object(url_request, 'Request', mock.Mock())
     def setUp(self):
         super(XMLAPIConnectorTest, self).setUp()
 
@@ -73,59 +72,95 @@ class XMLAPIConnectorTest(test.TestCase):
 
         self.configuration = emc_share_driver.configuration
 
-        xml_socket = mock.Mock()
-        xml_socket.read = mock.Mock(return_value=XML_CONN_TD.FAKE_RESP)
-        opener = mock.Mock()
-        opener.open = mock.Mock(return_value=xml_socket)
+        self.mock_post = self.mock_object(
+            requests.Session, 'post',
+            mock.Mock(return_value=self._fake_response()))
+        self.XmlConnector = connector.XMLAPIConnector(
+            configuration=self.configuration, debug=False)
 
-        with mock.patch.object(url_request, 'build_opener',
-                               mock.Mock(return_value=opener)):
-            self.XmlConnector = connector.XMLAPIConnector(
-                configuration=self.configuration, debug=False)
+        self.mock_post.assert_called_once_with(
+            XML_CONN_TD.req_auth_url(),
+            data=XML_CONN_TD.req_credential(),
+            headers=XML_CONN_TD.req_url_encode())
+
+    @staticmethod
+    def _fake_response(status_code=200, content=XML_CONN_TD.FAKE_RESP):
+        resp = mock.Mock(status_code=status_code, content=content,
+                         reason='fake_reason')
+        resp.headers = {XML_CONN_TD.FAKE_KEY: XML_CONN_TD.FAKE_VALUE}
+        return resp
+
+    @ddt.data(
+        {'verify': False, 'path': None, 'expected': False},
+        {'verify': True, 'path': None, 'expected': True},
+        {'verify': True, 'path': '/fake/ca/path', 'expected': '/fake/ca/path'},
+    )
+    @ddt.unpack
+    def test_session_ssl_verify(self, verify, path, expected):
+        self.configuration.emc_ssl_cert_verify = verify
+        self.configuration.emc_ssl_cert_path = path
+
+        xml_connector = connector.XMLAPIConnector(
+            configuration=self.configuration, debug=False)
+
+        self.assertEqual(expected, xml_connector.session.verify)
+
+    def test_session_reused(self):
+        mock_request = self.mock_object(
+            self.XmlConnector.session, 'request',
+            mock.Mock(return_value=self._fake_response()))
 
-            expected_calls = [
-                mock.call(XML_CONN_TD.req_auth_url(),
-                          XML_CONN_TD.req_credential(),
-                          XML_CONN_TD.req_url_encode()),
-            ]
+        self.XmlConnector.request(XML_CONN_TD.FAKE_BODY)
+        self.XmlConnector.request(XML_CONN_TD.FAKE_BODY)
 
-            url_request.Request.assert_has_calls(expected_calls)
+        self.assertEqual(2, mock_request.call_count)
+        mock_request.assert_called_with(
+            'POST', XML_CONN_TD.req_url(), data=XML_CONN_TD.FAKE_BODY,
+            headers=XML_CONN_TD.req_url_encode())
+        self.mock_post.assert_called_once_with(
+            XML_CONN_TD.req_auth_url(), data=mock.ANY, headers=mock.ANY)
 
     def test_request_with_debug(self):
         self.XmlConnector.debug = True
+        self.mock_object(self.XmlConnector.session, 'request',
+                         mock.Mock(return_value=self._fake_response()))
 
-        request = mock.Mock()
-        request.headers = {XML_CONN_TD.FAKE_KEY: XML_CONN_TD.FAKE_VALUE}
-        request.get_full_url = mock.Mock(
-            return_value=XML_CONN_TD.FAKE_VALUE)
+        rsp = self.XmlConnector.request(XML_CONN_TD.FAKE_BODY,
+                                        XML_CONN_TD.FAKE_METHOD)
 
-        with mock.patch.object(url_request, 'Request',
-                               mock.Mock(return_value=request)):
-            rsp = self.XmlConnector.request(XML_CONN_TD.FAKE_BODY,
-                                            XML_CONN_TD.FAKE_METHOD)
-
-            self.assertEqual(XML_CONN_TD.FAKE_RESP, rsp)
+        self.assertEqual(XML_CONN_TD.FAKE_RESP, rsp)
+        self.XmlConnector.session.request.assert_called_once_with(
+            XML_CONN_TD.FAKE_METHOD, XML_CONN_TD.req_url(),
+            data=XML_CONN_TD.FAKE_BODY, headers=XML_CONN_TD.req_url_encode())
 
     def test_request_with_no_authorized_exception(self):
-        xml_socket = mock.Mock()
-        xml_socket.read = mock.Mock(return_value=XML_CONN_TD.FAKE_RESP)
+        self.mock_object(
+            self.XmlConnector.session, 'request',
+            mock.Mock(side_effect=[self._fake_response(status_code=403),
+                                   self._fake_response()]))
 
-        hook = enas_utils.RequestSideEffect()
-        hook.append(ex=url_error.HTTPError(XML_CONN_TD.req_url(),
-                                           '403', 'fake_message', None, None))
-        hook.append(xml_socket)
-        hook.append(xml_socket)
+        rsp = self.XmlConnector.request(XML_CONN_TD.FAKE_BODY)
 
-        self.XmlConnector.url_opener.open = mock.Mock(side_effect=hook)
+        self.assertEqual(XML_CONN_TD.FAKE_RESP, rsp)
+        self.assertEqual(2, self.XmlConnector.session.request.call_count)
+        self.assertEqual(2, self.mock_post.call_count)
 
-        self.XmlConnector.request(XML_CONN_TD.FAKE_BODY)
+    def test_login_again_skipped_after_concurrent_login(self):
+        generation = self.XmlConnector._login_generation
+        self.XmlConnector._login_again(generation)
+        self.assertEqual(2, self.mock_post.call_count)
+
+        # A request that failed with the previous login must not log in
+        # again, another request already did it.
+        self.XmlConnector._login_again(generation)
+
+        self.assertEqual(2, self.mock_post.call_count)
+        self.assertEqual(generation + 1, self.XmlConnector._login_generation)
 
     def test_request_with_general_exception(self):
-        hook = enas_utils.RequestSideEffect()
-        hook.append(ex=url_error.HTTPError(XML_CONN_TD.req_url(),
-                                           'error_code', 'fake_message',
-                                           None, None))
-        self.XmlConnector.url_opener.open = mock.Mock(side_effect=hook)
+        self.mock_object(
+            self.XmlConnector.session, 'request',
+            mock.Mock(return_value=self._fake_response(status_code=500)))
 
         self.assertRaises(exception.ManilaException,
                           self.XmlConnector.request,
@@ -13,9 +13,11 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
 import ddt
-import mock
-import ssl
+import fixtures
+from oslo_utils import timeutils
 
 from manila.share.drivers.dell_emc.common.enas import utils
 from manila import test
@@ -46,31 +48,43 @@ class ENASUtilsTestCase(test.TestCase):
         self.assertEqual(unmatched, real_unmatched)
 
 
-class SslContextTestCase(test.TestCase):
-
-    def test_create_ssl_context(self):
-        configuration = mock.Mock()
-        configuration.emc_ssl_cert_verify = True
-        configuration.emc_ssl_cert_path = "./cert_path/"
-        self.mock_object(ssl, 'create_default_context')
-        context = utils.create_ssl_context(configuration)
-        self.assertIsNotNone(context)
-
-    def test_create_ssl_context_no_verify(self):
-        configuration = mock.Mock()
-        configuration.emc_ssl_cert_verify = False
-        self.mock_object(ssl, 'create_default_context')
-        context = utils.create_ssl_context(configuration)
-        self.assertFalse(context.check_hostname)
-
-    def test_no_create_default_context(self):
-        """Test scenario of running on python 2.7.8 or earlier."""
-        configuration = mock.Mock()
-        configuration.emc_ssl_cert_verify = False
-        self.mock_object(ssl, 'create_default_context',
-                         mock.Mock(side_effect=AttributeError))
-        context = utils.create_ssl_context(configuration)
-        self.assertIsNone(context)
+class ObjectCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ObjectCacheTestCase, self).setUp()
+        self.useFixture(fixtures.MonkeyPatch(
+            'oslo_utils.timeutils.utcnow.override_time',
+            datetime.datetime(2018, 1, 1)))
+
+    def test_entry_expires(self):
+        cache = utils.ObjectCache(ttl=60)
+        cache['fs'] = 'fake_fs'
+
+        timeutils.advance_time_seconds(59)
+        self.assertIn('fs', cache)
+        self.assertEqual('fake_fs', cache['fs'])
+
+        timeutils.advance_time_seconds(1)
+        self.assertNotIn('fs', cache)
+        self.assertIsNone(cache.get('fs'))
+
+    def test_entry_refreshed_when_set_again(self):
+        cache = utils.ObjectCache(ttl=60)
+        cache['fs'] = 'fake_fs'
+        timeutils.advance_time_seconds(30)
+        cache['fs'] = 'new_fake_fs'
+        timeutils.advance_time_seconds(45)
+
+        self.assertEqual('new_fake_fs', cache.get('fs'))
+
+    def test_no_ttl(self):
+        cache = utils.ObjectCache()
+        cache['fs'] = 'fake_fs'
+        timeutils.advance_time_seconds(3600 * 24)
+
+        self.assertIn('fs', cache)
+        self.assertEqual('fake_fs', cache.pop('fs'))
+        self.assertNotIn('fs', cache)
 
 
 @ddt.ddt
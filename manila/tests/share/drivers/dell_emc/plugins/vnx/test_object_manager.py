@@ -409,6 +409,7 @@ class FileSystemTestCase(StorageObjectTestCaseBase):
             mock.call(self.fs.req_extend()),
         ]
         context.conn['XML'].request.assert_has_calls(expected_calls)
+        self.assertNotIn(self.fs.filesystem_name, context.filesystem_map)
 
     def test_extend_file_system_but_not_found(self):
         self.hook.append(self.fs.resp_get_but_not_found())
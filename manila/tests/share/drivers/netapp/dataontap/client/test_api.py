@@ -19,6 +19,7 @@
 Tests for NetApp API layer
 """
 import ddt
+from lxml import etree
 import mock
 from six.moves import urllib
 
@@ -171,6 +172,102 @@ class NetAppApiElementTransTests(test.TestCase):
                           'value')
 
 
+class NetAppApiElementNavigationTests(test.TestCase):
+    """Test case for NetApp API element navigation and translation."""
+
+    def setUp(self):
+        super(NetAppApiElementNavigationTests, self).setUp()
+        self.element = api.NaElement(etree.XML("""
+            <results xmlns="http://www.netapp.com/filer/admin">
+              <!-- comment -->
+              <num-records>2</num-records>
+              <attributes-list>
+                <volume-attributes>
+                  <volume-id-attributes>
+                    <name>vol1</name>
+                  </volume-id-attributes>
+                </volume-attributes>
+                <volume-attributes>
+                  <volume-id-attributes>
+                    <name>vol2</name>
+                  </volume-id-attributes>
+                </volume-attributes>
+              </attributes-list>
+              <next-tag/>
+            </results>"""))
+
+    def test_get_child_by_name_namespaced(self):
+        child = self.element.get_child_by_name('num-records')
+
+        self.assertEqual('2', child.get_content())
+        self.assertIs(child, self.element.get_child_by_name(
+            '{http://www.netapp.com/filer/admin}num-records'))
+        self.assertIsNone(self.element.get_child_by_name('missing'))
+
+    def test_get_child_content(self):
+        self.assertEqual('2', self.element.get_child_content('num-records'))
+        self.assertIsNone(self.element.get_child_content('next-tag'))
+        self.assertIsNone(self.element.get_child_content('missing'))
+
+    def test_get_children_cached(self):
+        children = self.element.get_children()
+
+        self.assertEqual(4, len(children))
+        self.assertEqual(
+            [c._element for c in children],
+            [c._element for c in self.element.get_children()])
+        self.assertIs(children[1], self.element.get_children()[1])
+
+    def test_index_invalidated_on_new_child(self):
+        self.assertIsNone(self.element.get_child_content('new'))
+
+        self.element.add_new_child('new', 'value')
+
+        self.assertEqual('value', self.element.get_child_content('new'))
+        self.assertEqual(5, len(self.element.get_children()))
+
+    def test_index_invalidated_on_child_added_through_other_wrapper(self):
+        self.assertIsNone(self.element.get_child_content('new'))
+
+        api.NaElement(self.element._element).add_new_child('new', 'value')
+
+        self.assertEqual('value', self.element.get_child_content('new'))
+
+    def test_get_child_by_path(self):
+        volumes = self.element.get_child_by_name('attributes-list')
+
+        self.assertEqual(
+            'vol1',
+            volumes.get_children()[0].get_child_content_by_path(
+                'volume-id-attributes/name'))
+        self.assertEqual(
+            'volume-id-attributes',
+            volumes.get_child_by_path(
+                'volume-attributes/volume-id-attributes').get_name(
+                    ).rpartition('}')[2])
+        self.assertIsNone(
+            self.element.get_child_by_path('attributes-list/missing/name'))
+        self.assertIsNone(
+            self.element.get_child_content_by_path('missing/name'))
+
+    def test_to_dict(self):
+        expected = {
+            'num-records': '2',
+            'attributes-list': {
+                'volume-attributes': [
+                    {'volume-id-attributes': {'name': 'vol1'}},
+                    {'volume-id-attributes': {'name': 'vol2'}},
+                ],
+            },
+            'next-tag': None,
+        }
+
+        self.assertEqual(expected, self.element.to_dict())
+
+    def test_to_dict_empty(self):
+        self.assertEqual({}, api.NaElement('root').to_dict())
+
+
 @ddt.ddt
 class NetAppApiServerTests(test.TestCase):
     """Test case for NetApp API server methods"""
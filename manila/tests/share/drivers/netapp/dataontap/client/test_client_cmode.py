@@ -1929,6 +1929,64 @@ class NetAppClientCmodeTestCase(test.TestCase):
 
         self.assertIsNone(result)
 
+    def test_get_nodes_for_aggregates(self):
+
+        api_response = netapp_api.NaElement(
+            fake.AGGR_GET_NODE_RESPONSE).get_child_by_name(
+            'attributes-list').get_children()
+        self.mock_object(self.client,
+                         '_get_aggregates',
+                         mock.Mock(return_value=api_response))
+
+        result = self.client.get_nodes_for_aggregates(
+            [fake.SHARE_AGGREGATE_NAME, 'unknown_aggr'])
+
+        desired_attributes = {
+            'aggr-attributes': {
+                'aggregate-name': None,
+                'aggr-ownership-attributes': {
+                    'home-name': None,
+                },
+            },
+        }
+
+        self.client._get_aggregates.assert_called_once_with(
+            aggregate_names=[fake.SHARE_AGGREGATE_NAME, 'unknown_aggr'],
+            desired_attributes=desired_attributes)
+
+        self.assertEqual({fake.SHARE_AGGREGATE_NAME: fake.NODE_NAME}, result)
+
+    def test_get_nodes_for_aggregates_none_requested(self):
+
+        self.mock_object(self.client, '_get_aggregates')
+
+        result = self.client.get_nodes_for_aggregates([])
+
+        self.assertEqual({}, result)
+        self.assertFalse(self.client._get_aggregates.called)
+
+    def test_get_nodes_for_aggregates_api_not_found(self):
+
+        self.mock_object(self.client,
+                         'send_iter_request',
+                         mock.Mock(side_effect=self._mock_api_error(
+                             netapp_api.EAPINOTFOUND)))
+
+        result = self.client.get_nodes_for_aggregates(
+            [fake.SHARE_AGGREGATE_NAME])
+
+        self.assertEqual({}, result)
+
+    def test_get_nodes_for_aggregates_api_error(self):
+
+        self.mock_object(self.client,
+                         'send_iter_request',
+                         self._mock_api_error())
+
+        self.assertRaises(netapp_api.NaApiError,
+                          self.client.get_nodes_for_aggregates,
+                          [fake.SHARE_AGGREGATE_NAME])
+
     def test_get_cluster_aggregate_capacities(self):
 
         api_response = netapp_api.NaElement(
@@ -2151,6 +2209,32 @@ class NetAppClientCmodeTestCase(test.TestCase):
             'perf-object-instance-list-info-iter',
             perf_object_instance_list_info_iter_args)
 
+    def test_get_performance_instance_uuids_for_nodes(self):
+
+        api_response = netapp_api.NaElement(
+            fake.PERF_OBJECT_INSTANCE_LIST_INFO_ITER_RESPONSE)
+        self.mock_object(self.client,
+                         'send_iter_request',
+                         mock.Mock(return_value=api_response))
+
+        result = self.client.get_performance_instance_uuids_for_nodes(
+            'system', [fake.NODE_NAME, 'node2'])
+
+        expected = [fake.NODE_NAME + ':kernel:system']
+        self.assertEqual(expected, result)
+
+        perf_object_instance_list_info_iter_args = {
+            'objectname': 'system',
+            'query': {
+                'instance-info': {
+                    'uuid': fake.NODE_NAME + ':*|node2:*',
+                }
+            }
+        }
+        self.client.send_iter_request.assert_called_once_with(
+            'perf-object-instance-list-info-iter',
+            perf_object_instance_list_info_iter_args)
+
     def test_get_performance_counter_info(self):
 
         api_response = netapp_api.NaElement(
@@ -3171,6 +3255,68 @@ class NetAppClientCmodeTestCase(test.TestCase):
         self.client.send_request.assert_called_once_with(
             'volume-modify-iter', api_args)
 
+    @ddt.data(True, False)
+    def test_set_volumes_snapdir_access(self, hide_snapdir):
+        api_response = netapp_api.NaElement(
+            fake.VOLUME_MODIFY_ITER_RESPONSE)
+        self.mock_object(self.client,
+                         'send_request',
+                         mock.Mock(return_value=api_response))
+
+        self.client.set_volumes_snapdir_access(
+            ['vol2', 'vol1', 'vol2'], hide_snapdir)
+
+        api_args = {
+            'query': {
+                'volume-attributes': {
+                    'volume-id-attributes': {
+                        'name': 'vol1|vol2'
+                    }
+                }
+            },
+            'attributes': {
+                'volume-attributes': {
+                    'volume-snapshot-attributes': {
+                        'snapdir-access-enabled': six.text_type(
+                            not hide_snapdir).lower(),
+                    },
+                },
+            },
+            'max-records': 2,
+            'continue-on-failure': 'true',
+        }
+        self.client.send_request.assert_called_once_with(
+            'volume-modify-iter', api_args)
+
+    def test_set_volumes_snapdir_access_batches(self):
+        api_response = netapp_api.NaElement(
+            fake.VOLUME_MODIFY_ITER_RESPONSE)
+        self.mock_object(self.client,
+                         'send_request',
+                         mock.Mock(return_value=api_response))
+        self.mock_object(client_cmode, 'MAX_VOLUMES_PER_MODIFY', 2)
+
+        self.client.set_volumes_snapdir_access(
+            ['vol1', 'vol2', 'vol3'], True)
+
+        self.assertEqual(2, self.client.send_request.call_count)
+        queries = [
+            c[0][1]['query']['volume-attributes']['volume-id-attributes'][
+                'name'] for c in self.client.send_request.call_args_list]
+        self.assertEqual(['vol1|vol2', 'vol3'], queries)
+
+    def test_set_volumes_snapdir_access_api_error(self):
+        api_response = netapp_api.NaElement(
+            fake.VOLUME_MODIFY_ITER_ERROR_RESPONSE)
+        self.mock_object(self.client,
+                         'send_request',
+                         mock.Mock(return_value=api_response))
+
+        self.assertRaises(netapp_api.NaApiError,
+                          self.client.set_volumes_snapdir_access,
+                          ['vol1', 'vol2'],
+                          True)
+
     def test_set_volume_snapdir_access_api_error(self):
 
         api_response = netapp_api.NaElement(
@@ -4957,20 +4957,23 @@ class NetAppFileStorageLibraryTestCase(test.TestCase):
     def test_ensure_shares(self, snapdir_cfg):
         shares = [
             fake_share.fake_share_instance(id='s-1',
-                                           share_server='fake_server_1'),
+                                           share_server='fake_server_1',
+                                           share_server_id='server_1'),
             fake_share.fake_share_instance(id='s-2',
-                                           share_server='fake_server_2'),
+                                           share_server='fake_server_2',
+                                           share_server_id='server_2'),
             fake_share.fake_share_instance(id='s-3',
-                                           share_server='fake_server_2')
+                                           share_server='fake_server_2',
+                                           share_server_id='server_2')
         ]
 
-        vserver_client = mock.Mock()
+        vserver_client_1 = mock.Mock()
+        vserver_client_2 = mock.Mock()
         self.mock_object(
             self.library, '_get_vserver',
             mock.Mock(side_effect=[
-                (fake.VSERVER1, vserver_client),
-                (fake.VSERVER2, vserver_client),
-                (fake.VSERVER2, vserver_client)
+                (fake.VSERVER1, vserver_client_1),
+                (fake.VSERVER2, vserver_client_2),
             ]))
         (self.library.configuration.
          netapp_reset_snapdir_visibility) = snapdir_cfg
@@ -4979,17 +4982,18 @@ class NetAppFileStorageLibraryTestCase(test.TestCase):
 
         if snapdir_cfg == 'default':
             self.library._get_vserver.assert_not_called()
-            vserver_client.set_volume_snapdir_access.assert_not_called()
+            vserver_client_1.set_volumes_snapdir_access.assert_not_called()
+            vserver_client_2.set_volumes_snapdir_access.assert_not_called()
 
         else:
             self.library._get_vserver.assert_has_calls([
                 mock.call(share_server='fake_server_1'),
                 mock.call(share_server='fake_server_2'),
-                mock.call(share_server='fake_server_2'),
-            ])
-
-            vserver_client.set_volume_snapdir_access.assert_has_calls([
-                mock.call('share_s_1', True),
-                mock.call('share_s_2', True),
-                mock.call('share_s_3', True),
             ])
+            self.assertEqual(2, self.library._get_vserver.call_count)
+            (vserver_client_1.set_volumes_snapdir_access.
+             assert_called_once_with(['share_s_1'], True))
+            (vserver_client_2.set_volumes_snapdir_access.
+             assert_called_once_with(['share_s_2', 'share_s_3'], True))
+            vserver_client_1.set_volume_snapdir_access.assert_not_called()
+            vserver_client_2.set_volume_snapdir_access.assert_not_called()
@@ -169,8 +169,8 @@ class PerformanceLibraryTestCase(test.TestCase):
             mock.Mock(return_value=(self.fake_nodes,
                                     self.fake_aggr_node_map)))
         mock_get_node_utilization_counters = self.mock_object(
-            self.perf_library, '_get_node_utilization_counters',
-            mock.Mock(side_effect=[21, 31]))
+            self.perf_library, '_get_nodes_utilization_counters',
+            mock.Mock(return_value={'node1': 21, 'node2': 31}))
         mock_get_node_utilization = self.mock_object(
             self.perf_library, '_get_node_utilization',
             mock.Mock(side_effect=[25, 75]))
@@ -198,8 +198,8 @@ class PerformanceLibraryTestCase(test.TestCase):
             self.fake_volumes, self.fake_aggregates)
         mock_get_nodes_for_aggregates.assert_called_once_with(
             self.fake_aggr_names)
-        mock_get_node_utilization_counters.assert_has_calls([
-            mock.call('node1'), mock.call('node2')])
+        mock_get_node_utilization_counters.assert_called_once_with(
+            self.fake_nodes)
         mock_get_node_utilization.assert_has_calls([
             mock.call(12, 21, 'node1'), mock.call(22, 31, 'node2')])
 
@@ -213,8 +213,8 @@ class PerformanceLibraryTestCase(test.TestCase):
             mock.Mock(return_value=(self.fake_nodes,
                                     self.fake_aggr_node_map)))
         mock_get_node_utilization_counters = self.mock_object(
-            self.perf_library, '_get_node_utilization_counters',
-            mock.Mock(side_effect=[11, 21]))
+            self.perf_library, '_get_nodes_utilization_counters',
+            mock.Mock(return_value={'node1': 11, 'node2': 21}))
         mock_get_node_utilization = self.mock_object(
             self.perf_library, '_get_node_utilization',
             mock.Mock(side_effect=[25, 75]))
@@ -239,8 +239,8 @@ class PerformanceLibraryTestCase(test.TestCase):
             self.fake_volumes, self.fake_aggregates)
         mock_get_nodes_for_aggregates.assert_called_once_with(
             self.fake_aggr_names)
-        mock_get_node_utilization_counters.assert_has_calls([
-            mock.call('node1'), mock.call('node2')])
+        mock_get_node_utilization_counters.assert_called_once_with(
+            self.fake_nodes)
         self.assertFalse(mock_get_node_utilization.called)
 
     def test_update_performance_cache_unknown_nodes(self):
@@ -253,8 +253,8 @@ class PerformanceLibraryTestCase(test.TestCase):
             self.perf_library, '_get_nodes_for_aggregates',
             mock.Mock(return_value=([], {})))
         mock_get_node_utilization_counters = self.mock_object(
-            self.perf_library, '_get_node_utilization_counters',
-            mock.Mock(side_effect=[11, 21]))
+            self.perf_library, '_get_nodes_utilization_counters',
+            mock.Mock(return_value={'node1': 11, 'node2': 21}))
         mock_get_node_utilization = self.mock_object(
             self.perf_library, '_get_node_utilization',
             mock.Mock(side_effect=[25, 75]))
@@ -292,8 +292,8 @@ class PerformanceLibraryTestCase(test.TestCase):
             mock.Mock(return_value=(self.fake_nodes,
                                     self.fake_aggr_node_map)))
         mock_get_node_utilization_counters = self.mock_object(
-            self.perf_library, '_get_node_utilization_counters',
-            mock.Mock(side_effect=[None, None]))
+            self.perf_library, '_get_nodes_utilization_counters',
+            mock.Mock(return_value={}))
         mock_get_node_utilization = self.mock_object(
             self.perf_library, '_get_node_utilization',
             mock.Mock(side_effect=[25, 75]))
@@ -317,8 +317,8 @@ class PerformanceLibraryTestCase(test.TestCase):
             self.fake_volumes, self.fake_aggregates)
         mock_get_nodes_for_aggregates.assert_called_once_with(
             self.fake_aggr_names)
-        mock_get_node_utilization_counters.assert_has_calls([
-            mock.call('node1'), mock.call('node2')])
+        mock_get_node_utilization_counters.assert_called_once_with(
+            self.fake_nodes)
         self.assertFalse(mock_get_node_utilization.called)
 
     def test_update_performance_cache_not_supported(self):
@@ -362,6 +362,8 @@ class PerformanceLibraryTestCase(test.TestCase):
                                               self.fake_aggregates)
 
         self.assertEqual(mock_client, self.perf_library.zapi_client)
+        self.assertEqual({}, self.perf_library.aggr_node_map)
+        self.assertEqual({}, self.perf_library.counter_info)
         self.perf_library.update_performance_cache.assert_called_once_with(
             self.fake_volumes, self.fake_aggregates)
 
@@ -375,12 +377,11 @@ class PerformanceLibraryTestCase(test.TestCase):
 
     def test_get_nodes_for_aggregates(self):
 
-        aggregate_names = ['aggr1', 'aggr2', 'aggr3']
-        aggregate_nodes = ['node1', 'node2', 'node2']
-
-        mock_get_node_for_aggregate = self.mock_object(
-            self.zapi_client, 'get_node_for_aggregate',
-            mock.Mock(side_effect=aggregate_nodes))
+        aggregate_names = ['aggr1', 'aggr2', 'aggr3', None]
+        mock_get_nodes_for_aggregates = self.mock_object(
+            self.zapi_client, 'get_nodes_for_aggregates',
+            mock.Mock(return_value={
+                'aggr1': 'node1', 'aggr2': 'node2', 'aggr3': 'node2'}))
 
         result = self.perf_library._get_nodes_for_aggregates(aggregate_names)
 
@@ -388,11 +389,39 @@ class PerformanceLibraryTestCase(test.TestCase):
         result_node_names, result_aggr_node_map = result
 
         expected_node_names = ['node1', 'node2']
-        expected_aggr_node_map = dict(zip(aggregate_names, aggregate_nodes))
+        expected_aggr_node_map = {
+            'aggr1': 'node1', 'aggr2': 'node2', 'aggr3': 'node2'}
         self.assertItemsEqual(expected_node_names, result_node_names)
         self.assertEqual(expected_aggr_node_map, result_aggr_node_map)
-        mock_get_node_for_aggregate.assert_has_calls([
-            mock.call('aggr1'), mock.call('aggr2'), mock.call('aggr3')])
+        self.assertEqual(expected_aggr_node_map,
+                         self.perf_library.aggr_node_map)
+        mock_get_nodes_for_aggregates.assert_called_once_with(
+            ['aggr1', 'aggr2', 'aggr3'])
+
+    def test_get_nodes_for_aggregates_relocated(self):
+
+        self.perf_library.aggr_node_map = dict(self.fake_aggr_node_map)
+        mock_get_nodes_for_aggregates = self.mock_object(
+            self.zapi_client, 'get_nodes_for_aggregates',
+            mock.Mock(return_value={'aggr1': 'node2', 'aggr2': 'node2'}))
+
+        result = self.perf_library._get_nodes_for_aggregates(
+            ['aggr1', 'aggr2'])
+
+        self.assertEqual(['node2'], result[0])
+        self.assertEqual({'aggr1': 'node2', 'aggr2': 'node2'}, result[1])
+        mock_get_nodes_for_aggregates.assert_called_once_with(
+            ['aggr1', 'aggr2'])
+
+    def test_get_nodes_for_aggregates_none(self):
+
+        mock_get_nodes_for_aggregates = self.mock_object(
+            self.zapi_client, 'get_nodes_for_aggregates')
+
+        result = self.perf_library._get_nodes_for_aggregates([None])
+
+        self.assertEqual(([], {}), result)
+        self.assertFalse(mock_get_nodes_for_aggregates.called)
 
     def test_get_node_utilization_kahuna_overutilized(self):
 
@@ -705,56 +734,60 @@ class PerformanceLibraryTestCase(test.TestCase):
 
         self.assertEqual('cpu_elapsed_time', result)
 
-    def test_get_node_utilization_counters(self):
+    def test_get_nodes_utilization_counters(self):
 
+        counters = [{'node-name': 'node%s' % (i % 2), 'value': i}
+                    for i in range(9)]
         mock_get_node_utilization_system_counters = self.mock_object(
             self.perf_library, '_get_node_utilization_system_counters',
-            mock.Mock(return_value=['A', 'B', 'C']))
+            mock.Mock(return_value=counters[:3]))
         mock_get_node_utilization_wafl_counters = self.mock_object(
             self.perf_library, '_get_node_utilization_wafl_counters',
-            mock.Mock(return_value=['D', 'E', 'F']))
+            mock.Mock(return_value=counters[3:6]))
         mock_get_node_utilization_processor_counters = self.mock_object(
             self.perf_library, '_get_node_utilization_processor_counters',
-            mock.Mock(return_value=['G', 'H', 'I']))
+            mock.Mock(return_value=counters[6:]))
 
-        result = self.perf_library._get_node_utilization_counters(fake.NODE)
+        result = self.perf_library._get_nodes_utilization_counters(
+            ['node0', 'node1'])
 
-        expected = ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H', 'I']
+        expected = {'node0': counters[0::2], 'node1': counters[1::2]}
         self.assertEqual(expected, result)
 
         mock_get_node_utilization_system_counters.assert_called_once_with(
-            fake.NODE)
+            ['node0', 'node1'])
         mock_get_node_utilization_wafl_counters.assert_called_once_with(
-            fake.NODE)
+            ['node0', 'node1'])
         mock_get_node_utilization_processor_counters.assert_called_once_with(
-            fake.NODE)
+            ['node0', 'node1'])
 
-    def test_get_node_utilization_counters_api_error(self):
+    def test_get_nodes_utilization_counters_api_error(self):
 
         self.mock_object(self.perf_library,
                          '_get_node_utilization_system_counters',
                          mock.Mock(side_effect=netapp_api.NaApiError))
 
-        result = self.perf_library._get_node_utilization_counters(fake.NODE)
+        result = self.perf_library._get_nodes_utilization_counters(
+            [fake.NODE])
 
-        self.assertIsNone(result)
+        self.assertEqual({}, result)
 
     def test_get_node_utilization_system_counters(self):
 
         mock_get_performance_instance_uuids = self.mock_object(
-            self.zapi_client, 'get_performance_instance_uuids',
+            self.zapi_client, 'get_performance_instance_uuids_for_nodes',
             mock.Mock(return_value=fake.SYSTEM_INSTANCE_UUIDS))
         mock_get_performance_counters = self.mock_object(
             self.zapi_client, 'get_performance_counters',
             mock.Mock(return_value=fake.SYSTEM_COUNTERS))
 
         result = self.perf_library._get_node_utilization_system_counters(
-            fake.NODE)
+            [fake.NODE])
 
         self.assertEqual(fake.SYSTEM_COUNTERS, result)
 
         mock_get_performance_instance_uuids.assert_called_once_with(
-            'system', fake.NODE)
+            'system', [fake.NODE])
         mock_get_performance_counters.assert_called_once_with(
             'system', fake.SYSTEM_INSTANCE_UUIDS,
             ['avg_processor_busy', 'cpu_elapsed_time1', 'cpu_elapsed_time'])
@@ -762,7 +795,7 @@ class PerformanceLibraryTestCase(test.TestCase):
     def test_get_node_utilization_wafl_counters(self):
 
         mock_get_performance_instance_uuids = self.mock_object(
-            self.zapi_client, 'get_performance_instance_uuids',
+            self.zapi_client, 'get_performance_instance_uuids_for_nodes',
             mock.Mock(return_value=fake.WAFL_INSTANCE_UUIDS))
         mock_get_performance_counters = self.mock_object(
             self.zapi_client, 'get_performance_counters',
@@ -772,12 +805,12 @@ class PerformanceLibraryTestCase(test.TestCase):
             mock.Mock(return_value=fake.WAFL_CP_PHASE_TIMES_COUNTER_INFO))
 
         result = self.perf_library._get_node_utilization_wafl_counters(
-            fake.NODE)
+            [fake.NODE])
 
         self.assertEqual(fake.EXPANDED_WAFL_COUNTERS, result)
 
         mock_get_performance_instance_uuids.assert_called_once_with(
-            'wafl', fake.NODE)
+            'wafl', [fake.NODE])
         mock_get_performance_counters.assert_called_once_with(
             'wafl', fake.WAFL_INSTANCE_UUIDS,
             ['total_cp_msecs', 'cp_phase_times'])
@@ -787,22 +820,25 @@ class PerformanceLibraryTestCase(test.TestCase):
     def test_get_node_utilization_processor_counters(self):
 
         mock_get_performance_instance_uuids = self.mock_object(
-            self.zapi_client, 'get_performance_instance_uuids',
+            self.zapi_client, 'get_performance_instance_uuids_for_nodes',
             mock.Mock(return_value=fake.PROCESSOR_INSTANCE_UUIDS))
         mock_get_performance_counters = self.mock_object(
             self.zapi_client, 'get_performance_counters',
             mock.Mock(return_value=fake.PROCESSOR_COUNTERS))
-        self.mock_object(
+        mock_get_performance_counter_info = self.mock_object(
             self.zapi_client, 'get_performance_counter_info',
             mock.Mock(return_value=fake.PROCESSOR_DOMAIN_BUSY_COUNTER_INFO))
 
         result = self.perf_library._get_node_utilization_processor_counters(
-            fake.NODE)
+            [fake.NODE])
 
         self.assertEqual(fake.EXPANDED_PROCESSOR_COUNTERS, result)
 
         mock_get_performance_instance_uuids.assert_called_once_with(
-            'processor', fake.NODE)
+            'processor', [fake.NODE])
         mock_get_performance_counters.assert_called_once_with(
             'processor', fake.PROCESSOR_INSTANCE_UUIDS,
             ['domain_busy', 'processor_elapsed_time'])
+        # Counter info is cached across the processor instances
+        mock_get_performance_counter_info.assert_called_once_with(
+            'processor', 'domain_busy')
@@ -46,15 +46,16 @@ class QuobyteJsonRpcTestCase(test.TestCase):
                                    user_credentials=("me", "team"))
         self.mock_object(time, 'sleep')
 
-    @mock.patch.object(requests, 'post',
+    @mock.patch.object(requests.Session, 'post',
                        return_value=FakeResponse(200, {"result": "yes"}))
     def test_request_generation_and_basic_auth(self, req_get_mock):
         self.rpc.call('method', {'param': 'value'})
 
         req_get_mock.assert_called_once_with(
             url='http://test',
-            auth=auth.HTTPBasicAuth("me", "team"),
             json=mock.ANY)
+        self.assertEqual(auth.HTTPBasicAuth("me", "team"),
+                         self.rpc._session.auth)
 
     def test_jsonrpc_init_with_ca(self):
         foofile = tempfile.TemporaryFile()
@@ -90,7 +91,7 @@ class QuobyteJsonRpcTestCase(test.TestCase):
 
         self.assertEqual("http", self.rpc._url_scheme)
 
-    @mock.patch.object(requests, "post",
+    @mock.patch.object(requests.Session, "post",
                        return_value=FakeResponse(
                            200, {"result": "Sweet gorilla of Manila"}))
     def test_successful_call(self, mock_req_get):
@@ -98,11 +99,10 @@ class QuobyteJsonRpcTestCase(test.TestCase):
 
         mock_req_get.assert_called_once_with(
             url=self.rpc._url,
-            json=mock.ANY,  # not checking here as of undefined order in dict
-            auth=self.rpc._credentials)
+            json=mock.ANY)  # not checking here as of undefined order in dict
         self.assertEqual("Sweet gorilla of Manila", result)
 
-    @mock.patch.object(requests, "post",
+    @mock.patch.object(requests.Session, "post",
                        return_value=FakeResponse(
                            200, {"result": "Sweet gorilla of Manila"}))
     def test_https_call_with_cert(self, mock_req_get):
@@ -117,13 +117,13 @@ class QuobyteJsonRpcTestCase(test.TestCase):
 
         mock_req_get.assert_called_once_with(
             url=self.rpc._url,
-            json=mock.ANY,  # not checking here as of undefined order in dict
-            auth=self.rpc._credentials,
-            verify=False,
-            cert=(fake_cert_file, fake_key_file))
+            json=mock.ANY)  # not checking here as of undefined order in dict
+        self.assertFalse(self.rpc._session.verify)
+        self.assertEqual((fake_cert_file, fake_key_file),
+                         self.rpc._session.cert)
         self.assertEqual("Sweet gorilla of Manila", result)
 
-    @mock.patch.object(requests, "post",
+    @mock.patch.object(requests.Session, "post",
                        return_value=FakeResponse(
                            200, {"result": "Sweet gorilla of Manila"}))
     def test_https_call_verify(self, mock_req_get):
@@ -136,14 +136,13 @@ class QuobyteJsonRpcTestCase(test.TestCase):
 
         mock_req_get.assert_called_once_with(
             url=self.rpc._url,
-            json=mock.ANY,  # not checking here as of undefined order in dict
-            auth=self.rpc._credentials,
-            verify=fake_ca_file)
+            json=mock.ANY)  # not checking here as of undefined order in dict
+        self.assertEqual(fake_ca_file, self.rpc._session.verify)
         self.assertEqual("Sweet gorilla of Manila", result)
 
     @mock.patch.object(jsonrpc.JsonRpc, "_checked_for_application_error",
                        return_value="Sweet gorilla of Manila")
-    @mock.patch.object(requests, "post",
+    @mock.patch.object(requests.Session, "post",
                        return_value=FakeResponse(
                            200, {"result": "Sweet gorilla of Manila"}))
     def test_https_call_verify_expected_error(self, mock_req_get, mock_check):
@@ -157,24 +156,23 @@ class QuobyteJsonRpcTestCase(test.TestCase):
 
         mock_req_get.assert_called_once_with(
             url=self.rpc._url,
-            json=mock.ANY,  # not checking here as of undefined order in dict
-            auth=self.rpc._credentials,
-            verify=fake_ca_file)
+            json=mock.ANY)  # not checking here as of undefined order in dict
+        self.assertEqual(fake_ca_file, self.rpc._session.verify)
         mock_check.assert_called_once_with(
             {'result': 'Sweet gorilla of Manila'}, [42])
         self.assertEqual("Sweet gorilla of Manila", result)
 
-    @mock.patch.object(requests, "post", side_effect=exceptions.HTTPError)
+    @mock.patch.object(requests.Session, "post",
+                       side_effect=exceptions.HTTPError)
     def test_jsonrpc_call_http_exception(self, req_get_mock):
         self.assertRaises(exceptions.HTTPError,
                           self.rpc.call,
                           'method', {'param': 'value'})
         req_get_mock.assert_called_once_with(
             url=self.rpc._url,
-            json=mock.ANY,  # not checking here as of undefined order in dict
-            auth=self.rpc._credentials)
+            json=mock.ANY)  # not checking here as of undefined order in dict
 
-    @mock.patch.object(requests, "post",
+    @mock.patch.object(requests.Session, "post",
                        return_value=FakeResponse(
                            200,
                            {"error": {"code": 28, "message": "text"}}))
@@ -183,8 +181,79 @@ class QuobyteJsonRpcTestCase(test.TestCase):
                           self.rpc.call, 'method', {'param': 'value'})
         req_get_mock.assert_called_once_with(
             url=self.rpc._url,
-            json=mock.ANY,  # not checking here as of undefined order in dict
-            auth=self.rpc._credentials)
+            json=mock.ANY)  # not checking here as of undefined order in dict
+
+    def test_session_keep_alive_and_retries(self):
+        adapter = self.rpc._session.get_adapter('http://test')
+
+        self.assertEqual(self.rpc._credentials, self.rpc._session.auth)
+        self.assertEqual(jsonrpc.RETRIES, adapter.max_retries.total)
+        self.assertEqual(jsonrpc.RETRIES, adapter.max_retries.connect)
+        self.assertEqual(jsonrpc.RETRY_BACKOFF_FACTOR,
+                         adapter.max_retries.backoff_factor)
+        self.assertFalse(adapter.max_retries.read)
+        self.assertEqual(0, adapter.max_retries.status)
+        self.assertFalse(adapter.max_retries.is_retry('POST', 503))
+
+    @mock.patch.object(requests.Session, "post",
+                       return_value=FakeResponse(200, {"result": "yes"}))
+    def test_session_reused(self, mock_req_post):
+        self.rpc.call('method', {'param': 'value'})
+        self.rpc.call('method', {'param': 'value'})
+
+        self.assertEqual(2, mock_req_post.call_count)
+        self.assertEqual(2, self.rpc._id)
+
+    @mock.patch.object(requests.Session, "post")
+    def test_call_many(self, mock_req_post):
+        mock_req_post.return_value = FakeResponse(200, [
+            {"id": "2", "result": None,
+             "error": {"code": jsonrpc.ERROR_ENOENT, "message": "text"}},
+            {"id": "1", "result": "yes"},
+        ])
+
+        result = self.rpc.call_many(
+            [('method1', {'param': 'value'}), ('method2', None)],
+            expected_errors=[jsonrpc.ERROR_ENOENT])
+
+        self.assertEqual(["yes", None], result)
+        mock_req_post.assert_called_once_with(url=self.rpc._url, json=[
+            {'jsonrpc': '2.0', 'method': 'method1', 'id': '1',
+             'params': {'retry': 'INFINITELY', 'param': 'value'}},
+            {'jsonrpc': '2.0', 'method': 'method2', 'id': '2',
+             'params': {'retry': 'INFINITELY'}},
+        ])
+
+    @mock.patch.object(requests.Session, "post")
+    def test_call_many_no_calls(self, mock_req_post):
+        self.assertEqual([], self.rpc.call_many([]))
+        self.assertFalse(mock_req_post.called)
+
+    @mock.patch.object(requests.Session, "post",
+                       return_value=FakeResponse(
+                           200, [{"id": "1", "error": {"code": 28,
+                                                       "message": "text"}},
+                                 {"id": "2", "result": "yes"}]))
+    def test_call_many_application_error(self, mock_req_post):
+        self.assertRaises(exception.QBRpcException,
+                          self.rpc.call_many,
+                          [('method1', {}), ('method2', {})])
+
+    @mock.patch.object(requests.Session, "post",
+                       return_value=FakeResponse(200, [{"id": "1",
+                                                        "result": "yes"}]))
+    def test_call_many_missing_response(self, mock_req_post):
+        self.assertRaises(exception.QBException,
+                          self.rpc.call_many,
+                          [('method1', {}), ('method2', {})])
+
+    @mock.patch.object(requests.Session, "post",
+                       return_value=FakeResponse(
+                           200, {"error": {"code": -32600,
+                                           "message": "Invalid Request"}}))
+    def test_call_many_batch_rejected(self, mock_req_post):
+        self.assertRaises(exception.QBRpcException,
+                          self.rpc.call_many, [('method1', {})])
 
     def test_checked_for_application_error(self):
         resultdict = {"result": "Sweet gorilla of Manila"}
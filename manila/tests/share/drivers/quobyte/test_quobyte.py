@@ -18,6 +18,7 @@ from oslo_config import cfg
 from oslo_utils import units
 import six
 
+from manila.common import constants
 from manila import context
 from manila import exception
 from manila.share import configuration as config
@@ -350,12 +351,21 @@ class QuobyteShareDriverTestCase(test.TestCase):
         replfact = 3
         self._driver._get_qb_replication_factor = mock.Mock(
             return_value=replfact)
-        self._driver.rpc.call = mock.Mock(
-            return_value={'total_physical_capacity': six.text_type(capval),
-                          'total_physical_usage': six.text_type(useval)})
+        self._driver.rpc.call_many = mock.Mock(
+            return_value=[{'total_physical_capacity': six.text_type(capval),
+                           'total_physical_usage': six.text_type(useval)},
+                          'fake_volume_config'])
 
         self.assertEqual((39.223160718, 6.960214182),
                          self._driver._get_capacities())
+        self._driver._get_qb_replication_factor.assert_called_once_with(
+            'fake_volume_config')
+        self._driver.rpc.call_many.assert_called_once_with([
+            ('getSystemStatistics', {}),
+            ('getEffectiveVolumeConfiguration',
+             {'configuration_name':
+              self._driver.configuration.quobyte_volume_configuration}),
+        ])
 
     def test_get_capacities_gb_full(self):
         capval = 1024 * 1024 * 1024 * 3
@@ -363,9 +373,10 @@ class QuobyteShareDriverTestCase(test.TestCase):
         replfact = 1
         self._driver._get_qb_replication_factor = mock.Mock(
             return_value=replfact)
-        self._driver.rpc.call = mock.Mock(
-            return_value={'total_physical_capacity': six.text_type(capval),
-                          'total_physical_usage': six.text_type(useval)})
+        self._driver.rpc.call_many = mock.Mock(
+            return_value=[{'total_physical_capacity': six.text_type(capval),
+                           'total_physical_usage': six.text_type(useval)},
+                          'fake_volume_config'])
 
         self.assertEqual((3.0, 0), self._driver._get_capacities())
 
@@ -380,6 +391,15 @@ class QuobyteShareDriverTestCase(test.TestCase):
 
         self.assertEqual(fakerepl, self._driver._get_qb_replication_factor())
 
+    def test_get_replication_from_volume_config(self):
+        self._driver.rpc.call = mock.Mock()
+        volume_config = {'configuration': {'volume_metadata_configuration':
+                                           {'replication_factor': '3'}}}
+
+        self.assertEqual(
+            3, self._driver._get_qb_replication_factor(volume_config))
+        self.assertFalse(self._driver.rpc.call.called)
+
     @mock.patch.object(quobyte.QuobyteShareDriver,
                        "_resolve_volume_name",
                        return_value="fake_uuid")
@@ -411,6 +431,59 @@ class QuobyteShareDriverTestCase(test.TestCase):
          assert_called_once_with(self.share['name'],
                                  self.share['project_id']))
 
+    def test_ensure_shares(self):
+        share2 = fake_share.fake_share(id='fake_id_2', name='fake_name_2')
+        self._driver.rpc.call_many = mock.Mock(side_effect=[
+            [{'volume_uuid': 'fake_uuid'}, None],
+            [fake_rpc_handler('exportVolume')],
+        ])
+
+        result = self._driver.ensure_shares(
+            self._context, [self.share, share2])
+
+        self.assertEqual(
+            {self.share['id']: {
+                'export_locations': self.share['export_location']},
+             'fake_id_2': {'status': constants.STATUS_ERROR}},
+            result)
+        self._driver.rpc.call_many.assert_has_calls([
+            mock.call(
+                [('resolveVolumeName',
+                  dict(volume_name=self.share['name'],
+                       tenant_domain=self.share['project_id'])),
+                 ('resolveVolumeName',
+                  dict(volume_name='fake_name_2',
+                       tenant_domain=self.share['project_id']))],
+                expected_errors=[jsonrpc.ERROR_ENOENT,
+                                 jsonrpc.ERROR_ENTITY_NOT_FOUND]),
+            mock.call(
+                [('exportVolume',
+                  dict(volume_uuid='fake_uuid', protocol='NFS'))]),
+        ])
+
+    def test_ensure_shares_batches(self):
+        self.mock_object(quobyte, 'ENSURE_SHARES_BATCH_SIZE', 2)
+        shares = [fake_share.fake_share(id='fake_id_%d' % i,
+                                        name='fake_name_%d' % i)
+                  for i in range(3)]
+        self._driver.rpc.call_many = mock.Mock(side_effect=[
+            [{'volume_uuid': 'fake_uuid_0'}, {'volume_uuid': 'fake_uuid_1'}],
+            [fake_rpc_handler('exportVolume')] * 2,
+            [{'volume_uuid': 'fake_uuid_2'}],
+            [fake_rpc_handler('exportVolume')],
+        ])
+
+        result = self._driver.ensure_shares(self._context, shares)
+
+        self.assertEqual(
+            {share['id']: {'export_locations': self.share['export_location']}
+             for share in shares},
+            result)
+        self.assertEqual(4, self._driver.rpc.call_many.call_count)
+        self._driver.rpc.call_many.assert_called_with(
+            [('exportVolume', dict(volume_uuid='fake_uuid_2',
+                                   protocol='NFS'))])
+
     @mock.patch.object(quobyte.QuobyteShareDriver, "_resize_share")
     def test_extend_share(self, mock_qsd_resize_share):
         self._driver.extend_share(ext_share=self.share,
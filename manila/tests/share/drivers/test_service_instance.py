@@ -2143,38 +2143,36 @@ class NeutronNetworkHelperTestCase(test.TestCase):
             mock.call(interface_name_admin)])
         instance._remove_outdated_interfaces.assert_called_with(device_mock)
 
-    def test__get_set_of_device_cidrs(self):
-        device = fake_network.FakeDevice('foo')
+    def test__get_set_of_cidrs(self):
+        addr_list = [dict(ip_version=4, cidr='1.0.0.1/27'),
+                     dict(ip_version=4, cidr='2.0.0.1/27'),
+                     dict(ip_version=6, cidr='fe80::1/64')]
         expected = set(('1.0.0.0/27', '2.0.0.0/27'))
         instance = self._init_neutron_network_plugin()
 
-        result = instance._get_set_of_device_cidrs(device)
+        result = instance._get_set_of_cidrs(addr_list)
 
         self.assertEqual(expected, result)
 
-    def test__get_set_of_device_cidrs_exception(self):
-        device = fake_network.FakeDevice('foo')
-        self.mock_object(device.addr, 'list', mock.Mock(
-            side_effect=Exception('foo does not exist')))
-        instance = self._init_neutron_network_plugin()
-
-        result = instance._get_set_of_device_cidrs(device)
-
-        self.assertEqual(set(), result)
-
     def test__remove_outdated_interfaces(self):
-        device = fake_network.FakeDevice(
-            'foobarquuz', [dict(ip_version=4, cidr='1.0.0.0/27')])
-        devices = [fake_network.FakeDevice('foobar')]
+        device = fake_network.FakeDevice('foobarquuz')
+        devices = {
+            'foobarquuz': [dict(ip_version=4, cidr='1.0.0.1/27')],
+            'foobar': [dict(ip_version=4, cidr='1.0.0.2/27')],
+            'foobaz': [dict(ip_version=4, cidr='2.0.0.1/27')],
+            'lo': [dict(ip_version=4, cidr='1.0.0.3/27')],
+        }
         instance = self._init_neutron_network_plugin()
         self.mock_object(instance.vif_driver, 'unplug')
         self.mock_object(
-            service_instance.ip_lib.IPWrapper, 'get_devices',
+            service_instance.ip_lib.IPWrapper, 'get_devices_addresses',
             mock.Mock(return_value=devices))
 
         instance._remove_outdated_interfaces(device)
 
         instance.vif_driver.unplug.assert_called_once_with('foobar')
+        (service_instance.ip_lib.IPWrapper.get_devices_addresses.
+            assert_called_once_with())
 
     def test__get_service_port_none_exist(self):
         instance = self._init_neutron_network_plugin()
@@ -2415,8 +2413,9 @@ class NeutronNetworkHelperTestCase(test.TestCase):
         subnet_id2 = 'fake_subnet_id2'
         instance = self._init_neutron_network_plugin()
         network = dict(subnets=[subnet_id1, subnet_id2])
-        self.mock_object(instance.neutron_api, 'get_subnet',
-                         mock.Mock(side_effect=lambda s_id: dict(id=s_id)))
+        self.mock_object(
+            instance.neutron_api, 'get_subnet',
+            mock.Mock(side_effect=lambda s_id, use_cache: dict(id=s_id)))
         self.mock_object(instance.neutron_api, 'get_network',
                          mock.Mock(return_value=network))
 
@@ -2424,6 +2423,7 @@ class NeutronNetworkHelperTestCase(test.TestCase):
 
         self.assertEqual([dict(id=subnet_id1), dict(id=subnet_id2)], result)
         instance.neutron_api.get_network.assert_called_once_with(
-            instance.service_network_id)
+            instance.service_network_id, use_cache=False)
         instance.neutron_api.get_subnet.assert_has_calls([
-            mock.call(subnet_id1), mock.call(subnet_id2)])
+            mock.call(subnet_id1, use_cache=False),
+            mock.call(subnet_id2, use_cache=False)])
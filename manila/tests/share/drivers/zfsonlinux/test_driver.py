@@ -13,10 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import os
+
 import ddt
 import mock
 
 from oslo_config import cfg
+from oslo_utils import units
 
 from manila import context
 from manila import exception
@@ -52,6 +55,15 @@ class FakeConfig(object):
             "zfs_replica_snapshot_prefix", "tmp_snapshot_for_replication_")
         self.zfs_migration_snapshot_prefix = kwargs.get(
             "zfs_migration_snapshot_prefix", "tmp_snapshot_for_migration_")
+        self.zfs_send_compression = kwargs.get(
+            "zfs_send_compression", "none")
+        self.zfs_send_large_blocks = kwargs.get(
+            "zfs_send_large_blocks", False)
+        self.zfs_send_embedded_data = kwargs.get(
+            "zfs_send_embedded_data", False)
+        self.zfs_send_buffer_size = kwargs.get("zfs_send_buffer_size", 0)
+        self.zfs_receive_resumable = kwargs.get(
+            "zfs_receive_resumable", False)
         self.zfs_dataset_creation_options = kwargs.get(
             "zfs_dataset_creation_options", ["fook=foov", "bark=barv"])
         self.network_config_group = kwargs.get(
@@ -86,6 +98,15 @@ class FakeDriverPrivateStorage(object):
     def get(self, entity_id, key):
         return self.storage.get(entity_id, {}).get(key)
 
+    def get_by_entities(self, entity_ids, key):
+        if not isinstance(key, list):
+            key = [key]
+        return {
+            entity_id: {k: v for k, v in self.storage.get(
+                entity_id, {}).items() if k in key}
+            for entity_id in entity_ids
+        }
+
     def delete(self, entity_id):
         self.storage.pop(entity_id, None)
 
@@ -270,13 +291,22 @@ class ZFSonLinuxShareDriverTestCase(test.TestCase):
     @ddt.data(None, '', 'foo_replication_domain')
     def test__get_pools_info(self, replication_domain):
         self.mock_object(
-            self.driver, 'get_zpool_option',
-            mock.Mock(side_effect=['2G', '3G', '5G', '4G']))
+            self.driver, 'get_zpools_info',
+            mock.Mock(return_value={
+                'foo': {'size': 3 * units.Gi, 'free': 2 * units.Gi,
+                        'allocated': units.Gi, 'fragmentation': 10,
+                        'capacity': 33, 'dedupratio': 1.0},
+                'bar': {'size': 4 * units.Gi, 'free': 5 * units.Gi,
+                        'allocated': 0, 'fragmentation': None,
+                        'capacity': 0, 'dedupratio': None},
+            }))
         self.configuration.replication_domain = replication_domain
         self.driver.zpool_list = ['foo', 'bar']
         expected = [
             {'pool_name': 'foo', 'total_capacity_gb': 3.0,
              'free_capacity_gb': 2.0, 'reserved_percentage': 0,
+             'fragmentation_percent': 10,
+             'dedupe_ratio': 1.0,
              'compression': [True, False],
              'dedupe': [True, False],
              'thin_provisioning': [True],
@@ -299,12 +329,7 @@ class ZFSonLinuxShareDriverTestCase(test.TestCase):
         result = self.driver._get_pools_info()
 
         self.assertEqual(expected, result)
-        self.driver.get_zpool_option.assert_has_calls([
-            mock.call('foo', 'free'),
-            mock.call('foo', 'size'),
-            mock.call('bar', 'free'),
-            mock.call('bar', 'size'),
-        ])
+        self.driver.get_zpools_info.assert_called_once_with(['foo', 'bar'])
 
     @ddt.data(
         ([], {'compression': [True, False], 'dedupe': [True, False]}),
@@ -1682,31 +1707,41 @@ class ZFSonLinuxShareDriverTestCase(test.TestCase):
              'ssh_cmd': 'fake_dst_ssh_cmd',
              'repl_snapshot_tag': old_repl_snapshot_tag}
         )
+        new_repl_snapshot_tag = snap_tag_prefix + '_time_some_time'
+        stale_dst_snapshot_tag = snap_tag_prefix + 'quux'
         self.mock_object(
             self.driver, 'execute',
-            mock.Mock(side_effect=[('a', 'b'), ('c', 'd'), ('e', 'f')]))
+            mock.Mock(side_effect=[
+                ('a', 'b'),
+                ('c', 'd'),
+                ('\n'.join([
+                    src_dataset_name + '@' + old_repl_snapshot_tag,
+                    src_dataset_name + '@' + snap_tag_prefix + 'quuz',
+                    src_dataset_name + '@' + new_repl_snapshot_tag,
+                    src_dataset_name + '@fake_user_snapshot',
+                ]), 'f'),
+            ]))
         self.mock_object(self.driver, 'execute_with_retry',
                          mock.Mock(side_effect=[('g', 'h')]))
-        self.mock_object(self.driver, 'zfs',
-                         mock.Mock(side_effect=[('j', 'k'), ('l', 'm')]))
         self.mock_object(
-            self.driver, 'parse_zfs_answer',
+            self.driver, 'zfs',
             mock.Mock(side_effect=[
-                ({'NAME': dst_dataset_name + '@' + old_repl_snapshot_tag},
-                 {'NAME': dst_dataset_name + '@%s_time_some_time' %
-                  snap_tag_prefix},
-                 {'NAME': 'other/dataset/name1@' + old_repl_snapshot_tag}),
-                ({'NAME': src_dataset_name + '@' + old_repl_snapshot_tag},
-                 {'NAME': src_dataset_name + '@' + snap_tag_prefix + 'quuz'},
-                 {'NAME': 'other/dataset/name2@' + old_repl_snapshot_tag}),
-            ])
-        )
+                ('j', 'k'),
+                ('\n'.join([
+                    dst_dataset_name + '@' + old_repl_snapshot_tag,
+                    dst_dataset_name + '@' + new_repl_snapshot_tag,
+                    dst_dataset_name + '@' + stale_dst_snapshot_tag,
+                    dst_dataset_name + '@fake_user_snapshot',
+                ]), 'm'),
+            ]))
+        self.mock_object(self.driver, 'zfs_with_retry')
+        self.mock_object(
+            self.driver.private_storage, 'get_by_entities',
+            mock.Mock(wraps=self.driver.private_storage.get_by_entities))
         mock_helper = self.mock_object(self.driver, '_get_share_helper')
         self.configuration.zfs_dataset_name_prefix = 'fake_dataset_name_prefix'
         mock_utcnow = self.mock_object(zfs_driver.timeutils, 'utcnow')
         mock_utcnow.return_value.isoformat.return_value = 'some_time'
-        mock_delete_snapshot = self.mock_object(
-            self.driver, '_delete_dataset_or_snapshot_with_retry')
 
         result = self.driver.update_replica_state(
             'fake_context', replica_list, replica, access_rules,
@@ -1717,6 +1752,12 @@ class ZFSonLinuxShareDriverTestCase(test.TestCase):
         mock_helper.return_value.update_access.assert_called_once_with(
             dst_dataset_name, access_rules, add_rules=[], delete_rules=[],
             make_all_ro=True)
+        self.driver.private_storage.get_by_entities.assert_has_calls([
+            mock.call([replica['id'], active_replica['id']],
+                      ['dataset_name', 'ssh_cmd', 'repl_snapshot_tag']),
+            mock.call([replica['id'], active_replica['id']],
+                      'repl_snapshot_tag'),
+        ])
         self.driver.execute_with_retry.assert_called_once_with(
             'ssh', 'fake_src_ssh_cmd', 'sudo', 'zfs', 'destroy', '-f',
             src_dataset_name + '@' + snap_tag_prefix + 'quuz')
@@ -1728,17 +1769,168 @@ class ZFSonLinuxShareDriverTestCase(test.TestCase):
             mock.call(
                 'ssh', 'fake_src_ssh_cmd', 'sudo', 'zfs', 'send',
                 '-vDRI', old_repl_snapshot_tag,
-                src_dataset_name + '@%s' % snap_tag_prefix + '_time_some_time',
+                src_dataset_name + '@' + new_repl_snapshot_tag,
                 '|', 'ssh', 'fake_dst_ssh_cmd',
                 'sudo', 'zfs', 'receive', '-vF', dst_dataset_name),
             mock.call(
                 'ssh', 'fake_src_ssh_cmd',
-                'sudo', 'zfs', 'list', '-r', '-t', 'snapshot', 'bar'),
+                'sudo', 'zfs', 'list', '-H', '-o', 'name', '-t', 'snapshot',
+                '-d', '1', src_dataset_name),
+        ])
+        self.driver.zfs.assert_has_calls([
+            mock.call('set', 'readonly=on', dst_dataset_name),
+            mock.call('list', '-H', '-o', 'name', '-t', 'snapshot',
+                      '-d', '1', dst_dataset_name),
+        ])
+        self.driver.zfs_with_retry.assert_called_once_with(
+            'destroy', '-f', '%s@%s,%s' % (
+                dst_dataset_name, old_repl_snapshot_tag,
+                stale_dst_snapshot_tag))
+
+    def test_update_replica_nothing_to_prune(self):
+        active_replica = {
+            'id': 'fake_active_replica_id',
+            'host': 'hostname1@backend_name1#foo',
+            'replica_state': zfs_driver.constants.REPLICA_STATE_ACTIVE,
+        }
+        replica = {
+            'id': 'fake_new_replica_id',
+            'host': 'hostname2@backend_name2#bar',
+            'share_proto': 'NFS',
+            'replica_state': None,
+        }
+        for repl in (active_replica, replica):
+            self.driver.private_storage.update(
+                repl['id'],
+                {'dataset_name': 'bar/%s' % repl['id'],
+                 'ssh_cmd': 'fake_ssh_cmd',
+                 'repl_snapshot_tag': 'fake_old_tag'})
+        mock_utcnow = self.mock_object(zfs_driver.timeutils, 'utcnow')
+        mock_utcnow.return_value.isoformat.return_value = 'some_time'
+        new_snapshot_tag = self.driver._get_replication_snapshot_tag(replica)
+        self.mock_object(
+            self.driver, 'execute',
+            mock.Mock(side_effect=[
+                ('a', 'b'), ('c', 'd'),
+                ('bar/%s@%s' % (active_replica['id'], new_snapshot_tag),
+                 'f')]))
+        self.mock_object(self.driver, 'execute_with_retry')
+        self.mock_object(
+            self.driver, 'zfs',
+            mock.Mock(side_effect=[('j', 'k'), ('', 'm')]))
+        self.mock_object(self.driver, 'zfs_with_retry')
+
+        result = self.driver.update_replica_state(
+            'fake_context', [replica, active_replica], replica, [], [])
+
+        self.assertEqual(zfs_driver.constants.REPLICA_STATE_IN_SYNC, result)
+        self.assertFalse(self.driver.execute_with_retry.called)
+        self.assertFalse(self.driver.zfs_with_retry.called)
+
+    @ddt.data(
+        ({}, {},
+         ['sudo', 'zfs', 'send', '-vDR', 'foo@snap', '|',
+          'ssh', 'dst_ssh', 'sudo', 'zfs', 'receive', '-v', 'bar/ds']),
+        ({'previous_snapshot_tag': 'prev', 'force_receive': True}, {},
+         ['sudo', 'zfs', 'send', '-vDRI', 'prev', 'foo@snap', '|',
+          'ssh', 'dst_ssh', 'sudo', 'zfs', 'receive', '-vF', 'bar/ds']),
+        ({'previous_snapshot_tag': 'prev', 'force_receive': True},
+         {'zfs_send_compression': 'lz4', 'zfs_send_buffer_size': 512,
+          'zfs_send_large_blocks': True, 'zfs_send_embedded_data': True,
+          'zfs_receive_resumable': True},
+         ['sudo', 'zfs', 'send', '-vLeI', 'prev', 'foo@snap', '|',
+          'lz4', '-c', '|', 'mbuffer', '-q', '-m', '512M', '|',
+          'ssh', 'dst_ssh',
+          '"mbuffer -q -m 512M | lz4 -dc | sudo zfs receive -vFs bar/ds"']),
+        ({'resume_token': 'fake_token', 'progress_file': '/fake/progress'},
+         {'zfs_send_compression': 'gzip', 'zfs_receive_resumable': True},
+         ['sudo', 'zfs', 'send', '-vP', '-t', 'fake_token',
+          '2>/fake/progress', '|', 'gzip', '-c', '|', 'ssh', 'dst_ssh',
+          '"gzip -dc | sudo zfs receive -vs bar/ds"']),
+    )
+    @ddt.unpack
+    def test__get_send_receive_cmd(self, kwargs, config, expected):
+        for k, v in config.items():
+            setattr(self.configuration, k, v)
+
+        result = self.driver._get_send_receive_cmd(
+            'foo@snap', 'bar/ds', 'dst_ssh', **kwargs)
+
+        self.assertEqual(expected, result)
+
+    @ddt.data(('fake_token\n', 'fake_token'), ('-\n', None), ('', None))
+    @ddt.unpack
+    def test__get_receive_resume_token(self, out, expected):
+        self.mock_object(
+            self.driver, 'execute', mock.Mock(return_value=(out, '')))
+
+        result = self.driver._get_receive_resume_token('bar/ds', 'dst_ssh')
+
+        self.assertEqual(expected, result)
+        self.driver.execute.assert_called_once_with(
+            'ssh', 'dst_ssh', 'sudo', 'zfs', 'get', '-H', '-o', 'value',
+            'receive_resume_token', 'bar/ds')
+
+    def test__get_receive_resume_token_error(self):
+        self.mock_object(
+            self.driver, 'execute',
+            mock.Mock(side_effect=exception.ProcessExecutionError('fake')))
+
+        self.assertIsNone(
+            self.driver._get_receive_resume_token('bar/ds', 'dst_ssh'))
+
+    def test__send_snapshot_resumed(self):
+        self.configuration.zfs_receive_resumable = True
+        self.mock_object(
+            self.driver, 'execute',
+            mock.Mock(side_effect=[
+                exception.ProcessExecutionError('fake'),
+                ('fake_token', ''),
+                ('resumed_out', 'resumed_err'),
+                ('bar/ds@prev\nbar/ds@middle\n', ''),
+                ('fake_out', 'fake_err'),
+            ]))
+
+        result = self.driver._send_snapshot(
+            'src_ssh', 'dst_ssh', 'foo@snap', 'bar/ds',
+            previous_snapshot_tag='prev', force_receive=True)
+
+        self.assertEqual(('fake_out', 'fake_err'), result)
+        self.driver.execute.assert_has_calls([
+            mock.call('ssh', 'src_ssh', 'sudo', 'zfs', 'send', '-vI', 'prev',
+                      'foo@snap', '|', 'ssh', 'dst_ssh',
+                      'sudo', 'zfs', 'receive', '-vFs', 'bar/ds'),
+            mock.call('ssh', 'dst_ssh', 'sudo', 'zfs', 'get', '-H', '-o',
+                      'value', 'receive_resume_token', 'bar/ds'),
+            mock.call('ssh', 'src_ssh', 'sudo', 'zfs', 'send', '-v', '-t',
+                      'fake_token', '|', 'ssh', 'dst_ssh',
+                      'sudo', 'zfs', 'receive', '-vFs', 'bar/ds'),
+            mock.call('ssh', 'dst_ssh', 'sudo', 'zfs', 'list', '-H', '-o',
+                      'name', '-t', 'snapshot', '-s', 'createtxg', '-d', '1',
+                      'bar/ds'),
+            mock.call('ssh', 'src_ssh', 'sudo', 'zfs', 'send', '-vI',
+                      'middle', 'foo@snap', '|', 'ssh', 'dst_ssh',
+                      'sudo', 'zfs', 'receive', '-vFs', 'bar/ds'),
         ])
-        mock_delete_snapshot.assert_called_once_with(
-            dst_dataset_name + '@' + old_repl_snapshot_tag)
-        self.driver.parse_zfs_answer.assert_has_calls(
-            [mock.call('l'), mock.call('e')])
+
+    @ddt.data(False, True)
+    def test__send_snapshot_error(self, resumable):
+        self.configuration.zfs_receive_resumable = resumable
+        self.mock_object(
+            self.driver, 'execute',
+            mock.Mock(side_effect=exception.ProcessExecutionError('fake')))
+        self.mock_object(
+            self.driver, '_get_receive_resume_token',
+            mock.Mock(return_value='fake_token'))
+
+        self.assertRaises(
+            exception.ProcessExecutionError,
+            self.driver._send_snapshot,
+            'src_ssh', 'dst_ssh', 'foo@snap', 'bar/ds')
+
+        expected_attempts = (
+            zfs_driver.SEND_RESUME_ATTEMPTS + 1 if resumable else 1)
+        self.assertEqual(expected_attempts, self.driver.execute.call_count)
 
     def test_promote_replica_active_available(self):
         active_replica = {
@@ -2293,15 +2485,19 @@ class ZFSonLinuxShareDriverTestCase(test.TestCase):
                 'dataset_name': src_dataset_name,
             }
         )
+        progress_file = os.path.join(
+            zfs_driver.tempfile.gettempdir(), 'bar_dataset_name.progress')
         with mock.patch("six.moves.builtins.open",
                         mock.mock_open(read_data="data")) as mock_file:
             self.driver.migration_start(
                 self._context, src_share, dst_share, None, None)
 
             expected_file_content = (
-                'ssh %(ssh_cmd)s sudo zfs send -vDR %(snap)s | '
+                'ssh %(ssh_cmd)s sudo zfs send -vPDR %(snap)s '
+                '2>%(progress_file)s | '
                 'ssh %(dst_ssh_cmd)s sudo zfs receive -v %(dst_dataset)s'
             ) % {
+                'progress_file': progress_file,
                 'ssh_cmd': self.driver.private_storage.get(
                     src_share['id'], 'ssh_cmd'),
                 'dst_ssh_cmd': self.driver.private_storage.get(
@@ -2325,7 +2521,8 @@ class ZFSonLinuxShareDriverTestCase(test.TestCase):
         for k, v in (('dataset_name', dst_dataset_name),
                      ('migr_snapshot_tag', snapshot_tag),
                      ('pool_name', 'barpool'),
-                     ('ssh_cmd', dst_username + '@' + dst_hostname)):
+                     ('ssh_cmd', dst_username + '@' + dst_hostname),
+                     ('migr_progress_file', progress_file)):
             self.assertEqual(
                 v, self.driver.private_storage.get(dst_share['id'], k))
 
@@ -2417,6 +2614,109 @@ class ZFSonLinuxShareDriverTestCase(test.TestCase):
                       executor=mock_executor.return_value),
         ])
 
+    def test_migration_continue_resume(self):
+        self.configuration.zfs_receive_resumable = True
+        dst_share = {
+            'id': 'fake_dst_share_id',
+            'host': 'barhost@barbackend#barpool',
+        }
+        dst_dataset_name = 'bar/dataset_name'
+        self.driver.private_storage.update(
+            dst_share['id'], {
+                'migr_snapshot_tag': 'fake_migration_snapshot_tag',
+                'migr_progress_file': '/fake/progress',
+                'dataset_name': dst_dataset_name,
+                'ssh_cmd': 'fake_dst_ssh_cmd',
+            })
+        mock_executor = self.mock_object(
+            self.driver, '_get_shell_executor_by_host')
+        self.mock_object(
+            self.driver, 'execute',
+            mock.Mock(return_value=('fake_out', 'fake_err')))
+        self.mock_object(
+            self.driver, '_get_receive_resume_token',
+            mock.Mock(return_value='fake_token'))
+        self.mock_object(self.driver, '_run_migration_script')
+
+        result = self.driver.migration_continue(
+            self._context, 'fake_src_share', dst_share, None, None)
+
+        self.assertIsNone(result)
+        self.assertFalse(mock_executor.called)
+        self.driver.execute.assert_called_once_with('ps', 'aux')
+        self.driver._get_receive_resume_token.assert_called_once_with(
+            dst_dataset_name, 'fake_dst_ssh_cmd')
+        self.driver._run_migration_script.assert_called_once_with(
+            'fake_username@240.241.242.244',
+            ['sudo', 'zfs', 'send', '-vP', '-t', 'fake_token',
+             '2>/fake/progress', '|', 'ssh', 'fake_dst_ssh_cmd',
+             'sudo', 'zfs', 'receive', '-vs', dst_dataset_name],
+            'bar_dataset_name')
+        self.assertEqual(
+            'fake_token',
+            self.driver.private_storage.get(
+                dst_share['id'], 'migr_resume_token'))
+
+    def test_migration_get_progress(self):
+        dst_share = {'id': 'fake_dst_share_id'}
+        self.driver.private_storage.update(
+            dst_share['id'], {'migr_progress_file': '/fake/progress'})
+        out = ('full\tfoo@snap\t4096\n'
+               'size\t4096\n'
+               '23:59:59\t1024\tfoo@snap\n'
+               '00:00:01\t3072\tfoo@snap\n')
+        self.mock_object(
+            self.driver, 'execute', mock.Mock(return_value=(out, '')))
+
+        result = self.driver.migration_get_progress(
+            self._context, 'fake_src_share', dst_share, None, None)
+
+        self.assertEqual(
+            {'total_progress': 75, 'bytes_sent': 3072, 'bytes_total': 4096,
+             'throughput': 1024},
+            result)
+        self.driver.execute.assert_called_once_with('cat', '/fake/progress')
+
+    def test__parse_send_progress_replication_stream(self):
+        out = ('full\tfoo@snap1\t1000\n'
+               'incremental\tsnap1\tfoo@snap2\t500\n'
+               'incremental\tsnap2\tfoo@snap3\t200\n'
+               'incremental\tsnap3\tfoo@snap4\t300\n'
+               'size\t2000\n'
+               '10:00:00\t600\tfoo@snap1\n'
+               '10:00:01\t1000\tfoo@snap1\n'
+               '10:00:02\t100\tfoo@snap2\n'
+               '10:00:03\t500\tfoo@snap2\n'
+               '10:00:05\t100\tfoo@snap4\n')
+
+        result = self.driver._parse_send_progress(out)
+
+        # The 200 bytes of snap3 were sent without any progress report.
+        self.assertEqual(
+            {'total_progress': 90, 'bytes_sent': 1800, 'bytes_total': 2000,
+             'throughput': 240},
+            result)
+
+    def test__parse_send_progress_no_samples(self):
+        result = self.driver._parse_send_progress(
+            'full\tfoo@snap\t4096\nsize\t4096\n')
+
+        self.assertEqual(
+            {'total_progress': 0, 'bytes_sent': 0, 'bytes_total': 4096,
+             'throughput': 0},
+            result)
+
+    def test_migration_get_progress_unknown(self):
+        self.mock_object(
+            self.driver, 'execute',
+            mock.Mock(side_effect=exception.ProcessExecutionError('fake')))
+
+        result = self.driver.migration_get_progress(
+            self._context, 'fake_src_share', {'id': 'fake_dst_share_id'},
+            None, None)
+
+        self.assertEqual({'total_progress': 0}, result)
+
     def test_migration_complete(self):
         src_share = {'id': 'fake_src_share_id'}
         dst_share = {
@@ -2487,6 +2787,7 @@ class ZFSonLinuxShareDriverTestCase(test.TestCase):
                 'migr_snapshot_tag': snapshot_tag,
                 'dataset_name': dst_dataset_name,
                 'ssh_cmd': dst_ssh_cmd,
+                'migr_progress_file': '/fake/progress',
             })
         self.mock_object(zfs_driver.time, 'sleep')
         mock_delete_dataset = self.mock_object(
@@ -2507,6 +2808,7 @@ class ZFSonLinuxShareDriverTestCase(test.TestCase):
             mock.call('sudo', 'kill', '-9', '12345'),
             mock.call('ssh', dst_ssh_cmd, 'sudo', 'zfs', 'destroy', '-r',
                       dst_dataset_name),
+            mock.call('rm', '-f', '/fake/progress'),
         ])
         zfs_driver.time.sleep.assert_called_once_with(2)
         mock_delete_dataset.assert_called_once_with(
@@ -202,6 +202,27 @@ foo_res  opt_3           some_value       local"""
         self.driver._get_option.assert_called_once_with(
             zpool_name, opt_name, True)
 
+    def test_get_zpools_info(self):
+        out = ('foo\t3221225472\t2147483648\t1073741824\t10\t33\t1.50x\n'
+               'bar/baz\t1024\t1024\t0\t-\t0\t1.00\n')
+        self.mock_object(
+            self.driver, 'execute', mock.Mock(return_value=(out, '')))
+
+        result = self.driver.get_zpools_info(['foo', 'bar/baz'])
+
+        self.assertEqual(
+            {'foo': {'size': 3221225472, 'free': 2147483648,
+                     'allocated': 1073741824, 'fragmentation': 10,
+                     'capacity': 33, 'dedupratio': 1.5},
+             'bar/baz': {'size': 1024, 'free': 1024, 'allocated': 0,
+                         'fragmentation': None, 'capacity': 0,
+                         'dedupratio': 1.0}},
+            result)
+        self.driver.execute.assert_called_once_with(
+            'sudo', 'zpool', 'list', '-Hp', '-o',
+            'name,size,free,allocated,fragmentation,capacity,dedupratio',
+            'foo', 'bar/baz')
+
     def test_get_zfs_option(self):
         self.mock_object(self.driver, '_get_option')
         dataset_name = 'foo_resource_name'
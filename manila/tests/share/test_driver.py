@@ -153,6 +153,57 @@ class ShareDriverTestCase(test.TestCase):
             self.assertIn(key, result)
         self.assertEqual('Open Source', result['vendor_name'])
 
+    def test_get_share_stats_refresh_in_background(self):
+        self.flags(driver_stats_refresh_interval=60)
+        conf = configuration.Configuration(None)
+        share_driver = driver.ShareDriver(True, configuration=conf)
+        looping_call = self.mock_object(
+            driver.loopingcall, 'FixedIntervalLoopingCall')
+        self.mock_object(share_driver, '_update_share_stats')
+
+        share_driver.get_share_stats(True)
+        result = share_driver.get_share_stats(True)
+
+        self.assertEqual(share_driver._stats, result)
+        share_driver._update_share_stats.assert_called_once_with()
+        looping_call.assert_called_once_with(
+            share_driver._collect_share_stats)
+        looping_call.return_value.start.assert_called_once_with(
+            interval=60, initial_delay=60)
+
+    def test__collect_share_stats(self):
+        conf = configuration.Configuration(None)
+        share_driver = driver.ShareDriver(True, configuration=conf)
+        share_driver._stats = {'fake_key': 'fake_value'}
+
+        share_driver._collect_share_stats()
+
+        self.assertEqual('Open Source', share_driver._stats['vendor_name'])
+
+    @ddt.data(driver.eventlet_timeout.Timeout, Exception)
+    def test__collect_share_stats_failure(self, side_effect):
+        conf = configuration.Configuration(None)
+        share_driver = driver.ShareDriver(True, configuration=conf)
+        share_driver._stats = {'fake_key': 'fake_value'}
+        self.mock_object(share_driver, '_update_share_stats',
+                         mock.Mock(side_effect=side_effect))
+
+        share_driver._collect_share_stats()
+
+        self.assertEqual({'fake_key': 'fake_value'}, share_driver._stats)
+
+    def test__collect_share_stats_timeout(self):
+        self.flags(driver_stats_refresh_timeout=1)
+        conf = configuration.Configuration(None)
+        share_driver = driver.ShareDriver(True, configuration=conf)
+        share_driver._stats = {'fake_key': 'fake_value'}
+        with mock.patch.object(driver.eventlet_timeout.Timeout, 'start',
+                               autospec=True) as start:
+            share_driver._collect_share_stats()
+
+        self.assertEqual(1, start.call_args[0][0].seconds)
+        self.assertEqual('Open Source', share_driver._stats['vendor_name'])
+
     @ddt.data(
         {'opt': True, 'allowed': True},
         {'opt': True, 'allowed': (True, False)},
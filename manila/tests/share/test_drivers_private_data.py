@@ -105,6 +105,46 @@ class DriverPrivateDataTestCase(test.TestCase):
             self.entity_id, key, default_value
         )
 
+    @ddt.data(("fake_key", ["fake_key"]), (["fake_key"], ["fake_key"]),
+              (None, None))
+    @ddt.unpack
+    def test_get_by_entities(self, key, expected_key):
+        data = pd.DriverPrivateData(storage=self.fake_storage)
+        entity_ids = [self.entity_id, uuidutils.generate_uuid()]
+        value = {entity_id: {"fake_key": "fake_value"}
+                 for entity_id in entity_ids}
+        self.mock_object(self.fake_storage, 'get_by_entities',
+                         mock.Mock(return_value=value))
+
+        actual_result = data.get_by_entities(entity_ids, key)
+
+        self.assertEqual(value, actual_result)
+        self.fake_storage.get_by_entities.assert_called_once_with(
+            entity_ids, expected_key)
+
+    def test_get_by_entities_invalid(self):
+        data = pd.DriverPrivateData(storage=self.fake_storage)
+
+        self.assertRaises(ValueError, data.get_by_entities,
+                          [self.entity_id, "invalid"])
+
+        self.assertFalse(self.fake_storage.get_by_entities.called)
+
+    def test_storage_driver_get_by_entities(self):
+        storage = pd.SqlStorageDriver(context="fake", backend_host="fake")
+        self.mock_object(storage, 'get',
+                         mock.Mock(side_effect=[{"foo": "bar"}, {}]))
+
+        actual_result = pd.StorageDriver.get_by_entities(
+            storage, ["fake_id", "fake_id2"], ["foo"])
+
+        self.assertEqual({"fake_id": {"foo": "bar"}, "fake_id2": {}},
+                         actual_result)
+        storage.get.assert_has_calls([
+            mock.call("fake_id", ["foo"], {}),
+            mock.call("fake_id2", ["foo"], {}),
+        ])
+
     def test_delete(self):
         data = pd.DriverPrivateData(storage=self.fake_storage)
         key = "fake_key"
@@ -121,6 +161,7 @@ class DriverPrivateDataTestCase(test.TestCase):
 
 fake_storage_data = {
     "entity_id": "fake_id",
+    "entity_ids": ["fake_id"],
     "details": {"foo": "bar"},
     "context": "fake_context",
     "backend_host": "fake_host",
@@ -157,6 +198,12 @@ class SqlStorageDriverTestCase(test.TestCase):
             "valid_args": create_arg_list(
                 ["context", "entity_id", "key", "default"]),
         },
+        {
+            "method_name": 'get_by_entities',
+            "method_kwargs": create_arg_dict(["entity_ids", "key"]),
+            "valid_args": create_arg_list(
+                ["context", "entity_ids", "key"]),
+        },
         {
             "method_name": 'delete',
             "method_kwargs": create_arg_dict(["entity_id", "key"]),
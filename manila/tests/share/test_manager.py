@@ -2066,6 +2066,8 @@ class ShareManagerTestCase(test.TestCase):
         }
         self.mock_object(db, 'share_server_create',
                          mock.Mock(return_value=fake_server))
+        self.mock_object(db, 'share_server_get',
+                         mock.Mock(return_value=fake_server))
         self.mock_object(db, 'share_instance_update',
                          mock.Mock(return_value=fake_share.instance))
         self.mock_object(db, 'share_instance_get',
@@ -2212,6 +2214,8 @@ class ShareManagerTestCase(test.TestCase):
         }
         self.mock_object(db, 'share_server_create',
                          mock.Mock(return_value=fake_server))
+        self.mock_object(db, 'share_server_get',
+                         mock.Mock(return_value=fake_server))
         self.mock_object(self.share_manager, '_setup_server',
                          mock.Mock(return_value=fake_server))
 
@@ -2243,6 +2247,8 @@ class ShareManagerTestCase(test.TestCase):
         }
         self.mock_object(db, 'share_server_create',
                          mock.Mock(return_value=fake_server))
+        self.mock_object(db, 'share_server_get',
+                         mock.Mock(return_value=fake_server))
         self.mock_object(self.share_manager, '_setup_server',
                          mock.Mock(return_value=fake_server))
 
@@ -3533,6 +3539,19 @@ class ShareManagerTestCase(test.TestCase):
                                   (['INFO', 'share.shrink.start'],
                                    ['INFO', 'share.shrink.end']))
 
+    def test_publish_service_capabilities(self):
+        self.mock_object(self.share_manager, '_report_driver_status')
+        self.mock_object(self.share_manager, '_publish_service_capabilities')
+        self.share_manager._published_capabilities = {'field': 'val'}
+
+        self.share_manager.publish_service_capabilities(self.context)
+
+        self.share_manager._report_driver_status.assert_called_once_with(
+            self.context)
+        (self.share_manager._publish_service_capabilities.
+            assert_called_once_with(self.context))
+        self.assertIsNone(self.share_manager._published_capabilities)
+
     def test_report_driver_status_driver_handles_ss_false(self):
         fake_stats = {'field': 'val'}
         fake_pool = {'name': 'pool1'}
@@ -5527,6 +5546,68 @@ class ShareManagerTestCase(test.TestCase):
         (self.share_manager._create_share_server_in_backend.
          assert_called_once_with(self.context, server))
 
+    def test__create_share_server_in_backend_active(self):
+        server = db_utils.create_share_server(status=constants.STATUS_ACTIVE)
+        self.mock_object(self.share_manager.db, 'share_server_get')
+        self.mock_object(self.share_manager, '_setup_server')
+
+        result = self.share_manager._create_share_server_in_backend(
+            self.context, server)
+
+        self.assertEqual(server, result)
+        self.assertFalse(self.share_manager.db.share_server_get.called)
+        self.assertFalse(self.share_manager._setup_server.called)
+
+    def test__create_share_server_in_backend_creating(self):
+        server = db_utils.create_share_server(
+            status=constants.STATUS_CREATING)
+        mock_synchronized = self.mock_object(
+            utils, 'synchronized', mock.Mock(return_value=lambda f: f))
+        self.mock_object(self.share_manager, '_setup_server',
+                         mock.Mock(return_value='fake_server'))
+
+        result = self.share_manager._create_share_server_in_backend(
+            self.context, server, metadata='fake_metadata')
+
+        self.assertEqual('fake_server', result)
+        mock_synchronized.assert_called_once_with(
+            'share_server_setup_%s' % server['id'], external=True)
+        self.share_manager._setup_server.assert_called_once_with(
+            self.context, mock.ANY, metadata='fake_metadata')
+        self.assertEqual(
+            server['id'], self.share_manager._setup_server.call_args[0][1].id)
+
+    def test__create_share_server_in_backend_set_up_concurrently(self):
+        server = db_utils.create_share_server(
+            status=constants.STATUS_CREATING)
+        active_server = dict(server, status=constants.STATUS_ACTIVE)
+        self.mock_object(self.share_manager.db, 'share_server_get',
+                         mock.Mock(return_value=active_server))
+        self.mock_object(self.share_manager, '_setup_server')
+
+        result = self.share_manager._create_share_server_in_backend(
+            self.context, server)
+
+        self.assertEqual(active_server, result)
+        self.share_manager.db.share_server_get.assert_called_once_with(
+            self.context, server['id'])
+        self.assertFalse(self.share_manager._setup_server.called)
+
+    def test__create_share_server_in_backend_failed_concurrently(self):
+        server = db_utils.create_share_server(
+            status=constants.STATUS_CREATING)
+        self.mock_object(
+            self.share_manager.db, 'share_server_get',
+            mock.Mock(return_value=dict(server,
+                                        status=constants.STATUS_ERROR)))
+        self.mock_object(self.share_manager, '_setup_server')
+
+        self.assertRaises(
+            exception.ShareServerNotCreated,
+            self.share_manager._create_share_server_in_backend,
+            self.context, server)
+        self.assertFalse(self.share_manager._setup_server.called)
+
     def test_manage_snapshot_invalid_driver_mode(self):
         self.mock_object(self.share_manager, 'driver')
         self.share_manager.driver.driver_handles_share_servers = True
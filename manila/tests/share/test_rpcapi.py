@@ -362,6 +362,20 @@ class ShareRpcAPITestCase(test.TestCase):
                              share_instance=self.fake_share['instance'],
                              share_server_id='fake_server_id')
 
+    def test_publish_service_capabilities_to_host(self):
+        self._test_share_api('publish_service_capabilities',
+                             rpc_method='cast',
+                             host=self.fake_host)
+
+    def test_publish_service_capabilities(self):
+        prepare = self.mock_object(self.rpcapi.client, 'prepare')
+
+        self.rpcapi.publish_service_capabilities(self.ctxt)
+
+        prepare.assert_called_once_with(fanout=True, version='1.0')
+        prepare.return_value.cast.assert_called_once_with(
+            self.ctxt, 'publish_service_capabilities')
+
     def test_snapshot_update_access(self):
         self._test_share_api('snapshot_update_access',
                              rpc_method='cast',
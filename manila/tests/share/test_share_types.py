@@ -21,8 +21,10 @@ import datetime
 import itertools
 
 import ddt
+import fixtures
 import mock
 from oslo_utils import strutils
+from oslo_utils import timeutils
 
 from manila.common import constants
 from manila import context
@@ -375,3 +377,140 @@ class ShareTypesTestCase(test.TestCase):
                           share_types.parse_boolean_extra_spec,
                           'fake_key',
                           spec_value)
+
+
+@ddt.ddt
+class ShareTypeCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ShareTypeCacheTestCase, self).setUp()
+        self.context = context.get_admin_context()
+        self.flags(share_type_cache_ttl=60)
+        self.useFixture(fixtures.MonkeyPatch(
+            'oslo_utils.timeutils.utcnow.override_time',
+            datetime.datetime(2019, 1, 1)))
+        share_types.invalidate_cache()
+        self.addCleanup(share_types.invalidate_cache)
+        self.share_type = {'id': 'fake_id', 'name': 'fake_name',
+                           'extra_specs': {'gold': 'True'}}
+        self.mock_object(db, 'share_type_get',
+                         mock.Mock(return_value=self.share_type))
+
+    def test_get_share_type_cached(self):
+        expected = copy.deepcopy(self.share_type)
+
+        first = share_types.get_share_type(self.context, 'fake_id')
+        first['extra_specs']['gold'] = 'False'
+        second = share_types.get_share_type(self.context, 'fake_id')
+
+        self.assertEqual(expected, second)
+        db.share_type_get.assert_called_once_with(
+            self.context, 'fake_id', expected_fields=None)
+
+    def test_get_share_type_cache_disabled(self):
+        self.flags(share_type_cache_ttl=0)
+
+        share_types.get_share_type(self.context, 'fake_id')
+        share_types.get_share_type(self.context, 'fake_id')
+
+        self.assertEqual(2, db.share_type_get.call_count)
+
+    def test_get_share_type_cache_expired(self):
+        share_types.get_share_type(self.context, 'fake_id')
+        timeutils.advance_time_seconds(59)
+        share_types.get_share_type(self.context, 'fake_id')
+        timeutils.advance_time_seconds(1)
+        share_types.get_share_type(self.context, 'fake_id')
+
+        self.assertEqual(2, db.share_type_get.call_count)
+
+    def test_get_share_type_cache_per_project(self):
+        user_context = context.RequestContext('fake_user', 'fake_project')
+
+        share_types.get_share_type(self.context, 'fake_id')
+        share_types.get_share_type(user_context, 'fake_id')
+        share_types.get_share_type(user_context, 'fake_id',
+                                   expected_fields=['projects'])
+        share_types.get_share_type(user_context, 'fake_id')
+
+        self.assertEqual(3, db.share_type_get.call_count)
+
+    def test_get_share_type_extra_specs_cached(self):
+        share_types.get_share_type_extra_specs('fake_id')
+        result = share_types.get_share_type_extra_specs('fake_id', 'gold')
+
+        self.assertEqual('True', result)
+        db.share_type_get.assert_called_once_with(
+            mock.ANY, 'fake_id', expected_fields=None)
+
+    def test_get_default_share_type_cached(self):
+        self.flags(default_share_type='fake_name')
+        share_type = dict(self.share_type, extra_specs={
+            constants.ExtraSpecs.DRIVER_HANDLES_SHARE_SERVERS: 'True'})
+        self.mock_object(db, 'share_type_get_by_name',
+                         mock.Mock(return_value=share_type))
+
+        share_types.get_default_share_type()
+        result = share_types.get_default_share_type()
+
+        self.assertIn('required_extra_specs', result)
+        db.share_type_get_by_name.assert_called_once_with(
+            mock.ANY, 'fake_name')
+
+    def test_get_share_type_not_found_not_cached(self):
+        db.share_type_get.side_effect = exception.ShareTypeNotFound(
+            share_type_id='fake_id')
+
+        for i in range(2):
+            self.assertRaises(exception.ShareTypeNotFound,
+                              share_types.get_share_type,
+                              self.context, 'fake_id')
+
+        self.assertEqual(2, db.share_type_get.call_count)
+
+    @ddt.data(
+        ('update_share_type_extra_specs',
+         'share_type_extra_specs_update_or_create',
+         ('fake_id', {'gold': 'False'})),
+        ('delete_share_type_extra_spec', 'share_type_extra_specs_delete',
+         ('fake_id', 'gold')),
+        ('add_share_type_access', 'share_type_access_add',
+         ('fake_id', 'fake_project')),
+        ('remove_share_type_access', 'share_type_access_remove',
+         ('fake_id', 'fake_project')),
+        ('destroy', 'share_type_destroy', ('fake_id', )),
+    )
+    @ddt.unpack
+    def test_invalidate_on_change(self, method, db_method, args):
+        self.mock_object(db, db_method)
+
+        share_types.get_share_type(self.context, 'fake_id')
+        getattr(share_types, method)(self.context, *args)
+        share_types.get_share_type(self.context, 'fake_id')
+
+        getattr(db, db_method).assert_called_once_with(self.context, *args)
+        self.assertEqual(2, db.share_type_get.call_count)
+
+    def test_invalidate_on_create_failure(self):
+        self.mock_object(db, 'share_type_create', mock.Mock(
+            side_effect=exception.ShareTypeExists(id='fake_name')))
+        specs = {constants.ExtraSpecs.DRIVER_HANDLES_SHARE_SERVERS: 'True'}
+
+        share_types.get_share_type(self.context, 'fake_id')
+        self.assertRaises(exception.ShareTypeExists, share_types.create,
+                          self.context, 'fake_name', specs)
+        share_types.get_share_type(self.context, 'fake_id')
+
+        self.assertEqual(2, db.share_type_get.call_count)
+
+    def test_value_fetched_during_change_not_cached(self):
+        def share_type_get(*args, **kwargs):
+            share_types.invalidate_cache()
+            return self.share_type
+
+        db.share_type_get.side_effect = share_type_get
+
+        share_types.get_share_type(self.context, 'fake_id')
+        share_types.get_share_type(self.context, 'fake_id')
+
+        self.assertEqual(2, db.share_type_get.call_count)
@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
 from manila import context
 from manila import test
 
@@ -29,6 +31,15 @@ class ContextTestCase(test.TestCase):
         self.assertNotIn('admin', user_context.roles)
         self.assertIn('admin', admin_context.roles)
 
+    def test_request_context_elevated_shares_db_stats(self):
+        user_context = context.RequestContext(
+            'fake_user', 'fake_project', is_admin=False)
+        user_context.db_stats = mock.Mock()
+
+        admin_context = user_context.elevated()
+
+        self.assertIs(user_context.db_stats, admin_context.db_stats)
+
     def test_request_context_sets_is_admin(self):
         ctxt = context.RequestContext('111',
                                       '222',
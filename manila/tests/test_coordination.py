@@ -19,6 +19,7 @@ from tooz import coordination as tooz_coordination
 from tooz import locking as tooz_locking
 
 from manila import coordination
+from manila import lock_stats
 from manila import test
 
 
@@ -107,6 +108,35 @@ class CoordinationTestCase(test.TestCase):
         with coordination.Lock('lock'):
             self.assertTrue(get_lock.called)
 
+    def test_lock_records_stats(self, get_lock):
+        self.flags(lock_stats_report_interval=60)
+        mock_add = self.mock_object(lock_stats.LOCK_STATS, 'add')
+
+        with coordination.Lock('lock-{share}', {'share': 'fake_id'}):
+            self.assertFalse(mock_add.called)
+
+        mock_add.assert_called_once_with(
+            'lock-{share}', wait_time=mock.ANY, hold_time=mock.ANY)
+
+    def test_lock_not_acquired_records_no_stats(self, get_lock):
+        self.flags(lock_stats_report_interval=60)
+        get_lock.return_value.acquire.return_value = False
+        mock_add = self.mock_object(lock_stats.LOCK_STATS, 'add')
+        lock = coordination.Lock('lock')
+
+        self.assertFalse(lock.acquire(blocking=False))
+
+        self.assertFalse(mock_add.called)
+
+    def test_lock_stats_disabled(self, get_lock):
+        mock_add = self.mock_object(lock_stats.LOCK_STATS, 'add')
+
+        with coordination.Lock('lock') as lock:
+            self.assertIsNone(lock.timer)
+
+        self.assertTrue(get_lock.return_value.release.called)
+        self.assertFalse(mock_add.called)
+
     def test_synchronized(self, get_lock):
         @coordination.synchronized('lock-{f_name}-{foo.val}-{bar[val]}')
         def func(foo, bar):
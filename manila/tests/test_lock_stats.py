@@ -0,0 +1,125 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+import time
+
+import ddt
+import mock
+
+from manila import lock_stats
+from manila import test
+
+
+@ddt.ddt
+class LockStatsTestCase(test.TestCase):
+
+    @ddt.data(
+        ('share_manager_bd5d1d3b-5c59-4d34-9b4d-3a4e4b0f1c2e',
+         'share_manager_{id}'),
+        ('emc-shareaccess-share_bd5d1d3b_5c59_4d34_9b4d_3a4e4b0f1c2e',
+         'emc-shareaccess-share_{id}'),
+        ('ganesha-index-fake_tag', 'ganesha-index-fake_tag'),
+    )
+    @ddt.unpack
+    def test_lock_name_template(self, name, expected):
+        self.assertEqual(expected, lock_stats.lock_name_template(name))
+
+    def test_histogram(self):
+        histogram = lock_stats.Histogram()
+
+        for duration in (0.0005, 0.05, 0.07, 120):
+            histogram.add(duration)
+
+        result = histogram.to_dict()
+        self.assertEqual(4, result['count'])
+        self.assertEqual(120, result['max'])
+        self.assertAlmostEqual(120.1205, result['total'])
+        self.assertEqual(
+            {'le_0.001': 1, 'le_0.01': 0, 'le_0.1': 2, 'le_1': 0,
+             'le_10': 0, 'le_60': 0, 'inf': 1},
+            result['buckets'])
+
+    def test_report(self):
+        stats = lock_stats.LockStats()
+        stats.add('lock-{id}', wait_time=0.5, hold_time=2)
+        stats.add('lock-{id}', wait_time=1.5, hold_time=1)
+        stats.add('other-lock', hold_time=3)
+
+        result = stats.report()
+
+        self.assertEqual({'lock-{id}', 'other-lock'}, set(result))
+        self.assertEqual(2, result['lock-{id}']['wait']['count'])
+        self.assertEqual(2.0, result['lock-{id}']['wait']['total'])
+        self.assertEqual(3.0, result['lock-{id}']['hold']['total'])
+        self.assertEqual(0, result['other-lock']['wait']['count'])
+        self.assertEqual(1, result['other-lock']['hold']['count'])
+        self.assertEqual({}, stats.report())
+
+    def test_add_max_lock_names(self):
+        self.mock_object(lock_stats, 'MAX_LOCK_NAMES', 2)
+        stats = lock_stats.LockStats()
+
+        for name in ('lock-a', 'lock-b', 'lock-c', 'lock-d', 'lock-a'):
+            stats.add(name, wait_time=1, hold_time=1)
+
+        result = stats.report()
+        self.assertEqual(
+            {'lock-a', 'lock-b', lock_stats.OTHER_LOCKS}, set(result))
+        self.assertEqual(2, result['lock-a']['hold']['count'])
+        self.assertEqual(
+            2, result[lock_stats.OTHER_LOCKS]['hold']['count'])
+
+    @ddt.data((0, False), (60, True))
+    @ddt.unpack
+    def test_enabled(self, interval, expected):
+        self.flags(lock_stats_report_interval=interval)
+
+        self.assertEqual(expected, lock_stats.enabled())
+
+    def test_report_no_reset(self):
+        stats = lock_stats.LockStats()
+        stats.add('lock', wait_time=0.5, hold_time=2)
+
+        stats.report(reset=False)
+
+        self.assertEqual(1, stats.report()['lock']['hold']['count'])
+
+    def test_lock_timer(self):
+        stats = mock.Mock()
+        self.mock_object(time, 'time', mock.Mock(side_effect=[10, 13, 20]))
+        timer = lock_stats.LockTimer('lock', stats=stats)
+
+        timer.acquiring()
+        timer.acquired()
+        timer.released()
+
+        stats.add.assert_called_once_with('lock', wait_time=3, hold_time=7)
+
+    def test_lock_timer_not_acquired(self):
+        stats = mock.Mock()
+        timer = lock_stats.LockTimer('lock', stats=stats)
+
+        timer.acquiring()
+        timer.released()
+
+        self.assertFalse(stats.add.called)
+
+    def test_log_report(self):
+        mock_log = self.mock_object(lock_stats.LOG, 'info')
+        stats = lock_stats.LockStats()
+        stats.add('lock', wait_time=0.5, hold_time=2)
+        stats.add('hot-lock', wait_time=5, hold_time=2)
+
+        lock_stats.log_report(stats.report())
+
+        self.assertEqual(2, mock_log.call_count)
+        self.assertEqual('hot-lock', mock_log.call_args_list[0][0][1]['name'])
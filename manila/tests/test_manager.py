@@ -15,12 +15,18 @@
 
 """Test of Base Manager for Manila."""
 
+import datetime
+
 import ddt
+import fixtures
 import mock
 from oslo_utils import importutils
+from oslo_utils import timeutils
 
+from manila import lock_stats
 from manila import manager
 from manila import test
+from manila.tests import fake_notifier
 
 
 @ddt.ddt
@@ -55,6 +61,36 @@ class ManagerTestCase(test.TestCase):
         fake_manager.run_periodic_tasks.assert_called_once_with(
             fake_context, raise_on_error=raise_on_error)
 
+    def test__report_lock_stats(self):
+        fake_manager = manager.Manager(self.host, self.db_driver)
+        self.mock_object(lock_stats, 'log_report')
+        self.mock_object(lock_stats, 'LOCK_STATS', lock_stats.LockStats())
+        lock_stats.LOCK_STATS.add('lock', wait_time=0.5, hold_time=1)
+        fake_notifier.reset()
+
+        fake_manager._report_lock_stats('fake_context')
+
+        lock_stats.log_report.assert_called_once_with(
+            {'lock': mock.ANY})
+        self.assertEqual(1, len(fake_notifier.NOTIFICATIONS))
+        notification = fake_notifier.NOTIFICATIONS[0]
+        self.assertEqual('lock_stats.report', notification['event_type'])
+        self.assertEqual(self.host, notification['payload']['host'])
+        self.assertEqual(
+            1, notification['payload']['locks']['lock']['hold']['count'])
+        self.assertEqual({}, lock_stats.LOCK_STATS.report())
+
+    def test__report_lock_stats_nothing_recorded(self):
+        fake_manager = manager.Manager(self.host, self.db_driver)
+        self.mock_object(lock_stats, 'log_report')
+        self.mock_object(lock_stats, 'LOCK_STATS', lock_stats.LockStats())
+        fake_notifier.reset()
+
+        fake_manager._report_lock_stats('fake_context')
+
+        self.assertFalse(lock_stats.log_report.called)
+        self.assertEqual([], fake_notifier.NOTIFICATIONS)
+
 
 @ddt.ddt
 class SchedulerDependentManagerTestCase(test.TestCase):
@@ -119,3 +155,54 @@ class SchedulerDependentManagerTestCase(test.TestCase):
     def test_update_service_capabilities(self, capabilities):
         self.sched_manager.update_service_capabilities(capabilities)
         self.assertEqual(capabilities, self.sched_manager.last_capabilities)
+
+    def test__publish_service_capabilities_delta(self):
+        self.flags(capabilities_full_update_interval=600)
+        self.useFixture(fixtures.MonkeyPatch(
+            'oslo_utils.timeutils.utcnow.override_time',
+            datetime.datetime(2019, 1, 1)))
+        update = self.mock_object(
+            self.sched_manager.scheduler_rpcapi, 'update_service_capabilities')
+        capabilities = {'foo': 'bar', 'pools': [
+            {'pool_name': 'pool1', 'free_capacity_gb': 10},
+            {'pool_name': 'pool2', 'free_capacity_gb': 20}]}
+
+        self.sched_manager.update_service_capabilities(capabilities)
+        self.sched_manager._publish_service_capabilities(self.context)
+        capabilities['pools'][1]['free_capacity_gb'] = 15
+        self.sched_manager._publish_service_capabilities(self.context)
+        timeutils.advance_time_seconds(601)
+        self.sched_manager._publish_service_capabilities(self.context)
+
+        update.assert_has_calls([
+            mock.call(self.context, self.service_name, self.host,
+                      capabilities, generation=1),
+            mock.call(self.context, self.service_name, self.host,
+                      {'updated': {}, 'removed': [],
+                       'pools': {
+                           'updated': {'pool2': {'free_capacity_gb': 15}},
+                           'removed': {},
+                           'deleted': []}},
+                      generation=2, base_generation=1),
+            mock.call(self.context, self.service_name, self.host,
+                      capabilities, generation=3),
+        ])
+        self.assertEqual(3, update.call_count)
+
+    def test__publish_service_capabilities_forced_full_update(self):
+        self.flags(capabilities_full_update_interval=600)
+        update = self.mock_object(
+            self.sched_manager.scheduler_rpcapi, 'update_service_capabilities')
+        capabilities = {'foo': 'bar'}
+
+        self.sched_manager.update_service_capabilities(capabilities)
+        self.sched_manager._publish_service_capabilities(self.context)
+        self.sched_manager._force_full_capabilities_update()
+        self.sched_manager._publish_service_capabilities(self.context)
+
+        update.assert_has_calls([
+            mock.call(self.context, self.service_name, self.host,
+                      capabilities, generation=1),
+            mock.call(self.context, self.service_name, self.host,
+                      capabilities, generation=2),
+        ])
@@ -13,9 +13,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
+
 import ddt
+import fixtures
 import mock
 from oslo_config import cfg
+from oslo_utils import timeutils
 
 from manila import exception
 from manila import quota
@@ -314,6 +318,85 @@ class DbQuotaDriverTestCase(test.TestCase):
             self.assertEqual(0, self.driver.get_user_quotas.call_count)
             self.assertEqual(0, self.driver.get_share_type_quotas.call_count)
 
+    def test__get_quotas_cached(self):
+        self.flags(quota_limits_cache_ttl=30)
+        quotas = {'foo': {'limit': 5}, 'bar': {'limit': 13}}
+        self.mock_object(
+            self.driver, 'get_project_quotas', mock.Mock(return_value=quotas))
+        self.useFixture(fixtures.MonkeyPatch(
+            'oslo_utils.timeutils.utcnow.override_time',
+            datetime.datetime(2018, 1, 1)))
+
+        results = [
+            self.driver._get_quotas(
+                self.ctxt, self.resources, ('foo', 'bar'), False,
+                self.project_id)
+            for i in range(3)
+        ]
+
+        for result in results:
+            self.assertEqual({'foo': 5, 'bar': 13}, result)
+        self.driver.get_project_quotas.assert_called_once_with(
+            self.ctxt, self.resources, self.project_id,
+            self.ctxt.quota_class, usages=False)
+
+    @ddt.data(
+        {'elapsed': 31},
+        {'elapsed': 1, 'invalidate': 'fake_project_id'},
+        {'elapsed': 1, 'invalidate': None},
+    )
+    @ddt.unpack
+    def test__get_quotas_cache_dropped(self, elapsed, invalidate=False):
+        self.flags(quota_limits_cache_ttl=30)
+        quotas = {'foo': {'limit': 5}, 'bar': {'limit': 13}}
+        self.mock_object(
+            self.driver, 'get_project_quotas', mock.Mock(return_value=quotas))
+        self.useFixture(fixtures.MonkeyPatch(
+            'oslo_utils.timeutils.utcnow.override_time',
+            datetime.datetime(2018, 1, 1)))
+
+        self.driver._get_quotas(
+            self.ctxt, self.resources, ('foo', 'bar'), False, self.project_id)
+        timeutils.advance_time_seconds(elapsed)
+        if invalidate is not False:
+            self.driver.invalidate_limits_cache(invalidate)
+        self.driver._get_quotas(
+            self.ctxt, self.resources, ('foo', 'bar'), False, self.project_id)
+
+        self.assertEqual(2, self.driver.get_project_quotas.call_count)
+
+    def test__get_quotas_expired_cache_dropped(self):
+        self.flags(quota_limits_cache_ttl=30)
+        quotas = {'foo': {'limit': 5}, 'bar': {'limit': 13}}
+        self.mock_object(
+            self.driver, 'get_project_quotas', mock.Mock(return_value=quotas))
+        self.useFixture(fixtures.MonkeyPatch(
+            'oslo_utils.timeutils.utcnow.override_time',
+            datetime.datetime(2018, 1, 1)))
+
+        self.driver._get_quotas(
+            self.ctxt, self.resources, ('foo', 'bar'), False,
+            'fake_other_project_id')
+        timeutils.advance_time_seconds(31)
+        self.driver._get_quotas(
+            self.ctxt, self.resources, ('foo', 'bar'), False, self.project_id)
+
+        self.assertEqual(
+            [self.project_id],
+            [key[0] for key in self.driver._limits_cache])
+
+    def test_invalidate_limits_cache_other_project(self):
+        self.driver._limits_cache = {
+            ('fake_project_id', None, None): 'foo',
+            ('fake_other_project_id', None, None): 'bar',
+        }
+
+        self.driver.invalidate_limits_cache('fake_other_project_id')
+
+        self.assertEqual(
+            {('fake_project_id', None, None): 'foo'},
+            self.driver._limits_cache)
+
     def test__get_quotas_unknown(self):
         quotas = {'foo': {'limit': 5}, 'bar': {'limit': 13}}
         self.mock_object(
@@ -450,12 +533,36 @@ class DbQuotaDriverTestCase(test.TestCase):
             self.ctxt, self.project_id, self.share_type_id)
 
     def test_expire(self):
-        self.mock_object(quota.db, 'reservation_expire')
+        self.mock_object(
+            quota.db, 'reservation_expire', mock.Mock(return_value=3))
+        self.mock_object(quota.time, 'sleep')
 
         result = self.driver.expire(self.ctxt)
 
-        self.assertIsNone(result)
-        quota.db.reservation_expire.assert_called_once_with(self.ctxt)
+        self.assertEqual(3, result)
+        quota.db.reservation_expire.assert_called_once_with(
+            self.ctxt, batch_size=CONF.reservation_expire_batch_size)
+        self.assertFalse(quota.time.sleep.called)
+
+    @ddt.data(0, 2)
+    def test_expire_batches(self, batch_size):
+        side_effect = [2, 2, 1] if batch_size else [5]
+        self.mock_object(
+            quota.db, 'reservation_expire',
+            mock.Mock(side_effect=side_effect))
+        self.mock_object(quota.time, 'sleep')
+
+        result = self.driver.expire(
+            self.ctxt, batch_size=batch_size, batch_delay=0.5)
+
+        self.assertEqual(5, result)
+        quota.db.reservation_expire.assert_has_calls(
+            [mock.call(self.ctxt, batch_size=batch_size)] *
+            len(side_effect))
+        self.assertEqual(
+            len(side_effect) - 1, quota.time.sleep.call_count)
+        if batch_size:
+            quota.time.sleep.assert_called_with(0.5)
 
 
 @ddt.ddt
@@ -700,10 +807,18 @@ class QuotaEngineTestCase(test.TestCase):
             self.ctxt, 'fake_project_id')
 
     def test_expire(self):
-        result = self.engine.expire(self.ctxt)
+        result = self.engine.expire(self.ctxt, batch_size=10)
+
+        self.assertEqual(self.driver.expire.return_value, result)
+        self.driver.expire.assert_called_once_with(
+            self.ctxt, batch_size=10, batch_delay=None)
+
+    def test_invalidate_limits_cache(self):
+        result = self.engine.invalidate_limits_cache('fake_project')
 
         self.assertIsNone(result)
-        self.driver.expire.assert_called_once_with(self.ctxt)
+        self.driver.invalidate_limits_cache.assert_called_once_with(
+            project_id='fake_project')
 
     def test_resources(self):
         self.engine.register_resources(self.resources)
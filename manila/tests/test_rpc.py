@@ -36,3 +36,22 @@ class RPCTestCase(test.TestCase):
         self.assertTrue(messaging_mock.JsonPayloadSerializer.called)
         self.assertTrue(messaging_mock.Notifier.called)
         self.assertEqual(rpc.NOTIFIER, messaging_mock.Notifier.return_value)
+
+    @ddt.data(True, False)
+    @mock.patch.object(rpc, 'messaging')
+    def test_get_server(self, db_query_stats, messaging_mock):
+        self.flags(db_query_stats=db_query_stats)
+        self.mock_object(rpc, 'TRANSPORT')
+        endpoint = mock.Mock()
+
+        server = rpc.get_server(mock.sentinel.target, [endpoint])
+
+        self.assertEqual(messaging_mock.get_rpc_server.return_value, server)
+        endpoints = messaging_mock.get_rpc_server.call_args[0][2]
+        self.assertEqual(1, len(endpoints))
+        if db_query_stats:
+            self.assertIsInstance(endpoints[0],
+                                  rpc.query_stats.ProfiledEndpoint)
+            self.assertIs(endpoint, endpoints[0]._endpoint)
+        else:
+            self.assertIs(endpoint, endpoints[0])
@@ -34,6 +34,7 @@ from manila.common import constants
 from manila import context
 from manila.db import api as db
 from manila import exception
+from manila import lock_stats
 from manila import test
 from manila import utils
 
@@ -169,6 +170,46 @@ class GenericUtilsTestCase(test.TestCase):
         self.assertIsNone(actual)
 
 
+class SynchronizedTestCase(test.TestCase):
+
+    def test_synchronized(self):
+        self.flags(lock_stats_report_interval=60)
+        mock_add = self.mock_object(lock_stats.LOCK_STATS, 'add')
+
+        @utils.synchronized('lock-7d5e0f84-9d0d-4d8b-9b0a-3c3e9f3f2a11')
+        def func(value, other=None):
+            return value, other
+
+        self.assertEqual((1, 2), func(1, other=2))
+        self.assertEqual('func', func.__name__)
+        mock_add.assert_called_once_with(
+            'lock-{id}', wait_time=mock.ANY, hold_time=mock.ANY)
+
+    def test_synchronized_records_stats_on_error(self):
+        self.flags(lock_stats_report_interval=60)
+        mock_add = self.mock_object(lock_stats.LOCK_STATS, 'add')
+
+        @utils.synchronized('lock', external=False)
+        def func():
+            raise exception.ManilaException()
+
+        self.assertRaises(exception.ManilaException, func)
+        mock_add.assert_called_once_with(
+            'lock', wait_time=mock.ANY, hold_time=mock.ANY)
+
+    def test_synchronized_stats_disabled(self):
+        mock_add = self.mock_object(lock_stats.LOCK_STATS, 'add')
+        mock_timer = self.mock_object(lock_stats, 'LockTimer')
+
+        @utils.synchronized('lock', external=False)
+        def func(value):
+            return value
+
+        self.assertEqual(1, func(1))
+        self.assertFalse(mock_timer.called)
+        self.assertFalse(mock_add.called)
+
+
 class MonkeyPatchTestCase(test.TestCase):
     """Unit test for utils.monkey_patch()."""
     def setUp(self):
@@ -50,6 +50,7 @@ from manila.common import constants
 from manila.db import api as db_api
 from manila import exception
 from manila.i18n import _
+from manila import lock_stats
 
 CONF = cfg.CONF
 LOG = log.getLogger(__name__)
@@ -57,7 +58,40 @@ LOG = log.getLogger(__name__)
 _ISO8601_TIME_FORMAT_SUBSECOND = '%Y-%m-%dT%H:%M:%S.%f'
 _ISO8601_TIME_FORMAT = '%Y-%m-%dT%H:%M:%S'
 
-synchronized = lockutils.synchronized_with_prefix('manila-')
+_synchronized = lockutils.synchronized_with_prefix('manila-')
+
+
+def synchronized(name, *args, **kwargs):
+    """Synchronization decorator backed by oslo.concurrency lockutils.
+
+    Accepts the arguments of :func:`oslo_concurrency.lockutils.synchronized`
+    and records the wait and hold times of the lock in the lock statistics
+    of the service when they are enabled, see :mod:`manila.lock_stats`.
+    """
+    lock_decorator = _synchronized(name, *args, **kwargs)
+    template = lock_stats.lock_name_template(name)
+
+    def wrap(f):
+        @lock_decorator
+        @functools.wraps(f)
+        def locked(timer, *f_args, **f_kwargs):
+            if timer is None:
+                return f(*f_args, **f_kwargs)
+            timer.acquired()
+            try:
+                return f(*f_args, **f_kwargs)
+            finally:
+                timer.released()
+
+        @functools.wraps(f)
+        def inner(*f_args, **f_kwargs):
+            if not lock_stats.enabled():
+                return locked(None, *f_args, **f_kwargs)
+            timer = lock_stats.LockTimer(template)
+            timer.acquiring()
+            return locked(timer, *f_args, **f_kwargs)
+        return inner
+    return wrap
 
 
 def isotime(at=None, subsecond=False):